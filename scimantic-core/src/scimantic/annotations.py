@@ -0,0 +1,398 @@
+"""
+Interval index of a project's Annotation selectors.
+
+Annotations (``oa:Annotation``) select a region of their ``oa:hasTarget``
+document with a TextSelector: character offsets ``oa:start``/``oa:end``,
+optionally within page ``scimantic:pageNumber``. The AnnotationIndex stores
+one row per (annotation, selector) as a half-open span of positions, where a
+position is ``page << 32 | offset`` (page 0 for documents without pages), so
+spans compare across pages. Rows are sorted by document and span start, with
+a running maximum of span ends per document; a range query is then two
+binary searches and a vectorized filter over the rows in between, instead of
+a scan of every Annotation.
+
+Selectors with a page but no offsets span the whole page; a missing end is
+taken from the length of the ``oa:exact`` quote. Selectors with neither
+offsets nor a page are kept, so later writes can complete them, but match no
+query.
+
+The index is cached as ``<project>.annotations.npz`` in
+DEFAULT_ANNOTATION_CACHE_DIR beside the project and maintained like the
+Result table (scimantic.results): add_to_project merges the Annotations of
+each delta into a current cache, and a stale or missing cache is rebuilt from
+the project on first use.
+"""
+
+import os
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from itertools import pairwise
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+from rdflib import Graph, Namespace
+from rdflib.namespace import RDF
+from rdflib.term import Node
+
+from scimantic.config import DEFAULT_ANNOTATION_CACHE_DIR, SCIMANTIC_ONTOLOGY_URI
+from scimantic.storage import load_project, project_stamp
+
+SCIMANTIC = Namespace(SCIMANTIC_ONTOLOGY_URI)
+OA = Namespace("http://www.w3.org/ns/oa#")
+
+INDEX_FORMAT = 1
+INDEX_SUFFIX = ".annotations.npz"
+
+# Positions pack (page, offset) into one integer
+PAGE_SHIFT = 32
+MISSING = -1
+
+# Selector field → predicate
+_SELECTOR_FIELDS = {
+    "start": OA.start,
+    "end": OA.end,
+    "page": SCIMANTIC.pageNumber,
+}
+
+
+def position(page: int | None, offset: int) -> int:
+    """The index position of a character offset (page None: unpaged)."""
+    return (page or 0) << PAGE_SHIFT | offset
+
+
+def _span(row: dict[str, Any]) -> tuple[int, int]:
+    """
+    The [low, high) positions of a selector row; (MISSING, MISSING), which
+    matches no query, if it has no target or position.
+    """
+    page, start, end, length = row["page"], row["start"], row["end"], row["length"]
+    if not row["target"] or start == end == page == MISSING:
+        return MISSING, MISSING
+    if start == end == MISSING:
+        return position(page, 0), position(page + 1, 0)
+    if end == MISSING:
+        end = start + max(length, 0)
+    elif start == MISSING:
+        start = max(end - max(length, 0), 0)
+    page = None if page == MISSING else page
+    return position(page, start), position(page, max(start, end))
+
+
+def _ints(values: Iterable[int]) -> np.ndarray:
+    return np.array(list(values), dtype=np.int64)
+
+
+def _strings(values: Iterable[str]) -> np.ndarray:
+    return np.array(list(values), dtype=str)
+
+
+@dataclass
+class AnnotationIndex:
+    """
+    Selector spans of a project's Annotations, one row per selector.
+
+    Rows are sorted by ``targets`` then ``lows``; ``max_highs`` is the running
+    maximum of ``highs`` within each target. ``pages``, ``starts`` and
+    ``ends`` hold the selector's own values (MISSING if absent).
+    """
+
+    annotations: np.ndarray
+    selectors: np.ndarray
+    targets: np.ndarray
+    pages: np.ndarray
+    starts: np.ndarray
+    ends: np.ndarray
+    lengths: np.ndarray
+    lows: np.ndarray
+    highs: np.ndarray
+    max_highs: np.ndarray
+    stamp: tuple[int, ...] = ()
+    _rows: dict[str, int] = field(default_factory=dict, init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self._rows = {str(s): i for i, s in enumerate(self.selectors)}
+
+    def __len__(self) -> int:
+        return len(self.selectors)
+
+    @classmethod
+    def from_rows(
+        cls, rows: dict[str, dict[str, Any]], stamp: tuple[int, ...] = ()
+    ) -> "AnnotationIndex":
+        """Builds the index from {selector: row} (see _annotation_rows)."""
+        spans = {s: _span(row) for s, row in rows.items()}
+        order = sorted(rows, key=lambda s: (rows[s]["target"], spans[s], s))
+        targets = _strings(rows[s]["target"] for s in order)
+        lows = _ints(spans[s][0] for s in order)
+        highs = _ints(spans[s][1] for s in order)
+        max_highs = highs.copy()
+        for a, b in _segments(targets):
+            np.maximum.accumulate(highs[a:b], out=max_highs[a:b])
+        return cls(
+            annotations=_strings(rows[s]["annotation"] for s in order),
+            selectors=_strings(order),
+            targets=targets,
+            pages=_ints(rows[s]["page"] for s in order),
+            starts=_ints(rows[s]["start"] for s in order),
+            ends=_ints(rows[s]["end"] for s in order),
+            lengths=_ints(rows[s]["length"] for s in order),
+            lows=lows,
+            highs=highs,
+            max_highs=max_highs,
+            stamp=stamp,
+        )
+
+    def rows(self) -> dict[str, dict[str, Any]]:
+        """The index as {selector: row}, the inverse of from_rows."""
+        return {
+            str(selector): {
+                "annotation": str(self.annotations[i]),
+                "target": str(self.targets[i]),
+                "page": int(self.pages[i]),
+                "start": int(self.starts[i]),
+                "end": int(self.ends[i]),
+                "length": int(self.lengths[i]),
+            }
+            for i, selector in enumerate(self.selectors)
+        }
+
+    def document(self, target: str) -> tuple[int, int]:
+        """The [first, last) rows of a target document."""
+        first = int(np.searchsorted(self.targets, target, side="left"))
+        last = int(np.searchsorted(self.targets, target, side="right"))
+        return first, last
+
+    def query(
+        self,
+        target: str,
+        start: int | None = None,
+        end: int | None = None,
+        page: int | None = None,
+        last_page: int | None = None,
+        contained: bool = False,
+    ) -> np.ndarray:
+        """
+        Finds the selectors of a document that overlap (or lie within) a range.
+
+        The range runs from offset ``start`` on ``page`` to offset ``end`` on
+        ``last_page`` (default: the same page). Without offsets it covers
+        whole pages, or the whole document if no page is given either.
+
+        Args:
+            target: The annotated document (the oa:hasTarget value)
+            start: First character offset of the range (default: 0)
+            end: Character offset just past the range (default: end of page)
+            page: First page of the range (None for unpaged documents)
+            last_page: Last page of the range
+            contained: Only selectors lying entirely within the range
+
+        Returns:
+            Indices of the matching rows, ordered by position
+        """
+        first, last = self.document(target)
+        pages = page if last_page is None else last_page
+        low = position(page, start or 0)
+        if end is not None:
+            high = position(pages, end)
+        elif page is not None:
+            high = position((pages or 0) + 1, 0)
+        else:
+            high = np.iinfo(np.int64).max
+        lows = self.lows[first:last]
+        highs = self.highs[first:last]
+        if contained:
+            i = int(np.searchsorted(lows, low, side="left"))
+            j = int(np.searchsorted(lows, high, side="right"))
+            hits = highs[i:j] <= high
+        else:
+            # Every selector before i ends at or before low; from j on, all
+            # start at or after high
+            i = int(np.searchsorted(self.max_highs[first:last], low, side="right"))
+            j = int(np.searchsorted(lows, high, side="left"))
+            hits = highs[i:j] > low
+        return first + i + np.flatnonzero(hits)
+
+    def write(self, path: str | Path) -> None:
+        """Writes the index as an .npz file, atomically."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp.npz")
+        np.savez(
+            tmp,
+            format=np.array([INDEX_FORMAT]),
+            stamp=np.array(self.stamp, dtype=np.int64),
+            annotations=self.annotations,
+            selectors=self.selectors,
+            targets=self.targets,
+            pages=self.pages,
+            starts=self.starts,
+            ends=self.ends,
+            lengths=self.lengths,
+            lows=self.lows,
+            highs=self.highs,
+            max_highs=self.max_highs,
+        )
+        os.replace(tmp, path)
+
+    @classmethod
+    def read(cls, path: str | Path) -> "AnnotationIndex | None":
+        """Reads an index written by write (None if missing or outdated)."""
+        try:
+            with np.load(path, allow_pickle=False) as data:
+                if int(data["format"][0]) != INDEX_FORMAT:
+                    return None
+                return cls(
+                    annotations=data["annotations"],
+                    selectors=data["selectors"],
+                    targets=data["targets"],
+                    pages=data["pages"],
+                    starts=data["starts"],
+                    ends=data["ends"],
+                    lengths=data["lengths"],
+                    lows=data["lows"],
+                    highs=data["highs"],
+                    max_highs=data["max_highs"],
+                    stamp=tuple(int(v) for v in data["stamp"]),
+                )
+        except (OSError, KeyError, ValueError):
+            return None
+
+
+def _segments(targets: np.ndarray) -> list[tuple[int, int]]:
+    """[first, last) row ranges of each target in a sorted target column."""
+    if not len(targets):
+        return []
+    starts = np.flatnonzero(targets[1:] != targets[:-1]) + 1
+    bounds = [0, *starts.tolist(), len(targets)]
+    return list(pairwise(bounds))
+
+
+def _integer(graph: Graph, subject: Node, predicate: Node) -> int | None:
+    value = graph.value(subject, predicate)
+    if value is None:
+        return None
+    try:
+        return int(str(value))
+    except ValueError:
+        return None
+
+
+def _annotation_rows(
+    graph: Graph,
+    annotations: Iterable[Node],
+    selectors: Iterable[Node] = (),
+    rows: dict[str, dict[str, Any]] | None = None,
+) -> dict[str, dict[str, Any]]:
+    """
+    Reads the selectors of the given Annotations into rows, updating
+    existing rows.
+
+    Fields the graph does not mention keep their previous value, so a delta
+    graph can be merged into the rows of the whole project.
+
+    Args:
+        graph: Graph to read
+        annotations: Annotations whose target and selectors to read
+        selectors: Further, already known selectors to read
+        rows: Existing rows, keyed by selector
+    """
+    rows = {} if rows is None else rows
+    targets: dict[str, str] = {}
+    pending = {str(s): s for s in selectors}
+    for annotation in annotations:
+        target = graph.value(annotation, OA.hasTarget)
+        if target is not None:
+            targets[str(annotation)] = str(target)
+        for selector in graph.objects(annotation, OA.hasSelector):
+            pending[str(selector)] = selector
+            rows.setdefault(
+                str(selector),
+                {
+                    "annotation": str(annotation),
+                    "target": "",
+                    "page": MISSING,
+                    "start": MISSING,
+                    "end": MISSING,
+                    "length": MISSING,
+                },
+            )
+    for key, selector in pending.items():
+        row = rows.get(key)
+        if row is None:
+            continue
+        for name, predicate in _SELECTOR_FIELDS.items():
+            value = _integer(graph, selector, predicate)
+            if value is not None:
+                row[name] = value
+        exact = graph.value(selector, OA.exact)
+        if exact is not None:
+            row["length"] = len(str(exact))
+    for row in rows.values():
+        row["target"] = targets.get(row["annotation"], row["target"])
+    return rows
+
+
+def index_path(project_path: str | Path) -> Path:
+    """Returns the cache file of a project's annotation index."""
+    path = Path(project_path)
+    return path.parent / DEFAULT_ANNOTATION_CACHE_DIR / (path.name + INDEX_SUFFIX)
+
+
+def build_annotation_index(project_path: str | Path) -> AnnotationIndex:
+    """Reads every Annotation selector of a project into an index (no caching)."""
+    stamp = project_stamp(project_path)
+    graph = load_project(project_path, classes=[OA.Annotation, OA.TextQuoteSelector])
+    rows = _annotation_rows(graph, set(graph.subjects(RDF.type, OA.Annotation)))
+    return AnnotationIndex.from_rows(rows, stamp)
+
+
+_indexes: dict[Path, AnnotationIndex] = {}
+
+
+def load_annotation_index(project_path: str | Path) -> AnnotationIndex:
+    """
+    Returns the annotation index of a project, rebuilt only when it is stale.
+
+    The index is kept in memory and in index_path(project_path); both are
+    reused while the project's modification stamp is unchanged.
+    """
+    path = Path(project_path).resolve()
+    stamp = project_stamp(path)
+    index = _indexes.get(path)
+    if index is None or index.stamp != stamp:
+        index = AnnotationIndex.read(index_path(path))
+    if index is None or index.stamp != stamp:
+        index = build_annotation_index(path)
+        index.write(index_path(path))
+    _indexes[path] = index
+    return index
+
+
+def update_annotation_index(
+    graph: Graph, project_path: str | Path, previous_stamp: tuple[int, ...]
+) -> None:
+    """
+    Merges the Annotations of a graph just added to a project into its index.
+
+    Only an index that was current before the write (stamped previous_stamp)
+    is updated; otherwise it is left to be rebuilt on next use.
+    """
+    path = Path(project_path).resolve()
+    cache = index_path(path)
+    if not cache.exists():
+        return
+    index = AnnotationIndex.read(cache)
+    if index is None or index.stamp != previous_stamp:
+        return
+    known = set(index.annotations.tolist())
+    annotations = set(graph.subjects(RDF.type, OA.Annotation))
+    subjects = set(graph.subjects())
+    annotations.update(s for s in subjects if str(s) in known)
+    selectors = [s for s in subjects if str(s) in index._rows]
+    if annotations or selectors:
+        rows = _annotation_rows(graph, annotations, selectors, index.rows())
+        index = AnnotationIndex.from_rows(rows)
+    index.stamp = project_stamp(path)
+    index.write(cache)
+    _indexes[path] = index
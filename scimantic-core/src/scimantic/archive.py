@@ -0,0 +1,351 @@
+"""
+Nanopublication archives: a project kept as per-nanopub named graphs.
+
+An archive is one N-Quads (``project.nq``) or TriG (``project.trig``) file in
+which every nanopublication keeps its head, assertion, provenance and pubinfo
+named graphs. Each graph is written as one contiguous block, one statement
+per line with full IRIs, so any block can be parsed on its own. Nanopubs are
+only ever appended.
+
+Next to the archive, ``<archive>.offsets`` maps every graph IRI and every
+nanopub URI to the (offset, length) of its bytes, one tab-separated
+``offset length kind IRI`` line per entry (kind is ``graph`` or
+``nanopub``). Reading one nanopub or graph is then a dictionary lookup and
+a seek, however many nanopubs the archive holds. The offsets file is appended
+to after the archive; if it is missing or behind (e.g. after an interrupted
+write), the unindexed tail of the archive is scanned and indexed on open.
+"""
+
+import os
+import re
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+
+from rdflib import Dataset, Graph, URIRef
+from rdflib.graph import DATASET_DEFAULT_GRAPH_ID
+from rdflib.namespace import RDF
+from rdflib.term import Node
+
+from scimantic.config import NANOPUB_PROJECT_SUFFIXES
+from scimantic.ntriples import encode_term
+from scimantic.publish import NP, MintedNanopub, assemble_nanopub
+
+OFFSETS_SUFFIX = ".offsets"
+GRAPH = "graph"
+NANOPUB = "nanopub"
+
+# One RDF term in N-Quads: IRI, blank node or literal (with language or type)
+_TERM = re.compile(
+    rb'\s*(<[^>]*>|_:\S+|"(?:[^"\\]|\\.)*"(?:@[A-Za-z0-9\-]+|\^\^<[^>]*>)?)'
+)
+_TRIG_OPEN = re.compile(rb"^(<[^>]*>|_:\S+)\s*\{\s*$")
+_TRIG_CLOSE = re.compile(rb"^\}\s*$")
+_NANOPUBLICATION = encode_term(NP.Nanopublication)
+_TYPE = encode_term(RDF.type)
+_PARTS = tuple(
+    encode_term(p) for p in (NP.hasAssertion, NP.hasProvenance, NP.hasPublicationInfo)
+)
+
+Span = tuple[int, int]
+
+
+def is_archive(path: str | Path) -> bool:
+    """Whether a project path names a nanopub archive (.nq or .trig)."""
+    return str(path).endswith(NANOPUB_PROJECT_SUFFIXES)
+
+
+def _terms(line: bytes) -> list[bytes]:
+    """The encoded terms of an N-Quads (or one-line TriG) statement."""
+    terms: list[bytes] = []
+    pos = 0
+    while len(terms) < 4:
+        match = _TERM.match(line, pos)
+        if match is None:
+            break
+        terms.append(match.group(1))
+        pos = match.end()
+    return terms
+
+
+def _graph_term(line: bytes) -> bytes | None:
+    """The graph term of an N-Quads line (None for the default graph)."""
+    terms = _terms(line)
+    return terms[3] if len(terms) == 4 else None
+
+
+def _iri(term: bytes) -> str:
+    return term[1:-1].decode() if term.startswith(b"<") else term.decode()
+
+
+class NanopubArchive:
+    """
+    Append-only per-nanopub named graphs with a byte-offset index.
+
+    Args:
+        path: The .nq or .trig archive (created on first append)
+    """
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self.offsets_path = self.path.with_name(self.path.name + OFFSETS_SUFFIX)
+        self.format = "trig" if self.path.suffix == ".trig" else "nquads"
+        self._spans: dict[str, Span] = {}
+        self._nanopubs: set[str] = set()
+        self._end = 0
+        self._load_offsets()
+
+    # ------------------------------------------------------------------
+    # Index
+    # ------------------------------------------------------------------
+    def _load_offsets(self) -> None:
+        if self.offsets_path.exists():
+            with open(self.offsets_path, "rb") as f:
+                for line in f:
+                    offset, length, kind, iri = line.rstrip(b"\n").split(b"\t", 3)
+                    span = (int(offset), int(length))
+                    self._spans[iri.decode()] = span
+                    if kind.decode() == NANOPUB:
+                        self._nanopubs.add(iri.decode())
+                    self._end = max(self._end, span[0] + span[1])
+        size = self.path.stat().st_size if self.path.exists() else 0
+        if size < self._end:
+            # The archive was replaced behind the index's back
+            self.reindex()
+        elif size > self._end:
+            self._index_tail(self._end)
+
+    def reindex(self) -> None:
+        """Rebuilds the offsets file by scanning the whole archive."""
+        self._spans = {}
+        self._nanopubs = set()
+        self._end = 0
+        self.offsets_path.unlink(missing_ok=True)
+        if self.path.exists():
+            self._index_tail(0)
+
+    def _index_tail(self, start: int) -> None:
+        """Indexes the graphs and nanopubs stored from byte start onwards."""
+        graphs = dict(self._scan(start))
+        nanopubs: dict[str, Span] = {}
+        for iri, span in graphs.items():
+            nanopubs.update(self._nanopub_span(iri, span, graphs))
+        self._append_offsets(graphs, nanopubs)
+
+    def _scan(self, start: int) -> Iterator[tuple[str, Span]]:
+        """Yields (graph IRI, span) for each graph block after start."""
+        with open(self.path, "rb") as f:
+            f.seek(start)
+            offset = start
+            current: bytes | None = None
+            block_start = start
+            for line in f:
+                if self.format == "trig":
+                    opened = _TRIG_OPEN.match(line)
+                    if opened:
+                        current, block_start = opened.group(1), offset
+                    elif current is not None and _TRIG_CLOSE.match(line):
+                        yield (
+                            _iri(current),
+                            (block_start, offset + len(line) - block_start),
+                        )
+                        current = None
+                else:
+                    graph = _graph_term(line)
+                    if graph != current:
+                        if current is not None:
+                            yield _iri(current), (block_start, offset - block_start)
+                        current, block_start = graph, offset
+                offset += len(line)
+            if self.format == "nquads" and current is not None:
+                yield _iri(current), (block_start, offset - block_start)
+
+    def _nanopub_span(
+        self, iri: str, span: Span, spans: dict[str, Span]
+    ) -> dict[str, Span]:
+        """The span of the nanopub whose head graph this is, if it is one."""
+        data = self._read_span(span)
+        if _NANOPUBLICATION not in data:
+            return {}
+        # Heads are tiny and written one statement per line, so they are
+        # tokenized rather than parsed
+        statements = [_terms(line) for line in data.splitlines()]
+        result = {}
+        for s, p, o, *_ in (t for t in statements if len(t) >= 3):
+            if p != _TYPE or o != _NANOPUBLICATION:
+                continue
+            parts = [span]
+            for s2, p2, o2, *_ in (t for t in statements if len(t) >= 3):
+                if s2 == s and p2 in _PARTS and _iri(o2) in spans:
+                    parts.append(spans[_iri(o2)])
+            start = min(offset for offset, _ in parts)
+            end = max(offset + length for offset, length in parts)
+            result[_iri(s)] = (start, end - start)
+        return result
+
+    def _append_offsets(
+        self, graphs: dict[str, Span], nanopubs: dict[str, Span]
+    ) -> None:
+        with open(self.offsets_path, "ab") as f:
+            for kind, spans in ((GRAPH, graphs), (NANOPUB, nanopubs)):
+                for iri, (offset, length) in spans.items():
+                    f.write(f"{offset}\t{length}\t{kind}\t{iri}\n".encode())
+                    self._end = max(self._end, offset + length)
+        self._spans.update(graphs)
+        self._spans.update(nanopubs)
+        self._nanopubs.update(nanopubs)
+
+    # ------------------------------------------------------------------
+    # Writing
+    # ------------------------------------------------------------------
+    def _block(self, graph: Node, triples: Iterable[tuple[Node, Node, Node]]) -> bytes:
+        """One named graph as a self-contained block of lines."""
+        g = encode_term(graph)
+        rows = (b" ".join(encode_term(t) for t in triple) for triple in triples)
+        if self.format == "trig":
+            return g + b" {\n" + b"".join(row + b" .\n" for row in rows) + b"}\n"
+        return b"".join(row + b" " + g + b" .\n" for row in rows)
+
+    def append(self, nanopubs: Iterable[MintedNanopub]) -> list[str]:
+        """
+        Appends nanopubs, skipping ones the archive already holds.
+
+        Returns:
+            URIs of the nanopubs appended
+        """
+        appended = []
+        graphs: dict[str, Span] = {}
+        spans: dict[str, Span] = {}
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, "ab") as f:
+            offset = f.seek(0, os.SEEK_END)
+            for minted in nanopubs:
+                if minted.uri in self._nanopubs or minted.uri in spans:
+                    continue
+                parts: dict[Node, list[tuple[Node, Node, Node]]] = {}
+                for graph, s, p, o in minted.quads:
+                    parts.setdefault(graph, []).append((s, p, o))
+                start = offset
+                for part, triples in parts.items():
+                    block = self._block(part, triples)
+                    f.write(block)
+                    graphs[str(part)] = (offset, len(block))
+                    offset += len(block)
+                spans[minted.uri] = (start, offset - start)
+                appended.append(minted.uri)
+        if appended:
+            self._append_offsets(graphs, spans)
+        return appended
+
+    def add(self, graph: Graph) -> str:
+        """
+        Appends a graph as the assertion of a new (unsigned) nanopub.
+
+        Returns:
+            URI of the nanopub
+        """
+        minted = assemble_nanopub(graph)
+        self.append([minted])
+        return minted.uri
+
+    def save(self, dataset: Graph) -> None:
+        """
+        Replaces the archive with a dataset's named graphs.
+
+        Triples in the default graph (or all triples of a plain Graph) are
+        wrapped as the assertion of one new nanopub.
+        """
+        blocks = []
+        default = dataset
+        if isinstance(dataset, Dataset):
+            default = Graph()
+            # Sorting keeps each nanopub's graphs (this#Head, this#assertion,
+            # ...) next to each other
+            for graph in sorted(dataset.graphs(), key=lambda g: g.identifier):
+                if graph.identifier == DATASET_DEFAULT_GRAPH_ID:
+                    default += graph
+                elif len(graph):
+                    blocks.append(self._block(graph.identifier, graph))
+        tmp = self.path.with_name(f".{self.path.name}.tmp")
+        tmp.write_bytes(b"".join(blocks))
+        os.replace(tmp, self.path)
+        self.reindex()
+        if len(default):
+            self.add(default)
+
+    # ------------------------------------------------------------------
+    # Reading
+    # ------------------------------------------------------------------
+    def __contains__(self, iri: object) -> bool:
+        return str(iri) in self._spans
+
+    def __len__(self) -> int:
+        """Number of nanopubs in the archive."""
+        return len(self._nanopubs)
+
+    def nanopubs(self) -> list[str]:
+        """URIs of the nanopubs, in archive order."""
+        return sorted(self._nanopubs, key=self._spans.__getitem__)
+
+    def graphs(self) -> list[str]:
+        """IRIs of the named graphs, in archive order."""
+        graphs = set(self._spans) - self._nanopubs
+        return sorted(graphs, key=self._spans.__getitem__)
+
+    def _read_span(self, span: Span) -> bytes:
+        with open(self.path, "rb") as f:
+            f.seek(span[0])
+            return f.read(span[1])
+
+    def read(self, iri: str | Node) -> bytes:
+        """
+        The stored bytes of one graph or nanopub.
+
+        Raises:
+            KeyError: If the archive holds no graph or nanopub with that IRI
+        """
+        return self._read_span(self._spans[str(iri)])
+
+    def _parse(self, data: bytes) -> Dataset:
+        dataset = Dataset(default_union=True)
+        dataset.parse(data=data, format=self.format)
+        return dataset
+
+    def _copy(self, dataset: Dataset, iri: str | Node) -> Graph:
+        identifier = URIRef(str(iri))
+        graph = Graph(identifier=identifier)
+        graph += dataset.graph(identifier)
+        return graph
+
+    def graph(self, iri: str | Node) -> Graph:
+        """Reads one named graph, parsing only its own lines."""
+        return self._copy(self._parse(self.read(iri)), iri)
+
+    def nanopub(self, uri: str | Node) -> Dataset:
+        """Reads the head, assertion, provenance and pubinfo graphs of a nanopub."""
+        return self._parse(self.read(uri))
+
+    def assertion(self, uri: str | Node) -> Graph:
+        """Reads the assertion graph of a nanopub."""
+        nanopub = self.nanopub(uri)
+        graph = nanopub.value(URIRef(str(uri)), NP.hasAssertion)
+        if graph is None:
+            raise KeyError(f"{uri} has no assertion graph")
+        return self._copy(nanopub, graph)
+
+    def dataset(self) -> Dataset:
+        """
+        Loads the whole archive with its named graphs.
+
+        The dataset's default graph is the union of all named graphs.
+        """
+        if not self.path.exists():
+            return Dataset(default_union=True)
+        dataset = Dataset(default_union=True)
+        dataset.parse(str(self.path), format=self.format)
+        return dataset
+
+    def union(self) -> Graph:
+        """Loads the triples of all graphs as one flat project graph."""
+        graph = Graph()
+        graph.addN((s, p, o, graph) for s, p, o, _ in self.dataset().quads())
+        return graph
@@ -0,0 +1,483 @@
+"""
+Streaming import of Evidence from reference manager exports.
+
+Records are read one at a time from BibTeX (``.bib``), RIS (``.ris``), CSV
+(``.csv``) or NDJSON (``.ndjson``/``.jsonl``) files, so a library is never
+held in memory as text. Each record becomes one scimantic:Evidence with the
+same triples add_evidence writes:
+
+- ``content``: the abstract (or the record's content/title);
+- ``citation``: the record's citation, or one formatted from its authors,
+  year, title and journal;
+- ``source``: the DOI as a https://doi.org/ URL, or the record's URL.
+
+Records are validated against the Evidence model in batches and
+deduplicated, within the file and against the Evidence already in the
+project, by normalized DOI and by normalized citation. All new triples are
+written with one add_to_project call.
+"""
+
+import csv
+import json
+import re
+import uuid
+from collections.abc import Callable, Iterable, Iterator
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+
+from rdflib import Graph, Literal, Namespace, URIRef
+from rdflib.namespace import DCTERMS, PROV, RDF, RDFS, XSD
+
+from scimantic.config import SCIMANTIC_ONTOLOGY_URI
+from scimantic.models import Evidence
+from scimantic.storage import add_to_project, load_project
+
+SCIMANTIC = Namespace(SCIMANTIC_ONTOLOGY_URI)
+EVIDENCE_URI_PREFIX = "http://example.org/research/evidence/"
+DOI_URL = "https://doi.org/"
+
+BIBTEX, RIS, CSV, NDJSON = "bibtex", "ris", "csv", "ndjson"
+FORMATS = {
+    ".bib": BIBTEX,
+    ".bibtex": BIBTEX,
+    ".ris": RIS,
+    ".csv": CSV,
+    ".ndjson": NDJSON,
+    ".jsonl": NDJSON,
+}
+
+# Record field → the names it has in BibTeX, RIS, CSV headers and JSON keys
+_FIELDS = {
+    "title": ("title", "ti", "t1", "primary_title"),
+    "authors": ("author", "authors", "au", "a1", "a2"),
+    "year": ("year", "py", "y1", "da", "date", "issued"),
+    "journal": (
+        "journal",
+        "journaltitle",
+        "booktitle",
+        "jo",
+        "jf",
+        "t2",
+        "container-title",
+        "container_title",
+    ),
+    "doi": ("doi", "do"),
+    "url": ("url", "ur", "link"),
+    "abstract": ("abstract", "ab", "n2"),
+    "citation": ("citation", "bibliographiccitation"),
+    "content": ("content",),
+    "source": ("source",),
+}
+_ALIASES = {alias: name for name, aliases in _FIELDS.items() for alias in aliases}
+
+_RIS_LINE = re.compile(r"^([A-Z][A-Z0-9])  -(?: (.*))?$")
+_BIBTEX_START = re.compile(r"\s*@\s*(\w+)\s*[{(]")
+_BIBTEX_FIELD = re.compile(r"\s*,?\s*([\w:.-]+)\s*=\s*")
+_BIBTEX_BRACED = re.compile(r"\{((?:[^{}\\]|\\.|\{[^{}]*\})*)\}")
+_LATEX_ACCENT = re.compile(r"\\[\"'`^~=.]\{?(\w)\}?")
+_DOI = re.compile(r"10\.\d{4,9}/\S+", re.IGNORECASE)
+
+Record = dict[str, str | list[str]]
+ProgressCallback = Callable[[int, int], None]
+
+
+@dataclass
+class ImportReport:
+    """What an import_evidence call added to the project."""
+
+    read: int = 0
+    added: list[URIRef] = field(default_factory=list)
+    duplicates: int = 0
+    invalid: list[tuple[int, str]] = field(default_factory=list)
+
+
+def _record(fields: Iterable[tuple[str, object]]) -> Record:
+    """Maps raw field names onto record fields; unknown fields are dropped."""
+    record: Record = {}
+    authors: list[str] = []
+    for raw, value in fields:
+        name = _ALIASES.get(raw.strip().lower())
+        if name is None or value is None:
+            continue
+        if name == "authors":
+            authors.extend(_authors(value))
+        elif name not in record:  # keep the first of e.g. TI and T1
+            if isinstance(value, list):
+                value = "; ".join(map(str, value))
+            text = " ".join(str(value).split())
+            if text:
+                record[name] = text
+    if authors:
+        record["authors"] = authors
+    return record
+
+
+def _authors(value: object) -> list[str]:
+    if isinstance(value, list):
+        names = []
+        for author in value:
+            if isinstance(author, dict):  # CSL-JSON
+                name = ", ".join(
+                    part for part in (author.get("family"), author.get("given")) if part
+                )
+                names.append(name or str(author.get("literal", "")))
+            else:
+                names.append(str(author))
+        return [n for n in names if n]
+    parts = re.split(r"\s+and\s+|;", str(value))
+    return [" ".join(p.split()) for p in parts if p.strip()]
+
+
+def _latex(text: str) -> str:
+    """Strips the BibTeX markup that commonly appears in field values."""
+    if "\\" in text:
+        text = _LATEX_ACCENT.sub(r"\1", text)  # accents: \"{o} → o
+        text = text.replace("\\&", "&").replace("\\%", "%").replace("\\_", "_")
+    return text.replace("~", " ").replace("{", "").replace("}", "")
+
+
+def _bibtex_value(body: str, i: int) -> tuple[str, int]:
+    """Reads one (possibly #-concatenated) field value starting at body[i]."""
+    parts = []
+    while True:
+        while i < len(body) and body[i].isspace():
+            i += 1
+        if i >= len(body):
+            break
+        braced = _BIBTEX_BRACED.match(body, i) if body[i] == "{" else None
+        if braced:  # the common case: at most one level of nested braces
+            parts.append(braced[1])
+            i = braced.end()
+        elif body[i] in '{"':
+            close = "}" if body[i] == "{" else '"'
+            depth, j = 0, i + 1
+            while j < len(body):
+                c = body[j]
+                if c == "\\":
+                    j += 2
+                    continue
+                if c == "{":
+                    depth += 1
+                elif c == "}" and depth > 0:
+                    depth -= 1
+                elif c == close and depth == 0:
+                    break
+                j += 1
+            parts.append(body[i + 1 : j])
+            i = j + 1
+        else:
+            j = i
+            while j < len(body) and body[j] not in ",#}) \t\n":
+                j += 1
+            parts.append(body[i:j])
+            i = j
+        while i < len(body) and body[i].isspace():
+            i += 1
+        if i < len(body) and body[i] == "#":
+            i += 1
+            continue
+        break
+    return "".join(parts), i
+
+
+def _bibtex_entry(text: str) -> Record | None:
+    match = _BIBTEX_START.match(text)
+    if not match or match[1].lower() in ("comment", "string", "preamble"):
+        return None
+    body = text[match.end() :]
+    comma = body.find(",")
+    if comma < 0:
+        return None
+    fields = []
+    i = comma
+    while True:
+        name = _BIBTEX_FIELD.match(body, i)
+        if not name:
+            break
+        value, i = _bibtex_value(body, name.end())
+        fields.append((name[1], _latex(value)))
+    return _record(fields)
+
+
+def read_bibtex(lines: Iterable[str]) -> Iterator[Record]:
+    """Streams records from BibTeX lines, one entry at a time."""
+    entry: list[str] = []
+    depth = 0
+    opener = closer = ""
+    for line in lines:
+        if not entry:
+            match = _BIBTEX_START.match(line)
+            if not match:
+                continue
+            opener = line[match.end() - 1]
+            closer = "}" if opener == "{" else ")"
+            depth = 0
+        entry.append(line)
+        depth += line.count(opener) - line.count("\\" + opener)
+        depth -= line.count(closer) - line.count("\\" + closer)
+        if depth <= 0:
+            record = _bibtex_entry("".join(entry))
+            entry = []
+            if record is not None:
+                yield record
+    if entry:
+        record = _bibtex_entry("".join(entry))
+        if record is not None:
+            yield record
+
+
+def read_ris(lines: Iterable[str]) -> Iterator[Record]:
+    """Streams records from RIS lines (``TY  -`` to ``ER  -``)."""
+    fields: list[tuple[str, str]] = []
+    tag = None
+    for line in lines:
+        line = line.rstrip("\r\n")
+        match = _RIS_LINE.match(line.lstrip("\ufeff"))
+        if match:
+            tag, value = match[1], match[2] or ""
+            if tag == "ER":
+                if fields:
+                    yield _record(fields)
+                fields, tag = [], None
+            elif tag != "TY":
+                fields.append((tag, value))
+        elif tag and line.strip() and fields:
+            # Wrapped continuation of the previous field
+            fields[-1] = (tag, f"{fields[-1][1]} {line.strip()}")
+    if fields:
+        yield _record(fields)
+
+
+def read_csv(lines: Iterable[str]) -> Iterator[Record]:
+    """Streams records from CSV rows with a header row."""
+    for row in csv.DictReader(lines):
+        yield _record((k, v) for k, v in row.items() if k)
+
+
+def read_ndjson(lines: Iterable[str]) -> Iterator[Record | ValueError]:
+    """
+    Streams records from newline-delimited JSON objects.
+
+    A malformed line is yielded as a ValueError in its place, so one bad
+    line is reported as an invalid record instead of ending the import.
+    """
+    for number, line in enumerate(lines, 1):
+        if not line.strip():
+            continue
+        try:
+            value = json.loads(line)
+        except json.JSONDecodeError as e:
+            yield ValueError(f"Line {number} is not valid JSON: {e.msg}")
+            continue
+        if isinstance(value, dict):
+            yield _record(value.items())
+        else:
+            yield ValueError(f"Line {number} is not a JSON object")
+
+
+_READERS = {BIBTEX: read_bibtex, RIS: read_ris, CSV: read_csv, NDJSON: read_ndjson}
+
+
+def read_records(
+    path: str | Path, format: str | None = None
+) -> Iterator[Record | ValueError]:
+    """
+    Streams the records of a reference file.
+
+    Records that cannot be read are yielded as a ValueError in their place.
+
+    Args:
+        path: BibTeX, RIS, CSV or NDJSON file
+        format: One of FORMATS' values (default: from the file suffix)
+
+    Raises:
+        ValueError: If the format is unknown
+    """
+    path = Path(path)
+    format = format or FORMATS.get(path.suffix.lower())
+    if format not in _READERS:
+        raise ValueError(
+            f"Unknown reference format for {path}; expected one of "
+            f"{', '.join(sorted(FORMATS))}"
+        )
+    with open(path, encoding="utf-8-sig", newline="") as f:
+        yield from _READERS[format](f)
+
+
+def normalize_doi(text: str | None) -> str | None:
+    """The bare, lower-case DOI in a DOI, doi: or https://doi.org/ string."""
+    match = _DOI.search(text or "")
+    return match[0].rstrip(".,;").lower() if match else None
+
+
+def normalize_citation(text: str) -> str:
+    """
+    Case-, punctuation- and whitespace-insensitive form of a citation.
+
+    Single letters are dropped, so "Curtiss, L. A." and "Curtiss"
+    match: exports differ most in whether they keep initials.
+    """
+    words = re.sub(r"[^\w]+", " ", _latex(text).casefold()).split()
+    return " ".join(word for word in words if len(word) > 1 or word.isdigit())
+
+
+def format_citation(record: Record) -> str:
+    """Formats 'Authors (Year). Title. Journal.' from a record's fields."""
+    authors = list(record.get("authors", []))
+    if len(authors) > 2:
+        names = f"{authors[0]} et al."
+    else:
+        names = " and ".join(authors)
+    match = re.search(r"\d{4}", str(record.get("year", "")))
+    year = match[0] if match else ""
+    head = f"{names} ({year})" if names and year else names or year
+    parts = [head, record.get("title"), record.get("journal")]
+    return " ".join(f"{str(p).rstrip('.')}." for p in parts if p)
+
+
+def _keys(citation: str, source: str | None) -> set[str]:
+    keys = {f"citation:{normalize_citation(citation)}"}
+    doi = normalize_doi(source)
+    if doi:
+        keys.add(f"doi:{doi}")
+    return keys
+
+
+def evidence_fields(record: Record) -> dict[str, str]:
+    """
+    Maps a record onto the Evidence fields add_evidence takes.
+
+    Raises:
+        ValueError: If the record has no text for content or citation
+    """
+    doi = normalize_doi(str(record.get("doi", ""))) or normalize_doi(
+        str(record.get("url", ""))
+    )
+    content = str(
+        record.get("content") or record.get("abstract") or record.get("title") or ""
+    )
+    citation = str(record.get("citation") or format_citation(record))
+    source = str(
+        record.get("source") or (DOI_URL + doi if doi else record.get("url", ""))
+    )
+    if not content:
+        raise ValueError("Record has no abstract, title or content")
+    if not citation:
+        raise ValueError("Record has no citation, authors or title")
+    title = str(record.get("title") or "")
+    label = title or (content[:50] + "..." if len(content) > 50 else content)
+    return {"label": label, "content": content, "citation": citation, "source": source}
+
+
+def project_evidence_keys(project_path: str | Path) -> set[str]:
+    """Dedup keys (normalized citations and DOIs) of a project's Evidence."""
+    if not Path(project_path).exists():
+        return set()
+    g = load_project(project_path, classes=[SCIMANTIC.Evidence])
+    keys: set[str] = set()
+    for evidence in g.subjects(RDF.type, SCIMANTIC.Evidence):
+        for citation in g.objects(evidence, DCTERMS.bibliographicCitation):
+            keys.add(f"citation:{normalize_citation(str(citation))}")
+        for source in g.objects(evidence, DCTERMS.source):
+            doi = normalize_doi(str(source))
+            if doi:
+                keys.add(f"doi:{doi}")
+    return keys
+
+
+def import_evidence(
+    path: str | Path,
+    project_path: str | Path,
+    agent: str | None = None,
+    relates_to_question: str | None = None,
+    format: str | None = None,
+    batch_size: int = 1000,
+    progress: ProgressCallback | None = None,
+) -> ImportReport:
+    """
+    Imports the records of a reference file as Evidence, in one write.
+
+    Example:
+        import_evidence("library.bib", "project.nt", agent=orcid,
+                        progress=lambda read, added: print(read, added))
+
+    Args:
+        path: BibTeX, RIS, CSV or NDJSON file
+        project_path: Project to add the Evidence to
+        agent: Agent URI the Evidence is attributed to
+        relates_to_question: Question URI the Evidence is derived from
+        format: Reference format (default: from the file suffix)
+        batch_size: Records validated per batch
+        progress: Called with (records read, Evidence added) after each batch
+
+    Returns:
+        The Evidence added and the number of duplicate and invalid records
+    """
+    report = ImportReport()
+    seen = project_evidence_keys(project_path)
+    # Only iterated by add_to_project, so skip the Memory store's extra indexes
+    g = Graph(store="SimpleMemory")
+    g.bind("scimantic", SCIMANTIC)
+    g.bind("prov", PROV)
+    g.bind("dcterms", DCTERMS)
+    now = Literal(datetime.now(timezone.utc), datatype=XSD.dateTime)
+    agent_node = URIRef(agent) if agent else None
+    if agent_node:
+        g.add((agent_node, RDF.type, PROV.Agent))
+    question = URIRef(relates_to_question) if relates_to_question else None
+
+    def add_batch(batch: list[Record | ValueError]) -> None:
+        valid = []
+        for number, record in enumerate(batch, report.read + 1):
+            try:
+                if isinstance(record, ValueError):
+                    raise record
+                fields = evidence_fields(record)
+                Evidence(**fields)  # type: ignore[arg-type]
+            except (ValueError, TypeError) as e:
+                report.invalid.append((number, str(e)))
+            else:
+                valid.append(fields)
+        report.read += len(batch)
+
+        triples = []
+        evidence, content = SCIMANTIC.Evidence, SCIMANTIC.content
+        for fields in valid:
+            keys = _keys(fields["citation"], fields["source"])
+            if keys & seen:
+                report.duplicates += 1
+                continue
+            seen.update(keys)
+            # Full UUIDs: short ones collide within a large library
+            node = URIRef(f"{EVIDENCE_URI_PREFIX}{uuid.uuid4().hex}")
+            triples += [
+                (node, RDF.type, evidence),
+                (node, RDF.type, PROV.Entity),
+                (node, RDFS.label, Literal(fields["label"])),
+                (node, content, Literal(fields["content"])),
+                (node, DCTERMS.bibliographicCitation, Literal(fields["citation"])),
+                (node, DCTERMS.source, Literal(fields["source"])),
+                (node, PROV.generatedAtTime, now),
+            ]
+            if agent_node:
+                triples.append((node, PROV.wasAttributedTo, agent_node))
+            if question:
+                triples.append((node, PROV.wasDerivedFrom, question))
+            report.added.append(node)
+        g.addN((s, p, o, g) for s, p, o in triples)
+        if progress:
+            progress(report.read, len(report.added))
+
+    batch: list[Record | ValueError] = []
+    for record in read_records(path, format):
+        batch.append(record)
+        if len(batch) >= batch_size:
+            add_batch(batch)
+            batch = []
+    if batch:
+        add_batch(batch)
+
+    if report.added:
+        add_to_project(g, project_path)
+    return report
@@ -0,0 +1,385 @@
+"""
+Content-hash cache of cclib-parsed output files.
+
+Parsing a large quantum chemistry output is far slower than reading the
+arrays it yields, so parsed data is stored as ``<sha256>.npz`` in a cache
+directory (``.scimantic/cache/cclib`` by default), keyed by the SHA-256 of
+the output file. ``index.json`` next to them records
+
+- ``paths``: path → [mtime_ns, size, sha256], so an unchanged file is found
+  with one ``stat`` and never re-read, let alone hashed;
+- ``entries``: sha256 → {bytes, used}, for least-recently-used eviction once
+  the cache outgrows its size limit.
+
+Arrays are stored as ``.npz`` members; lists of arrays (e.g. alpha and beta
+``moenergies``) as ``name[0]``, ``name[1]``, ...; scalars, lists and dicts
+(``metadata``, whose ``cpu_time`` durations are tagged timedeltas) as one
+JSON member. Nothing is pickled.
+
+A cached file is also a provenance artifact: entity_uri() names it by its
+digest, and record_entity() describes it as the ``prov:Entity`` an Analysis
+used.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import re
+import time
+from collections.abc import Iterable
+from datetime import timedelta
+from pathlib import Path
+from typing import Any
+
+import cclib
+import numpy as np
+from cclib.parser.data import ccData
+from rdflib import Graph, Literal, URIRef
+from rdflib.namespace import PROV, RDF, RDFS
+
+from scimantic.config import DEFAULT_CCLIB_CACHE_BYTES, DEFAULT_CCLIB_CACHE_DIR
+
+# Bump when the .npz layout changes so stale entries are ignored
+CACHE_FORMAT = 2
+INDEX_FILE = "index.json"
+ARTIFACT_URI_PREFIX = "http://example.org/research/artifact/"
+
+_JSON_MEMBER = "__json__"
+_TIMEDELTA = "__timedelta__"
+_LIST_MEMBER = re.compile(r"(\w+)\[(\d+)\]$")
+_BLOCK_SIZE = 1 << 20
+
+
+def file_digest(path: str | Path) -> str:
+    """SHA-256 of a file's content, read in blocks."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        while block := f.read(_BLOCK_SIZE):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def entity_uri(digest: str) -> URIRef:
+    """The prov:Entity URI of the cached data for a file digest."""
+    return URIRef(f"{ARTIFACT_URI_PREFIX}{digest}")
+
+
+def _members(data: ccData) -> dict[str, Any]:
+    """Splits parsed data into .npz members (see the module docstring)."""
+    members: dict[str, Any] = {}
+    other: dict[str, Any] = {}
+    for name, value in data.getattributes().items():
+        if isinstance(value, np.ndarray) and value.dtype != object:
+            members[name] = value
+        elif (
+            isinstance(value, list)
+            and value
+            and all(isinstance(v, np.ndarray) and v.dtype != object for v in value)
+        ):
+            for i, item in enumerate(value):
+                members[f"{name}[{i}]"] = item
+        else:
+            other[name] = value
+    encodable = {}
+    for name, value in other.items():
+        if isinstance(value, dict):
+            # Drop only the keys that cannot be stored, so e.g. metadata
+            # keeps package and methods
+            value = {k: v for k, v in value.items() if _encodes(v)}
+        elif not _encodes(value):
+            continue  # not read by summarize or any Result
+        encodable[name] = value
+    payload = {"format": CACHE_FORMAT, "attributes": encodable}
+    members[_JSON_MEMBER] = np.array(json.dumps(payload, default=_json_default))
+    return members
+
+
+def _json_default(value: Any) -> Any:
+    """Encodes the non-JSON values cclib stores outside arrays."""
+    if isinstance(value, timedelta):  # metadata cpu_time and wall_time
+        return {_TIMEDELTA: value.total_seconds()}
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray) and value.dtype != object:
+        return value.tolist()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+def _json_object(obj: dict[str, Any]) -> Any:
+    if obj.keys() == {_TIMEDELTA}:
+        return timedelta(seconds=obj[_TIMEDELTA])
+    return obj
+
+
+def _encodes(value: Any) -> bool:
+    try:
+        json.dumps(value, default=_json_default)
+    except (TypeError, ValueError):
+        return False
+    return True
+
+
+def _data(members: Any) -> ccData:
+    """Rebuilds parsed data from the members written by _members."""
+    payload = json.loads(str(members[_JSON_MEMBER]), object_hook=_json_object)
+    if payload.get("format") != CACHE_FORMAT:
+        raise ValueError("Unknown cache format")
+    attributes: dict[str, Any] = dict(payload["attributes"])
+    lists: dict[str, dict[int, np.ndarray]] = {}
+    for key in members.files:
+        if key == _JSON_MEMBER:
+            continue
+        match = _LIST_MEMBER.match(key)
+        if match:
+            lists.setdefault(match[1], {})[int(match[2])] = members[key]
+        else:
+            attributes[key] = members[key]
+    for name, items in lists.items():
+        attributes[name] = [items[i] for i in sorted(items)]
+    # Set attributes directly: typecheck() rejects some of cclib's own values
+    # (e.g. optdone as a bool)
+    data = ccData()
+    for name, value in attributes.items():
+        setattr(data, name, value)
+    return data
+
+
+def _read(directory: Path, digest: str) -> ccData | None:
+    try:
+        with np.load(directory / f"{digest}.npz", allow_pickle=False) as members:
+            return _data(members)
+    except (OSError, ValueError, KeyError, json.JSONDecodeError):
+        return None  # missing, truncated or stale; parse the source again
+
+
+def _write(directory: Path, digest: str, data: ccData) -> int:
+    """Writes an entry atomically and returns its size in bytes."""
+    directory.mkdir(parents=True, exist_ok=True)
+    path = directory / f"{digest}.npz"
+    tmp = directory / f".{digest}.{os.getpid()}.tmp.npz"
+    np.savez(tmp, **_members(data))
+    os.replace(tmp, path)
+    return path.stat().st_size
+
+
+def parse_cached(
+    path: str | Path, directory: str | Path
+) -> tuple[ccData | None, str, int]:
+    """
+    Reads a file's parsed data from the cache by content, parsing it on a miss.
+
+    Safe to run in worker processes: entries are written atomically and the
+    index is left to the caller (see CclibCache.record).
+
+    Args:
+        path: Output file
+        directory: Cache directory
+
+    Returns:
+        The parsed data (None if cclib does not recognize the file), the
+        file's SHA-256 and the size of its entry (0 if nothing is cached)
+
+    Raises:
+        Whatever cclib raises for a malformed file
+    """
+    directory = Path(directory)
+    digest = file_digest(path)
+    entry = directory / f"{digest}.npz"
+    data = _read(directory, digest)
+    if data is not None:
+        return data, digest, entry.stat().st_size
+    data = cclib.io.ccread(str(path), loglevel=logging.ERROR)
+    if data is None:
+        return None, digest, 0
+    return data, digest, _write(directory, digest, data)
+
+
+class CclibCache:
+    """
+    Size-bounded LRU cache of cclib-parsed data, keyed by content hash.
+
+    Example:
+        cache = CclibCache()
+        data = cache.load("runs/water.log")  # parsed once, then read from .npz
+        cache.save()
+
+    Args:
+        directory: Cache directory
+        max_bytes: Total size of the cached entries before the least
+            recently used are evicted
+    """
+
+    def __init__(
+        self,
+        directory: str | Path = DEFAULT_CCLIB_CACHE_DIR,
+        max_bytes: int = DEFAULT_CCLIB_CACHE_BYTES,
+    ):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self._index: dict[str, dict[str, Any]] | None = None
+
+    @property
+    def index_path(self) -> Path:
+        return self.directory / INDEX_FILE
+
+    def _load_index(self) -> dict[str, dict[str, Any]]:
+        if self._index is None:
+            try:
+                self._index = json.loads(self.index_path.read_text())
+            except (FileNotFoundError, json.JSONDecodeError):
+                self._index = {}
+            self._index.setdefault("paths", {})
+            self._index.setdefault("entries", {})
+        return self._index
+
+    @staticmethod
+    def _stamp(path: str | Path) -> tuple[str, list[int]]:
+        stat = os.stat(path)
+        return str(Path(path).resolve()), [stat.st_mtime_ns, stat.st_size]
+
+    def lookup(self, path: str | Path) -> str | None:
+        """
+        Returns the digest of a file known to be cached, from its path,
+        modification time and size alone.
+        """
+        index = self._load_index()
+        try:
+            key, stamp = self._stamp(path)
+        except OSError:
+            return None
+        known = index["paths"].get(key)
+        if not known or known[:2] != stamp or known[2] not in index["entries"]:
+            return None
+        return str(known[2])
+
+    def read(self, digest: str) -> ccData | None:
+        """Returns the cached data of a digest, or None if it is not cached."""
+        return _read(self.directory, digest)
+
+    def get(self, path: str | Path) -> tuple[ccData, str] | None:
+        """
+        Returns a file's cached data and digest, or None on a miss.
+
+        Unchanged files are found by (path, mtime, size); others are hashed,
+        so a copied or touched file still hits the entry of its content.
+        """
+        digest = self.lookup(path)
+        if digest is None:
+            try:
+                digest = file_digest(path)
+            except OSError:
+                return None
+        data = self.read(digest)
+        if data is None:
+            return None
+        self.record(path, digest)
+        return data, digest
+
+    def load(self, path: str | Path) -> ccData | None:
+        """
+        Returns a file's parsed data, parsing and caching it on a miss.
+
+        Returns:
+            The parsed data, or None if cclib does not recognize the file
+        """
+        cached = self.get(path)
+        if cached is not None:
+            return cached[0]
+        data, digest, size = parse_cached(path, self.directory)
+        if data is not None:
+            self.record(path, digest, size)
+            self.evict()
+        return data
+
+    def record(self, path: str | Path, digest: str, size: int | None = None) -> None:
+        """
+        Records that a file's data is cached, and marks it recently used.
+
+        Args:
+            path: Output file
+            digest: SHA-256 of its content
+            size: Size of the entry in bytes (default: read from disk)
+        """
+        index = self._load_index()
+        key, stamp = self._stamp(path)
+        if size is None:
+            size = (self.directory / f"{digest}.npz").stat().st_size
+        index["paths"][key] = [*stamp, digest]
+        index["entries"][digest] = {"bytes": size, "used": time.time()}
+
+    def evict(self, keep: Iterable[str] = ()) -> list[str]:
+        """
+        Removes least recently used entries until the cache fits max_bytes.
+
+        Args:
+            keep: Digests never to evict (e.g. those in use by a batch)
+
+        Returns:
+            The evicted digests
+        """
+        index = self._load_index()
+        entries = index["entries"]
+        total = sum(entry["bytes"] for entry in entries.values())
+        keep = set(keep)
+        evicted = []
+        for digest in sorted(entries, key=lambda d: entries[d]["used"]):
+            if total <= self.max_bytes:
+                break
+            if digest in keep:
+                continue
+            total -= entries.pop(digest)["bytes"]
+            (self.directory / f"{digest}.npz").unlink(missing_ok=True)
+            evicted.append(digest)
+        if evicted:
+            gone = set(evicted)
+            paths = index["paths"]
+            for key in [k for k, v in paths.items() if v[2] in gone]:
+                del paths[key]
+        return evicted
+
+    def save(self) -> None:
+        """Writes the index; call once after a batch of lookups."""
+        if self._index is None:
+            return
+        self.directory.mkdir(parents=True, exist_ok=True)
+        tmp = self.index_path.with_name(f".{INDEX_FILE}.{os.getpid()}.tmp")
+        tmp.write_text(json.dumps(self._index, sort_keys=True))
+        os.replace(tmp, self.index_path)
+
+    def __len__(self) -> int:
+        return len(self._load_index()["entries"])
+
+    def __contains__(self, digest: str) -> bool:
+        return digest in self._load_index()["entries"]
+
+    def size(self) -> int:
+        """Total size of the cached entries in bytes."""
+        return sum(e["bytes"] for e in self._load_index()["entries"].values())
+
+
+def record_entity(
+    g: Graph, digest: str, source: URIRef | None = None, label: str | None = None
+) -> URIRef:
+    """
+    Describes the cached data of a file as a prov:Entity.
+
+    The URI depends only on the digest, so every Analysis that used the same
+    file content points at the same artifact.
+
+    Args:
+        g: Graph to add the description to
+        digest: SHA-256 of the source file
+        source: The Dataset the data was parsed from
+        label: Label (default: "cclib data <digest prefix>")
+
+    Returns:
+        The entity URI
+    """
+    uri = entity_uri(digest)
+    g.add((uri, RDF.type, PROV.Entity))
+    g.add((uri, RDFS.label, Literal(label or f"cclib data {digest[:12]}")))
+    g.add((uri, RDFS.comment, Literal(f"Parsed by cclib from content sha256:{digest}")))
+    if source is not None:
+        g.add((uri, PROV.wasDerivedFrom, source))
+    return uri
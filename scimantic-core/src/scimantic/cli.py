@@ -0,0 +1,209 @@
+"""
+Command line interface (the ``scimantic`` entry point).
+"""
+
+import argparse
+import sys
+
+from scimantic.bibliography import FORMATS, import_evidence
+from scimantic.config import DEFAULT_CCLIB_CACHE_DIR, DEFAULT_PROJECT_FILE
+from scimantic.export import JSONLD, NDJSON, export_entities, resolve_class
+from scimantic.storage import convert_project
+from scimantic.subset import generate_subsets
+
+
+def _convert(args: argparse.Namespace) -> int:
+    count = convert_project(args.source, args.destination, partitioned=args.partitioned)
+    print(f"✅ Converted {args.source} → {args.destination} ({count} triples)")
+    return 0
+
+
+def _ingest(args: argparse.Namespace) -> int:
+    # cclib is slow to import
+    from scimantic.cclib_cache import CclibCache
+    from scimantic.ingest import ingest_outputs
+
+    cache = None if args.no_cache else CclibCache(args.cache_dir)
+    report = ingest_outputs(
+        args.project, args.paths, agent=args.agent, jobs=args.jobs, cache=cache
+    )
+    print(
+        f"✅ Ingested {len(report.datasets)} outputs into {args.project} "
+        f"({len(report.results)} Results)"
+    )
+    for path, error in report.failed.items():
+        print(f"⚠️  Skipped {path}: {error}")
+    return 1 if report.failed and not report.datasets else 0
+
+
+def _import_evidence(args: argparse.Namespace) -> int:
+    def progress(read: int, added: int) -> None:
+        print(f"   {read} records read, {added} new", end="\r", flush=True)
+
+    report = import_evidence(
+        args.file,
+        args.project,
+        agent=args.agent,
+        relates_to_question=args.question,
+        format=args.format,
+        progress=progress,
+    )
+    if report.read:
+        print()  # keep the last progress line
+    print(
+        f"✅ Imported {len(report.added)} Evidence into {args.project} "
+        f"({report.duplicates} duplicates, {len(report.invalid)} invalid)"
+    )
+    for number, error in report.invalid:
+        print(f"⚠️  Record {number}: {error}")
+    return 0
+
+
+def _export(args: argparse.Namespace) -> int:
+    classes = [resolve_class(name) for name in args.classes] if args.classes else None
+    count = export_entities(args.project, args.destination, args.format, classes)
+    print(f"✅ Exported {count} entities from {args.project} → {args.destination}")
+    return 0
+
+
+def _subset_generate(args: argparse.Namespace) -> int:
+    results = generate_subsets(args.root, jobs=args.jobs, force=args.force)
+    if not results:
+        print("No subset definitions found in .scimantic/subsets/")
+        return 0
+    blocked = False
+    for result in results:
+        status = "license: OK" if result.report.publishable else "license: BLOCKED"
+        cached = " (unchanged)" if result.cached else ""
+        print(
+            f"✓ Generated {result.path} ({result.entities} entities, {status}){cached}"
+        )
+        if not result.report.publishable:
+            blocked = True
+            print(result.report.summary())
+    return 1 if blocked else 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="scimantic", description="Scimantic project tools."
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    convert = commands.add_parser(
+        "convert",
+        help="Convert a project between Turtle, N-Triples and stores.",
+        description=(
+            "Convert a project graph. Formats follow the file names: .ttl for "
+            "Turtle, .nt / .nt.gz for sorted canonical N-Triples, .sqlite for a "
+            "SQLite store, .idx for a read-only memory-mapped triple index "
+            "directory. Existing partition directories are read and written "
+            "as such; --partitioned creates one."
+        ),
+    )
+    convert.add_argument("source", help="Input file (e.g. project.ttl)")
+    convert.add_argument("destination", help="Output file (e.g. project.nt.gz)")
+    convert.add_argument(
+        "--partitioned",
+        action="store_true",
+        help="Write the destination as a per-class partition directory.",
+    )
+    convert.set_defaults(handler=_convert)
+
+    ingest = commands.add_parser(
+        "ingest",
+        help="Add computational chemistry outputs as Datasets and Results.",
+        description=(
+            "Parse quantum chemistry output files with cclib across a process "
+            "pool and add one Dataset per file, with its parsed Results, to "
+            "the project in a single write."
+        ),
+    )
+    ingest.add_argument(
+        "paths", nargs="+", help="Output files, or directories of .log/.out files"
+    )
+    ingest.add_argument("--project", default=DEFAULT_PROJECT_FILE, help="Project file.")
+    ingest.add_argument("--agent", help="Agent URI (e.g. an ORCID) to credit.")
+    ingest.add_argument(
+        "-j", "--jobs", type=int, default=None, help="Parser processes."
+    )
+    ingest.add_argument(
+        "--cache-dir",
+        default=DEFAULT_CCLIB_CACHE_DIR,
+        help="Cache of parsed outputs, keyed by content hash.",
+    )
+    ingest.add_argument(
+        "--no-cache", action="store_true", help="Parse every file again."
+    )
+    ingest.set_defaults(handler=_ingest)
+
+    evidence = commands.add_parser(
+        "import-evidence",
+        help="Import a BibTeX, RIS, CSV or NDJSON library as Evidence.",
+        description=(
+            "Stream the records of a reference library into the project as "
+            "Evidence, skipping records whose DOI or citation is already "
+            "present, in a single write."
+        ),
+    )
+    evidence.add_argument("file", help="Library file (e.g. references.bib)")
+    evidence.add_argument(
+        "--project", default=DEFAULT_PROJECT_FILE, help="Project file."
+    )
+    evidence.add_argument("--agent", help="Agent URI (e.g. an ORCID) to credit.")
+    evidence.add_argument("--question", help="Question URI the Evidence relates to.")
+    evidence.add_argument(
+        "--format",
+        choices=sorted(set(FORMATS.values())),
+        help="Library format (default: from the file suffix).",
+    )
+    evidence.set_defaults(handler=_import_evidence)
+
+    export = commands.add_parser(
+        "export",
+        help="Export project entities as NDJSON or JSON-LD.",
+        description=(
+            "Write every instance of the schema classes as a JSON-LD node "
+            "object, one subject at a time: one per line for .ndjson/.jsonl, "
+            "or the @graph of one document for .jsonld/.json."
+        ),
+    )
+    export.add_argument("destination", help="Output file (e.g. project.ndjson)")
+    export.add_argument("--project", default=DEFAULT_PROJECT_FILE, help="Project file.")
+    export.add_argument(
+        "--format",
+        choices=(NDJSON, JSONLD),
+        help="Output format (default: from the file suffix).",
+    )
+    export.add_argument(
+        "--class",
+        dest="classes",
+        action="append",
+        help="Only export this class (e.g. Evidence); repeatable.",
+    )
+    export.set_defaults(handler=_export)
+
+    subset = commands.add_parser("subset", help="Subset generation.")
+    subset_commands = subset.add_subparsers(dest="subset_command", required=True)
+    generate = subset_commands.add_parser(
+        "generate", help="Generate subsets/*.ttl from .scimantic/subsets/*.yaml."
+    )
+    generate.add_argument("--root", default=".", help="Project directory.")
+    generate.add_argument(
+        "-j", "--jobs", type=int, default=1, help="Forked query workers."
+    )
+    generate.add_argument(
+        "--force", action="store_true", help="Ignore memoized results."
+    )
+    generate.set_defaults(handler=_subset_generate)
+
+    return parser
+
+
+def main(argv: list[str] | None = None) -> None:
+    args = build_parser().parse_args(argv)
+    sys.exit(args.handler(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,322 @@
+"""
+Columnar term-ID representation of a project graph for vectorized analytics.
+
+A ColumnarGraph holds the distinct triples as subject/predicate/object int32
+columns over a sorted term dictionary, plus typed columns decoded from the
+literals once: ``numbers`` (float64) and ``datetimes`` (UTC datetime64[us]),
+indexed by term ID. Aggregations run on these arrays with NumPy:
+
+- ``mask`` filters triples by term(s);
+- ``relation(p)`` gives a predicate's (subject, object) pairs sorted by
+  subject, whose ``join``/``first`` methods join on IDs by binary search;
+- ``group_count`` groups rows by any number of columns.
+
+Typed columns carry one extra trailing slot (NaN / NaT), so indexing them with
+-1, the ID used for "no term", yields a missing value.
+"""
+
+import bisect
+from collections.abc import Iterable
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from functools import lru_cache
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+from rdflib import Literal, Namespace
+from rdflib.namespace import PROV, RDF, XSD
+from rdflib.term import Node
+
+from scimantic.config import SCIMANTIC_ONTOLOGY_URI
+from scimantic.ntriples import Triple, decode_term, encode_term
+from scimantic.storage import load_project, project_stamp
+from scimantic.tripleindex import dictionary_encode
+
+MISSING = -1
+
+SCIMANTIC = Namespace(SCIMANTIC_ONTOLOGY_URI)
+
+_NUMERIC_TYPES = (
+    XSD.integer,
+    XSD.decimal,
+    XSD.double,
+    XSD.float,
+    XSD.int,
+    XSD.long,
+    XSD.short,
+    XSD.nonNegativeInteger,
+    XSD.positiveInteger,
+)
+_DATETIME_TYPES = (XSD.dateTime, XSD.dateTimeStamp, XSD.date)
+
+
+def _datatype_suffixes(datatypes: Iterable[Node]) -> tuple[bytes, ...]:
+    return tuple(f"^^{dt.n3()}".encode() for dt in datatypes)
+
+
+_NUMERIC_SUFFIXES = _datatype_suffixes(_NUMERIC_TYPES)
+_DATETIME_SUFFIXES = _datatype_suffixes(_DATETIME_TYPES)
+
+
+def _to_datetime64(value: Any) -> np.datetime64:
+    """Converts a literal's value to UTC datetime64 (NaT if it is invalid)."""
+    if isinstance(value, datetime) and value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    try:
+        result: np.datetime64 = np.datetime64(value, "us")
+    except (TypeError, ValueError):
+        result = np.datetime64("NaT", "us")
+    return result
+
+
+@dataclass(frozen=True)
+class Relation:
+    """A predicate's (subject, object) ID pairs, sorted by subject."""
+
+    subjects: np.ndarray
+    objects: np.ndarray
+
+    def join(self, keys: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Inner join of subject IDs with this relation.
+
+        Args:
+            keys: Subject IDs
+
+        Returns:
+            Positions in keys and the matching object IDs, one pair per match
+        """
+        lo = np.searchsorted(self.subjects, keys, side="left")
+        hi = np.searchsorted(self.subjects, keys, side="right")
+        counts = hi - lo
+        positions = np.repeat(np.arange(len(keys)), counts)
+        starts = np.repeat(lo - (np.cumsum(counts) - counts), counts)
+        return positions, self.objects[starts + np.arange(len(positions))]
+
+    def first(self, keys: np.ndarray) -> np.ndarray:
+        """Left join keeping one object per key (MISSING where there is none)."""
+        result = np.full(len(keys), MISSING, dtype=np.int32)
+        if not len(self.subjects):
+            return result
+        lo = np.searchsorted(self.subjects, keys, side="left")
+        found = lo < len(self.subjects)
+        found[found] = self.subjects[lo[found]] == keys[found]
+        result[found] = self.objects[lo[found]]
+        return result
+
+
+class ColumnarGraph:
+    """
+    Subject/predicate/object ID columns with a term dictionary.
+
+    Args:
+        terms: Sorted N-Triples encodings of the terms (IDs are positions)
+        spo: Distinct triples as an (n, 3) array of term IDs
+    """
+
+    def __init__(self, terms: list[bytes], spo: np.ndarray):
+        self._terms = terms
+        self.s = np.ascontiguousarray(spo[:, 0], dtype=np.int32)
+        self.p = np.ascontiguousarray(spo[:, 1], dtype=np.int32)
+        self.o = np.ascontiguousarray(spo[:, 2], dtype=np.int32)
+        self._relations: dict[int, Relation] = {}
+        self._decode = lru_cache(maxsize=1 << 16)(self._decode_uncached)
+
+        self.numbers = np.full(len(terms) + 1, np.nan)
+        self.datetimes = np.full(len(terms) + 1, np.datetime64("NaT", "us"))
+        for term_id, encoded in enumerate(terms):
+            if not encoded.startswith(b'"'):
+                continue
+            if encoded.endswith(_NUMERIC_SUFFIXES):
+                self.numbers[term_id] = self._number(term_id)
+            elif encoded.endswith(_DATETIME_SUFFIXES):
+                self.datetimes[term_id] = self._datetime(term_id)
+
+    @classmethod
+    def from_triples(cls, triples: Iterable[Triple]) -> "ColumnarGraph":
+        """Builds the columns from a graph or any stream of triples."""
+        return cls(*dictionary_encode(triples))
+
+    def __len__(self) -> int:
+        return len(self.s)
+
+    def _decode_uncached(self, term_id: int) -> Node:
+        return decode_term(self._terms[term_id])
+
+    def _literal_value(self, term_id: int) -> Any:
+        term = self._decode(term_id)
+        return term.toPython() if isinstance(term, Literal) else None
+
+    def _lexical(self, term_id: int) -> str:
+        # Numeric and date lexical forms never contain escaped characters
+        encoded = self._terms[term_id]
+        return encoded[1 : encoded.rindex(b'"^^')].decode()
+
+    def _number(self, term_id: int) -> float:
+        try:
+            return float(self._lexical(term_id))
+        except ValueError:
+            return np.nan
+
+    def _datetime(self, term_id: int) -> np.datetime64:
+        try:
+            value: Any = datetime.fromisoformat(self._lexical(term_id))
+        except ValueError:  # forms fromisoformat rejects (e.g. "Z" before 3.11)
+            value = self._literal_value(term_id)
+        return _to_datetime64(value)
+
+    def term(self, term_id: int) -> Node | None:
+        """Returns the term with an ID (None for MISSING)."""
+        if term_id == MISSING:
+            return None
+        return self._decode(int(term_id))
+
+    def term_id(self, term: Node) -> int:
+        """Returns the ID of a term, or MISSING."""
+        key = encode_term(term)
+        i = bisect.bisect_left(self._terms, key)
+        return i if i < len(self._terms) and self._terms[i] == key else MISSING
+
+    def ids(self, terms: Node | Iterable[Node]) -> np.ndarray:
+        """IDs of one or more terms (absent terms are dropped)."""
+        if isinstance(terms, Node):
+            terms = [terms]
+        found = [i for i in map(self.term_id, terms) if i != MISSING]
+        return np.array(found, dtype=np.int32)
+
+    def mask(
+        self,
+        s: Node | Iterable[Node] | None = None,
+        p: Node | Iterable[Node] | None = None,
+        o: Node | Iterable[Node] | None = None,
+    ) -> np.ndarray:
+        """
+        Boolean mask of the triples matching a pattern.
+
+        Each position may be None (anything), a term or several terms.
+        """
+        result = np.ones(len(self), dtype=bool)
+        for column, terms in ((self.s, s), (self.p, p), (self.o, o)):
+            if terms is None:
+                continue
+            ids = self.ids(terms)
+            if len(ids) == 1:
+                result &= column == ids[0]
+            else:
+                result &= np.isin(column, ids)
+        return result
+
+    def relation(self, predicate: Node) -> Relation:
+        """The (subject, object) pairs of a predicate; cached per predicate."""
+        predicate_id = self.term_id(predicate)
+        relation = self._relations.get(predicate_id)
+        if relation is None:
+            selected = self.p == predicate_id
+            # Triples are sorted by subject already, so selection keeps order
+            relation = Relation(self.s[selected], self.o[selected])
+            self._relations[predicate_id] = relation
+        return relation
+
+    def instances(self, cls: Node) -> np.ndarray:
+        """Sorted IDs of the subjects typed with a class."""
+        types = self.relation(RDF.type)
+        return _sorted_unique(types.subjects[types.objects == self.term_id(cls)])
+
+
+def _sorted_unique(values: np.ndarray) -> np.ndarray:
+    """np.unique for an already sorted array, without re-sorting or hashing."""
+    if not len(values):
+        return values
+    keep = np.empty(len(values), dtype=bool)
+    keep[0] = True
+    np.not_equal(values[1:], values[:-1], out=keep[1:])
+    return values[keep]
+
+
+def group_count(*columns: np.ndarray) -> tuple[list[np.ndarray], np.ndarray]:
+    """
+    Groups rows by the given columns and counts each group.
+
+    Missing values (MISSING IDs, NaT) form their own groups.
+
+    Returns:
+        One array of group keys per column, and the group sizes
+    """
+    if not columns or not len(columns[0]):
+        return [c[:0] for c in columns], np.zeros(0, dtype=np.int64)
+    comparable = [c.view(np.int64) if c.dtype.kind == "M" else c for c in columns]
+    order = np.lexsort(comparable[::-1])
+    change = np.zeros(len(order), dtype=bool)
+    change[0] = True
+    for column in comparable:
+        ordered = column[order]
+        change[1:] |= ordered[1:] != ordered[:-1]
+    starts = np.flatnonzero(change)
+    counts = np.diff(np.append(starts, len(order)))
+    return [c[order][starts] for c in columns], counts
+
+
+def class_counts(graph: ColumnarGraph) -> dict[str, int]:
+    """Number of instances of each rdf:type."""
+    counts = np.bincount(graph.relation(RDF.type).objects)
+    return {str(graph.term(int(i))): int(counts[i]) for i in np.flatnonzero(counts)}
+
+
+def evidence_summary(graph: ColumnarGraph) -> list[dict[str, Any]]:
+    """
+    Evidence counts per question, agent and month.
+
+    Evidence is linked to questions through prov:wasDerivedFrom, to agents
+    through prov:wasAttributedTo and dated by prov:generatedAtTime. Evidence
+    without a question, agent or timestamp is counted under None.
+    """
+    evidence = graph.instances(SCIMANTIC.Evidence)
+    questions = graph.instances(SCIMANTIC.Question)
+
+    positions, sources = graph.relation(PROV.wasDerivedFrom).join(evidence)
+    linked = np.isin(sources, questions)
+    positions, sources = positions[linked], sources[linked]
+    has_question = np.zeros(len(evidence), dtype=bool)
+    has_question[positions] = True
+    unlinked = np.flatnonzero(~has_question)
+    rows = np.concatenate([positions, unlinked])
+    question = np.concatenate(
+        [sources, np.full(len(unlinked), MISSING, dtype=np.int32)]
+    )
+
+    entities = evidence[rows]
+    agent = graph.relation(PROV.wasAttributedTo).first(entities)
+    generated = graph.relation(PROV.generatedAtTime).first(entities)
+    month = graph.datetimes[generated].astype("datetime64[M]")
+
+    (questions_, agents, months), counts = group_count(question, agent, month)
+    return [
+        {
+            "question": None if q == MISSING else str(graph.term(q)),
+            "agent": None if a == MISSING else str(graph.term(a)),
+            "month": None if np.isnat(m) else str(m),
+            "count": int(n),
+        }
+        for q, a, m, n in zip(questions_, agents, months, counts, strict=True)
+    ]
+
+
+_cache: dict[Path, tuple[tuple[int, ...], ColumnarGraph]] = {}
+
+
+def load_columnar(project_path: str | Path) -> ColumnarGraph:
+    """
+    Returns the columnar form of a project, rebuilt only when it changes.
+
+    The columns are kept in memory per project file and reused while the
+    file's modification time and size are unchanged.
+    """
+    path = Path(project_path).resolve()
+    stamp = project_stamp(path)
+    cached = _cache.get(path)
+    if cached is not None and cached[0] == stamp:
+        return cached[1]
+    graph = ColumnarGraph.from_triples(load_project(path))
+    _cache[path] = (stamp, graph)
+    return graph
@@ -4,6 +4,8 @@ Scimantic configuration constants.
 Centralized location for namespace URIs and other configuration values.
 """
 
+import os
+
 # RDF Namespace URIs
 SCIMANTIC_ONTOLOGY_URI = "http://scimantic.io/"
 PROV_ONTOLOGY_URI = "http://www.w3.org/ns/prov#"
@@ -11,7 +13,38 @@ DCTERMS_URI = "http://purl.org/dc/terms/"
 FOAF_URI = "http://xmlns.com/foaf/0.1/"
 
 # Default file paths
-DEFAULT_PROJECT_FILE = "project.ttl"
+# The project store is chosen by the file name (see scimantic.storage): .ttl,
+# .nt/.nt.gz, .idx, .sqlite, .nq/.trig (nanopub archive) or an existing
+# partition directory such as .scimantic/graph.
+# SCIMANTIC_PROJECT_FILE selects it per project.
+DEFAULT_PROJECT_FILE = os.environ.get("SCIMANTIC_PROJECT_FILE", "project.ttl")
+# Partitioned project layout (one N-Triples file per top-level class)
+DEFAULT_GRAPH_DIR = ".scimantic/graph"
+# File suffixes of SQLite-backed project stores
+SQLITE_PROJECT_SUFFIXES = (".sqlite", ".sqlite3", ".db")
+# File suffixes of nanopub archives (per-nanopub named graphs)
+NANOPUB_PROJECT_SUFFIXES = (".nq", ".trig")
+# Locally minted nanopublications (one TriG file per Trusty URI)
+DEFAULT_NANOPUB_DIR = ".scimantic/nanopubs"
+# Nanopub server that queued nanopubs are published to
+DEFAULT_NANOPUB_SERVER = "https://np.petapico.org/"
+# Subset definitions, generated subsets and their memoized results
+DEFAULT_SUBSETS_DIR = ".scimantic/subsets"
+DEFAULT_SUBSET_OUTPUT_DIR = "subsets"
+DEFAULT_SUBSET_CACHE = ".scimantic/cache/subsets.json"
+# Content-hash cache of cclib-parsed outputs, and its size limit
+DEFAULT_CCLIB_CACHE_DIR = ".scimantic/cache/cclib"
+DEFAULT_CCLIB_CACHE_BYTES = 1 << 30
+# Binary caches of parsed RDF sources (scimantic.graph_cache), relative to
+# each source's directory
+DEFAULT_GRAPH_CACHE_DIR = ".scimantic/cache/graphs"
+# Result tables of projects (scimantic.results), relative to each project's
+# directory
+DEFAULT_RESULT_CACHE_DIR = ".scimantic/cache/results"
+# Annotation indexes of projects (scimantic.annotations), likewise
+DEFAULT_ANNOTATION_CACHE_DIR = ".scimantic/cache/annotations"
+# Entity exports written for MCP clients
+DEFAULT_EXPORT_DIR = ".scimantic/exports"
 # Ontology is now in sibling scimantic-ontology package
 DEFAULT_ONTOLOGY_FILE = "../scimantic-ontology/generated/scimantic.ttl"
 
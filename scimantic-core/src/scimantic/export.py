@@ -0,0 +1,308 @@
+"""
+Streaming export of project entities as NDJSON or JSON-LD.
+
+Every instance of a schema class (Question, Evidence, Result, Analysis, ...,
+including prov:Entity, prov:Activity and prov:Agent) is written as one
+JSON-LD node object: its ``@id``, its ``@type`` (schema class names) and one
+key per property, as a prefixed name (``scimantic:content``,
+``prov:wasAttributedTo``). Values are JSON strings, numbers and booleans
+where the literal's datatype allows it, ``{"@value", "@type"}`` or
+``{"@value", "@language"}`` otherwise, and ``{"@id"}`` for references to
+other nodes. Blank nodes an entity refers to (e.g. the qualified usage of an
+Activity) are embedded in its node object, so every entity is complete on
+its own line.
+
+- NDJSON (``.ndjson``/``.jsonl``): one node object per line;
+- JSON-LD (``.jsonld``/``.json``): one document with the ``@context`` of
+  json_ld_context() and the node objects in its ``@graph``.
+
+Nodes are generated one subject at a time. Sorted N-Triples and partitioned
+projects hold each subject's triples together, so they are streamed from
+disk; N-Triples files that are not sorted (checked first) are loaded. Only
+blank nodes, which sort last, and the entities referring to them are held
+until the end of each file. SQLite stores and triple indexes are queried in
+place; Turtle projects and nanopub archives are loaded first.
+"""
+
+import json
+import math
+import os
+from collections.abc import Callable, Iterable, Iterator
+from itertools import groupby
+from pathlib import Path
+from typing import IO, Any
+
+from linkml_runtime.utils.yamlutils import YAMLRoot
+from rdflib import BNode, Literal, URIRef
+from rdflib.namespace import RDF, XSD
+from rdflib.term import Node
+
+from scimantic import models
+from scimantic.ntriples import is_ntriples, is_sorted, iter_triples
+from scimantic.partition import PartitionedProject, is_partitioned
+from scimantic.storage import PROJECT_NAMESPACES, load_project
+
+NDJSON, JSONLD = "ndjson", "jsonld"
+FORMATS = {".ndjson": NDJSON, ".jsonl": NDJSON, ".jsonld": JSONLD, ".json": JSONLD}
+
+# Class URI → schema class name, in schema order
+SCHEMA_CLASSES: dict[URIRef, str] = {
+    URIRef(str(cls.class_class_uri)): cls.__name__
+    for cls in vars(models).values()
+    if isinstance(cls, type)
+    and issubclass(cls, YAMLRoot)
+    and cls.__module__ == models.__name__
+    and hasattr(cls, "class_class_uri")
+}
+
+# Literal datatypes written as native JSON values
+_NATIVE = {XSD.string: str, XSD.integer: int, XSD.double: float, XSD.boolean: bool}
+
+Pairs = list[tuple[Node, Node]]
+Blanks = dict[Node, Pairs]
+
+
+def json_ld_context() -> dict[str, Any]:
+    """The @context that expands exported node objects to the project IRIs."""
+    context: dict[str, Any] = dict(PROJECT_NAMESPACES)
+    for uri, name in SCHEMA_CLASSES.items():
+        context.setdefault(name, _compact(uri))
+    return context
+
+
+def _compact(iri: str) -> str:
+    for prefix, namespace in PROJECT_NAMESPACES.items():
+        if iri.startswith(namespace) and len(iri) > len(namespace):
+            return f"{prefix}:{iri[len(namespace) :]}"
+    return str(iri)
+
+
+def resolve_class(name: str) -> URIRef:
+    """
+    Returns the URI of a schema class given its name, prefixed name or IRI.
+
+    Raises:
+        ValueError: If a bare name is not a schema class
+    """
+    for uri, class_name in SCHEMA_CLASSES.items():
+        if name in (class_name, _compact(uri)):
+            return uri
+    prefix, _, local = name.partition(":")
+    if prefix in PROJECT_NAMESPACES and local and not local.startswith("//"):
+        return URIRef(PROJECT_NAMESPACES[prefix] + local)
+    if ":" in name:
+        return URIRef(name)
+    raise ValueError(f"Unknown schema class: {name}")
+
+
+def _reference(term: Node) -> str:
+    return f"_:{term}" if isinstance(term, BNode) else _compact(str(term))
+
+
+def _value(term: Node) -> Any:
+    if not isinstance(term, Literal):
+        return {"@id": _reference(term)}
+    if term.language:
+        return {"@value": str(term), "@language": term.language}
+    datatype = term.datatype
+    if datatype is None:
+        return str(term)
+    native = _NATIVE.get(datatype)
+    if native is not None and term.ill_typed is not True:
+        value = term.toPython()
+        if isinstance(value, native) and not (
+            isinstance(value, float) and not math.isfinite(value)
+        ):
+            return value
+    return {"@value": str(term), "@type": _compact(str(datatype))}
+
+
+def node_object(
+    subject: Node, pairs: Iterable[tuple[Node, Node]], blanks: Blanks | None = None
+) -> dict[str, Any]:
+    """
+    Builds the JSON-LD node object of a subject from its (predicate, object)
+    pairs. Keys other than @id and @type are sorted; a key with one value
+    holds it directly, otherwise a list. Blank node objects described in
+    `blanks` are embedded as node objects.
+    """
+    blanks = blanks or {}
+    node: dict[str, Any] = {"@id": _reference(subject)}
+    types: list[str] = []
+    properties: dict[str, list[Any]] = {}
+    for p, o in sorted(pairs, key=lambda pair: (str(pair[0]), pair[1].n3())):
+        if p == RDF.type:
+            name = SCHEMA_CLASSES.get(o) if isinstance(o, URIRef) else None
+            types.append(name or _reference(o))
+        elif o in blanks:
+            # Drop the node while embedding it, so cycles terminate
+            rest = {b: description for b, description in blanks.items() if b != o}
+            properties.setdefault(_compact(str(p)), []).append(
+                node_object(o, blanks[o], rest)
+            )
+        else:
+            properties.setdefault(_compact(str(p)), []).append(_value(o))
+    if types:
+        node["@type"] = types[0] if len(types) == 1 else types
+    for key in sorted(properties):
+        values = properties[key]
+        node[key] = values[0] if len(values) == 1 else values
+    return node
+
+
+def _by_subject(
+    triples: Iterable[tuple[Node, Node, Node]],
+) -> Iterator[tuple[Node, Pairs]]:
+    for subject, group in groupby(triples, key=lambda t: t[0]):
+        yield subject, [(p, o) for _, p, o in group]
+
+
+def _reachable(pairs: Pairs, describe: Callable[[Node], Pairs]) -> Blanks:
+    """The blank nodes reachable from pairs through blank nodes, described."""
+    blanks: Blanks = {}
+    pending = [o for _, o in pairs if isinstance(o, BNode)]
+    while pending:
+        node = pending.pop()
+        if node not in blanks:
+            blanks[node] = describe(node)
+            pending.extend(o for _, o in blanks[node] if isinstance(o, BNode))
+    return blanks
+
+
+def _iter_file(path: Path, types: set[Node]) -> Iterator[tuple[Node, Pairs, Blanks]]:
+    # Blank node subjects sort after IRIs, so entities referring to blank
+    # nodes wait for the end of the file
+    blank: Blanks = {}
+    waiting: list[tuple[Node, Pairs]] = []
+    for subject, pairs in _by_subject(iter_triples(path)):
+        if isinstance(subject, BNode):
+            blank[subject] = pairs
+        if not any(p == RDF.type and o in types for p, o in pairs):
+            continue
+        if isinstance(subject, BNode) or any(isinstance(o, BNode) for _, o in pairs):
+            waiting.append((subject, pairs))
+        else:
+            yield subject, pairs, {}
+    for subject, pairs in waiting:
+        yield subject, pairs, _reachable(pairs, lambda b: blank.get(b, []))
+
+
+def iter_subjects(
+    project_path: str | Path, classes: Iterable[Node] | None = None
+) -> Iterator[tuple[Node, Pairs, Blanks]]:
+    """
+    Yields each instance of the given classes with its (predicate, object)
+    pairs and the pairs of the blank nodes it refers to, directly or through
+    other blank nodes, one subject at a time.
+
+    Args:
+        project_path: Project file or directory
+        classes: Classes to export (default: every schema class)
+    """
+    wanted = list(SCHEMA_CLASSES if classes is None else classes)
+    streamable = is_ntriples(project_path) and is_sorted(project_path)
+    if streamable or is_partitioned(project_path):
+        if is_partitioned(project_path):
+            files = PartitionedProject(project_path).files(wanted)
+        else:
+            files = [Path(project_path)]
+        for path in files:
+            yield from _iter_file(path, set(wanted))
+        return
+    g = load_project(project_path, classes=wanted)
+
+    def describe(node: Node) -> Pairs:
+        return list(g.predicate_objects(node))
+
+    for i, cls in enumerate(wanted):
+        earlier = set(wanted[:i])
+        for subject in g.subjects(RDF.type, cls, unique=True):
+            if earlier and earlier.intersection(g.objects(subject, RDF.type)):
+                continue  # already exported as an instance of an earlier class
+            pairs = describe(subject)
+            yield subject, pairs, _reachable(pairs, describe)
+
+
+def iter_entities(
+    project_path: str | Path, classes: Iterable[Node] | None = None
+) -> Iterator[dict[str, Any]]:
+    """Yields the JSON-LD node object of each entity (see iter_subjects)."""
+    for subject, pairs, blanks in iter_subjects(project_path, classes):
+        yield node_object(subject, pairs, blanks)
+
+
+def _format(destination: Path, format: str | None) -> str:
+    if format is not None:
+        if format not in (NDJSON, JSONLD):
+            raise ValueError(f"Unknown export format: {format}")
+        return format
+    for suffix, name in FORMATS.items():
+        if destination.name.lower().endswith(suffix):
+            return name
+    raise ValueError(
+        f"Unknown export format for {destination.name}; "
+        f"use one of {', '.join(FORMATS)} or pass a format"
+    )
+
+
+def _dump(node: dict[str, Any]) -> str:
+    return json.dumps(node, ensure_ascii=False, separators=(",", ":"))
+
+
+def write_entities(
+    nodes: Iterable[dict[str, Any]], f: IO[str], format: str = NDJSON
+) -> int:
+    """
+    Writes node objects to a text stream as they are generated.
+
+    Returns:
+        Number of nodes written
+    """
+    count = 0
+    if format == NDJSON:
+        for node in nodes:
+            f.write(_dump(node) + "\n")
+            count += 1
+        return count
+    f.write('{"@context":' + json.dumps(json_ld_context()) + ',"@graph":[')
+    for node in nodes:
+        f.write(("," if count else "") + "\n" + _dump(node))
+        count += 1
+    f.write("\n]}\n")
+    return count
+
+
+def export_entities(
+    project_path: str | Path,
+    destination: str | Path,
+    format: str | None = None,
+    classes: Iterable[Node] | None = None,
+) -> int:
+    """
+    Exports a project's entities to an NDJSON or JSON-LD file.
+
+    The file is written incrementally and replaced atomically.
+
+    Args:
+        project_path: Project file or directory
+        destination: Output file
+        format: "ndjson" or "jsonld" (default: from the destination suffix)
+        classes: Classes to export (default: every schema class)
+
+    Returns:
+        Number of entities written
+
+    Raises:
+        ValueError: If the format is unknown
+    """
+    destination = Path(destination)
+    format = _format(destination, format)
+    destination.parent.mkdir(parents=True, exist_ok=True)
+    tmp = destination.with_name(f".{destination.name}.{os.getpid()}.tmp")
+    try:
+        with open(tmp, "w", encoding="utf-8") as f:
+            count = write_entities(iter_entities(project_path, classes), f, format)
+        os.replace(tmp, destination)
+    finally:
+        tmp.unlink(missing_ok=True)
+    return count
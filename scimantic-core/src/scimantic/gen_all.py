@@ -1,7 +1,17 @@
+import argparse
+import hashlib
+import json
+import os
 import subprocess
 import sys
-import os
+import time
+from collections.abc import Callable
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from dataclasses import dataclass, field
+from functools import cache, lru_cache, partial
+from importlib import metadata
 from pathlib import Path
+from typing import Any
 
 # Constants
 # Paths relative to scimantic-core directory (where this is run from)
@@ -11,6 +21,18 @@ PYTHON_DEST = Path("src/scimantic/models.py")
 ONTOLOGY_DEST = ONTOLOGY_ROOT / "generated" / "scimantic.ttl"
 SHACL_DEST = ONTOLOGY_ROOT / "generated" / "shacl" / "scimantic-shapes.ttl"
 WIDOCO_CONF = ONTOLOGY_ROOT / "generated" / "widoco.conf"
+INJECT_SCRIPT = ONTOLOGY_ROOT / "scripts" / "inject_version.py"
+ROOT_DIR = Path("..")
+GRAPH_SCRIPT = ROOT_DIR / "scripts" / "visualize_ontology.py"
+GRAPH_MMD = ROOT_DIR / "ontology_graph.mmd"
+GRAPH_PNG = ROOT_DIR / "ontology_graph.png"
+GRAPH_RENDER_HASH = ROOT_DIR / "ontology_graph.png.sha256"
+DOCS_SCRIPT = ROOT_DIR / "scripts" / "build-docs.sh"
+DOCS_DEST = ROOT_DIR / "public"
+BUILD_MANIFEST = Path(".gen-all-manifest.json")
+
+# Tools whose version changes must invalidate every generated artifact
+TOOLCHAIN_PACKAGES = ("linkml", "rdflib")
 
 
 def run_command(command, cwd=None, env=None, shell=True):
@@ -38,7 +60,7 @@ def remove_timestamp(file_path: Path):
     if not file_path.exists():
         return
 
-    with open(file_path, "r") as f:
+    with open(file_path) as f:
         content = f.read()
 
     lines = content.splitlines(keepends=True)
@@ -58,155 +80,541 @@ def remove_timestamp(file_path: Path):
             f.write(new_content)
 
 
-def determinize_ttl(file_path: Path):
+# Prefixes used in the generated artifacts (LinkML's own bindings are dropped)
+TTL_NAMESPACES = {
+    "scimantic": "http://scimantic.io/",
+    "owl": "http://www.w3.org/2002/07/owl#",
+    "prov": "http://www.w3.org/ns/prov#",
+    "dcterms": "http://purl.org/dc/terms/",
+    "sh": "http://www.w3.org/ns/shacl#",
+    "linkml": "https://w3id.org/linkml/",
+    "pav": "http://purl.org/pav/",
+    "xsd": "http://www.w3.org/2001/XMLSchema#",
+    "urref": "https://raw.githubusercontent.com/adelphi23/urref/469137/URREF.ttl#",
+    "rdf": "http://www.w3.org/1999/02/22-rdf-syntax-ns#",
+    "rdfs": "http://www.w3.org/2000/01/rdf-schema#",
+    "skos": "http://www.w3.org/2004/02/skos/core#",
+    "dcat": "http://www.w3.org/ns/dcat#",
+}
+
+
+@cache
+def load_script(path: Path) -> Any:
     """
-    Parses a TTL file, canonicalizes BNodes, and re-serializes deterministically.
-    Uses a fresh graph to ensure clean namespace bindings.
+    Imports a repository script (e.g. scripts/inject_version.py) as a module so
+    it can be called in-process. Returns None if it cannot be loaded.
+    """
+    import importlib.util
+
+    spec = importlib.util.spec_from_file_location(path.stem, path)
+    if spec is None or spec.loader is None:
+        return None
+    module = importlib.util.module_from_spec(spec)
+    try:
+        spec.loader.exec_module(module)
+    except (OSError, ImportError) as e:
+        print(f"⚠️  Warning: Could not load {path}: {e}")
+        return None
+    return module
+
+
+def load_version_injector() -> Any:
+    """Returns the scimantic-ontology/scripts/inject_version.py module, or None."""
+    return load_script(INJECT_SCRIPT)
+
+
+def determinize_ttl(file_path: Path, version: str | None = None, is_shacl=False):
+    """
+    Parses a TTL file and re-serializes it deterministically.
+
+    Blank node labels and sh:ignoredProperties ordering are fixed by
+    scimantic.serializer, so repeated generator runs produce identical bytes.
+    With a version, the owl:Ontology version triples are injected into the
+    graph first, so the file is written exactly once. Errors propagate, so a
+    failed step is not recorded in the build manifest.
     """
     try:
         import rdflib
-        from rdflib.compare import to_canonical_graph
+
+        from scimantic.serializer import serialize_deterministic
     except ImportError:
         print("⚠️  Warning: rdflib not installed. Skipping deterministic serialization.")
         return
 
     print(f"Determinizing {file_path}...")
     g = rdflib.Graph()
-    try:
-        g.parse(file_path, format="turtle")
-
-        # 1. Canonicalize (Stable BNodes)
-        g_canonical = to_canonical_graph(g)
-
-        # 2. Fresh Graph (Clean Namespaces)
-        # We copy triples to a new graph to drop all random 'ns1', 'ns2' bindings from recursion/LinkML
-        g_final = rdflib.Graph()
-        for triple in g_canonical:
-            g_final.add(triple)
-
-        # 3. Explicit Bindings (Consistent Prefixes)
-        g_final.bind("scimantic", "http://scimantic.io/")
-        g_final.bind("owl", "http://www.w3.org/2002/07/owl#")
-        g_final.bind("prov", "http://www.w3.org/ns/prov#")
-        g_final.bind("dcterms", "http://purl.org/dc/terms/")
-        g_final.bind("sh", "http://www.w3.org/ns/shacl#")
-        g_final.bind("linkml", "https://w3id.org/linkml/")
-        g_final.bind("pav", "http://purl.org/pav/")
-        g_final.bind("xsd", "http://www.w3.org/2001/XMLSchema#")
-        g_final.bind(
-            "urref",
-            "https://raw.githubusercontent.com/adelphi23/urref/469137/URREF.ttl#",
-        )
+    g.parse(file_path, format="turtle")
+
+    if version is not None:
+        injector = load_version_injector()
+        if injector is None:
+            raise RuntimeError(f"version injection unavailable ({INJECT_SCRIPT})")
+        injector.inject_version_triples(g, version, is_shacl=is_shacl)
+
+    # LinkML output has random order for ignoredProperties lists
+    ttl_content = serialize_deterministic(
+        g,
+        namespaces=TTL_NAMESPACES,
+        sorted_list_predicates=[
+            rdflib.URIRef("http://www.w3.org/ns/shacl#ignoredProperties")
+        ],
+    )
+
+    with open(file_path, "w") as f:
+        f.write(ttl_content)
+
+
+def finalize_ttl(file_path: Path, is_shacl=False):
+    """Injects the schema version and determinizes a generated TTL artifact."""
+    injector = load_version_injector()
+    version = injector.get_version(SCHEMA_PATH) if injector else None
+    determinize_ttl(file_path, version=version, is_shacl=is_shacl)
+
+
+def file_hash(path: Path) -> str | None:
+    """
+    Returns the SHA-256 of a file, or of every file below a directory.
+    Returns None if the path does not exist.
+    """
+    if path.is_file():
+        return hashlib.sha256(path.read_bytes()).hexdigest()
+    if path.is_dir():
+        h = hashlib.sha256()
+        for child in sorted(p for p in path.rglob("*") if p.is_file()):
+            h.update(child.relative_to(path).as_posix().encode())
+            h.update(hashlib.sha256(child.read_bytes()).digest())
+        return h.hexdigest()
+    return None
+
+
+def toolchain_fingerprint() -> dict[str, str]:
+    """
+    Versions of the generator toolchain plus the hash of this module.
+    Any change here invalidates every step.
+    """
+    fingerprint = {"gen_all.py": file_hash(Path(__file__)) or ""}
+    for package in TOOLCHAIN_PACKAGES:
+        try:
+            fingerprint[package] = metadata.version(package)
+        except metadata.PackageNotFoundError:
+            fingerprint[package] = "missing"
+    return fingerprint
+
 
-        # 4. Sort SHACL Lists (sh:ignoredProperties)
-        # LinkML output has random order for ignoredProperties lists.
-        # We must sort them in the graph to ensure structural determinism.
-        SH_IGNORED = rdflib.URIRef("http://www.w3.org/ns/shacl#ignoredProperties")
+@dataclass
+class Step:
+    """
+    A build step with the files it reads and writes and the steps it depends on.
+    The action must be picklable (a module-level function or a partial of one)
+    so it can run in a worker process.
+    """
 
-        # Find all ignoredProperties lists
-        list_triples = []
-        for s, p, o in g_final.triples((None, SH_IGNORED, None)):
-            list_triples.append((s, p, o))
+    name: str
+    action: Callable[[], None]
+    inputs: list[Path] = field(default_factory=list)
+    outputs: list[Path] = field(default_factory=list)
+    deps: list[str] = field(default_factory=list)
+    # Runs in the parent right before the action is dispatched, so state it
+    # loads (e.g. the SchemaView) is inherited by forked workers
+    prepare: Callable[[], Any] | None = None
+
+
+class BuildManifest:
+    """
+    Records, per step, a digest of its inputs and the hashes of the outputs it
+    produced, plus the final hash of every output after the last build.
 
-        for s, p, o in list_triples:
+    A step is up to date when its input digest is unchanged and its outputs on
+    disk still match the final hashes. Inputs produced by an earlier step are
+    hashed as that step produced them, so steps that rewrite a file in place
+    (determinize, version injection) do not invalidate their own upstream.
+    """
+
+    def __init__(self, path: Path = BUILD_MANIFEST):
+        self.path = path
+        self.steps: dict[str, dict] = {}
+        self.files: dict[str, str | None] = {}
+        if path.exists():
             try:
-                # Extract items
-                c = rdflib.collection.Collection(g_final, o)
-                items = list(c)
-                if not items:
+                data = json.loads(path.read_text())
+                self.steps = data.get("steps", {})
+                self.files = data.get("files", {})
+            except (ValueError, OSError):
+                print(f"⚠️  Warning: Ignoring unreadable build manifest {path}")
+
+    def input_digest(
+        self, step: Step, produced: dict[str, str | None], extra: dict[str, str]
+    ) -> str:
+        """Digest of a step's inputs, using upstream-produced hashes when known."""
+        own_outputs = {str(p) for p in step.outputs}
+        entries = []
+        for path in step.inputs:
+            key = str(path)
+            if key in produced:
+                entries.append((key, produced[key]))
+            elif key not in own_outputs:
+                entries.append((key, file_hash(path)))
+        payload = json.dumps({"inputs": entries, "extra": extra}, sort_keys=True)
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def is_fresh(self, step: Step, digest: str) -> bool:
+        record = self.steps.get(step.name)
+        if not record or record.get("digest") != digest:
+            return False
+        return all(
+            str(p) in self.files and file_hash(p) == self.files[str(p)]
+            for p in step.outputs
+        )
+
+    def produced(self, step: Step) -> dict[str, str | None]:
+        """Output hashes recorded when the step last ran."""
+        return dict(self.steps[step.name].get("outputs", {}))
+
+    def record(self, step: Step, digest: str) -> dict[str, str | None]:
+        outputs = {str(p): file_hash(p) for p in step.outputs}
+        self.steps[step.name] = {"digest": digest, "outputs": outputs}
+        self.save()
+        return outputs
+
+    def finalize(self, steps: list[Step]) -> None:
+        """Records the final state of every output after a build."""
+        for step in steps:
+            for path in step.outputs:
+                self.files[str(path)] = file_hash(path)
+        self.save()
+
+    def save(self) -> None:
+        data = {"steps": self.steps, "files": self.files}
+        self.path.write_text(json.dumps(data, indent=2, sort_keys=True) + "\n")
+
+
+def run_steps(
+    steps: list[Step],
+    manifest: BuildManifest,
+    force: bool = False,
+    jobs: int | None = None,
+):
+    """
+    Runs the step DAG, executing independent steps concurrently in a process
+    pool and skipping steps whose inputs and outputs are unchanged.
+
+    Args:
+        steps: Steps in a valid topological order
+        manifest: Build manifest used to skip up-to-date steps
+        force: Run every step regardless of the manifest
+        jobs: Worker processes (default: CPU count). 1 runs steps in-process.
+    """
+    names = {step.name for step in steps}
+    for step in steps:
+        unknown = set(step.deps) - names
+        if unknown:
+            raise ValueError(f"Step {step.name} depends on unknown steps: {unknown}")
+
+    toolchain = toolchain_fingerprint()
+    produced: dict[str, str | None] = {}
+    pending = list(steps)
+    done: set[str] = set()
+    running: dict[Future, tuple[Step, str, float]] = {}
+    build_start = time.perf_counter()
+
+    executor = ProcessPoolExecutor(max_workers=jobs) if jobs != 1 else None
+
+    def finish(step: Step, digest: str, started: float):
+        produced.update(manifest.record(step, digest))
+        done.add(step.name)
+        print(f"✔ {step.name} finished in {time.perf_counter() - started:.2f}s")
+
+    def schedule_ready():
+        # Skipped steps complete immediately and may unblock others, so loop
+        progress = True
+        while progress:
+            progress = False
+            for step in list(pending):
+                if not set(step.deps) <= done:
                     continue
+                pending.remove(step)
+                progress = True
+                digest = manifest.input_digest(step, produced, toolchain)
+                if not force and manifest.is_fresh(step, digest):
+                    print(f"⏭️  {step.name}: up to date")
+                    produced.update(manifest.produced(step))
+                    done.add(step.name)
+                    continue
+
+                print(f"Running {step.name}...")
+                started = time.perf_counter()
+                if step.prepare is not None:
+                    step.prepare()
+                if executor is None:
+                    step.action()
+                    finish(step, digest, started)
+                else:
+                    running[executor.submit(step.action)] = (step, digest, started)
 
-                # Sort items by their string representation/URI
-                sorted_items = sorted(items, key=lambda x: str(x))
+    try:
+        schedule_ready()
+        while running:
+            completed, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in completed:
+                step, digest, started = running.pop(future)
+                try:
+                    future.result()
+                except (Exception, SystemExit) as e:  # noqa: BLE001 - any step failure aborts
+                    print(f"❌ Step {step.name} failed: {e!r}")
+                    sys.exit(1)
+                finish(step, digest, started)
+            schedule_ready()
+    finally:
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+
+    if pending:
+        blocked = ", ".join(step.name for step in pending)
+        raise ValueError(f"Dependency cycle or missing step; never ran: {blocked}")
+
+    manifest.finalize(steps)
+    print(f"Build finished in {time.perf_counter() - build_start:.2f}s")
+
+
+@lru_cache(maxsize=1)
+def load_schema_view() -> Any:
+    """
+    Loads the LinkML schema once per process and shares it between generators.
+    Returns None if LinkML is not importable (subprocess fallback is used).
+    """
+    try:
+        from linkml_runtime.utils.schemaview import SchemaView
+    except ImportError:
+        return None
+    return SchemaView(str(SCHEMA_PATH))
 
-                # If order changed, reconstruct
-                if items != sorted_items:
-                    c.clear()
-                    for item in sorted_items:
-                        c.append(item)
-            except Exception:
-                # List sorting might fail if list is malformed, just ignore
-                pass
 
-        # 5. Serialize
-        ttl_content = g_final.serialize(format="turtle", sort_keys=True)
+def _generate_in_process(generator: str, **kwargs) -> str | None:
+    """
+    Runs a LinkML generator class against the shared SchemaView.
+    Returns the serialized output, or None if the subprocess path should be used.
+    """
+    schema_view = load_schema_view()
+    if schema_view is None:
+        return None
 
-        # Strict newline enforcement
-        ttl_content = ttl_content.rstrip() + "\n"
+    try:
+        if generator == "python":
+            from linkml.generators.pythongen import PythonGenerator as Generator
+        elif generator == "owl":
+            from linkml.generators.owlgen import OwlSchemaGenerator as Generator
+        else:
+            from linkml.generators.shaclgen import ShaclGenerator as Generator
 
-        with open(file_path, "w") as f:
-            f.write(ttl_content)
-    except Exception as e:
-        print(f"⚠️  Warning: Failed to determinize {file_path}: {e}")
+        generated = Generator(str(SCHEMA_PATH), schemaview=schema_view, **kwargs)
+        return str(generated.serialize())
+    except Exception as e:  # noqa: BLE001 - any generator error falls back to uv run
+        print(f"⚠️  Warning: In-process gen-{generator} failed ({e}); using uv run.")
+        return None
 
 
-def main():
+def _write_output(dest: Path, content: str):
+    with open(dest, "w") as f:
+        f.write(content)
+
+
+def generate_python(in_process: bool = True):
+    content = _generate_in_process("python") if in_process else None
+    if content is not None:
+        _write_output(PYTHON_DEST, content)
+    else:
+        run_command(f"uv run gen-python {SCHEMA_PATH} > {PYTHON_DEST}")
+    # Remove timestamp immediately
+    remove_timestamp(PYTHON_DEST)
+
+
+def generate_owl(in_process: bool = True):
+    # Match the gen-owl CLI defaults, which differ from the class defaults
+    content = (
+        _generate_in_process(
+            "owl",
+            metadata=False,
+            metaclasses=False,
+            type_objects=False,
+            ontology_uri_suffix=".owl.ttl",
+        )
+        if in_process
+        else None
+    )
+    if content is not None:
+        _write_output(ONTOLOGY_DEST, content)
+    else:
+        run_command(f"uv run gen-owl --no-metadata {SCHEMA_PATH} > {ONTOLOGY_DEST}")
+
+
+def generate_shacl(in_process: bool = True):
+    content = _generate_in_process("shacl", metadata=False) if in_process else None
+    if content is not None:
+        _write_output(SHACL_DEST, content)
+    else:
+        run_command(f"uv run gen-shacl --no-metadata {SCHEMA_PATH} > {SHACL_DEST}")
+
+
+def inject_version():
+    """Updates the version in widoco.conf (the TTL artifacts get it in finalize_ttl)."""
+    injector = load_version_injector()
+    if injector is None:
+        print(f"⚠️  Warning: {INJECT_SCRIPT} unavailable. Skipping widoco.conf.")
+        return
+    injector.update_widoco_conf(WIDOCO_CONF, injector.get_version(SCHEMA_PATH))
+
+
+def generate_ontology_graph():
+    if not GRAPH_SCRIPT.exists():
+        print(f"⚠️  Warning: {GRAPH_SCRIPT} not found. Skipping graph generation.")
+        return
+
+    visualize = load_script(GRAPH_SCRIPT)
+    if visualize is not None:
+        # The script skips mmdc when the diagram hash matches the last render
+        visualize.generate_mermaid_v2(root=ROOT_DIR)
+    else:
+        # RUN in the root dir because visualize_ontology.py expects that context
+        subprocess.run(
+            [sys.executable, str(GRAPH_SCRIPT.resolve())],
+            cwd=ROOT_DIR.resolve(),
+            check=True,
+        )
+
+
+def generate_docs():
+    if DOCS_SCRIPT.exists():
+        # Set environment variable to prevent recursion in case build-docs calls gen-all
+        env = os.environ.copy()
+        env["SKIP_GEN_ALL"] = "true"
+        subprocess.run(
+            [str(DOCS_SCRIPT.resolve())], cwd=ROOT_DIR.resolve(), env=env, check=True
+        )
+    else:
+        print(
+            f"⚠️  Warning: {DOCS_SCRIPT} not found. Skipping documentation generation."
+        )
+
+
+def build_steps(include_docs: bool = True, in_process: bool = True) -> list[Step]:
+    """
+    The generation pipeline as a DAG:
+    generate → finalize (inject version + determinize) → graph/docs.
+
+    Finalization parses each generated TTL once, adds the version triples to
+    the graph and writes it with the deterministic serializer, so every
+    artifact is written by exactly one step after its generator.
+
+    With in_process, the LinkML generators run as library calls sharing one
+    SchemaView (loaded in the parent, inherited by forked workers) instead of
+    three `uv run gen-*` subprocesses.
+    """
+    prepare = load_schema_view if in_process else None
+    steps = [
+        Step(
+            "gen-python",
+            partial(generate_python, in_process),
+            [SCHEMA_PATH],
+            [PYTHON_DEST],
+            prepare=prepare,
+        ),
+        Step(
+            "gen-owl",
+            partial(generate_owl, in_process),
+            [SCHEMA_PATH],
+            [ONTOLOGY_DEST],
+            prepare=prepare,
+        ),
+        Step(
+            "gen-shacl",
+            partial(generate_shacl, in_process),
+            [SCHEMA_PATH],
+            [SHACL_DEST],
+            prepare=prepare,
+        ),
+        Step(
+            "finalize-owl",
+            partial(finalize_ttl, ONTOLOGY_DEST),
+            [SCHEMA_PATH, INJECT_SCRIPT, ONTOLOGY_DEST],
+            [ONTOLOGY_DEST],
+            deps=["gen-owl"],
+        ),
+        Step(
+            "finalize-shacl",
+            partial(finalize_ttl, SHACL_DEST, True),
+            [SCHEMA_PATH, INJECT_SCRIPT, SHACL_DEST],
+            [SHACL_DEST],
+            deps=["gen-shacl"],
+        ),
+        Step(
+            "inject-version",
+            inject_version,
+            [SCHEMA_PATH, INJECT_SCRIPT, WIDOCO_CONF],
+            [WIDOCO_CONF],
+        ),
+        Step(
+            "ontology-graph",
+            generate_ontology_graph,
+            [GRAPH_SCRIPT, ONTOLOGY_DEST],
+            [GRAPH_MMD, GRAPH_PNG, GRAPH_RENDER_HASH],
+            deps=["finalize-owl"],
+        ),
+    ]
+    if include_docs:
+        steps.append(
+            Step(
+                "docs",
+                generate_docs,
+                [DOCS_SCRIPT, ONTOLOGY_DEST, WIDOCO_CONF],
+                [DOCS_DEST],
+                deps=["finalize-owl", "inject-version"],
+            )
+        )
+    return steps
+
+
+def main(argv: list[str] | None = None):
     """
     Generates all ontology artifacts: Python models, OWL, and SHACL.
     Acts as a python entry point for `gen-all`.
+
+    Steps whose inputs (schema, scripts, tool versions) and outputs are
+    unchanged since the last build are skipped; pass --force to rebuild all.
     """
+    parser = argparse.ArgumentParser(prog="gen-all", description=main.__doc__)
+    parser.add_argument(
+        "--force", action="store_true", help="Ignore the build manifest."
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=None,
+        help="Parallel worker processes (default: CPU count, 1 = sequential).",
+    )
+    parser.add_argument(
+        "--subprocess",
+        action="store_true",
+        help="Run the LinkML generators via `uv run gen-*` instead of in-process.",
+    )
+    args = parser.parse_args(argv)
 
     # Check if we are in the right directory
     if not SCHEMA_PATH.exists():
         print(
-            f"Error: {SCHEMA_PATH} not found. Please run this command from the scimantic-core directory."
+            f"Error: {SCHEMA_PATH} not found. "
+            "Please run this command from the scimantic-core directory."
         )
         sys.exit(1)
 
     print("Generating artifacts...")
 
-    # 1. Generate Python Models
-    print("Running gen-python...")
-    run_command(f"uv run gen-python {SCHEMA_PATH} > {PYTHON_DEST}")
-    # Remove timestamp immediately
-    remove_timestamp(PYTHON_DEST)
-
-    # 2. Generate OWL Ontology
-    print("Running gen-owl...")
-    run_command(f"uv run gen-owl --no-metadata {SCHEMA_PATH} > {ONTOLOGY_DEST}")
-
-    # 3. Generate SHACL Shapes
-    print("Running gen-shacl...")
-    run_command(f"uv run gen-shacl --no-metadata {SCHEMA_PATH} > {SHACL_DEST}")
-
-    # 4. Determinize (Fixes random ordering)
-    # This must happen BEFORE version injection if version injection relies on regex,
-    # OR AFTER if we want to ensure the injected version isn't re-serialized strangely.
-    # However, since inject_version does simple regex replacement, it's safer to determinize first
-    # so the structure is stable, then inject the specific strings.
-    determinize_ttl(ONTOLOGY_DEST)
-    determinize_ttl(SHACL_DEST)
-
-    # 5. Inject Version (Updates IRIs / headers)
-    print("Injecting version...")
-    inject_script = ONTOLOGY_ROOT / "scripts" / "inject_version.py"
-    run_command(f"{sys.executable} {inject_script}", cwd=str(ONTOLOGY_ROOT))
-
-    # 6. Generate Ontology Graph
-    print("Generating ontology graph...")
-    root_dir = Path("..").resolve()
-    script_path = root_dir / "scripts" / "visualize_ontology.py"
-
-    if script_path.exists():
-        # RUN in the root dir because visualize_ontology.py expects that context
-        subprocess.run([sys.executable, str(script_path)], cwd=root_dir, check=True)
-    else:
-        print(f"⚠️  Warning: {script_path} not found. Skipping graph generation.")
-
-    # 7. Generate Documentation (Public Folder)
-    # Only run if not skipping
-    if os.environ.get("SKIP_GEN_doc") != "true":
-        print("Generating documentation (public folder)...")
-        docs_script = root_dir / "scripts" / "build-docs.sh"
-        if docs_script.exists():
-            # Set environment variable to prevent recursion in case build-docs calls gen-all
-            env = os.environ.copy()
-            env["SKIP_GEN_ALL"] = "true"
-            subprocess.run([str(docs_script)], cwd=root_dir, env=env, check=True)
-        else:
-            print(
-                f"⚠️  Warning: {docs_script} not found. Skipping documentation generation."
-            )
+    # Documentation (public folder) only if not skipping
+    steps = build_steps(
+        include_docs=os.environ.get("SKIP_GEN_doc") != "true",
+        in_process=not args.subprocess,
+    )
+    run_steps(steps, BuildManifest(), force=args.force, jobs=args.jobs)
 
     print("✅ Successfully generated all artifacts.")
 
@@ -0,0 +1,187 @@
+"""
+Binary cache for parsed RDF graphs.
+
+Parsing Turtle is the dominant start-up cost for anything that consumes the
+generated ontology or SHACL shapes. This module stores the parsed triples in
+``.scimantic/cache/graphs`` beside the source, as an interned term table plus
+a flat integer triple array keyed by the parser format and the SHA-256 of the
+source bytes, so later loads can rebuild an ``rdflib.Graph`` without running
+the parser.
+"""
+
+import hashlib
+import marshal
+import os
+from array import array
+from pathlib import Path
+from typing import Any
+
+from rdflib import BNode, Graph, Literal, URIRef
+from rdflib.term import Node
+
+from scimantic.config import DEFAULT_GRAPH_CACHE_DIR
+
+# Bump when the on-disk layout changes so stale caches are ignored
+CACHE_MAGIC = b"SCIGC\x00\x02\n"
+CACHE_SUFFIX = ".graphcache"
+
+_URI, _BNODE, _LITERAL = 0, 1, 2
+
+
+def cache_path_for(
+    source: str | Path, format: str = "turtle", cache_dir: str | Path | None = None
+) -> Path:
+    """
+    Returns the cache file used for an RDF source file parsed as `format`.
+
+    There is one file per source name and format, replaced when the source
+    changes, so the cache does not grow.
+
+    Args:
+        source: Path to the RDF file
+        format: rdflib parser format of the source
+        cache_dir: Cache directory (default: .scimantic/cache/graphs in the
+            source's directory)
+    """
+    source = Path(source)
+    if cache_dir is None:
+        cache_dir = source.parent / DEFAULT_GRAPH_CACHE_DIR
+    return Path(cache_dir) / f"{source.name}.{format}{CACHE_SUFFIX}"
+
+
+def _encode(graph: Graph) -> bytes:
+    """Encodes a graph as a term table and an integer triple array."""
+    ids: dict[Node, int] = {}
+    kinds = bytearray()
+    values: list[str] = []
+    langs: list[Any] = []
+    datatypes: list[Any] = []
+    triples = array("I")
+
+    def intern(term: Node) -> int:
+        term_id = ids.get(term)
+        if term_id is None:
+            term_id = ids[term] = len(values)
+            if isinstance(term, Literal):
+                kinds.append(_LITERAL)
+                langs.append(term.language)
+                datatypes.append(str(term.datatype) if term.datatype else None)
+            else:
+                kinds.append(_BNODE if isinstance(term, BNode) else _URI)
+                langs.append(None)
+                datatypes.append(None)
+            values.append(str(term))
+        return term_id
+
+    for s, p, o in graph:
+        triples.append(intern(s))
+        triples.append(intern(p))
+        triples.append(intern(o))
+
+    namespaces = [(prefix, str(uri)) for prefix, uri in graph.namespaces()]
+    payload = (namespaces, bytes(kinds), values, langs, datatypes, triples.tobytes())
+    return marshal.dumps(payload)
+
+
+def _decode(data: bytes) -> Graph:
+    """Rebuilds a graph from the output of ``_encode``."""
+    namespaces, kinds, values, langs, datatypes, triple_bytes = marshal.loads(data)
+
+    terms: list[Node] = []
+    for kind, value, lang, datatype in zip(
+        kinds, values, langs, datatypes, strict=True
+    ):
+        if kind == _URI:
+            terms.append(URIRef(value))
+        elif kind == _BNODE:
+            terms.append(BNode(value))
+        else:
+            terms.append(
+                Literal(
+                    value, lang=lang, datatype=URIRef(datatype) if datatype else None
+                )
+            )
+
+    triples = array("I")
+    triples.frombytes(triple_bytes)
+
+    g = Graph()
+    for prefix, uri in namespaces:
+        g.bind(prefix, uri, override=True, replace=True)
+
+    it = iter(triples)
+    g.addN(
+        (terms[s], terms[p], terms[o], g) for s, p, o in zip(it, it, it, strict=True)
+    )
+    return g
+
+
+def _read_cache(cache_file: Path, digest: bytes) -> Graph | None:
+    """Returns the cached graph if the cache exists and matches ``digest``."""
+    try:
+        data = cache_file.read_bytes()
+    except OSError:
+        return None
+
+    header = CACHE_MAGIC + digest
+    if not data.startswith(header):
+        return None
+
+    try:
+        return _decode(data[len(header) :])
+    except (ValueError, EOFError, TypeError, IndexError):
+        # Corrupt or truncated cache; fall back to parsing the source
+        return None
+
+
+def _write_cache(cache_file: Path, digest: bytes, graph: Graph) -> None:
+    """Writes the cache atomically. Failures are ignored (e.g. read-only dirs)."""
+    tmp_file = cache_file.with_name(f"{cache_file.name}.{os.getpid()}.tmp")
+    try:
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file.write_bytes(CACHE_MAGIC + digest + _encode(graph))
+        os.replace(tmp_file, cache_file)
+    except OSError:
+        tmp_file.unlink(missing_ok=True)
+
+
+def load_graph(
+    source: str | Path,
+    format: str = "turtle",
+    use_cache: bool = True,
+    cache_dir: str | Path | None = None,
+) -> Graph:
+    """
+    Loads an RDF file into a Graph, using the binary cache when it is current.
+
+    The cache lives in cache_dir (see cache_path_for) and is keyed by the
+    format and the SHA-256 of the source content, so any edit to the source
+    or a different parser invalidates it.
+
+    Args:
+        source: Path to the RDF file (e.g. scimantic.ttl)
+        format: rdflib parser format of the source (default: "turtle")
+        use_cache: Set to False to always parse the source
+        cache_dir: Cache directory (default: .scimantic/cache/graphs in the
+            source's directory)
+
+    Returns:
+        The parsed graph
+    """
+    source = Path(source)
+    if not use_cache:
+        g = Graph()
+        g.parse(str(source), format=format)
+        return g
+
+    digest = hashlib.sha256(f"{format}\n".encode() + source.read_bytes()).digest()
+    cache_file = cache_path_for(source, format, cache_dir)
+
+    cached = _read_cache(cache_file, digest)
+    if cached is not None:
+        return cached
+
+    g = Graph()
+    g.parse(str(source), format=format)
+    _write_cache(cache_file, digest, g)
+    return g
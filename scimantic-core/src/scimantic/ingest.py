@@ -0,0 +1,407 @@
+"""
+Bulk ingestion of computational chemistry outputs with cclib.
+
+Each output file (GAMESS, Gaussian, ORCA, ... log files) is parsed by cclib
+in a process pool; only the quantities recorded as Results cross back to the
+parent process. The project then gains, per file,
+
+- a scimantic:Experimentation (the calculation) that used the file's
+  scimantic:ExperimentalMethod (program, method and basis set) and generated
+- a scimantic:Dataset for the output file,
+
+and, for the whole batch, one scimantic:Analysis (the cclib parse) that used
+every Dataset and generated a scimantic:Result per parsed quantity, derived
+from its Dataset. Everything is written with a single add_to_project call.
+"""
+
+import logging
+import os
+import uuid
+from collections import Counter
+from collections.abc import Iterable
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from functools import partial
+from pathlib import Path
+from typing import Any
+
+import cclib
+import numpy as np
+from cclib.parser.utils import PeriodicTable, convertor
+from rdflib import Graph, Literal, Namespace, URIRef
+from rdflib.namespace import DCAT, PROV, RDF, RDFS, XSD
+
+from scimantic.cclib_cache import CclibCache, parse_cached, record_entity
+from scimantic.config import SCIMANTIC_ONTOLOGY_URI
+from scimantic.storage import add_to_project
+
+SCIMANTIC = Namespace(SCIMANTIC_ONTOLOGY_URI)
+URI_PREFIX = "http://example.org/research/"
+OUTPUT_SUFFIXES = (".log", ".out")
+
+# Result name → (cclib attribute, unit). Energies are reported in hartree
+# (cclib parses them to eV), orbital gaps in eV.
+QUANTITIES = {
+    "SCF energy": ("scfenergies", "hartree"),
+    "MP energy": ("mpenergies", "hartree"),
+    "CC energy": ("ccenergies", "hartree"),
+    "zero-point energy": ("zpve", "hartree"),
+    "enthalpy": ("enthalpy", "hartree"),
+    "free energy": ("freeenergy", "hartree"),
+    "HOMO-LUMO gap": ("moenergies", "eV"),
+    "dipole moment": ("moments", "D"),
+    "lowest frequency": ("vibfreqs", "cm-1"),
+}
+
+
+@dataclass(frozen=True)
+class ParsedOutput:
+    """The quantities cclib parsed from one output file."""
+
+    path: str
+    package: str = ""
+    method: str = ""
+    formula: str = ""
+    natom: int = 0
+    charge: int | None = None
+    mult: int | None = None
+    success: bool | None = None
+    quantities: tuple[tuple[str, float, str], ...] = ()
+    sha256: str | None = None
+    error: str | None = None
+
+    @property
+    def method_label(self) -> str:
+        return " ".join(part for part in (self.package, self.method) if part)
+
+
+@dataclass
+class IngestReport:
+    """What an ingest_outputs call added to the project."""
+
+    datasets: dict[str, URIRef] = field(default_factory=dict)
+    results: list[URIRef] = field(default_factory=list)
+    failed: dict[str, str] = field(default_factory=dict)
+    analysis: URIRef | None = None
+
+
+def _formula(atomnos: Iterable[int]) -> str:
+    """Hill-order formula (C, H, then alphabetical) of atomic numbers."""
+    table = PeriodicTable()
+    counts = Counter(str(table.element[int(number)]) for number in atomnos)
+    order = [e for e in ("C", "H") if "C" in counts and e in counts]
+    order += sorted(e for e in counts if e not in order)
+    return "".join(f"{e}{counts[e] if counts[e] > 1 else ''}" for e in order)
+
+
+def _quantity(data: Any, attribute: str) -> float | None:
+    value = getattr(data, attribute, None)
+    if value is None or len(np.atleast_1d(value)) == 0:
+        return None
+    if attribute in ("scfenergies", "ccenergies"):
+        return convertor(float(value[-1]), "eV", "hartree")
+    if attribute == "mpenergies":
+        return convertor(float(value[-1][-1]), "eV", "hartree")
+    if attribute == "moenergies":
+        homos = getattr(data, "homos", None)
+        if homos is None or homos[0] + 1 >= len(value[0]):
+            return None
+        return float(value[0][homos[0] + 1] - value[0][homos[0]])
+    if attribute == "moments":
+        return float(np.linalg.norm(value[1])) if len(value) > 1 else None
+    if attribute == "vibfreqs":
+        return float(np.min(value))
+    return float(value)
+
+
+def summarize(path: str | Path, data: Any, digest: str | None = None) -> ParsedOutput:
+    """
+    Extracts the QUANTITIES recorded as Results from cclib-parsed data.
+
+    Args:
+        path: Output file the data was parsed from
+        data: cclib data (from ccread or a CclibCache)
+        digest: SHA-256 of the file, when its data is cached
+
+    Returns:
+        The parsed quantities and calculation metadata
+    """
+    metadata = getattr(data, "metadata", {})
+    theory = metadata.get("functional") or (metadata.get("methods") or [""])[-1]
+    basis = metadata.get("basis_set", "")
+    quantities = []
+    for name, (attribute, unit) in QUANTITIES.items():
+        try:
+            value = _quantity(data, attribute)
+        except (IndexError, TypeError, ValueError):
+            value = None
+        if value is not None and np.isfinite(value):
+            quantities.append((name, value, unit))
+    atomnos = getattr(data, "atomnos", [])
+    charge = getattr(data, "charge", None)
+    mult = getattr(data, "mult", None)
+    return ParsedOutput(
+        path=str(path),
+        package=metadata.get("package", ""),
+        method="/".join(part for part in (theory, basis) if part),
+        formula=_formula(atomnos) if len(atomnos) else "",
+        natom=int(getattr(data, "natom", 0)),
+        charge=None if charge is None else int(charge),
+        mult=None if mult is None else int(mult),
+        success=metadata.get("success"),
+        quantities=tuple(quantities),
+        sha256=digest,
+    )
+
+
+def parse_output(path: str | Path, cache_dir: str | Path | None = None) -> ParsedOutput:
+    """
+    Parses one output file with cclib (run in the worker processes).
+
+    Args:
+        path: Output file of any program cclib supports
+        cache_dir: CclibCache directory to read the parsed data from, or to
+            store it in, by content hash
+
+    Returns:
+        The parsed quantities, or the reason the file could not be parsed
+    """
+    path = str(path)
+    digest = None
+    try:
+        if cache_dir is None:
+            data = cclib.io.ccread(path, loglevel=logging.ERROR)
+        else:
+            data, digest, _ = parse_cached(path, cache_dir)
+    except Exception as e:  # noqa: BLE001 - cclib raises anything on a malformed file
+        return ParsedOutput(path, error=f"{type(e).__name__}: {e}")
+    if data is None:
+        return ParsedOutput(path, error="Not an output file cclib recognizes")
+    return summarize(path, data, digest)
+
+
+def parse_outputs(
+    paths: Iterable[str | Path],
+    jobs: int | None = None,
+    chunksize: int = 8,
+    cache: CclibCache | None = None,
+) -> list[ParsedOutput]:
+    """
+    Parses output files across a process pool.
+
+    With a cache, files whose (path, mtime, size) is already indexed are read
+    from their .npz in this process and never parsed; only the rest are sent
+    to the pool, which hashes them, reuses any entry with the same content and
+    parses (and caches) the others. The index is saved once, after eviction.
+
+    Args:
+        paths: Output files
+        jobs: Worker processes (default: CPU count; 1 parses in-process)
+        chunksize: Files sent to a worker at a time
+        cache: Cache of parsed data (see scimantic.cclib_cache)
+
+    Returns:
+        One ParsedOutput per file, in input order
+    """
+    items = [str(path) for path in paths]
+    parsed: dict[int, ParsedOutput] = {}
+    if cache is not None:
+        for i, path in enumerate(items):
+            digest = cache.lookup(path)
+            if digest and (data := cache.read(digest)) is not None:
+                cache.record(path, digest)
+                parsed[i] = summarize(path, data, digest)
+    misses = [i for i in range(len(items)) if i not in parsed]
+
+    parse = partial(parse_output, cache_dir=None if cache is None else cache.directory)
+    jobs = jobs or os.cpu_count() or 1
+    if jobs == 1 or len(misses) <= chunksize:
+        outputs = [parse(items[i]) for i in misses]
+    else:
+        with ProcessPoolExecutor(max_workers=min(jobs, len(misses))) as executor:
+            outputs = list(
+                executor.map(parse, [items[i] for i in misses], chunksize=chunksize)
+            )
+    parsed.update(zip(misses, outputs, strict=True))
+
+    if cache is not None:
+        for i, output in zip(misses, outputs, strict=True):
+            if output.sha256:
+                cache.record(items[i], output.sha256)
+        cache.evict(keep={p.sha256 for p in parsed.values() if p.sha256})
+        cache.save()
+    return [parsed[i] for i in range(len(items))]
+
+
+def find_outputs(paths: Iterable[str | Path]) -> list[Path]:
+    """Expands directories into the output files (OUTPUT_SUFFIXES) they hold."""
+    found = []
+    for path in map(Path, paths):
+        if path.is_dir():
+            found += sorted(
+                p
+                for p in path.rglob("*")
+                if p.suffix.lower() in OUTPUT_SUFFIXES and p.is_file()
+            )
+        else:
+            found.append(path)
+    return found
+
+
+def _uri(kind: str) -> URIRef:
+    return URIRef(f"{URI_PREFIX}{kind}/{uuid.uuid4().hex}")
+
+
+def outputs_graph(
+    parsed: Iterable[ParsedOutput], agent: str | None = None
+) -> tuple[Graph, IngestReport]:
+    """
+    Builds the Dataset/Result graph, with provenance, for parsed outputs.
+
+    Args:
+        parsed: Parsed output files (see parse_outputs)
+        agent: Agent URI the activities and entities are attributed to
+
+    Returns:
+        The graph and a report of the URIs created and the files skipped
+    """
+    g = Graph()
+    g.bind("scimantic", SCIMANTIC)
+    g.bind("prov", PROV)
+    g.bind("dcat", DCAT)
+    now = Literal(datetime.now(timezone.utc), datatype=XSD.dateTime)
+    report = IngestReport()
+    agent_uri = URIRef(agent) if agent else None
+    if agent_uri:
+        g.add((agent_uri, RDF.type, PROV.Agent))
+
+    methods: dict[str, URIRef] = {}
+    experimentations = []
+    outputs = []
+    for output in parsed:
+        if output.error:
+            report.failed[output.path] = output.error
+            continue
+        name = Path(output.path).name
+        method_label = output.method_label or "Unknown method"
+        method = methods.get(method_label)
+        if method is None:
+            method = methods[method_label] = _uri("method")
+            g.add((method, RDF.type, SCIMANTIC.ExperimentalMethod))
+            g.add((method, RDF.type, PROV.Entity))
+            g.add((method, RDFS.label, Literal(method_label)))
+            if output.method:
+                g.add((method, SCIMANTIC.method, Literal(output.method)))
+
+        experimentation = _uri("experimentation")
+        g.add((experimentation, RDF.type, SCIMANTIC.Experimentation))
+        g.add((experimentation, RDF.type, PROV.Activity))
+        g.add((experimentation, RDFS.label, Literal(f"{method_label}: {name}")))
+        g.add((experimentation, PROV.used, method))
+        if agent_uri:
+            g.add((experimentation, PROV.wasAssociatedWith, agent_uri))
+
+        dataset = _uri("dataset")
+        label = f"{output.formula or name} ({method_label}, {name})"
+        g.add((dataset, RDF.type, SCIMANTIC.Dataset))
+        g.add((dataset, RDF.type, PROV.Entity))
+        g.add((dataset, RDFS.label, Literal(label)))
+        g.add((dataset, DCAT.downloadURL, URIRef(Path(output.path).resolve().as_uri())))
+        g.add((dataset, PROV.wasGeneratedBy, experimentation))
+        g.add((dataset, PROV.wasDerivedFrom, method))
+        if agent_uri:
+            g.add((dataset, PROV.wasAttributedTo, agent_uri))
+        comment = f"{output.natom} atoms"
+        if output.charge is not None and output.mult is not None:
+            comment += f", charge {output.charge}, multiplicity {output.mult}"
+        if output.success is False:
+            comment += "; the calculation did not terminate normally"
+        g.add((dataset, RDFS.comment, Literal(comment)))
+
+        report.datasets[output.path] = dataset
+        experimentations.append(experimentation)
+        outputs.append((output, dataset, name))
+
+    if not outputs:
+        return g, report
+
+    analysis = report.analysis = _uri("analysis")
+    g.add((analysis, RDF.type, SCIMANTIC.Analysis))
+    g.add((analysis, RDF.type, PROV.Activity))
+    g.add(
+        (
+            analysis,
+            RDFS.label,
+            Literal(f"cclib {cclib.__version__} parse of {len(outputs)} outputs"),
+        )
+    )
+    g.add((analysis, PROV.endedAtTime, now))
+    for experimentation in experimentations:
+        g.add((analysis, PROV.wasInformedBy, experimentation))
+    if agent_uri:
+        g.add((analysis, PROV.wasAssociatedWith, agent_uri))
+
+    for output, dataset, name in outputs:
+        g.add((analysis, PROV.used, dataset))
+        if output.sha256:
+            label = f"cclib data of {name}"
+            g.add(
+                (analysis, PROV.used, record_entity(g, output.sha256, dataset, label))
+            )
+        for quantity, value, unit in output.quantities:
+            result = _uri("result")
+            g.add((result, RDF.type, SCIMANTIC.Result))
+            g.add((result, RDF.type, PROV.Entity))
+            g.add(
+                (
+                    result,
+                    RDFS.label,
+                    Literal(f"{quantity} of {output.formula or name} ({name})"),
+                )
+            )
+            g.add((result, SCIMANTIC.value, Literal(f"{value:.10g}")))
+            g.add((result, SCIMANTIC.unit, Literal(unit)))
+            g.add((result, PROV.wasGeneratedBy, analysis))
+            g.add((result, PROV.wasDerivedFrom, dataset))
+            g.add((result, PROV.generatedAtTime, now))
+            if agent_uri:
+                g.add((result, PROV.wasAttributedTo, agent_uri))
+            report.results.append(result)
+    return g, report
+
+
+def ingest_outputs(
+    project_path: str | Path,
+    paths: Iterable[str | Path],
+    agent: str | None = None,
+    jobs: int | None = None,
+    chunksize: int = 8,
+    cache: CclibCache | None = None,
+) -> IngestReport:
+    """
+    Parses computational chemistry outputs and adds them to a project.
+
+    Example:
+        ingest_outputs("project.ttl", ["runs/"], agent=orcid, jobs=16)
+
+    Args:
+        project_path: Project to add the Datasets and Results to
+        paths: Output files, or directories searched for OUTPUT_SUFFIXES files
+        agent: Agent URI the activities and entities are attributed to
+        jobs: Worker processes (default: CPU count; 1 parses in-process)
+        chunksize: Files sent to a worker at a time
+        cache: Cache of parsed data; unchanged files are not parsed again, and
+            the Analysis records the cached data it used as prov:Entities
+
+    Returns:
+        The Datasets, Results and Analysis created, and the files cclib
+        could not parse
+    """
+    parsed = parse_outputs(
+        find_outputs(paths), jobs=jobs, chunksize=chunksize, cache=cache
+    )
+    g, report = outputs_graph(parsed, agent=agent)
+    if report.datasets:
+        add_to_project(g, project_path)
+    return report
@@ -0,0 +1,297 @@
+"""
+License and access analysis for subset publishing.
+
+LicenseIndex is built once per master graph revision. It resolves, for every
+entity, its effective license(s), access level and publishable flag:
+
+- values stated on the entity itself (``dcterms:license``,
+  ``scimantic:accessLevel``, ``scimantic:publishable``) win;
+- otherwise they are inherited through ``prov:wasDerivedFrom``. An entity
+  derived from several sources carries all of their licenses, the most
+  restrictive of their access levels, and is publishable only if every source
+  is.
+
+Resolution visits each entity and derivation edge once (derivation cycles
+are resolved as strongly connected components), so checking a subset
+is a dictionary lookup per entity and the whole report is linear in the size
+of the subset.
+"""
+
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass, field
+from typing import Any
+
+from rdflib import Graph, Literal, URIRef
+from rdflib.namespace import DCTERMS, PROV
+from rdflib.term import Node
+
+from scimantic.config import SCIMANTIC_ONTOLOGY_URI
+
+ACCESS_LEVEL = URIRef(f"{SCIMANTIC_ONTOLOGY_URI}accessLevel")
+PUBLISHABLE = URIRef(f"{SCIMANTIC_ONTOLOGY_URI}publishable")
+
+# Short names used in subset definitions (license_filter) for common licenses
+LICENSE_NAMES = {
+    "https://creativecommons.org/licenses/by/4.0/": "CC-BY-4.0",
+    "http://creativecommons.org/licenses/by/4.0/": "CC-BY-4.0",
+    "https://creativecommons.org/publicdomain/zero/1.0/": "CC0",
+    "http://creativecommons.org/publicdomain/zero/1.0/": "CC0",
+    f"{SCIMANTIC_ONTOLOGY_URI}license#AllRightsReserved": "AllRightsReserved",
+    f"{SCIMANTIC_ONTOLOGY_URI}license#Proprietary": "Proprietary",
+}
+
+# Access levels from most to least restrictive
+ACCESS_LEVELS = ("local", "institutional", "public", "public_essential_evidence")
+
+
+def license_name(license_: str) -> str:
+    """Returns the short name of a license IRI (or the IRI itself)."""
+    return LICENSE_NAMES.get(license_, license_)
+
+
+def _restrictiveness(level: str) -> int:
+    # Unknown levels are treated as the most restrictive
+    return ACCESS_LEVELS.index(level) if level in ACCESS_LEVELS else -1
+
+
+@dataclass(frozen=True)
+class EntityTerms:
+    """Effective license terms of one entity."""
+
+    licenses: frozenset[str] = frozenset()
+    access_level: str | None = None
+    publishable: bool | None = None
+
+
+_UNKNOWN = EntityTerms()
+
+
+class LicenseIndex:
+    """
+    Effective license, access level and publishable flag of every entity.
+
+    Args:
+        graph: The master graph
+    """
+
+    def __init__(self, graph: Graph):
+        self.own_licenses: dict[Node, set[str]] = {}
+        self.own_access: dict[Node, str] = {}
+        self.own_publishable: dict[Node, bool] = {}
+        self.sources: dict[Node, list[Node]] = {}
+
+        for s, o in graph.subject_objects(DCTERMS.license):
+            self.own_licenses.setdefault(s, set()).add(str(o))
+        for s, o in graph.subject_objects(ACCESS_LEVEL):
+            level = str(o)
+            current = self.own_access.get(s)
+            if current is None or _restrictiveness(level) < _restrictiveness(current):
+                self.own_access[s] = level
+        for s, o in graph.subject_objects(PUBLISHABLE):
+            value = o.toPython() if isinstance(o, Literal) else o
+            self.own_publishable[s] = self.own_publishable.get(s, True) and bool(value)
+        for s, o in graph.subject_objects(PROV.wasDerivedFrom):
+            self.sources.setdefault(s, []).append(o)
+
+        self.terms: dict[Node, EntityTerms] = {}
+        self._resolve()
+
+    def _resolve(self) -> None:
+        """
+        Resolves inherited terms for all entities.
+
+        Derivation cycles are handled by resolving strongly connected
+        components (iterative Tarjan): members of a cycle inherit from
+        each other, and every component is combined once, after its sources.
+        """
+        entities: set[Node] = set(self.sources)
+        entities.update(self.own_licenses, self.own_access, self.own_publishable)
+        interned: dict[EntityTerms, EntityTerms] = {}
+        order: dict[Node, int] = {}
+        low: dict[Node, int] = {}
+        component_stack: list[Node] = []
+        on_stack: set[Node] = set()
+
+        for root in entities:
+            if root in order:
+                continue
+            order[root] = low[root] = len(order)
+            component_stack.append(root)
+            on_stack.add(root)
+            work = [(root, iter(self.sources.get(root, ())))]
+            while work:
+                node, pending = work[-1]
+                for source in pending:
+                    if source not in order:
+                        order[source] = low[source] = len(order)
+                        component_stack.append(source)
+                        on_stack.add(source)
+                        work.append((source, iter(self.sources.get(source, ()))))
+                        break
+                    if source in on_stack:
+                        low[node] = min(low[node], order[source])
+                else:
+                    work.pop()
+                    if work:
+                        parent = work[-1][0]
+                        low[parent] = min(low[parent], low[node])
+                    if low[node] == order[node]:
+                        component = []
+                        while True:
+                            member = component_stack.pop()
+                            on_stack.discard(member)
+                            component.append(member)
+                            if member == node:
+                                break
+                        self._resolve_component(component, interned)
+
+    def _resolve_component(
+        self, component: list[Node], interned: dict[EntityTerms, EntityTerms]
+    ) -> None:
+        if len(component) == 1:
+            node = component[0]
+            inherited = [
+                self.terms.get(s, _UNKNOWN) for s in self.sources.get(node, ())
+            ]
+            terms = self._combine(node, inherited)
+            self.terms[node] = interned.setdefault(terms, terms)
+            return
+
+        # A derivation cycle: pool external sources and members' own terms
+        members = set(component)
+        pooled = [
+            self.terms.get(s, _UNKNOWN)
+            for node in component
+            for s in self.sources.get(node, ())
+            if s not in members
+        ]
+        pooled += [self._combine(node, []) for node in component]
+        for node in component:
+            terms = self._combine(node, pooled)
+            self.terms[node] = interned.setdefault(terms, terms)
+
+    def _combine(self, node: Node, inherited: list[EntityTerms]) -> EntityTerms:
+        licenses = self.own_licenses.get(node)
+        if licenses is not None:
+            license_set = frozenset(licenses)
+        elif len(inherited) == 1:
+            license_set = inherited[0].licenses
+        else:
+            license_set = frozenset().union(*(t.licenses for t in inherited))
+
+        access = self.own_access.get(node)
+        if access is None:
+            levels = [t.access_level for t in inherited if t.access_level is not None]
+            access = min(levels, key=_restrictiveness) if levels else None
+
+        publishable = self.own_publishable.get(node)
+        if publishable is None:
+            flags = [t.publishable for t in inherited if t.publishable is not None]
+            publishable = all(flags) if flags else None
+
+        return EntityTerms(license_set, access, publishable)
+
+    def __getitem__(self, entity: Node) -> EntityTerms:
+        return self.terms.get(entity, _UNKNOWN)
+
+    def __len__(self) -> int:
+        return len(self.terms)
+
+    def check(
+        self, entities: Iterable[Node], rules: Mapping[str, Iterable[str]]
+    ) -> "LicenseReport":
+        """
+        Checks entities against subset license rules.
+
+        Args:
+            entities: Entities included in a subset
+            rules: A subset definition's license_filter. ``allow`` / ``warn``
+                / ``block`` list license short names or IRIs; ``access`` lists
+                acceptable access levels.
+
+        Returns:
+            License counts, violations (which block publishing) and warnings
+        """
+        allow = set(rules.get("allow", ()))
+        warn = set(rules.get("warn", ()))
+        block = set(rules.get("block", ()))
+        access = set(rules.get("access", ()))
+
+        report = LicenseReport()
+        for entity in entities:
+            terms = self[entity]
+            name = str(entity)
+            if terms.publishable is False:
+                report.violations.append(Violation(name, "not publishable"))
+            if (
+                access
+                and terms.access_level is not None
+                and terms.access_level not in access
+            ):
+                reason = f"access level {terms.access_level}"
+                report.violations.append(Violation(name, reason))
+            if not terms.licenses:
+                report.counts["unlicensed"] = report.counts.get("unlicensed", 0) + 1
+                continue
+            for license_ in terms.licenses:
+                short = license_name(license_)
+                report.counts[short] = report.counts.get(short, 0) + 1
+                keys = {short, license_}
+                if keys & block:
+                    report.violations.append(Violation(name, f"blocked: {short}"))
+                elif keys & warn:
+                    report.warnings.append(Violation(name, f"review: {short}"))
+                elif allow and not keys & allow:
+                    report.violations.append(Violation(name, f"not allowed: {short}"))
+        return report
+
+
+@dataclass(frozen=True)
+class Violation:
+    """A license or access problem of one entity."""
+
+    entity: str
+    reason: str
+
+
+@dataclass
+class LicenseReport:
+    """License analysis of one subset."""
+
+    counts: dict[str, int] = field(default_factory=dict)
+    violations: list[Violation] = field(default_factory=list)
+    warnings: list[Violation] = field(default_factory=list)
+
+    @property
+    def publishable(self) -> bool:
+        return not self.violations
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "counts": self.counts,
+            "violations": [[v.entity, v.reason] for v in self.violations],
+            "warnings": [[v.entity, v.reason] for v in self.warnings],
+        }
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> "LicenseReport":
+        return cls(
+            counts=dict(data.get("counts", {})),
+            violations=[Violation(*v) for v in data.get("violations", [])],
+            warnings=[Violation(*v) for v in data.get("warnings", [])],
+        )
+
+    def summary(self) -> str:
+        """Human-readable report, as printed by subset generation."""
+        lines = ["License Analysis:"]
+        for name, count in sorted(self.counts.items()):
+            lines.append(f"  {count} entities: {name}")
+        for violation in self.violations:
+            lines.append(f"  ✗ {violation.entity}: {violation.reason}")
+        for warning in self.warnings:
+            lines.append(f"  ⚠ {warning.entity}: {warning.reason}")
+        verdict = "PUBLISHABLE" if self.publishable else "BLOCKED"
+        if self.publishable and self.warnings:
+            verdict += " (review warnings)"
+        lines.append(f"Overall: {verdict}")
+        return "\n".join(lines)
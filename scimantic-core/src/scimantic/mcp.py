@@ -1,5 +1,6 @@
 import json
 import uuid
+from urllib.parse import quote
 from pathlib import Path
 from typing import Any, Dict, cast
 
@@ -10,13 +11,22 @@ from rdflib import Graph, Namespace, Literal, URIRef
 from rdflib.namespace import RDF, RDFS, DCTERMS, XSD
 from rdflib.query import ResultRow
 
+from scimantic import bibliography, export
+from scimantic.annotations import load_annotation_index
+from scimantic.columnar import class_counts, evidence_summary, load_columnar
 from scimantic.config import (
+    DEFAULT_EXPORT_DIR,
+    DEFAULT_NANOPUB_DIR,
+    DEFAULT_NANOPUB_SERVER,
     DEFAULT_PROJECT_FILE,
     PROV_ONTOLOGY_URI,
     SCIMANTIC_ONTOLOGY_URI,
 )
 from scimantic.models import Evidence
 from scimantic.provenance import provenance_tracker
+from scimantic.publish import TEMP_NP, NanopubClient, Outbox, OutboxPublisher
+from scimantic.results import load_result_table
+from scimantic.storage import add_to_project, load_project
 
 # Initialize the MCP Server
 mcp = FastMCP("Scimantic Framework")
@@ -25,6 +35,9 @@ mcp = FastMCP("Scimantic Framework")
 SCIMANTIC = Namespace(SCIMANTIC_ONTOLOGY_URI)
 PROV = Namespace(PROV_ONTOLOGY_URI)
 
+# Classes read by the VS Code tree view
+TREE_VIEW_CLASSES = (SCIMANTIC.Evidence, SCIMANTIC.Question)
+
 
 @mcp.tool()
 def get_provenance_graph() -> str:
@@ -40,7 +53,9 @@ def get_provenance_graph_json(project_path: str = DEFAULT_PROJECT_FILE) -> str:
     with the structure needed for tree view rendering.
 
     Args:
-        project_path: Path to project.ttl file (default: "project.ttl")
+        project_path: Path to the project (default: "project.ttl"); any
+            format scimantic.storage supports. Partitioned projects load only
+            their Evidence and Question partitions.
 
     Returns:
         JSON string with structure: {"evidence": [{uri, content, citation, source, timestamp, agent}, ...]}
@@ -51,9 +66,8 @@ def get_provenance_graph_json(project_path: str = DEFAULT_PROJECT_FILE) -> str:
     if not project_file.exists():
         return json.dumps({"evidence": []})
 
-    # Load RDF graph
-    g = Graph()
-    g.parse(str(project_file), format="turtle")
+    # Load RDF graph (only the partitions the tree view needs, if partitioned)
+    g = load_project(project_file, classes=TREE_VIEW_CLASSES)
 
     # Query for all Evidence entities
     evidence_list = []
@@ -93,6 +107,190 @@ def get_provenance_graph_json(project_path: str = DEFAULT_PROJECT_FILE) -> str:
     return json.dumps({"evidence": evidence_list, "questions": get_questions_list(g)})
 
 
+@mcp.tool()
+def get_project_statistics(project_path: str = DEFAULT_PROJECT_FILE) -> str:
+    """
+    Returns summary statistics of the project graph as JSON.
+
+    Aggregates are computed on a columnar (NumPy) form of the graph, which is
+    cached in memory until the project file changes.
+
+    Args:
+        project_path: Path to the project file (default: "project.ttl")
+
+    Returns:
+        JSON string with structure: {"triples": n, "classes": {class: count},
+        "evidence": [{question, agent, month, count}, ...]}
+    """
+    if not Path(project_path).exists():
+        return json.dumps({"triples": 0, "classes": {}, "evidence": []})
+    columns = load_columnar(project_path)
+    return json.dumps(
+        {
+            "triples": len(columns),
+            "classes": class_counts(columns),
+            "evidence": evidence_summary(columns),
+        }
+    )
+
+
+@mcp.tool()
+def query_results(
+    min_value: float | None = None,
+    max_value: float | None = None,
+    unit: str | None = None,
+    dataset: str | None = None,
+    supports: str | None = None,
+    contradicts: str | None = None,
+    limit: int = 100,
+    project_path: str = DEFAULT_PROJECT_FILE,
+) -> str:
+    """
+    Finds Results by value range and links, with aggregates.
+
+    Values are read from a typed Result table cached next to the project
+    and maintained as the project is written, so queries do not re-parse
+    the graph.
+
+    Args:
+        min_value: Lower bound (inclusive) on the value
+        max_value: Upper bound (inclusive) on the value
+        unit: Convert values to this unit (e.g. "kcal/mol") before comparing;
+            Results in incompatible units are skipped
+        dataset: Only Results derived from this Dataset URI
+        supports: Only Results supporting this Hypothesis URI
+        contradicts: Only Results contradicting this Hypothesis URI
+        limit: Maximum number of Results listed (aggregates cover all matches)
+        project_path: Path to the project file (default: "project.ttl")
+
+    Returns:
+        JSON string with structure: {"count", "min", "max", "mean", "unit",
+        "results": [{uri, label, value, uncertainty, unit}, ...]}
+    """
+    if not Path(project_path).exists():
+        return json.dumps({"count": 0, "results": []})
+    table = load_result_table(project_path)
+    rows = table.select(min_value, max_value, unit, dataset, supports, contradicts)
+    values = table.values_in(unit)[rows]
+    uncertainties = table.uncertainties_in(unit)[rows]
+    summary: Dict[str, Any] = {"count": len(rows), "unit": unit}
+    if len(rows):
+        summary.update(
+            min=float(values.min()), max=float(values.max()), mean=float(values.mean())
+        )
+    summary["results"] = [
+        {
+            "uri": str(table.uris[row]),
+            "label": str(table.labels[row]),
+            "value": float(values[i]),
+            "uncertainty": float(uncertainties[i]),
+            "unit": unit if unit is not None else str(table.units[row]),
+        }
+        for i, row in enumerate(rows[:limit])
+    ]
+    return json.dumps(summary)
+
+
+@mcp.tool()
+def query_annotations(
+    target: str,
+    start: int | None = None,
+    end: int | None = None,
+    page: int | None = None,
+    last_page: int | None = None,
+    contained: bool = False,
+    limit: int = 10_000,
+    project_path: str = DEFAULT_PROJECT_FILE,
+) -> str:
+    """
+    Finds the Annotations of a document that overlap or lie within a range.
+
+    Selectors are read from an interval index cached next to the project and
+    maintained as annotations are written, so a query costs two binary
+    searches rather than a scan of every Annotation.
+
+    Args:
+        target: The annotated document (its oa:hasTarget DOI, URL or file)
+        start: First character offset of the range (default: 0)
+        end: Character offset just past the range (default: end of the page,
+            or of the document)
+        page: First page of the range (omit for documents without pages)
+        last_page: Last page of the range (default: page)
+        contained: Only annotations lying entirely within the range
+        limit: Maximum number of selectors listed
+        project_path: Path to the project file (default: "project.ttl")
+
+    Returns:
+        JSON string with structure: {"count", "annotations": [{uri, selector,
+        page, start, end}, ...]} ordered by position; absent values are null
+    """
+    if not Path(project_path).exists():
+        return json.dumps({"count": 0, "annotations": []})
+    index = load_annotation_index(project_path)
+    rows = index.query(target, start, end, page, last_page, contained)
+
+    def optional(value: Any) -> int | None:
+        return None if value < 0 else int(value)
+
+    return json.dumps(
+        {
+            "count": len(rows),
+            "annotations": [
+                {
+                    "uri": str(index.annotations[row]),
+                    "selector": str(index.selectors[row]),
+                    "page": optional(index.pages[row]),
+                    "start": optional(index.starts[row]),
+                    "end": optional(index.ends[row]),
+                }
+                for row in rows[:limit]
+            ],
+        }
+    )
+
+
+@mcp.tool()
+def export_entities(
+    format: str = export.NDJSON,
+    project_path: str = DEFAULT_PROJECT_FILE,
+    destination: str | None = None,
+    classes: list[str] | None = None,
+) -> Dict[str, Any]:
+    """
+    Exports project entities as NDJSON or JSON-LD to a file.
+
+    The export is streamed to disk one subject at a time and only its path
+    is returned, so projects of any size can be handed to other tools.
+
+    Args:
+        format: "ndjson" (one JSON-LD node object per line) or "jsonld"
+        project_path: Path to the project file (default: "project.ttl")
+        destination: Output file (default: .scimantic/exports/<project>.<format>)
+        classes: Schema class names (e.g. ["Evidence"]) to export
+            (default: all)
+
+    Returns:
+        {"status", "path", "entities", "message"}
+    """
+    if not Path(project_path).exists():
+        return {"status": "error", "message": f"Project not found: {project_path}"}
+    if destination is None:
+        name = Path(project_path).name.partition(".")[0] or "project"
+        destination = str(Path(DEFAULT_EXPORT_DIR) / f"{name}.{format}")
+    try:
+        wanted = [export.resolve_class(c) for c in classes] if classes else None
+        count = export.export_entities(project_path, destination, format, wanted)
+    except ValueError as e:
+        return {"status": "error", "message": str(e)}
+    path = str(Path(destination).resolve())
+    return {
+        "status": "success",
+        "path": path,
+        "entities": count,
+        "message": f"Exported {count} entities from {project_path} to {path}",
+    }
+
+
 def get_questions_list(g: Graph) -> list[Dict[str, Any]]:
     """Helper to query questions from the graph."""
     questions = []
@@ -122,30 +320,98 @@ def get_questions_list(g: Graph) -> list[Dict[str, Any]]:
 
 
 @mcp.tool()
-def mint_hypothesis(statement: str, evidence_uris: list[str] = []) -> str:
+def mint_hypothesis(
+    statement: str,
+    evidence_uris: list[str] = [],
+    nanopub_dir: str = DEFAULT_NANOPUB_DIR,
+) -> str:
     """
     Creates a new Hypothesis Nanopublication.
 
+    The nanopub is minted locally with its Trusty URI and queued in the
+    nanopub_dir outbox (see publish_nanopubs).
+
     Args:
         statement: The scientific hypothesis text.
         evidence_uris: List of URIs (e.g., from literature) supporting this hypothesis.
+        nanopub_dir: Directory for minted nanopubs (default: ".scimantic/nanopubs")
     """
-    # Logic to create a Nanopub would go here
-    # For now, we mock it and return a placeholder URI
-    hypothesis_uri = f"http://padamson.github.io/nanopubs/hypothesis/{statement[:10].replace(' ', '_')}"
-    return f"Minted Hypothesis: {hypothesis_uri}"
+    hypothesis = TEMP_NP.hypothesis
+
+    assertion = Graph()
+    assertion.add((hypothesis, RDF.type, SCIMANTIC.Hypothesis))
+    assertion.add((hypothesis, RDF.type, PROV.Entity))
+    assertion.add((hypothesis, RDFS.label, Literal(statement)))
+    for evidence_uri in evidence_uris:
+        assertion.add((hypothesis, PROV.wasDerivedFrom, URIRef(evidence_uri)))
+
+    minted = NanopubClient().mint(assertion)
+    Outbox(nanopub_dir).enqueue(minted)
+    return f"Minted Hypothesis: {minted.uri}"
 
 
 @mcp.tool()
-def mint_design(parameters: dict, methodology: str) -> str:
+def mint_design(
+    parameters: dict,
+    methodology: str,
+    nanopub_dir: str = DEFAULT_NANOPUB_DIR,
+) -> str:
     """
     Creates a Study Design Nanopublication.
 
     Args:
         parameters: Key-value pairs of experimental parameters (e.g. basis_set: 'cc-pVQZ')
         methodology: Description of the method (e.g. 'GAMESS MRCI')
+        nanopub_dir: Directory for minted nanopubs (default: ".scimantic/nanopubs")
     """
-    return "Minted Design: http://padamson.github.io/nanopubs/design/123"
+    design = TEMP_NP.design
+
+    assertion = Graph()
+    assertion.add((design, RDF.type, SCIMANTIC.ExperimentalMethod))
+    assertion.add((design, RDF.type, PROV.Entity))
+    assertion.add((design, SCIMANTIC.method, Literal(methodology)))
+    for name, value in sorted(parameters.items()):
+        parameter = TEMP_NP[f"parameter/{quote(name, safe='')}"]
+        assertion.add((design, SCIMANTIC.parameter, parameter))
+        assertion.add((parameter, RDF.type, SCIMANTIC.Parameter))
+        assertion.add((parameter, RDFS.label, Literal(name)))
+        assertion.add((parameter, SCIMANTIC.value, Literal(str(value))))
+
+    minted = NanopubClient().mint(assertion)
+    Outbox(nanopub_dir).enqueue(minted)
+    return f"Minted Design: {minted.uri}"
+
+
+# Background publishers, one per (outbox directory, server)
+_publishers: dict[tuple[str, str], OutboxPublisher] = {}
+
+
+@mcp.tool()
+def publish_nanopubs(
+    server_url: str = DEFAULT_NANOPUB_SERVER,
+    nanopub_dir: str = DEFAULT_NANOPUB_DIR,
+) -> str:
+    """
+    Publishes queued nanopublications to a nanopub server in the background.
+
+    Returns immediately; uploads are batched and retried with backoff until
+    they succeed. Calling it again reports progress.
+
+    Args:
+        server_url: Nanopub server to publish to (default: "https://np.petapico.org/")
+        nanopub_dir: Outbox directory of minted nanopubs (default: ".scimantic/nanopubs")
+    """
+    outbox = Outbox(nanopub_dir)
+    key = (str(outbox.directory.resolve()), server_url)
+    publisher = _publishers.get(key)
+    if publisher is None:
+        publisher = _publishers[key] = OutboxPublisher(outbox, server_url)
+    publisher.start()
+    return (
+        f"Publishing to {server_url} in the background: "
+        f"{len(outbox.pending())} queued, {len(outbox.published())} published, "
+        f"{len(outbox.failed())} failed"
+    )
 
 
 def get_tools() -> list[Dict[str, Any]]:
@@ -158,22 +424,24 @@ def get_tools() -> list[Dict[str, Any]]:
         {"name": "get_provenance_graph"},
         {"name": "mint_hypothesis"},
         {"name": "mint_design"},
+        {"name": "publish_nanopubs"},
+        {"name": "get_project_statistics"},
+        {"name": "query_results"},
+        {"name": "query_annotations"},
+        {"name": "export_entities"},
         {"name": "add_evidence"},
+        {"name": "import_evidence"},
         {"name": "add_question"},
     ]
 
 
 def _persist_graph(graph: Graph, project_path: str = DEFAULT_PROJECT_FILE):
-    """Helper to persist RDF graph to disk."""
-    project_file = Path(project_path)
-    if project_file.exists():
-        existing_g = Graph()
-        existing_g.parse(str(project_file), format="turtle")
-        existing_g += graph
-        graph = existing_g
-
-    project_file.parent.mkdir(parents=True, exist_ok=True)
-    graph.serialize(destination=str(project_file), format="turtle")
+    """
+    Adds an RDF graph to the project through storage.add_to_project, so every
+    project format is supported: Turtle, N-Triples, SQLite, partitions and
+    nanopub archives. Read-only triple indexes raise ValueError.
+    """
+    add_to_project(graph, project_path)
 
 
 @mcp.tool()
@@ -246,6 +514,37 @@ def add_evidence(
     }
 
 
+@mcp.tool()
+def import_evidence(
+    file_path: str,
+    agent: str,
+    project_path: str = DEFAULT_PROJECT_FILE,
+    relates_to_question: str | None = None,
+) -> Dict[str, Any]:
+    """
+    Import a reference library (BibTeX, RIS, CSV or NDJSON) as Evidence.
+
+    Records are deduplicated by DOI and citation, including against the
+    Evidence already in the project, and written in a single update.
+    """
+    report = bibliography.import_evidence(
+        file_path,
+        project_path,
+        agent=agent,
+        relates_to_question=relates_to_question,
+    )
+    return {
+        "status": "success",
+        "added": len(report.added),
+        "duplicates": report.duplicates,
+        "invalid": [{"record": n, "error": e} for n, e in report.invalid],
+        "message": (
+            f"Imported {len(report.added)} of {report.read} records from "
+            f"{file_path} into {project_path}"
+        ),
+    }
+
+
 @mcp.tool()
 def add_question(
     label: str,
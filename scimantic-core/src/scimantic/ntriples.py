@@ -0,0 +1,296 @@
+"""
+Sorted canonical N-Triples project format.
+
+A canonical N-Triples file holds one triple per line, written with rdflib's
+N-Triples term encoding, deduplicated and sorted by the line's UTF-8 bytes
+(blank nodes get canonical labels). A ``.gz`` suffix selects gzip
+compression. Because lines are sorted:
+
+- files can be loaded as a stream, line by line, with bounded buffering;
+- two files (or a file and a small delta) merge in one streaming pass;
+- all triples of a subject are contiguous, so an uncompressed file can be
+  binary-searched for a subject without reading it;
+- git diffs show exactly the triples that were added or removed.
+
+N-Triples written by other tools need not be sorted. Merging and searching
+check a file first (once per modification) and rewrite one that is out of
+order canonically.
+"""
+
+import gzip
+import heapq
+import os
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+from typing import IO
+
+from rdflib import BNode, Graph, Literal, URIRef
+from rdflib.compare import to_canonical_graph
+from rdflib.plugins.parsers.ntriples import W3CNTriplesParser
+from rdflib.plugins.serializers.nt import _nt_row, _quoteLiteral
+from rdflib.term import Node
+
+NT_SUFFIXES = (".nt", ".nt.gz")
+
+# Lines handed to the N-Triples parser at a time while streaming
+_CHUNK_LINES = 10_000
+
+Triple = tuple[Node, Node, Node]
+
+# Files known to be sorted: resolved path → (mtime_ns, size) when checked
+_sorted_stamps: dict[Path, tuple[int, int]] = {}
+
+
+def is_ntriples(path: str | Path) -> bool:
+    """Whether a path names an (optionally gzipped) N-Triples file."""
+    return str(path).endswith(NT_SUFFIXES)
+
+
+def _is_gzip(path: str | Path) -> bool:
+    return str(path).endswith(".gz")
+
+
+def _open(path: str | Path, mode: str) -> IO[bytes]:
+    if _is_gzip(path):
+        return gzip.open(path, mode)  # type: ignore[return-value]
+    return open(path, mode)  # type: ignore[return-value]
+
+
+def canonical_lines(graph: Graph) -> list[bytes]:
+    """
+    Returns the sorted, deduplicated N-Triples lines of a graph.
+
+    Blank nodes are relabelled canonically (rdflib.compare), so isomorphic
+    graphs produce identical lines.
+    """
+    triples: Iterable[Triple] = graph
+    if any(isinstance(t, BNode) for triple in graph for t in triple):
+        triples = to_canonical_graph(graph)
+    return sorted({_nt_row(triple).encode() for triple in triples})  # type: ignore[arg-type]
+
+
+def _write_lines(path: str | Path, lines: Iterable[bytes]) -> int:
+    """Writes lines atomically, dropping adjacent duplicates; returns the count."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.tmp")
+    count = 0
+    previous = None
+    # An empty name and mtime=0 keep gzip output byte-identical for identical
+    # content
+    with open(tmp, "wb") as raw:
+        out: IO[bytes] = (
+            gzip.GzipFile(filename="", fileobj=raw, mode="wb", mtime=0)  # type: ignore[assignment]
+            if _is_gzip(path)
+            else raw
+        )
+        try:
+            for line in lines:
+                if line != previous:
+                    out.write(line)
+                    count += 1
+                previous = line
+        finally:
+            if out is not raw:
+                out.close()
+    os.replace(tmp, path)
+    # Callers write sorted lines, so the result needs no check
+    _sorted_stamps[path.resolve()] = _stamp(path)
+    return count
+
+
+def _stamp(path: Path) -> tuple[int, int]:
+    stat = path.stat()
+    return stat.st_mtime_ns, stat.st_size
+
+
+def write_ntriples(graph: Graph, path: str | Path) -> int:
+    """
+    Writes a graph as sorted canonical N-Triples (gzip if path ends in .gz).
+
+    Returns:
+        Number of triples written
+    """
+    return _write_lines(path, canonical_lines(graph))
+
+
+def iter_lines(path: str | Path) -> Iterator[bytes]:
+    """Yields the lines of a canonical N-Triples file, streaming."""
+    with _open(path, "rb") as f:
+        for line in f:
+            if line.strip() and not line.startswith(b"#"):
+                yield line if line.endswith(b"\n") else line + b"\n"
+
+
+class _Collector:
+    def __init__(self):
+        self.triples: list[Triple] = []
+
+    def triple(self, s: Node, p: Node, o: Node) -> None:
+        self.triples.append((s, p, o))
+
+
+def _parse_lines(lines: Iterable[bytes]) -> Iterator[Triple]:
+    """Parses N-Triples lines in chunks, sharing one blank node context."""
+    sink = _Collector()
+    parser = W3CNTriplesParser(sink=sink, bnode_context={})  # type: ignore[arg-type]
+    chunk: list[bytes] = []
+
+    def flush() -> Iterator[Triple]:
+        parser.parsestring(b"".join(chunk))
+        chunk.clear()
+        yield from sink.triples
+        sink.triples.clear()
+
+    for line in lines:
+        chunk.append(line)
+        if len(chunk) >= _CHUNK_LINES:
+            yield from flush()
+    if chunk:
+        yield from flush()
+
+
+def encode_term(term: Node) -> bytes:
+    """Returns the N-Triples encoding of a single term."""
+    if isinstance(term, Literal):
+        return _quoteLiteral(term).encode()
+    return term.n3().encode()
+
+
+def decode_term(encoded: bytes) -> Node:
+    """Parses a term written by encode_term."""
+    if encoded.startswith(b"<"):
+        return URIRef(encoded[1:-1].decode())
+    if encoded.startswith(b"_:"):
+        return BNode(encoded[2:].decode())
+    ((_, _, term),) = _parse_lines([b"<urn:s> <urn:p> " + encoded + b" .\n"])
+    return term
+
+
+def iter_triples(path: str | Path) -> Iterator[Triple]:
+    """Streams the triples of an N-Triples file without loading it whole."""
+    return _parse_lines(iter_lines(path))
+
+
+def load_ntriples(path: str | Path, graph: Graph | None = None) -> Graph:
+    """Loads an N-Triples file into a graph (a new one by default)."""
+    graph = Graph() if graph is None else graph
+    graph.addN((s, p, o, graph) for s, p, o in iter_triples(path))
+    return graph
+
+
+def is_sorted(path: str | Path) -> bool:
+    """
+    Whether an N-Triples file is sorted and free of duplicate lines, as
+    written by write_ntriples. The answer is remembered until the file
+    changes.
+    """
+    path = Path(path).resolve()
+    stamp = _stamp(path)
+    if _sorted_stamps.get(path) == stamp:
+        return True
+    previous = b""
+    for line in iter_lines(path):
+        if line <= previous:
+            return False
+        previous = line
+    _sorted_stamps[path] = stamp
+    return True
+
+
+def ensure_sorted(path: str | Path) -> None:
+    """Rewrites an existing N-Triples file canonically if it is not sorted."""
+    if Path(path).exists() and not is_sorted(path):
+        write_ntriples(load_ntriples(path), path)
+
+
+def merge_ntriples(sources: Iterable[str | Path], destination: str | Path) -> int:
+    """
+    Merges N-Triples files into one in a single streaming pass.
+
+    The destination may be one of the sources. Sources that are not sorted
+    are rewritten canonically first.
+
+    Returns:
+        Number of distinct triples written
+    """
+    sources = list(sources)
+    for source in sources:
+        ensure_sorted(source)
+    return _write_lines(destination, heapq.merge(*map(iter_lines, sources)))
+
+
+def merge_graph(graph: Graph, path: str | Path) -> int:
+    """
+    Adds a graph's triples to a sorted N-Triples file (created if missing).
+
+    Only the new triples are sorted in memory; the existing file is streamed
+    through a sorted merge, so appending costs O(file) I/O and O(delta)
+    memory. Graphs with blank nodes are merged by reloading the file, since
+    canonical blank node labels are only meaningful within one graph. A file
+    that is not sorted is rewritten canonically first.
+
+    Returns:
+        Number of distinct triples in the file afterwards
+    """
+    path = Path(path)
+    if not path.exists():
+        return write_ntriples(graph, path)
+    if any(isinstance(t, BNode) for triple in graph for t in triple):
+        merged = load_ntriples(path)
+        merged += graph
+        return write_ntriples(merged, path)
+    ensure_sorted(path)
+    delta = canonical_lines(graph)
+    return _write_lines(path, heapq.merge(iter_lines(path), delta))
+
+
+def find_subject(path: str | Path, subject: Node) -> list[Triple]:
+    """
+    Returns the triples of one subject.
+
+    Uncompressed files are binary-searched (O(log n) seeks); gzip files are
+    scanned, stopping after the subject's block. A file that is not sorted is
+    rewritten canonically first.
+    """
+    ensure_sorted(path)
+    prefix = f"{subject.n3()} ".encode()
+    lines: Iterable[bytes]
+    if _is_gzip(path):
+        lines = _subject_block(iter_lines(path), prefix)
+    else:
+        lines = _bisect_subject(Path(path), prefix)
+    return list(_parse_lines(lines))
+
+
+def _subject_block(lines: Iterable[bytes], prefix: bytes) -> Iterator[bytes]:
+    for line in lines:
+        if line.startswith(prefix):
+            yield line
+        elif line > prefix:
+            return
+
+
+def _bisect_subject(path: Path, prefix: bytes) -> list[bytes]:
+    with open(path, "rb") as f:
+
+        def line_after(offset: int) -> bytes:
+            """The first complete line starting at or after offset."""
+            f.seek(offset)
+            if offset:
+                f.readline()
+            return f.readline()
+
+        lo, hi = 0, path.stat().st_size
+        while lo < hi:
+            mid = (lo + hi) // 2
+            line = line_after(mid)
+            if line and line < prefix:
+                lo = mid + 1
+            else:
+                hi = mid
+
+        f.seek(lo)
+        if lo:
+            f.readline()
+        return list(_subject_block(f, prefix))
@@ -0,0 +1,205 @@
+"""
+Partitioned project storage.
+
+A partitioned project is a directory (``.scimantic/graph/`` by default) that
+holds one sorted canonical N-Triples file per top-level class, plus a
+``manifest.json`` that lists each partition's file, triple count and classes.
+All triples of a subject are stored in one partition, chosen from the
+subject's rdf:type:
+
+- scimantic classes (Question, Evidence, Hypothesis, ...) take precedence;
+- then any other class, except PROV's generic ones;
+- then prov:Activity, prov:Agent or prov:Entity.
+
+Untyped subjects join the partition that already holds the subject or, for
+blank nodes, the partition of the subject that refers to them. Anything
+else goes to the ``misc`` partition.
+
+Readers load only the partitions of the classes they query. For example, the
+tree view reads Question and Evidence. Writers merge new triples into the
+affected partitions only.
+"""
+
+import json
+import os
+import re
+from collections.abc import Iterable
+from pathlib import Path
+from typing import Any
+
+from rdflib import BNode, Graph, URIRef
+from rdflib.namespace import PROV, RDF
+from rdflib.term import Node
+
+from scimantic.config import SCIMANTIC_ONTOLOGY_URI
+from scimantic.ntriples import find_subject, load_ntriples, merge_graph, write_ntriples
+
+PARTITION_FORMAT = 1
+MANIFEST = "manifest.json"
+MISC_PARTITION = "misc"
+
+_PROV_CLASSES = (PROV.Activity, PROV.Agent, PROV.Entity)
+_UNSAFE = re.compile(r"[^A-Za-z0-9_\-]")
+
+
+def is_partitioned(path: str | Path) -> bool:
+    """
+    Whether a project path names a partition directory: one with a manifest,
+    or an existing directory without a suffix. A path that does not exist yet
+    is not one; partitioned projects are created explicitly (see
+    storage.save_project).
+    """
+    path = Path(path)
+    return (path / MANIFEST).is_file() or (path.is_dir() and path.suffix == "")
+
+
+def _local_name(iri: str) -> str:
+    name = re.split(r"[#/]", iri.rstrip("#/"))[-1]
+    return _UNSAFE.sub("_", name) or MISC_PARTITION
+
+
+def partition_key(types: Iterable[Node]) -> str:
+    """Returns the partition of a subject with the given rdf:types."""
+    iris = sorted(str(t) for t in types if isinstance(t, URIRef))
+    own = [t for t in iris if t.startswith(SCIMANTIC_ONTOLOGY_URI)]
+    other = [t for t in iris if t not in own and URIRef(t) not in _PROV_CLASSES]
+    generic = [str(t) for t in _PROV_CLASSES if str(t) in iris]
+    for group in (own, other, generic):
+        if group:
+            return _local_name(group[0])
+    return MISC_PARTITION
+
+
+class PartitionedProject:
+    """
+    A project graph split into per-class N-Triples partitions.
+
+    Args:
+        directory: The partition directory (created on first write)
+    """
+
+    def __init__(self, directory: str | Path):
+        self.directory = Path(directory)
+        self.manifest = self._read_manifest()
+
+    def _read_manifest(self) -> dict[str, Any]:
+        path = self.directory / MANIFEST
+        if not path.exists():
+            return {"format": PARTITION_FORMAT, "partitions": {}}
+        manifest: dict[str, Any] = json.loads(path.read_text())
+        if manifest.get("format") != PARTITION_FORMAT:
+            raise ValueError(
+                f"Unsupported partition format {manifest.get('format')!r} in {path}"
+            )
+        return manifest
+
+    def _write_manifest(self) -> None:
+        path = self.directory / MANIFEST
+        tmp = path.with_name(f".{MANIFEST}.tmp")
+        tmp.write_text(json.dumps(self.manifest, indent=2, sort_keys=True) + "\n")
+        os.replace(tmp, path)
+
+    @property
+    def partitions(self) -> dict[str, dict[str, Any]]:
+        partitions: dict[str, dict[str, Any]] = self.manifest["partitions"]
+        return partitions
+
+    def _file(self, key: str) -> Path:
+        return self.directory / f"{key}.nt"
+
+    def partitions_for(self, classes: Iterable[Node] | None) -> list[str]:
+        """Partitions holding instances of any of the classes (all if None)."""
+        if classes is None:
+            return sorted(self.partitions)
+        wanted = {str(c) for c in classes}
+        return sorted(
+            key
+            for key, entry in self.partitions.items()
+            if wanted & set(entry["classes"])
+        )
+
+    def files(self, classes: Iterable[Node] | None = None) -> list[Path]:
+        """N-Triples files of the partitions holding instances of the classes."""
+        return [self._file(key) for key in self.partitions_for(classes)]
+
+    def load(self, classes: Iterable[Node] | None = None) -> Graph:
+        """
+        Loads the partitions holding instances of the given classes.
+
+        Args:
+            classes: Classes to load (default: the whole project)
+        """
+        graph = Graph()
+        for key in self.partitions_for(classes):
+            load_ntriples(self._file(key), graph)
+        return graph
+
+    def _split(self, graph: Graph, lookup_existing: bool) -> dict[str, Graph]:
+        """Assigns every triple of a graph to a partition by its subject."""
+        types: dict[Node, set[Node]] = {}
+        for s, o in graph.subject_objects(RDF.type):
+            types.setdefault(s, set()).add(o)
+
+        assigned: dict[Node, str] = {}
+        for subject in set(graph.subjects()):
+            if subject in types:
+                assigned[subject] = partition_key(types[subject])
+            elif lookup_existing and not isinstance(subject, BNode):
+                for key in sorted(self.partitions):
+                    if find_subject(self._file(key), subject):
+                        assigned[subject] = key
+                        break
+
+        # Blank nodes follow the subject that refers to them
+        pending = {s for s in graph.subjects() if s not in assigned}
+        while pending:
+            progress = False
+            for node in list(pending):
+                for referrer in graph.subjects(None, node):
+                    if referrer in assigned:
+                        assigned[node] = assigned[referrer]
+                        pending.discard(node)
+                        progress = True
+                        break
+            if not progress:
+                break
+
+        parts: dict[str, Graph] = {}
+        for triple in graph:
+            key = assigned.get(triple[0], MISC_PARTITION)
+            parts.setdefault(key, Graph()).add(triple)
+        return parts
+
+    def _record(self, key: str, part: Graph, count: int) -> None:
+        entry = self.partitions.setdefault(key, {"file": f"{key}.nt", "classes": []})
+        classes = set(entry["classes"])
+        classes.update(str(o) for o in part.objects(None, RDF.type))
+        entry["classes"] = sorted(classes)
+        entry["triples"] = count
+
+    def add(self, graph: Graph) -> list[str]:
+        """
+        Merges triples into the partitions they belong to.
+
+        Only the affected partition files are rewritten.
+
+        Returns:
+            Keys of the partitions that changed
+        """
+        self.directory.mkdir(parents=True, exist_ok=True)
+        parts = self._split(graph, lookup_existing=True)
+        for key, part in parts.items():
+            self._record(key, part, merge_graph(part, self._file(key)))
+        self._write_manifest()
+        return sorted(parts)
+
+    def save(self, graph: Graph) -> None:
+        """Replaces the whole project with a graph."""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        parts = self._split(graph, lookup_existing=False)
+        for key in set(self.partitions) - set(parts):
+            self._file(key).unlink(missing_ok=True)
+        self.manifest = {"format": PARTITION_FORMAT, "partitions": {}}
+        for key, part in parts.items():
+            self._record(key, part, write_ntriples(part, self._file(key)))
+        self._write_manifest()
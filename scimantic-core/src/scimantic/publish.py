@@ -1,26 +1,441 @@
+import base64
+import json
+import logging
+import os
+import random
+import re
+import threading
+import time
+import urllib.error
+import urllib.request
+from collections.abc import Callable, Iterable
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from functools import lru_cache
+from pathlib import Path
+from typing import Any
+
 import nanopub
-from typing import Union
-from rdflib import Graph, Literal, URIRef
+from rdflib import BNode, Dataset, Graph, Literal, Namespace, URIRef
+from rdflib.namespace import DCTERMS, PROV, RDF, XSD
+from rdflib.term import Node
+
+from scimantic.config import DEFAULT_NANOPUB_DIR, DEFAULT_NANOPUB_SERVER
+from scimantic.trusty import artifact_code, normalize_quads, trusty_uri
+
+logger = logging.getLogger(__name__)
+
+NP = Namespace("http://www.nanopub.org/nschema#")
+NPX = Namespace("http://purl.org/nanopub/x/")
+
+# Temporary namespace of a nanopub before its Trusty URI is known
+TEMP_NP_NAMESPACE = "http://purl.org/nanopub/temp/np#"
+TEMP_NP = Namespace(TEMP_NP_NAMESPACE)
+
+NANOPUB_SUFFIX = ".trig"
+
+_THIS = TEMP_NP[""]
+_HEAD = TEMP_NP["Head"]
+_ASSERTION = TEMP_NP["assertion"]
+_PROVENANCE = TEMP_NP["provenance"]
+_PUBINFO = TEMP_NP["pubinfo"]
+_SIG = TEMP_NP["sig"]
+
+Quad = tuple[URIRef, Node, Node, Node]
+Triple = tuple[Node, Node, Node]
+
+# Local names that can be written as sub:<name> in TriG
+_LOCAL_NAME = re.compile(r"^[A-Za-z_][A-Za-z0-9_\-]*$")
+
+
+@dataclass(frozen=True)
+class MintedNanopub:
+    """
+    A nanopublication with its Trusty URI, held as (graph, s, p, o) quads.
+
+    Minting is local and offline; the nanopub can be serialized and published
+    later.
+    """
+
+    uri: str
+    artifact_code: str
+    quads: tuple[Quad, ...]
+
+    @property
+    def assertion_uri(self) -> URIRef:
+        return URIRef(f"{self.uri}#assertion")
+
+    def to_dataset(self) -> Dataset:
+        """Returns the nanopub as an rdflib Dataset with one graph per part."""
+        ds = Dataset()
+        ds.bind("this", Namespace(self.uri))
+        ds.bind("sub", Namespace(f"{self.uri}#"))
+        ds.bind("np", NP)
+        ds.bind("prov", PROV)
+        ds.bind("dcterms", DCTERMS)
+        for graph, s, p, o in self.quads:
+            ds.graph(graph).add((s, p, o))
+        return ds
+
+    def serialize(self, format: str = "trig") -> str:
+        """
+        Serializes the nanopub.
+
+        Args:
+            format: "trig" or "nquads" (N-Quads is written without rdflib)
+
+        Returns:
+            The serialized nanopub
+        """
+        if format == "nquads":
+            return "".join(
+                f"{s.n3()} {p.n3()} {o.n3()} {graph.n3()} .\n"
+                for graph, s, p, o in self.quads
+            )
+        if format == "trig":
+            return self._trig()
+        return self.to_dataset().serialize(format=format)
+
+    def _trig(self) -> str:
+        """
+        Writes TriG with every literal in its original lexical form.
+
+        rdflib's TriG writer abbreviates numbers (28.0134 → 2.80134e+01), which
+        changes the bytes the Trusty URI and signature were computed over.
+        """
+        sub = f"{self.uri}#"
+
+        def term(node: Node) -> str:
+            value = str(node)
+            if isinstance(node, URIRef) and value.startswith(sub):
+                local = value[len(sub) :]
+                if _LOCAL_NAME.match(local):
+                    return f"sub:{local}"
+            if isinstance(node, URIRef) and value == self.uri:
+                return "this:"
+            return node.n3()
+
+        graphs: dict[URIRef, list[str]] = {}
+        for graph, s, p, o in self.quads:
+            graphs.setdefault(graph, []).append(f"    {term(s)} {term(p)} {term(o)} .")
+        lines = [f"@prefix this: <{self.uri}> .", f"@prefix sub: <{sub}> .", ""]
+        for graph_uri, triples in graphs.items():
+            lines += [f"{term(graph_uri)} {{", *triples, "}", ""]
+        return "\n".join(lines)
+
+    def write(self, directory: str | Path) -> Path:
+        """Writes the nanopub as <artifact code>.trig into directory."""
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        path = directory / f"{self.artifact_code}{NANOPUB_SUFFIX}"
+        _write_atomic(path, self.serialize("trig"))
+        return path
+
+
+def _write_atomic(path: Path, text: str) -> None:
+    """Writes via a temporary file so readers never see a partial file."""
+    tmp = path.with_name(f".{path.name}.tmp")
+    tmp.write_text(text)
+    os.replace(tmp, path)
+
+
+def _skolemizer():
+    """Maps blank nodes to sub:_1, sub:_2, ... in order of first appearance."""
+    bnodes: dict[BNode, URIRef] = {}
+
+    def skolemize(term: Node) -> Node:
+        if isinstance(term, BNode):
+            if term not in bnodes:
+                bnodes[term] = TEMP_NP[f"_{len(bnodes) + 1}"]
+            return bnodes[term]
+        return term
+
+    return skolemize
+
+
+def _finalizer(code: str):
+    """Maps temporary nanopub URIs to their Trusty equivalents."""
+    np_uri = TEMP_NP_NAMESPACE[:-1]
+    final = trusty_uri(code, TEMP_NP_NAMESPACE)
+
+    def finalize(term: Node) -> Node:
+        if not isinstance(term, URIRef):
+            return term
+        value = str(term)
+        if value == np_uri or value == TEMP_NP_NAMESPACE:
+            return URIRef(final)
+        if value.startswith(TEMP_NP_NAMESPACE):
+            return URIRef(f"{final}#{value[len(TEMP_NP_NAMESPACE) :]}")
+        return term
+
+    return finalize
+
+
+@dataclass(frozen=True)
+class SigningKey:
+    """
+    RSA key material of a nanopub profile (base64 DER, as in profile.yml keys).
+    """
+
+    private_key: str
+    public_key: str
+    orcid_id: str | None = None
+
+    @classmethod
+    def from_profile(cls, profile) -> "SigningKey":
+        orcid = getattr(profile, "orcid_id", None)
+        return cls(
+            private_key=profile.private_key,
+            public_key=profile.public_key,
+            orcid_id=str(orcid) if orcid else None,
+        )
+
+    def sign(self, data: bytes) -> str:
+        """Returns the base64 RSA PKCS#1 v1.5 / SHA-256 signature of data."""
+        return base64.b64encode(_rsa_signer(self.private_key)(data)).decode()
+
+
+@lru_cache(maxsize=8)
+def _rsa_signer(private_key: str) -> Callable[[bytes], bytes]:
+    """
+    Imports a private key once per process and returns a signing function.
+    Uses the (much faster) cryptography package when installed; PKCS#1 v1.5
+    signatures are deterministic, so both backends produce identical bytes.
+    """
+    der = base64.b64decode(private_key)
+    try:
+        from cryptography.hazmat.primitives import hashes, serialization
+        from cryptography.hazmat.primitives.asymmetric import padding, rsa
+    except ImportError:
+        from Crypto.Hash import SHA256
+        from Crypto.PublicKey import RSA
+        from Crypto.Signature import PKCS1_v1_5
+
+        signer = PKCS1_v1_5.new(RSA.import_key(der))
+        return lambda data: signer.sign(SHA256.new(data))
+
+    key = serialization.load_der_private_key(der, password=None)
+    if not isinstance(key, rsa.RSAPrivateKey):
+        raise TypeError("Nanopub signing keys must be RSA keys")
+    return lambda data: key.sign(data, padding.PKCS1v15(), hashes.SHA256())
+
+
+@lru_cache(maxsize=8)
+def load_signing_key(profile_path: str | None = None) -> SigningKey:
+    """
+    Loads the signing key of a nanopub profile once per process.
+
+    Args:
+        profile_path: Path to profile.yml (default: ~/.nanopub/profile.yml)
+    """
+    if profile_path is None:
+        profile = nanopub.profile.load_profile()
+    else:
+        profile = nanopub.profile.load_profile(profile_path)
+    return SigningKey.from_profile(profile)
+
+
+def _sign(quads: list[Quad], key: SigningKey) -> None:
+    """Adds the npx signature triples to pubinfo, as nanopub's add_signature."""
+    signature = _SIG
+    quads.append((_PUBINFO, signature, NPX.hasPublicKey, Literal(key.public_key)))
+    quads.append((_PUBINFO, signature, NPX.hasAlgorithm, Literal("RSA")))
+    quads.append((_PUBINFO, signature, NPX.hasSignatureTarget, _THIS))
+    normalized = normalize_quads(quads, TEMP_NP_NAMESPACE)
+    value = Literal(key.sign(normalized.encode()))
+    quads.append((_PUBINFO, signature, NPX.hasSignature, value))
+
+
+def assemble_nanopub(
+    assertion: Iterable[Triple],
+    provenance: Iterable[Triple] | None = None,
+    pubinfo: Iterable[Triple] | None = None,
+    created: datetime | None = None,
+    creator: str | None = None,
+    signing_key: SigningKey | None = None,
+) -> MintedNanopub:
+    """
+    Assembles head/assertion/provenance/pubinfo graphs and computes the
+    Trusty URI (RA artifact code) locally.
+
+    Terms in the temporary namespace (``TEMP_NP``, e.g. ``TEMP_NP.hypothesis``)
+    end up inside the minted nanopub (``http://purl.org/np/RA...#hypothesis``).
+    Blank nodes are replaced by ``sub:_1``, ``sub:_2``, ... as nanopub servers
+    reject them.
+
+    Args:
+        assertion: The assertion triples (a Graph or any iterable of triples)
+        provenance: Provenance triples (default: assertion prov:generatedAtTime,
+            plus prov:wasAttributedTo creator)
+        pubinfo: Publication info triples; dcterms:created and dcterms:creator
+            of the nanopub are added
+        created: Creation time (default: now, UTC)
+        creator: Agent URI (e.g. an ORCID) credited with the nanopub
+        signing_key: Key to sign the nanopub with before hashing (unsigned
+            if None)
+
+    Returns:
+        The minted nanopub
+    """
+    parts = [
+        (_ASSERTION, list(assertion)),
+        (_PROVENANCE, list(provenance) if provenance is not None else []),
+        (_PUBINFO, list(pubinfo) if pubinfo is not None else []),
+    ]
+    if not parts[0][1]:
+        raise ValueError("A nanopublication needs at least one assertion triple")
+
+    created_literal = Literal(
+        (created or datetime.now(timezone.utc)).isoformat(), datatype=XSD.dateTime
+    )
+    creator_uri = URIRef(creator) if creator else None
+
+    quads: list[Quad] = [
+        (_HEAD, _THIS, RDF.type, NP.Nanopublication),
+        (_HEAD, _THIS, NP.hasAssertion, _ASSERTION),
+        (_HEAD, _THIS, NP.hasProvenance, _PROVENANCE),
+        (_HEAD, _THIS, NP.hasPublicationInfo, _PUBINFO),
+    ]
+
+    skolemize = _skolemizer()
+    for graph_uri, triples in parts:
+        for s, p, o in triples:
+            quads.append((graph_uri, skolemize(s), p, skolemize(o)))
+
+    if not parts[1][1]:
+        quads.append((_PROVENANCE, _ASSERTION, PROV.generatedAtTime, created_literal))
+        if creator_uri is not None:
+            quads.append((_PROVENANCE, _ASSERTION, PROV.wasAttributedTo, creator_uri))
+    if not any(s == _THIS and p == DCTERMS.created for s, p, _ in parts[2][1]):
+        quads.append((_PUBINFO, _THIS, DCTERMS.created, created_literal))
+    if creator_uri is not None:
+        quads.append((_PUBINFO, _THIS, DCTERMS.creator, creator_uri))
+
+    if signing_key is not None:
+        _sign(quads, signing_key)
+
+    code = artifact_code(quads, TEMP_NP_NAMESPACE)
+    finalize = _finalizer(code)
+    final_quads = tuple(
+        (finalize(g), finalize(s), finalize(p), finalize(o)) for g, s, p, o in quads
+    )
+    return MintedNanopub(
+        uri=trusty_uri(code, TEMP_NP_NAMESPACE),
+        artifact_code=code,
+        quads=final_quads,  # type: ignore[arg-type]
+    )
+
+
+# Per-worker minting options, set once by the pool initializer
+_batch_options: dict[str, Any] = {}
+
+
+def _init_batch_worker(options: dict[str, Any]) -> None:
+    _batch_options.clear()
+    _batch_options.update(options)
+    key = options.get("signing_key")
+    if key is not None:
+        _rsa_signer(key.private_key)  # import the key once per worker
+
+
+def _mint_batch_item(triples: list[Triple]) -> MintedNanopub:
+    return assemble_nanopub(triples, **_batch_options)
+
+
+def mint_batch(
+    assertions: Iterable[Iterable[Triple]],
+    signing_key: SigningKey | None = None,
+    created: datetime | None = None,
+    creator: str | None = None,
+    jobs: int | None = None,
+    chunksize: int = 64,
+) -> list[MintedNanopub]:
+    """
+    Mints (and optionally signs) many single-assertion nanopubs.
+
+    The key is imported once per worker process; assertions are distributed
+    across a process pool in chunks. All nanopubs in the batch share one
+    creation time.
+
+    Args:
+        assertions: One assertion graph (or list of triples) per nanopub
+        signing_key: Key to sign with (see load_signing_key); unsigned if None
+        created: Creation time shared by the batch (default: now, UTC)
+        creator: Agent URI credited with the nanopubs (default: the key's ORCID)
+        jobs: Worker processes (default: CPU count; 1 mints in-process)
+        chunksize: Assertions sent to a worker at a time
+
+    Returns:
+        Minted nanopubs in input order; serialize them with
+        ``serialize("trig")`` or ``serialize("nquads")``
+    """
+    items = [list(assertion) for assertion in assertions]
+    options: dict[str, Any] = {
+        "created": created or datetime.now(timezone.utc),
+        "creator": creator or (signing_key.orcid_id if signing_key else None),
+        "signing_key": signing_key,
+    }
+
+    jobs = jobs or os.cpu_count() or 1
+    if jobs == 1 or len(items) <= chunksize:
+        return [assemble_nanopub(triples, **options) for triples in items]
+
+    with ProcessPoolExecutor(
+        max_workers=jobs, initializer=_init_batch_worker, initargs=(options,)
+    ) as executor:
+        return list(executor.map(_mint_batch_item, items, chunksize=chunksize))
 
 
 class NanopubClient:
     def __init__(self, profile_name=None):
-        self.profile = (
-            nanopub.profile.load_profile(profile_name) if profile_name else None
+        # Key material is cached per profile, so clients are cheap to create
+        self.signing_key = load_signing_key(profile_name) if profile_name else None
+
+    @property
+    def creator(self) -> str | None:
+        """The ORCID of the loaded profile, if any."""
+        return self.signing_key.orcid_id if self.signing_key else None
+
+    def mint(
+        self,
+        assertion: Iterable[Triple],
+        provenance: Iterable[Triple] | None = None,
+        pubinfo: Iterable[Triple] | None = None,
+    ) -> MintedNanopub:
+        """
+        Mints a nanopublication locally (see assemble_nanopub), signed when a
+        profile was given.
+        """
+        return assemble_nanopub(
+            assertion,
+            provenance,
+            pubinfo,
+            creator=self.creator,
+            signing_key=self.signing_key,
         )
 
+    def mint_batch(
+        self, assertions: Iterable[Iterable[Triple]], jobs: int | None = None
+    ) -> list[MintedNanopub]:
+        """Mints many nanopubs with this client's key (see mint_batch)."""
+        return mint_batch(assertions, signing_key=self.signing_key, jobs=jobs)
+
     def mint_assertion(
-        self, subject: str, predicate: str, object_value: Union[str, float, int]
+        self, subject: str, predicate: str, object_value: str | float | int
     ) -> str:
         """
         Mints a single triple assertion as a Nanopublication.
+
+        Returns:
+            The Trusty URI of the minted nanopub (http://purl.org/np/RA...)
         """
         assertion = Graph()
 
         # Convert simplistic primitives to Literals/URIs
         s = URIRef(subject)
         p = URIRef(predicate)
-        o: Union[Literal, URIRef]
+        o: Literal | URIRef
         if isinstance(object_value, (str, float, int)):
             o = Literal(object_value)
         else:
@@ -28,10 +443,274 @@ class NanopubClient:
 
         assertion.add((s, p, o))
 
-        # Create Nanopub - profile parameter not supported in current nanopub library
-        # TODO: Implement actual nanopub creation and publishing
-        # _np = Nanopub(assertion=assertion)
-        # _np.publish()  <-- This would actually publish to the network
+        return self.mint(assertion).uri
+
+
+# ----------------------------------------------------------------------
+# Outbox
+# ----------------------------------------------------------------------
+RETRY_SUFFIX = ".retry"
+PUBLISHED_DIR = "published"
+FAILED_DIR = "failed"
+
+# HTTP statuses worth retrying; other 4xx responses are permanent failures
+_RETRY_STATUSES = {408, 425, 429}
+
+
+class PermanentPublishError(Exception):
+    """The server rejected a nanopub; resubmitting it will not help."""
+
+
+class Outbox:
+    """
+    Durable on-disk queue of minted nanopubs awaiting publication.
+
+    Queued nanopubs are ``<artifact code>.trig`` files in ``directory``, the
+    layout MintedNanopub.write already uses, so minted nanopubs are queued as
+    soon as they are written. Retry state is kept next to each file as
+    ``<artifact code>.trig.retry`` (JSON). Published nanopubs move to
+    ``published/`` and rejected ones to ``failed/``. Everything is keyed by
+    the Trusty artifact code, so queueing or uploading a nanopub twice is
+    harmless.
+    """
+
+    def __init__(self, directory: str | Path = DEFAULT_NANOPUB_DIR):
+        self.directory = Path(directory)
+        self.published_dir = self.directory / PUBLISHED_DIR
+        self.failed_dir = self.directory / FAILED_DIR
+
+    def _path(self, code: str, directory: Path | None = None) -> Path:
+        return (directory or self.directory) / f"{code}{NANOPUB_SUFFIX}"
+
+    def _state_path(self, code: str, directory: Path | None = None) -> Path:
+        return (directory or self.directory) / f"{code}{NANOPUB_SUFFIX}{RETRY_SUFFIX}"
+
+    def enqueue(self, minted: MintedNanopub) -> Path:
+        """
+        Queues a nanopub for publishing (no-op if queued or published).
+
+        Returns:
+            Path of the queued, or already published, TriG file
+        """
+        published = self._path(minted.artifact_code, self.published_dir)
+        if published.exists():
+            return published
+        path = self._path(minted.artifact_code)
+        if path.exists():
+            return path
+        return minted.write(self.directory)
+
+    def _codes(self, directory: Path) -> list[str]:
+        if not directory.is_dir():
+            return []
+        paths = sorted(
+            directory.glob(f"*{NANOPUB_SUFFIX}"),
+            key=lambda p: (p.stat().st_mtime, p.name),
+        )
+        return [p.name[: -len(NANOPUB_SUFFIX)] for p in paths]
+
+    def pending(self) -> list[str]:
+        """Artifact codes of all queued nanopubs, oldest first."""
+        return self._codes(self.directory)
+
+    def published(self) -> list[str]:
+        return self._codes(self.published_dir)
+
+    def failed(self) -> list[str]:
+        return self._codes(self.failed_dir)
+
+    def due(self, now: float | None = None) -> list[str]:
+        """Queued artifact codes whose retry delay (if any) has elapsed."""
+        now = time.time() if now is None else now
+        return [
+            code
+            for code in self.pending()
+            if self.retry_state(code).get("next_attempt", 0.0) <= now
+        ]
+
+    def read(self, code: str) -> bytes:
+        return self._path(code).read_bytes()
+
+    def retry_state(self, code: str) -> dict[str, Any]:
+        """Returns {"attempts", "next_attempt", "last_error"} ({} if none)."""
+        try:
+            state: dict[str, Any] = json.loads(self._state_path(code).read_text())
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+        return state
+
+    def record_failure(self, code: str, error: str, next_attempt: float) -> int:
+        """Stores a failed attempt; returns the number of attempts so far."""
+        attempts = int(self.retry_state(code).get("attempts", 0)) + 1
+        state = {
+            "attempts": attempts,
+            "next_attempt": next_attempt,
+            "last_error": error,
+        }
+        _write_atomic(self._state_path(code), json.dumps(state))
+        return attempts
+
+    def mark_published(self, code: str) -> None:
+        self._move(code, self.published_dir)
+
+    def mark_failed(self, code: str) -> None:
+        self._move(code, self.failed_dir)
+
+    def _move(self, code: str, target: Path) -> None:
+        target.mkdir(parents=True, exist_ok=True)
+        os.replace(self._path(code), self._path(code, target))
+        if self._state_path(code).exists():
+            os.replace(self._state_path(code), self._state_path(code, target))
+
+
+@dataclass
+class PublishReport:
+    """Outcome of one publishing pass, as lists of artifact codes."""
+
+    published: list[str] = field(default_factory=list)
+    retrying: list[str] = field(default_factory=list)
+    failed: list[str] = field(default_factory=list)
+
+
+class OutboxPublisher:
+    """
+    Uploads queued nanopubs to a nanopub server.
+
+    A pass takes the due nanopubs in batches of ``batch_size`` and uploads each
+    batch with at most ``max_concurrency`` requests in flight. Transient
+    failures (network errors, 5xx, 408/425/429) are retried with exponential
+    backoff; a 409 response means the server already has the nanopub and
+    counts as published. ``start()`` runs passes on a daemon thread so callers
+    such as MCP tools never wait on the network.
+    """
+
+    def __init__(
+        self,
+        outbox: Outbox,
+        server_url: str = DEFAULT_NANOPUB_SERVER,
+        batch_size: int = 50,
+        max_concurrency: int = 4,
+        max_attempts: int = 8,
+        backoff_base: float = 1.0,
+        backoff_max: float = 300.0,
+        jitter: float = 0.1,
+        timeout: float = 30.0,
+        interval: float = 5.0,
+    ):
+        self.outbox = outbox
+        self.server_url = server_url
+        self.batch_size = batch_size
+        self.max_concurrency = max_concurrency
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.jitter = jitter
+        self.timeout = timeout
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def backoff(self, attempts: int) -> float:
+        """Delay in seconds before retrying after `attempts` failures."""
+        delay = min(self.backoff_max, self.backoff_base * 2.0 ** (attempts - 1))
+        return delay * (1 + random.uniform(0, self.jitter))
+
+    def upload(self, data: bytes) -> None:
+        """
+        POSTs one TriG nanopub to the server.
+
+        Raises:
+            PermanentPublishError: If the server rejects the nanopub
+            OSError: On transient (retryable) failures
+        """
+        request = urllib.request.Request(
+            self.server_url,
+            data=data,
+            headers={"Content-Type": "application/trig"},
+            method="POST",
+        )
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                response.read()
+        except urllib.error.HTTPError as e:
+            if e.code == 409:
+                return  # the server already has it
+            if 400 <= e.code < 500 and e.code not in _RETRY_STATUSES:
+                raise PermanentPublishError(f"HTTP {e.code}: {e.reason}") from e
+            raise
+
+    def _publish_one(self, code: str) -> Exception | None:
+        try:
+            self.upload(self.outbox.read(code))
+        except (OSError, PermanentPublishError) as e:
+            return e
+        return None
+
+    def publish_pending(self, now: float | None = None) -> PublishReport:
+        """
+        Runs one publishing pass over the nanopubs that are due.
+
+        Args:
+            now: Current time in seconds since the epoch (default: time.time())
+
+        Returns:
+            Which nanopubs were published, scheduled for retry, or failed
+        """
+        now = time.time() if now is None else now
+        report = PublishReport()
+        with self._lock:
+            due = self.outbox.due(now)
+            with ThreadPoolExecutor(max_workers=self.max_concurrency) as executor:
+                for start in range(0, len(due), self.batch_size):
+                    batch = due[start : start + self.batch_size]
+                    errors = executor.map(self._publish_one, batch)
+                    for code, error in zip(batch, errors, strict=True):
+                        self._record(code, error, report, now)
+        return report
+
+    def _record(
+        self, code: str, error: Exception | None, report: PublishReport, now: float
+    ):
+        if error is None:
+            self.outbox.mark_published(code)
+            report.published.append(code)
+            return
+        attempts = self.outbox.retry_state(code).get("attempts", 0) + 1
+        if isinstance(error, PermanentPublishError) or attempts >= self.max_attempts:
+            self.outbox.record_failure(code, str(error), float("inf"))
+            self.outbox.mark_failed(code)
+            report.failed.append(code)
+            return
+        next_attempt = now + self.backoff(attempts)
+        self.outbox.record_failure(code, str(error), next_attempt)
+        report.retrying.append(code)
+
+    def start(self) -> None:
+        """Publishes in the background, one pass every `interval` seconds."""
+        if self.running:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="nanopub-outbox", daemon=True
+        )
+        self._thread.start()
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self.publish_pending()
+            except Exception:  # a failed pass must not end the thread
+                logger.exception("Nanopub outbox pass failed; retrying")
+            self._stop.wait(self.interval)
+
+    def stop(self, timeout: float | None = None) -> None:
+        """Stops the background thread after its current pass."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
 
-        # For now we return a placeholder URI
-        return "http://purl.org/np/placeholder"
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
@@ -0,0 +1,508 @@
+"""
+Typed table of a project's Results.
+
+Result values and units are free strings (``"28.0134 ± 0.0004"``, ``"kcal
+mol-1"``). The ResultTable parses them once into NumPy columns: float value
+and uncertainty (the standard uncertainty of a ``±`` value, the half-width of
+an interval; see scimantic.uncertainty.parse_value), normalized unit and
+label, plus a link table of the Datasets each Result was derived from and
+the Hypotheses it supports or contradicts. Range queries, unit conversion
+and aggregates then run on arrays instead of a graph scan.
+
+The table is cached as ``<project>.results.npz`` in DEFAULT_RESULT_CACHE_DIR
+beside the project, stamped with the project's modification stamp.
+add_to_project merges the Results of each delta into a current cache, so the
+table is maintained incrementally; a stale or missing cache is rebuilt from
+the project on first use.
+"""
+
+import os
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+from rdflib import Graph, Namespace
+from rdflib.namespace import PROV, RDF, RDFS
+from rdflib.term import Node
+
+from scimantic.config import DEFAULT_RESULT_CACHE_DIR, SCIMANTIC_ONTOLOGY_URI
+from scimantic.storage import load_project, project_stamp
+from scimantic.uncertainty import parse_value
+
+SCIMANTIC = Namespace(SCIMANTIC_ONTOLOGY_URI)
+
+TABLE_FORMAT = 2
+TABLE_SUFFIX = ".results.npz"
+
+DATASET = "dataset"
+SUPPORTS = "supports"
+CONTRADICTS = "contradicts"
+_LINKS = {
+    PROV.wasDerivedFrom: DATASET,
+    SCIMANTIC.supports: SUPPORTS,
+    SCIMANTIC.contradicts: CONTRADICTS,
+}
+
+_AVOGADRO = 6.02214076e23
+_HARTREE = 4.3597447222071e-18
+_ELECTRONVOLT = 1.602176634e-19
+_CALORIE = 4.184
+
+# unit → (dimension, factor, offset): value in SI = value * factor + offset.
+# Molar energies are expressed per particle so they convert to eV/hartree.
+UNITS: dict[str, tuple[str, float, float]] = {
+    "": ("dimensionless", 1.0, 0.0),
+    "%": ("dimensionless", 0.01, 0.0),
+    "m": ("length", 1.0, 0.0),
+    "km": ("length", 1e3, 0.0),
+    "cm": ("length", 1e-2, 0.0),
+    "mm": ("length", 1e-3, 0.0),
+    "um": ("length", 1e-6, 0.0),
+    "nm": ("length", 1e-9, 0.0),
+    "pm": ("length", 1e-12, 0.0),
+    "angstrom": ("length", 1e-10, 0.0),
+    "bohr": ("length", 5.29177210903e-11, 0.0),
+    "kg": ("mass", 1.0, 0.0),
+    "g": ("mass", 1e-3, 0.0),
+    "mg": ("mass", 1e-6, 0.0),
+    "ug": ("mass", 1e-9, 0.0),
+    "Da": ("mass", 1.66053906660e-27, 0.0),
+    "s": ("time", 1.0, 0.0),
+    "ms": ("time", 1e-3, 0.0),
+    "us": ("time", 1e-6, 0.0),
+    "ns": ("time", 1e-9, 0.0),
+    "ps": ("time", 1e-12, 0.0),
+    "fs": ("time", 1e-15, 0.0),
+    "min": ("time", 60.0, 0.0),
+    "h": ("time", 3600.0, 0.0),
+    "K": ("temperature", 1.0, 0.0),
+    "degC": ("temperature", 1.0, 273.15),
+    "degF": ("temperature", 5 / 9, 273.15 - 32 * 5 / 9),
+    "Pa": ("pressure", 1.0, 0.0),
+    "kPa": ("pressure", 1e3, 0.0),
+    "MPa": ("pressure", 1e6, 0.0),
+    "bar": ("pressure", 1e5, 0.0),
+    "atm": ("pressure", 101325.0, 0.0),
+    "Torr": ("pressure", 101325.0 / 760, 0.0),
+    "mHz": ("frequency", 1e-3, 0.0),
+    "Hz": ("frequency", 1.0, 0.0),
+    "kHz": ("frequency", 1e3, 0.0),
+    "MHz": ("frequency", 1e6, 0.0),
+    "GHz": ("frequency", 1e9, 0.0),
+    "THz": ("frequency", 1e12, 0.0),
+    "J": ("energy", 1.0, 0.0),
+    "kJ": ("energy", 1e3, 0.0),
+    "eV": ("energy", _ELECTRONVOLT, 0.0),
+    "meV": ("energy", _ELECTRONVOLT * 1e-3, 0.0),
+    "keV": ("energy", _ELECTRONVOLT * 1e3, 0.0),
+    "MeV": ("energy", _ELECTRONVOLT * 1e6, 0.0),
+    "hartree": ("energy", _HARTREE, 0.0),
+    "cm-1": ("energy", 1.986445857e-23, 0.0),
+    "J/mol": ("energy", 1.0 / _AVOGADRO, 0.0),
+    "kJ/mol": ("energy", 1e3 / _AVOGADRO, 0.0),
+    "kcal/mol": ("energy", 1e3 * _CALORIE / _AVOGADRO, 0.0),
+    "D": ("dipole moment", 3.33564095e-30, 0.0),
+}
+
+# Symbols are case-sensitive: SI prefixes differ only by case (M/m, P/p)
+_ALIASES = {
+    "a0": "bohr",
+    "amu": "Da",
+    "u": "Da",
+    "Eh": "hartree",
+    "Ha": "hartree",
+    "1/cm": "cm-1",
+    "cm^-1": "cm-1",
+    "mmHg": "Torr",
+    "°C": "degC",
+    "°F": "degF",
+}
+
+# Spelled-out names are unambiguous and match in any case
+_NAMES = {
+    "percent": "%",
+    "meter": "m",
+    "metre": "m",
+    "micrometer": "um",
+    "micron": "um",
+    "angstrom": "angstrom",
+    "bohr": "bohr",
+    "dalton": "Da",
+    "sec": "s",
+    "second": "s",
+    "kelvin": "K",
+    "celsius": "degC",
+    "fahrenheit": "degF",
+    "torr": "Torr",
+    "electronvolt": "eV",
+    "hartree": "hartree",
+    "hartrees": "hartree",
+    "wavenumber": "cm-1",
+    "debye": "D",
+}
+
+
+def _clean_unit(unit: str | None) -> str:
+    text = " ".join((unit or "").replace("·", " ").replace("*", " ").split())
+    text = text.replace("µ", "u").replace("μ", "u").replace("Å", "angstrom")
+    text = text.replace("° ", "°")
+    for inverse in (" mol-1", " mol^-1", "mol-1", "mol^-1"):
+        if text.endswith(inverse):
+            text = text[: -len(inverse)].rstrip() + "/mol"
+    return text
+
+
+def normalize_unit(unit: str | None) -> str:
+    """
+    Normalizes a unit string to its UNITS key.
+
+    Spacing, ``·``/``*`` separators, ``mol-1``/``mol^-1`` and micro signs
+    are normalized. Symbols match case-sensitively ("MeV" is not "meV");
+    spelled-out names ("Hartree", "Kelvin") in any case.
+
+    Raises:
+        ValueError: If the unit is not known
+    """
+    text = _clean_unit(unit)
+    if text in UNITS:
+        return text
+    normalized = _ALIASES.get(text) or _NAMES.get(text.lower())
+    if normalized is None:
+        raise ValueError(f"Unknown unit: {unit!r}")
+    return normalized
+
+
+def convert(
+    values: np.ndarray, units: np.ndarray, target: str, offset: bool = True
+) -> np.ndarray:
+    """
+    Converts values in per-row (normalized) units to one target unit.
+
+    The conversion factor is computed once per distinct unit. Rows whose
+    unit is unknown or of another dimension become NaN.
+
+    Args:
+        values: Values to convert
+        units: Normalized unit of each value
+        target: Unit to convert to
+        offset: Apply unit offsets (e.g. degC → K); False for differences
+            such as uncertainties
+
+    Raises:
+        ValueError: If the target unit is not known
+    """
+    target = normalize_unit(target)
+    if not len(values):
+        return np.asarray(values, dtype=float)
+    keys, inverse = np.unique(units, return_inverse=True)
+    factors = np.full(len(keys), np.nan)
+    offsets = np.zeros(len(keys))
+    to = UNITS.get(target)
+    for i, key in enumerate(keys):
+        source = UNITS.get(str(key))
+        if str(key) == target:
+            factors[i] = 1.0
+        elif source is not None and to is not None and source[0] == to[0]:
+            factors[i] = source[1] / to[1]
+            offsets[i] = (source[2] - to[2]) / to[1]
+    converted: np.ndarray = values * factors[inverse]
+    if offset:
+        converted += offsets[inverse]
+    return converted
+
+
+def _strings(values: Iterable[str]) -> np.ndarray:
+    return np.array(list(values), dtype=str)
+
+
+@dataclass
+class ResultTable:
+    """
+    Columns of a project's Results, one row per Result.
+
+    ``values`` and ``uncertainties`` are NaN where the value is not numeric.
+    An uncertainty is the standard uncertainty of a ``±`` value and the
+    half-width of an interval value.
+    Links are stored as parallel ``link_rows``/``link_kinds``/``link_targets``
+    arrays (kind DATASET, SUPPORTS or CONTRADICTS).
+    """
+
+    uris: np.ndarray
+    labels: np.ndarray
+    values: np.ndarray
+    uncertainties: np.ndarray
+    units: np.ndarray
+    link_rows: np.ndarray
+    link_kinds: np.ndarray
+    link_targets: np.ndarray
+    stamp: tuple[int, ...] = ()
+    _rows: dict[str, int] = field(default_factory=dict, init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self._rows = {str(uri): i for i, uri in enumerate(self.uris)}
+
+    def __len__(self) -> int:
+        return len(self.uris)
+
+    @classmethod
+    def from_rows(
+        cls, rows: dict[str, dict[str, Any]], stamp: tuple[int, ...] = ()
+    ) -> "ResultTable":
+        """Builds the table from {uri: row} (see _result_rows)."""
+        uris = sorted(rows)
+        links = [
+            (i, kind, target)
+            for i, uri in enumerate(uris)
+            for kind, target in sorted(rows[uri]["links"])
+        ]
+        return cls(
+            uris=_strings(uris),
+            labels=_strings(rows[u]["label"] for u in uris),
+            values=np.array([rows[u]["value"] for u in uris], dtype=float),
+            uncertainties=np.array([rows[u]["uncertainty"] for u in uris], dtype=float),
+            units=_strings(rows[u]["unit"] for u in uris),
+            link_rows=np.array([row for row, _, _ in links], dtype=np.int32),
+            link_kinds=_strings(kind for _, kind, _ in links),
+            link_targets=_strings(target for _, _, target in links),
+            stamp=stamp,
+        )
+
+    def rows(self) -> dict[str, dict[str, Any]]:
+        """The table as {uri: row}, the inverse of from_rows."""
+        rows: dict[str, dict[str, Any]] = {
+            str(uri): {
+                "label": str(self.labels[i]),
+                "value": float(self.values[i]),
+                "uncertainty": float(self.uncertainties[i]),
+                "unit": str(self.units[i]),
+                "links": set(),
+            }
+            for i, uri in enumerate(self.uris)
+        }
+        for row, kind, target in zip(
+            self.link_rows, self.link_kinds, self.link_targets, strict=True
+        ):
+            rows[str(self.uris[row])]["links"].add((str(kind), str(target)))
+        return rows
+
+    def linked(self, kind: str, target: str) -> np.ndarray:
+        """Boolean mask of the rows linked to target by a link kind."""
+        mask = np.zeros(len(self), dtype=bool)
+        hits = (self.link_kinds == kind) & (self.link_targets == str(target))
+        mask[self.link_rows[hits]] = True
+        return mask
+
+    def values_in(self, unit: str | None = None) -> np.ndarray:
+        """Values converted to a unit (as stored if None)."""
+        if unit is None:
+            return self.values
+        return convert(self.values, self.units, unit)
+
+    def uncertainties_in(self, unit: str | None = None) -> np.ndarray:
+        """Uncertainties converted to a unit (as stored if None)."""
+        if unit is None:
+            return self.uncertainties
+        return convert(self.uncertainties, self.units, unit, offset=False)
+
+    def select(
+        self,
+        min_value: float | None = None,
+        max_value: float | None = None,
+        unit: str | None = None,
+        dataset: str | None = None,
+        supports: str | None = None,
+        contradicts: str | None = None,
+    ) -> np.ndarray:
+        """
+        Selects Results by value range and links.
+
+        Args:
+            min_value: Lower bound (inclusive) on the value
+            max_value: Upper bound (inclusive) on the value
+            unit: Compare and return values in this unit; Results whose unit
+                cannot be converted to it are excluded
+            dataset: Only Results derived from this Dataset
+            supports: Only Results supporting this Hypothesis
+            contradicts: Only Results contradicting this Hypothesis
+
+        Returns:
+            Indices of the selected rows
+        """
+        values = self.values_in(unit)
+        mask = ~np.isnan(values)
+        if min_value is not None:
+            mask &= values >= min_value
+        if max_value is not None:
+            mask &= values <= max_value
+        for kind, target in (
+            (DATASET, dataset),
+            (SUPPORTS, supports),
+            (CONTRADICTS, contradicts),
+        ):
+            if target is not None:
+                mask &= self.linked(kind, target)
+        return np.flatnonzero(mask)
+
+    def write(self, path: str | Path) -> None:
+        """Writes the table as an .npz file, atomically."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp.npz")
+        np.savez(
+            tmp,
+            format=np.array([TABLE_FORMAT]),
+            stamp=np.array(self.stamp, dtype=np.int64),
+            uris=self.uris,
+            labels=self.labels,
+            values=self.values,
+            uncertainties=self.uncertainties,
+            units=self.units,
+            link_rows=self.link_rows,
+            link_kinds=self.link_kinds,
+            link_targets=self.link_targets,
+        )
+        os.replace(tmp, path)
+
+    @classmethod
+    def read(cls, path: str | Path) -> "ResultTable | None":
+        """Reads a table written by write (None if missing or outdated)."""
+        try:
+            with np.load(path, allow_pickle=False) as data:
+                if int(data["format"][0]) != TABLE_FORMAT:
+                    return None
+                return cls(
+                    uris=data["uris"],
+                    labels=data["labels"],
+                    values=data["values"],
+                    uncertainties=data["uncertainties"],
+                    units=data["units"],
+                    link_rows=data["link_rows"],
+                    link_kinds=data["link_kinds"],
+                    link_targets=data["link_targets"],
+                    stamp=tuple(int(v) for v in data["stamp"]),
+                )
+        except (OSError, KeyError, ValueError):
+            return None
+
+
+def _result_rows(
+    graph: Graph,
+    subjects: Iterable[Node],
+    rows: dict[str, dict[str, Any]] | None = None,
+) -> dict[str, dict[str, Any]]:
+    """
+    Parses the given Results of a graph into rows, updating existing rows.
+
+    Fields the graph does not mention keep their previous value, so a delta
+    graph can be merged into the rows of the whole project.
+    """
+    rows = {} if rows is None else rows
+    for subject in subjects:
+        row = rows.setdefault(
+            str(subject),
+            {
+                "label": "",
+                "value": np.nan,
+                "uncertainty": np.nan,
+                "unit": "",
+                "links": set(),
+            },
+        )
+        label = graph.value(subject, RDFS.label)
+        if label is not None:
+            row["label"] = str(label)
+        value = graph.value(subject, SCIMANTIC.value)
+        if value is not None:
+            try:
+                distribution = parse_value(str(value))
+            except ValueError:
+                row["value"] = row["uncertainty"] = np.nan
+            else:
+                row["value"] = distribution.loc
+                row["uncertainty"] = distribution.scale
+        unit = graph.value(subject, SCIMANTIC.unit)
+        if unit is not None:
+            try:
+                row["unit"] = normalize_unit(str(unit))
+            except ValueError:
+                row["unit"] = _clean_unit(str(unit))  # kept, but not convertible
+        for predicate, kind in _LINKS.items():
+            for target in graph.objects(subject, predicate):
+                row["links"].add((kind, str(target)))
+    return rows
+
+
+def table_path(project_path: str | Path) -> Path:
+    """Returns the cache file of a project's Result table."""
+    path = Path(project_path)
+    return path.parent / DEFAULT_RESULT_CACHE_DIR / (path.name + TABLE_SUFFIX)
+
+
+def build_result_table(project_path: str | Path) -> ResultTable:
+    """Parses every Result of a project into a table (no caching)."""
+    stamp = project_stamp(project_path)
+    graph = load_project(project_path, classes=[SCIMANTIC.Result])
+    rows = _result_rows(graph, set(graph.subjects(RDF.type, SCIMANTIC.Result)))
+    _drop_result_links(rows)
+    return ResultTable.from_rows(rows, stamp)
+
+
+def _drop_result_links(rows: dict[str, dict[str, Any]]) -> None:
+    # prov:wasDerivedFrom also links Results to the Results they were computed
+    # from (see scimantic.uncertainty); only other sources are Datasets
+    for row in rows.values():
+        row["links"] = {
+            (k, t) for k, t in row["links"] if k != DATASET or t not in rows
+        }
+
+
+_tables: dict[Path, ResultTable] = {}
+
+
+def load_result_table(project_path: str | Path) -> ResultTable:
+    """
+    Returns the Result table of a project, rebuilt only when it is stale.
+
+    The table is kept in memory and in table_path(project_path); both are
+    reused while the project's modification stamp is unchanged.
+    """
+    path = Path(project_path).resolve()
+    stamp = project_stamp(path)
+    table = _tables.get(path)
+    if table is None or table.stamp != stamp:
+        table = ResultTable.read(table_path(path))
+    if table is None or table.stamp != stamp:
+        table = build_result_table(path)
+        table.write(table_path(path))
+    _tables[path] = table
+    return table
+
+
+def update_result_table(
+    graph: Graph, project_path: str | Path, previous_stamp: tuple[int, ...]
+) -> None:
+    """
+    Merges the Results of a graph just added to a project into its table.
+
+    Only a table that was current before the write (stamped previous_stamp)
+    is updated; otherwise it is left to be rebuilt on next use.
+    """
+    path = Path(project_path).resolve()
+    cache = table_path(path)
+    if not cache.exists():
+        return
+    table = ResultTable.read(cache)
+    if table is None or table.stamp != previous_stamp:
+        return
+    known = set(table._rows)
+    subjects = set(graph.subjects(RDF.type, SCIMANTIC.Result))
+    subjects.update(s for s in set(graph.subjects()) if str(s) in known)
+    rows = _result_rows(graph, subjects, table.rows()) if subjects else None
+    if rows is not None:
+        _drop_result_links(rows)
+        table = ResultTable.from_rows(rows)
+    table.stamp = project_stamp(path)
+    table.write(cache)
+    _tables[path] = table
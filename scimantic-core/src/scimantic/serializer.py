@@ -0,0 +1,301 @@
+"""
+Deterministic Turtle serialization.
+
+rdflib's Turtle output depends on blank node identifiers, which are random on
+every parse, so generated artifacts used to be canonicalized with
+``rdflib.compare.to_canonical_graph`` first. That is expensive for the
+bnode-heavy OWL and SHACL output of LinkML. This writer instead:
+
+- inlines blank nodes referenced exactly once as ``[ ... ]`` and well-formed
+  RDF lists as ``( ... )``, ordering them by their rendered text;
+- labels the remaining blank nodes by hashing their structural context
+  (iterated neighbourhood hashing), so labels do not depend on parse order;
+- optionally sorts the members of set-like lists (e.g. ``sh:ignoredProperties``);
+- emits every subject block in a single pass over an in-memory index.
+
+The output is byte-identical for isomorphic input graphs.
+"""
+
+import hashlib
+import re
+from collections import defaultdict
+from collections.abc import Iterable, Mapping
+
+from rdflib import BNode, Graph, Literal, URIRef
+from rdflib.namespace import OWL, RDF, XSD
+from rdflib.term import Node
+
+INDENT = "    "
+
+# Conservative PN_LOCAL: no escapes, no leading "-"/".", no trailing "."
+_LOCAL_NAME = re.compile(r"^(?:[A-Za-z0-9_](?:[A-Za-z0-9_.\-]*[A-Za-z0-9_\-])?)?$")
+_INTEGER = re.compile(r"^[+-]?[0-9]+$")
+_DECIMAL = re.compile(r"^[+-]?[0-9]*\.[0-9]+$")
+_ESCAPES = {"\\": "\\\\", '"': '\\"', "\n": "\\n", "\r": "\\r", "\t": "\\t"}
+
+# Rounds of neighbourhood hashing used to label non-inlined blank nodes
+_HASH_ROUNDS = 4
+
+
+def _escape(value: str) -> str:
+    return "".join(_ESCAPES.get(ch, ch) for ch in value)
+
+
+class _Writer:
+    def __init__(
+        self,
+        graph: Graph,
+        namespaces: Mapping[str, str],
+        sorted_list_predicates: Iterable[URIRef],
+    ):
+        self.graph = graph
+        # Longest namespace first so the most specific prefix wins
+        self.namespaces = sorted(
+            ((str(uri), prefix) for prefix, uri in namespaces.items()),
+            key=lambda item: (-len(item[0]), item[1]),
+        )
+        self.sorted_list_predicates = set(sorted_list_predicates)
+        self.used_prefixes: set[str] = set()
+
+        self.outgoing: dict[Node, list[tuple[Node, Node]]] = defaultdict(list)
+        self.incoming: dict[Node, list[tuple[Node, Node]]] = defaultdict(list)
+        for s, p, o in graph:
+            self.outgoing[s].append((p, o))
+            if isinstance(o, BNode):
+                self.incoming[o].append((s, p))
+
+        self.list_items = self._find_lists()
+        self.inline = self._find_inline_bnodes()
+        self.labels = self._label_bnodes()
+        self._rendered_inline: dict[Node, str] = {}
+
+    # ------------------------------------------------------------------
+    # Structure analysis
+    # ------------------------------------------------------------------
+    def _list_node(self, node: Node) -> tuple[Node, Node] | None:
+        """Returns (first, rest) if node is a bnode list cell, else None."""
+        if not isinstance(node, BNode) or len(self.incoming[node]) != 1:
+            return None
+        props = self.outgoing.get(node, [])
+        if len(props) != 2:
+            return None
+        first = [o for p, o in props if p == RDF.first]
+        rest = [o for p, o in props if p == RDF.rest]
+        if len(first) != 1 or len(rest) != 1:
+            return None
+        return first[0], rest[0]
+
+    def _find_lists(self) -> dict[Node, list[Node]]:
+        """Maps each well-formed list head to its items."""
+        lists: dict[Node, list[Node]] = {}
+        for node in list(self.outgoing):
+            cell = self._list_node(node)
+            if cell is None:
+                continue
+            ((parent, predicate),) = self.incoming[node]
+            if predicate == RDF.rest and self._list_node(parent) is not None:
+                continue  # not a head
+
+            items: list[Node] = []
+            seen = set()
+            current: Node = node
+            while current != RDF.nil:
+                cell = self._list_node(current)
+                if cell is None or current in seen:
+                    break
+                seen.add(current)
+                items.append(cell[0])
+                current = cell[1]
+            else:
+                lists[node] = items
+        return lists
+
+    def _find_inline_bnodes(self) -> set[Node]:
+        """Blank nodes that can be written nested at their single reference."""
+        candidates = {
+            node
+            for node in self.outgoing
+            if isinstance(node, BNode) and len(self.incoming[node]) == 1
+        }
+        # Only keep candidates reachable from a written subject (breaks cycles)
+        reachable: set[Node] = set()
+        stack = [node for node in self.outgoing if node not in candidates]
+        while stack:
+            node = stack.pop()
+            for _, o in self.outgoing.get(node, []):
+                if o in candidates and o not in reachable:
+                    reachable.add(o)
+                    stack.append(o)
+        return reachable
+
+    def _label_bnodes(self) -> dict[Node, str]:
+        """Stable labels for blank nodes that cannot be inlined."""
+        bnodes: set[Node] = {n for n in self.outgoing if isinstance(n, BNode)}
+        bnodes |= set(self.incoming)
+        labelled = sorted(bnodes - self.inline, key=str)
+        if not labelled:
+            return {}
+
+        def key(term: Node, hashes: dict[Node, str]) -> str:
+            if isinstance(term, BNode):
+                return "_:" + hashes.get(term, "")
+            return term.n3()
+
+        hashes: dict[Node, str] = {node: "" for node in bnodes}
+        for _ in range(_HASH_ROUNDS):
+            new_hashes: dict[Node, str] = {}
+            for node in bnodes:
+                out = sorted(
+                    f"{p.n3()} {key(o, hashes)}" for p, o in self.outgoing[node]
+                )
+                inc = sorted(
+                    f"{key(s, hashes)} {p.n3()}" for s, p in self.incoming[node]
+                )
+                payload = "\n".join([hashes[node], *out, "<-", *inc])
+                new_hashes[node] = hashlib.sha256(payload.encode()).hexdigest()
+            hashes = new_hashes
+
+        labels: dict[Node, str] = {}
+        taken: set[str] = set()
+        for node in sorted(labelled, key=lambda n: hashes[n]):
+            label = "b" + hashes[node][:16]
+            suffix = 0
+            while label in taken:
+                suffix += 1
+                label = f"b{hashes[node][:16]}_{suffix}"
+            taken.add(label)
+            labels[node] = label
+        return labels
+
+    # ------------------------------------------------------------------
+    # Rendering
+    # ------------------------------------------------------------------
+    def qname(self, uri: URIRef) -> str:
+        value = str(uri)
+        for namespace, prefix in self.namespaces:
+            if value.startswith(namespace):
+                local = value[len(namespace) :]
+                if _LOCAL_NAME.match(local):
+                    self.used_prefixes.add(prefix)
+                    return f"{prefix}:{local}"
+        return f"<{value}>"
+
+    def literal(self, lit: Literal) -> str:
+        lexical = str(lit)
+        if lit.language:
+            return f'"{_escape(lexical)}"@{lit.language}'
+        datatype = lit.datatype
+        if datatype is None:
+            return f'"{_escape(lexical)}"'
+        if datatype == XSD.integer and _INTEGER.match(lexical):
+            return lexical
+        if datatype == XSD.decimal and _DECIMAL.match(lexical):
+            return lexical
+        if datatype == XSD.boolean and lexical in ("true", "false"):
+            return lexical
+        return f'"{_escape(lexical)}"^^{self.qname(datatype)}'
+
+    def term(self, term: Node, depth: int, predicate: Node | None = None) -> str:
+        if isinstance(term, Literal):
+            return self.literal(term)
+        if term == RDF.nil:
+            return "()"
+        if isinstance(term, BNode):
+            if term in self.list_items and term in self.inline:
+                return self.collection(term, depth, predicate)
+            if term in self.inline:
+                return self.inline_bnode(term, depth)
+            return f"_:{self.labels[term]}"
+        return self.qname(term)  # type: ignore[arg-type]
+
+    def collection(self, head: Node, depth: int, predicate: Node | None) -> str:
+        items = self.list_items[head]
+        if predicate in self.sorted_list_predicates:
+            # Sort by IRI / lexical form; blank nodes by their rendering
+            items = sorted(
+                items,
+                key=lambda item: (
+                    isinstance(item, BNode),
+                    self.term(item, depth + 1)
+                    if isinstance(item, BNode)
+                    else str(item),
+                ),
+            )
+        return "( " + " ".join(self.term(item, depth + 1) for item in items) + " )"
+
+    def inline_bnode(self, node: Node, depth: int) -> str:
+        if node not in self._rendered_inline:
+            body = self.predicate_object_list(node, depth + 2)
+            self._rendered_inline[node] = f"[ {body} ]" if body else "[ ]"
+        return self._rendered_inline[node]
+
+    def predicate_object_list(self, subject: Node, depth: int) -> str:
+        by_predicate: dict[Node, list[str]] = defaultdict(list)
+        for p, o in self.outgoing.get(subject, []):
+            by_predicate[p].append(self.term(o, depth, p))
+
+        def predicate_key(p: Node) -> tuple[int, str]:
+            return (0, "") if p == RDF.type else (1, str(p))
+
+        indent = INDENT * depth
+        parts = []
+        for p in sorted(by_predicate, key=predicate_key):
+            verb = "a" if p == RDF.type else self.qname(p)  # type: ignore[arg-type]
+            # Not deduplicated: distinct inline blank nodes may render alike
+            objects = sorted(by_predicate[p])
+            parts.append(f"{verb} " + f",\n{indent}{INDENT}".join(objects))
+        return f" ;\n{indent}".join(parts)
+
+    def subjects(self) -> list[Node]:
+        def subject_key(s: Node) -> tuple[int, str]:
+            if (s, RDF.type, OWL.Ontology) in self.graph:
+                return (0, str(s))
+            if isinstance(s, BNode):
+                return (2, self.labels[s])
+            return (1, str(s))
+
+        return sorted(
+            (s for s in self.outgoing if s not in self.inline), key=subject_key
+        )
+
+    def write(self) -> str:
+        blocks = []
+        for subject in self.subjects():
+            if isinstance(subject, BNode):
+                head = f"_:{self.labels[subject]}"
+            else:
+                head = self.qname(subject)  # type: ignore[arg-type]
+            body = self.predicate_object_list(subject, 1)
+            blocks.append(f"{head} {body} .\n")
+
+        namespaces = {prefix: ns for ns, prefix in self.namespaces}
+        header = [
+            f"@prefix {prefix}: <{namespaces[prefix]}> .\n"
+            for prefix in sorted(self.used_prefixes)
+        ]
+        return "".join(header) + "\n" + "\n".join(blocks)
+
+
+def serialize_deterministic(
+    graph: Graph,
+    namespaces: Mapping[str, str] | None = None,
+    sorted_list_predicates: Iterable[URIRef] = (),
+) -> str:
+    """
+    Serializes a graph to Turtle whose bytes depend only on the graph structure.
+
+    Args:
+        graph: Graph to serialize
+        namespaces: Prefix bindings to use (default: the graph's own bindings).
+            Only prefixes that are actually used are declared.
+        sorted_list_predicates: Predicates whose RDF list objects are written
+            with their members sorted (lists treated as sets, e.g.
+            sh:ignoredProperties)
+
+    Returns:
+        Turtle text ending with exactly one newline
+    """
+    if namespaces is None:
+        namespaces = {prefix: str(uri) for prefix, uri in graph.namespaces() if prefix}
+    writer = _Writer(graph, namespaces, sorted_list_predicates)
+    return writer.write().rstrip() + "\n"
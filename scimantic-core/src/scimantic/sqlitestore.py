@@ -0,0 +1,341 @@
+"""
+SQLite-backed rdflib Store.
+
+A persistent, indexed project store on the standard-library sqlite3 module
+(``project.sqlite``). Terms are interned: each distinct term is stored once,
+as its N-Triples encoding, and quads refer to terms by integer ID. The quad
+table's primary key and two covering indexes give SPO, POS and OSP access
+paths, so triple patterns are answered from indexes rather than by loading
+the graph, and writes cost O(delta).
+
+The store is context (named graph) aware and transactional: writes join the
+current SQLite transaction until ``commit()`` (``Graph.commit()``), and
+``rollback()`` discards them. The database runs in WAL mode, so readers are
+not blocked by a writer.
+"""
+
+import sqlite3
+from collections.abc import Iterable, Iterator
+from functools import lru_cache
+from pathlib import Path
+from typing import Any
+
+from rdflib import Graph, URIRef
+from rdflib.graph import DATASET_DEFAULT_GRAPH_ID
+from rdflib.store import VALID_STORE, Store
+from rdflib.term import Node
+
+from scimantic.config import SQLITE_PROJECT_SUFFIXES
+from scimantic.ntriples import decode_term, encode_term
+
+SQLITE_SCHEMA_VERSION = 1
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS terms (
+    id INTEGER PRIMARY KEY,
+    term BLOB NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS quads (
+    s INTEGER NOT NULL,
+    p INTEGER NOT NULL,
+    o INTEGER NOT NULL,
+    g INTEGER NOT NULL,
+    PRIMARY KEY (s, p, o, g)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS quads_pos ON quads (p, o, s);
+CREATE INDEX IF NOT EXISTS quads_osp ON quads (o, s, p);
+CREATE INDEX IF NOT EXISTS quads_g ON quads (g);
+CREATE TABLE IF NOT EXISTS graphs (
+    id INTEGER PRIMARY KEY
+);
+CREATE TABLE IF NOT EXISTS namespaces (
+    prefix TEXT PRIMARY KEY,
+    uri TEXT NOT NULL UNIQUE
+);
+"""
+
+# Host parameters per IN (...) lookup, below SQLite's default limit
+_LOOKUP_BATCH = 500
+
+# Decoded terms kept per open store
+_TERM_CACHE = 1 << 16
+
+_decode = lru_cache(maxsize=_TERM_CACHE)(decode_term)
+
+
+def is_sqlite(path: str | Path) -> bool:
+    """Whether a path names a SQLite project store."""
+    return str(path).endswith(SQLITE_PROJECT_SUFFIXES)
+
+
+def _identifier(context: Any) -> Node | None:
+    """The graph name of a context argument (a Graph or an identifier)."""
+    if context is None:
+        return None
+    identifier: Node = getattr(context, "identifier", context)
+    return identifier
+
+
+class SQLiteStore(Store):
+    """
+    rdflib Store persisted in a SQLite database.
+
+    Args:
+        configuration: Path of the database file (created if missing)
+        identifier: Store identifier (unused)
+    """
+
+    context_aware = True
+    formula_aware = False
+    transaction_aware = True
+    graph_aware = True
+
+    def __init__(self, configuration: str | None = None, identifier: Any = None):
+        self.connection: sqlite3.Connection | None = None
+        self._ids: dict[bytes, int] = {}
+        super().__init__(configuration, identifier)
+
+    def open(self, configuration: Any, create: bool = True) -> int | None:
+        path = Path(configuration)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.connection = sqlite3.connect(path)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        version = self.connection.execute("PRAGMA user_version").fetchone()[0]
+        if version not in (0, SQLITE_SCHEMA_VERSION):
+            self.close()
+            raise ValueError(f"Unsupported store schema {version} in {path}")
+        if version == 0:
+            self.connection.executescript(
+                f"{_SCHEMA}PRAGMA user_version={SQLITE_SCHEMA_VERSION};"
+            )
+        return VALID_STORE
+
+    def close(self, commit_pending_transaction: bool = False) -> None:
+        if self.connection is None:
+            return
+        if commit_pending_transaction:
+            self.connection.commit()
+        else:
+            self.connection.rollback()
+        self.connection.close()
+        self.connection = None
+
+    def commit(self) -> None:
+        self._db().commit()
+
+    def rollback(self) -> None:
+        self._db().rollback()
+        self._ids.clear()  # interned IDs may have been rolled back
+
+    def _db(self) -> sqlite3.Connection:
+        if self.connection is None:
+            raise ValueError("SQLiteStore is not open")
+        return self.connection
+
+    # Term interning
+
+    def _lookup(self, keys: Iterable[bytes]) -> None:
+        """Loads the IDs of stored terms into the interning cache."""
+        missing = [k for k in dict.fromkeys(keys) if k not in self._ids]
+        db = self._db()
+        for start in range(0, len(missing), _LOOKUP_BATCH):
+            batch = missing[start : start + _LOOKUP_BATCH]
+            marks = ",".join("?" * len(batch))
+            self._ids.update(
+                (term, term_id)
+                for term_id, term in db.execute(
+                    f"SELECT id, term FROM terms WHERE term IN ({marks})", batch
+                )
+            )
+
+    def _intern(self, keys: list[bytes]) -> None:
+        """Stores terms that are new to the database and caches all IDs."""
+        self._lookup(keys)
+        new = [k for k in dict.fromkeys(keys) if k not in self._ids]
+        if new:
+            self._db().executemany(
+                "INSERT INTO terms (term) VALUES (?)", [(k,) for k in new]
+            )
+            self._lookup(new)
+
+    def _term_id(self, term: Node) -> int | None:
+        key = encode_term(term)
+        self._lookup([key])
+        return self._ids.get(key)
+
+    def _where(
+        self, pattern: Iterable[Node | None], context: Any
+    ) -> tuple[str, list[int]] | None:
+        """SQL conditions for a pattern; None if a bound term is not stored."""
+        clauses = []
+        params = []
+        graph = _identifier(context)
+        for column, term in zip("spog", (*pattern, graph), strict=True):
+            if term is None:
+                continue
+            term_id = self._term_id(term)
+            if term_id is None:
+                return None
+            clauses.append(f"q.{column} = ?")
+            params.append(term_id)
+        return (" WHERE " + " AND ".join(clauses) if clauses else ""), params
+
+    # Triples
+
+    def add(self, triple: Any, context: Any, quoted: bool = False) -> None:
+        self.addN([(*triple, context)])
+
+    def addN(self, quads: Iterable[Any]) -> None:
+        encoded = [
+            tuple(
+                encode_term(term)
+                for term in (s, p, o, _identifier(c) or DATASET_DEFAULT_GRAPH_ID)
+            )
+            for s, p, o, c in quads
+        ]
+        self._intern([key for quad in encoded for key in quad])
+        ids = self._ids
+        self._db().executemany(
+            "INSERT OR IGNORE INTO quads (s, p, o, g) VALUES (?, ?, ?, ?)",
+            [tuple(ids[key] for key in quad) for quad in encoded],
+        )
+
+    def remove(self, triple: Any, context: Any = None) -> None:
+        where = self._where(triple, context)
+        if where is None:
+            return
+        clauses, params = where
+        self._db().execute(f"DELETE FROM quads AS q{clauses}", params)
+
+    def triples(self, triple_pattern: Any, context: Any = None) -> Iterator[Any]:
+        where = self._where(triple_pattern, context)
+        if where is None:
+            return
+        clauses, params = where
+        db = self._db()
+        if context is not None:
+            rows = db.execute(
+                "SELECT ts.term, tp.term, tt.term FROM quads AS q"
+                " JOIN terms AS ts ON ts.id = q.s"
+                " JOIN terms AS tp ON tp.id = q.p"
+                f" JOIN terms AS tt ON tt.id = q.o{clauses}",
+                params,
+            )
+            for s, p, o in rows:
+                yield (_decode(s), _decode(p), _decode(o)), iter((context,))
+            return
+
+        rows = db.execute(
+            "SELECT d.s, d.p, d.o, ts.term, tp.term, tt.term"
+            f" FROM (SELECT DISTINCT q.s, q.p, q.o FROM quads AS q{clauses}) AS d"
+            " JOIN terms AS ts ON ts.id = d.s"
+            " JOIN terms AS tp ON tp.id = d.p"
+            " JOIN terms AS tt ON tt.id = d.o",
+            params,
+        )
+        for s_id, p_id, o_id, s, p, o in rows:
+            triple = (_decode(s), _decode(p), _decode(o))
+            yield triple, self._contexts_of(s_id, p_id, o_id)
+
+    def _contexts_of(self, s: int, p: int, o: int) -> Iterator[Graph]:
+        rows = self._db().execute(
+            "SELECT t.term FROM quads AS q JOIN terms AS t ON t.id = q.g"
+            " WHERE q.s = ? AND q.p = ? AND q.o = ?",
+            (s, p, o),
+        )
+        for (term,) in rows.fetchall():
+            yield self._graph(term)
+
+    def _graph(self, encoded: bytes) -> Graph:
+        return Graph(store=self, identifier=_decode(encoded))  # type: ignore[arg-type]
+
+    def __len__(self, context: Any = None) -> int:
+        db = self._db()
+        if context is None:
+            query = "SELECT COUNT(*) FROM (SELECT DISTINCT s, p, o FROM quads)"
+            return int(db.execute(query).fetchone()[0])
+        graph_id = self._term_id(_identifier(context))  # type: ignore[arg-type]
+        if graph_id is None:
+            return 0
+        query = "SELECT COUNT(*) FROM quads WHERE g = ?"
+        return int(db.execute(query, (graph_id,)).fetchone()[0])
+
+    # Named graphs
+
+    def contexts(self, triple: Any = None) -> Iterator[Graph]:  # type: ignore[override]
+        if triple is not None:
+            ids = [self._term_id(term) for term in triple]
+            if None not in ids:
+                yield from self._contexts_of(*ids)  # type: ignore[arg-type]
+            return
+        rows = self._db().execute(
+            "SELECT t.term FROM terms AS t WHERE t.id IN"
+            " (SELECT id FROM graphs UNION SELECT DISTINCT g FROM quads)"
+            " ORDER BY t.term"
+        )
+        for (term,) in rows.fetchall():
+            yield self._graph(term)
+
+    def add_graph(self, graph: Graph) -> None:
+        key = encode_term(graph.identifier)
+        self._intern([key])
+        self._db().execute(
+            "INSERT OR IGNORE INTO graphs (id) VALUES (?)", (self._ids[key],)
+        )
+
+    def remove_graph(self, graph: Graph) -> None:
+        graph_id = self._term_id(graph.identifier)
+        if graph_id is None:
+            return
+        db = self._db()
+        db.execute("DELETE FROM quads WHERE g = ?", (graph_id,))
+        db.execute("DELETE FROM graphs WHERE id = ?", (graph_id,))
+
+    # Namespaces
+
+    def bind(self, prefix: str, namespace: URIRef, override: bool = True) -> None:
+        if self.namespace(prefix) == namespace and self.prefix(namespace) == prefix:
+            return  # already bound; avoid opening a write transaction
+        db = self._db()
+        if override:
+            db.execute(
+                "DELETE FROM namespaces WHERE prefix = ? OR uri = ?",
+                (prefix, str(namespace)),
+            )
+        db.execute(
+            "INSERT OR IGNORE INTO namespaces (prefix, uri) VALUES (?, ?)",
+            (prefix, str(namespace)),
+        )
+
+    def namespace(self, prefix: str) -> URIRef | None:
+        row = (
+            self._db()
+            .execute("SELECT uri FROM namespaces WHERE prefix = ?", (prefix,))
+            .fetchone()
+        )
+        return URIRef(row[0]) if row else None
+
+    def prefix(self, namespace: URIRef) -> str | None:
+        row = (
+            self._db()
+            .execute("SELECT prefix FROM namespaces WHERE uri = ?", (str(namespace),))
+            .fetchone()
+        )
+        return row[0] if row else None
+
+    def namespaces(self) -> Iterator[tuple[str, URIRef]]:
+        rows = self._db().execute("SELECT prefix, uri FROM namespaces ORDER BY prefix")
+        for prefix, uri in rows.fetchall():
+            yield prefix, URIRef(uri)
+
+
+def open_sqlite(path: str | Path) -> Graph:
+    """
+    Opens the default graph of a SQLite project store.
+
+    Writes through the returned graph are kept until ``graph.commit()``.
+    """
+    graph = Graph(store=SQLiteStore(str(path)), identifier=DATASET_DEFAULT_GRAPH_ID)
+    graph.commit()  # default prefixes bound by a new database
+    return graph
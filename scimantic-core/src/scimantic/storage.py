@@ -0,0 +1,218 @@
+"""
+Project graph storage.
+
+The master project graph can be kept as Turtle (``project.ttl``, the default),
+as sorted canonical N-Triples (``project.nt`` / ``project.nt.gz``, see
+scimantic.ntriples), in a SQLite store (``project.sqlite``, see
+scimantic.sqlitestore), as per-nanopub named graphs (``project.nq`` /
+``project.trig``, see scimantic.archive), split into per-class partitions (an
+existing directory such as ``.scimantic/graph``, see scimantic.partition) or, for
+read-only analytics
+over very large graphs, as a memory-mapped triple index (``project.idx/``,
+see scimantic.tripleindex). The format is chosen by the file name; MCP tools
+and the CLI load and update projects through these helpers.
+"""
+
+import os
+from collections.abc import Iterable
+from pathlib import Path
+
+from rdflib import Graph
+from rdflib.namespace import RDF, RDFS, XSD
+from rdflib.term import Node
+from rdflib.util import guess_format
+
+from scimantic.archive import NanopubArchive, is_archive
+from scimantic.config import DCTERMS_URI, PROV_ONTOLOGY_URI, SCIMANTIC_ONTOLOGY_URI
+from scimantic.ntriples import (
+    is_ntriples,
+    iter_triples,
+    load_ntriples,
+    merge_graph,
+    write_ntriples,
+)
+from scimantic.partition import PartitionedProject, is_partitioned
+from scimantic.serializer import serialize_deterministic
+from scimantic.sqlitestore import is_sqlite, open_sqlite
+from scimantic.tripleindex import build_index, is_index, open_index
+
+# Prefixes used when writing project graphs as Turtle
+PROJECT_NAMESPACES = {
+    "scimantic": SCIMANTIC_ONTOLOGY_URI,
+    "prov": PROV_ONTOLOGY_URI,
+    "dcterms": DCTERMS_URI,
+    "rdf": str(RDF),
+    "rdfs": str(RDFS),
+    "xsd": str(XSD),
+    "oa": "http://www.w3.org/ns/oa#",
+    "np": "http://www.nanopub.org/nschema#",
+}
+
+
+def project_stamp(project_path: str | Path) -> tuple[int, ...]:
+    """
+    Modification stamp of a project, for caches derived from it.
+
+    Covers a SQLite store's WAL file and every file of a directory project,
+    so any write changes the stamp. A missing project has an empty stamp.
+    """
+    path = Path(project_path)
+    candidates = [path, Path(f"{path}-wal")]
+    if path.is_dir():
+        candidates = sorted(path.iterdir())
+    stamp: tuple[int, ...] = ()
+    for candidate in candidates:
+        if candidate.exists():
+            stat = os.stat(candidate)
+            stamp += (stat.st_mtime_ns, stat.st_size)
+    return stamp
+
+
+def load_project(
+    project_path: str | Path, classes: Iterable[Node] | None = None
+) -> Graph:
+    """
+    Loads a project graph from Turtle, (gzipped) N-Triples or a store.
+
+    SQLite stores and triple indexes are opened in place rather than loaded:
+    queries on the returned graph read only the triples they match. Nanopub
+    archives load as the union of their nanopub graphs (NanopubArchive reads
+    single nanopubs or keeps the named graphs).
+
+    Args:
+        project_path: Project file or directory
+        classes: Classes the caller queries. Partitioned projects then load
+            only the partitions holding them; other formats load everything.
+    """
+    if is_partitioned(project_path):
+        return PartitionedProject(project_path).load(classes)
+    if is_sqlite(project_path):
+        return open_sqlite(project_path)
+    if is_archive(project_path):
+        return NanopubArchive(project_path).union()
+    if is_index(project_path):
+        return open_index(project_path)
+    if is_ntriples(project_path):
+        return load_ntriples(project_path)
+    g = Graph()
+    g.parse(str(project_path), format=guess_format(str(project_path)) or "turtle")
+    return g
+
+
+def add_to_project(graph: Graph, project_path: str | Path) -> None:
+    """
+    Adds triples to a project file, creating it if needed.
+
+    SQLite projects are updated in one transaction and N-Triples projects by a
+    streaming sorted merge, so both cost O(delta). Partitioned projects merge
+    into the affected partitions only. Nanopub archives append the graph as
+    the assertion of a new nanopub. Turtle projects are parsed, extended and
+    re-serialized. A current Result table (scimantic.results) and annotation
+    index (scimantic.annotations) are updated with the delta.
+
+    Raises:
+        ValueError: If the project is a read-only triple index
+    """
+    from scimantic.annotations import update_annotation_index
+    from scimantic.results import update_result_table
+
+    project_file = Path(project_path)
+    if is_index(project_file):
+        raise ValueError(
+            f"{project_file} is a read-only triple index; add to the source "
+            "project and rebuild it with `scimantic convert`"
+        )
+    stamp = project_stamp(project_file)
+    _add(graph, project_file)
+    update_result_table(graph, project_file, stamp)
+    update_annotation_index(graph, project_file, stamp)
+
+
+def _add(graph: Graph, project_file: Path) -> None:
+    project_file.parent.mkdir(parents=True, exist_ok=True)
+    if is_partitioned(project_file):
+        PartitionedProject(project_file).add(graph)
+        return
+    if is_archive(project_file):
+        NanopubArchive(project_file).add(graph)
+        return
+    if is_sqlite(project_file):
+        project = open_sqlite(project_file)
+        project.addN((s, p, o, project) for s, p, o in graph)
+        project.commit()
+        project.close()
+        return
+    if is_ntriples(project_file):
+        merge_graph(graph, project_file)
+        return
+
+    if project_file.exists():
+        existing_g = load_project(project_file)
+        existing_g += graph
+        graph = existing_g
+    graph.serialize(destination=str(project_file), format="turtle")
+
+
+def save_project(
+    graph: Graph, project_path: str | Path, partitioned: bool = False
+) -> None:
+    """
+    Writes a whole project graph, replacing the file.
+
+    Args:
+        graph: The project graph
+        project_path: Project file or directory
+        partitioned: Create a partition directory at project_path. Existing
+            partition directories are always written as such.
+    """
+    project_file = Path(project_path)
+    project_file.parent.mkdir(parents=True, exist_ok=True)
+    namespaces = {prefix: str(uri) for prefix, uri in graph.namespaces() if prefix}
+    namespaces.update(PROJECT_NAMESPACES)
+    if partitioned or is_partitioned(project_file):
+        PartitionedProject(project_file).save(graph)
+    elif is_archive(project_file):
+        NanopubArchive(project_file).save(graph)
+    elif is_sqlite(project_file):
+        project = open_sqlite(project_file)
+        project.remove((None, None, None))
+        project.addN((s, p, o, project) for s, p, o in graph)
+        for prefix, uri in namespaces.items():
+            project.bind(prefix, uri)
+        project.commit()
+        project.close()
+    elif is_index(project_file):
+        build_index(graph, project_file, namespaces=namespaces)
+    elif is_ntriples(project_file):
+        write_ntriples(graph, project_file)
+    else:
+        project_file.write_text(serialize_deterministic(graph, namespaces=namespaces))
+
+
+def convert_project(
+    source: str | Path, destination: str | Path, partitioned: bool = False
+) -> int:
+    """
+    Converts a project between Turtle, (gzipped) N-Triples and stores.
+
+    This is also how SQLite stores are imported from and exported to Turtle.
+
+    Args:
+        source: Project file or directory to read
+        destination: Project file or directory to write
+        partitioned: Write the destination as a partition directory
+
+    Returns:
+        Number of triples converted
+    """
+    if is_ntriples(source) and is_index(destination):
+        # Stream straight into the index without building an rdflib graph
+        return build_index(iter_triples(source), destination, PROJECT_NAMESPACES)
+    if is_archive(source) and is_archive(destination):
+        # Keep the named graphs, e.g. to switch between N-Quads and TriG
+        dataset = NanopubArchive(source).dataset()
+        NanopubArchive(destination).save(dataset)
+        return len(list(dataset.quads()))
+    graph = load_project(source)
+    save_project(graph, destination, partitioned=partitioned)
+    return len(graph)
@@ -0,0 +1,340 @@
+"""
+Subset generation.
+
+A subset definition (``.scimantic/subsets/<name>.yaml``) holds a SPARQL
+CONSTRUCT query and license rules; generating it renders the query result
+against the master ``project.ttl`` to ``subsets/<name>.ttl``.
+
+The master graph (any project format, see scimantic.storage) is loaded once
+per revision (its project_stamp) and every definition is evaluated against
+that single in-memory graph. With ``jobs > 1`` the queries run in forked
+workers that share the loaded graph copy-on-write. Results are memoized in
+``.scimantic/cache/subsets.json``: a definition whose text is unchanged,
+evaluated against an unchanged master revision, is not queried again.
+
+Every subset is checked against its definition's license rules with a
+LicenseIndex (see scimantic.licensing) built once per master revision.
+"""
+
+import hashlib
+import json
+import multiprocessing
+import os
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+import yaml
+from rdflib import Graph
+from rdflib.namespace import RDF
+
+from scimantic.config import (
+    DEFAULT_PROJECT_FILE,
+    DEFAULT_SUBSET_CACHE,
+    DEFAULT_SUBSET_OUTPUT_DIR,
+    DEFAULT_SUBSETS_DIR,
+)
+from scimantic.licensing import LicenseIndex, LicenseReport
+from scimantic.serializer import serialize_deterministic
+from scimantic.storage import PROJECT_NAMESPACES, load_project, project_stamp
+
+# Bump when the rendering changes so memoized results are regenerated
+SUBSET_ENGINE_VERSION = "2"
+
+# Prefixes available to subset queries and used when writing subsets
+SUBSET_NAMESPACES = PROJECT_NAMESPACES
+
+
+@dataclass(frozen=True)
+class SubsetDefinition:
+    """A parsed ``.scimantic/subsets/<name>.yaml`` file."""
+
+    name: str
+    query: str
+    title: str | None = None
+    description: str | None = None
+    license: str | None = None
+    license_filter: dict[str, list[str]] = field(default_factory=dict)
+    # SHA-256 of the definition file, part of the memoization key
+    digest: str = ""
+
+    @classmethod
+    def from_file(cls, path: str | Path) -> "SubsetDefinition":
+        """
+        Loads a subset definition.
+
+        Raises:
+            ValueError: If the file has no CONSTRUCT query
+        """
+        path = Path(path)
+        raw = path.read_bytes()
+        data = yaml.safe_load(raw) or {}
+        query = data.get("query")
+        if not query or "CONSTRUCT" not in query.upper():
+            raise ValueError(f"{path}: subset definitions need a CONSTRUCT query")
+        license_filter = {
+            key: [str(value) for value in values or []]
+            for key, values in (data.get("license_filter") or {}).items()
+        }
+        return cls(
+            name=data.get("name") or path.stem,
+            query=query,
+            title=data.get("title"),
+            description=data.get("description"),
+            license=data.get("license"),
+            license_filter=license_filter,
+            digest=hashlib.sha256(raw).hexdigest(),
+        )
+
+
+def load_definitions(
+    directory: str | Path = DEFAULT_SUBSETS_DIR,
+) -> list[SubsetDefinition]:
+    """Loads all ``*.yaml`` subset definitions in a directory, by file name."""
+    directory = Path(directory)
+    if not directory.is_dir():
+        return []
+    return [SubsetDefinition.from_file(p) for p in sorted(directory.glob("*.yaml"))]
+
+
+@dataclass
+class SubsetResult:
+    """Outcome of generating one subset."""
+
+    name: str
+    path: Path
+    triples: int
+    entities: int
+    report: LicenseReport
+    # True when the memoized result was reused without running the query
+    cached: bool = False
+
+    @property
+    def licenses(self) -> dict[str, int]:
+        """Entity counts by effective license short name."""
+        return self.report.counts
+
+
+# Master graph and license index handed to forked workers (copy-on-write)
+_fork_state: tuple[Graph, LicenseIndex] | None = None
+
+
+def _construct(master: Graph, query: str) -> Graph:
+    result = Graph()
+    for prefix, uri in SUBSET_NAMESPACES.items():
+        result.bind(prefix, uri)
+    for triple in master.query(query, initNs=SUBSET_NAMESPACES):
+        result.add(triple)  # type: ignore[arg-type]
+    return result
+
+
+def _render(
+    master: Graph, index: LicenseIndex, definition: SubsetDefinition
+) -> dict[str, Any]:
+    """Runs a definition and returns its Turtle text, statistics and report."""
+    subset = _construct(master, definition.query)
+    namespaces = {prefix: str(uri) for prefix, uri in master.namespaces() if prefix}
+    namespaces.update(SUBSET_NAMESPACES)
+    entities = set(subset.subjects(RDF.type, None))
+    report = index.check(entities, definition.license_filter)
+    return {
+        "turtle": serialize_deterministic(subset, namespaces=namespaces),
+        "triples": len(subset),
+        "entities": len(entities),
+        "report": report.to_dict(),
+    }
+
+
+def _render_in_worker(definition: SubsetDefinition) -> dict[str, Any]:
+    assert _fork_state is not None
+    return _render(*_fork_state, definition)
+
+
+class SubsetEngine:
+    """
+    Generates subsets from one master graph.
+
+    Args:
+        root: Project directory (containing project.ttl and .scimantic/)
+        project_file: Master graph, relative to root
+        subsets_dir: Definition directory, relative to root
+        output_dir: Generated subset directory, relative to root
+        cache_file: Memoization file, relative to root
+    """
+
+    def __init__(
+        self,
+        root: str | Path = ".",
+        project_file: str = DEFAULT_PROJECT_FILE,
+        subsets_dir: str = DEFAULT_SUBSETS_DIR,
+        output_dir: str = DEFAULT_SUBSET_OUTPUT_DIR,
+        cache_file: str = DEFAULT_SUBSET_CACHE,
+    ):
+        root = Path(root)
+        self.project_path = root / project_file
+        self.subsets_dir = root / subsets_dir
+        self.output_dir = root / output_dir
+        self.cache_path = root / cache_file
+        self._master: Graph | None = None
+        self._revision: str | None = None
+        self._license_index: LicenseIndex | None = None
+        self._memo: dict[str, dict[str, Any]] | None = None
+
+    @property
+    def revision(self) -> str:
+        """Modification stamp of the master project (the master revision)."""
+        return ":".join(str(n) for n in project_stamp(self.project_path))
+
+    def master(self, revision: str | None = None) -> Graph:
+        """Returns the master graph, parsing it only when its revision changed."""
+        revision = revision or self.revision
+        if self._master is None or revision != self._revision:
+            self._master = load_project(self.project_path)
+            self._revision = revision
+            self._license_index = None
+        return self._master
+
+    def license_index(self, revision: str | None = None) -> LicenseIndex:
+        """Returns the license index of the master graph, built once per revision."""
+        master = self.master(revision)
+        if self._license_index is None:
+            self._license_index = LicenseIndex(master)
+        return self._license_index
+
+    def _load_memo(self) -> dict[str, dict[str, Any]]:
+        if self._memo is None:
+            try:
+                self._memo = json.loads(self.cache_path.read_text())
+            except (FileNotFoundError, json.JSONDecodeError):
+                self._memo = {}
+        return self._memo
+
+    def _save_memo(self) -> None:
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.cache_path.with_name(f".{self.cache_path.name}.tmp")
+        tmp.write_text(json.dumps(self._load_memo(), indent=2, sort_keys=True))
+        os.replace(tmp, self.cache_path)
+
+    @staticmethod
+    def _key(definition: SubsetDefinition, revision: str) -> str:
+        payload = f"{SUBSET_ENGINE_VERSION}\n{revision}\n{definition.digest}"
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def _output_path(self, definition: SubsetDefinition) -> Path:
+        return self.output_dir / f"{definition.name}.ttl"
+
+    def _memoized(self, definition: SubsetDefinition, key: str) -> SubsetResult | None:
+        entry = self._load_memo().get(definition.name)
+        path = self._output_path(definition)
+        if not entry or entry.get("key") != key or not path.exists():
+            return None
+        if hashlib.sha256(path.read_bytes()).hexdigest() != entry.get("output"):
+            return None  # edited or replaced by hand; regenerate
+        return SubsetResult(
+            name=definition.name,
+            path=path,
+            triples=entry["triples"],
+            entities=entry["entities"],
+            report=LicenseReport.from_dict(entry["report"]),
+            cached=True,
+        )
+
+    def _store(
+        self, definition: SubsetDefinition, key: str, rendered: dict[str, Any]
+    ) -> SubsetResult:
+        path = self._output_path(definition)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        text = rendered["turtle"]
+        if not path.exists() or path.read_text() != text:
+            path.write_text(text)
+        self._load_memo()[definition.name] = {
+            "key": key,
+            "output": hashlib.sha256(text.encode()).hexdigest(),
+            "triples": rendered["triples"],
+            "entities": rendered["entities"],
+            "report": rendered["report"],
+        }
+        return SubsetResult(
+            name=definition.name,
+            path=path,
+            triples=rendered["triples"],
+            entities=rendered["entities"],
+            report=LicenseReport.from_dict(rendered["report"]),
+        )
+
+    def generate(
+        self,
+        definitions: Iterable[SubsetDefinition] | None = None,
+        jobs: int = 1,
+        force: bool = False,
+    ) -> list[SubsetResult]:
+        """
+        Generates subsets, reusing memoized results where possible.
+
+        Args:
+            definitions: Definitions to generate (default: all in subsets_dir)
+            jobs: Worker processes for the queries (forked, sharing the master
+                graph; falls back to in-process where fork is unavailable)
+            force: Regenerate even if the memoized result is current
+
+        Returns:
+            One result per definition, in order
+        """
+        if definitions is None:
+            definitions = load_definitions(self.subsets_dir)
+        definitions = list(definitions)
+        revision = self.revision
+
+        results: dict[str, SubsetResult] = {}
+        stale: list[tuple[SubsetDefinition, str]] = []
+        for definition in definitions:
+            key = self._key(definition, revision)
+            memoized = None if force else self._memoized(definition, key)
+            if memoized is not None:
+                results[definition.name] = memoized
+            else:
+                stale.append((definition, key))
+
+        if stale:
+            master = self.master(revision)
+            index = self.license_index(revision)
+            for (definition, key), rendered in zip(
+                stale,
+                self._render_all(master, index, [d for d, _ in stale], jobs),
+                strict=True,
+            ):
+                results[definition.name] = self._store(definition, key, rendered)
+            self._save_memo()
+
+        return [results[definition.name] for definition in definitions]
+
+    @staticmethod
+    def _render_all(
+        master: Graph,
+        index: LicenseIndex,
+        definitions: list[SubsetDefinition],
+        jobs: int,
+    ) -> list[dict[str, Any]]:
+        if (
+            jobs <= 1
+            or len(definitions) <= 1
+            or ("fork" not in multiprocessing.get_all_start_methods())
+        ):
+            return [_render(master, index, definition) for definition in definitions]
+
+        global _fork_state
+        _fork_state = (master, index)
+        try:
+            context = multiprocessing.get_context("fork")
+            with context.Pool(min(jobs, len(definitions))) as pool:
+                return pool.map(_render_in_worker, definitions)
+        finally:
+            _fork_state = None
+
+
+def generate_subsets(
+    root: str | Path = ".", jobs: int = 1, force: bool = False
+) -> list[SubsetResult]:
+    """Generates every subset defined in a project (see SubsetEngine)."""
+    return SubsetEngine(root).generate(jobs=jobs, force=force)
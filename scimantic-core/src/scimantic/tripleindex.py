@@ -0,0 +1,352 @@
+"""
+Memory-mapped, dictionary-encoded read-only triple index.
+
+An index is a directory (``project.idx/`` by convention) holding:
+
+- ``terms.bin``: the N-Triples encoding of every distinct term, sorted by
+  bytes and concatenated. A term's ID is its position in this order.
+- ``offsets.npy``: the start offset of each term in terms.bin, plus the end.
+- ``spo.npy``, ``pos.npy``, ``osp.npy``: the triples as term IDs, stored as
+  (3, n) arrays sorted in each permutation's column order.
+- ``index.json``: format version, counts and namespace prefixes.
+
+Files are opened with mmap (NumPy ``mmap_mode="r"``), so opening an index
+reads only file headers and stays near-zero in resident memory. A triple
+pattern is answered by binary search over the permutation whose leading
+columns are bound, touching O(log n) pages. TripleIndex is the low-level
+API; IndexStore adapts it to rdflib's Store interface, so
+``Graph(store=IndexStore(path))`` runs SPARQL like any other graph.
+"""
+
+import json
+import mmap
+import os
+import shutil
+from array import array
+from collections.abc import Iterable, Iterator, Mapping
+from functools import lru_cache
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+from rdflib import Graph, URIRef
+from rdflib.graph import ModificationException
+from rdflib.store import VALID_STORE, Store
+from rdflib.term import Node
+
+from scimantic.ntriples import Triple, decode_term, encode_term
+
+INDEX_SUFFIX = ".idx"
+INDEX_FORMAT = 1
+
+_META = "index.json"
+
+# Permutation name -> triple position (0=s, 1=p, 2=o) stored in each row
+_ORDERS = {"spo": (0, 1, 2), "pos": (1, 2, 0), "osp": (2, 0, 1)}
+
+# Triples decoded per block when iterating a range
+_BLOCK = 65_536
+
+# Decoded terms kept per open index
+_TERM_CACHE = 1 << 16
+
+Pattern = tuple[Node | None, Node | None, Node | None]
+
+
+def is_index(path: str | Path) -> bool:
+    """Whether a path names a triple index directory."""
+    return Path(path).suffix == INDEX_SUFFIX
+
+
+def dictionary_encode(triples: Iterable[Triple]) -> tuple[list[bytes], np.ndarray]:
+    """
+    Dictionary-encodes triples.
+
+    Returns:
+        The sorted N-Triples encodings of all distinct terms (a term's ID is
+        its position) and the distinct triples as an (n, 3) array of term
+        IDs, sorted by subject, predicate, object
+    """
+    ids: dict[bytes, int] = {}
+    rows = array("q")
+    for triple in triples:
+        for term in triple:
+            key = encode_term(term)
+            term_id = ids.get(key)
+            if term_id is None:
+                term_id = ids[key] = len(ids)
+            rows.append(term_id)
+
+    # IDs follow the sorted term encodings, so lookups can binary-search
+    terms = list(ids)
+    del ids
+    order = sorted(range(len(terms)), key=terms.__getitem__)
+    remap = np.empty(len(terms), dtype=np.int64)
+    remap[order] = np.arange(len(terms))
+    dtype = np.uint32 if len(terms) < 2**32 else np.uint64
+    spo = np.unique(
+        remap[np.frombuffer(rows, dtype=np.int64)].reshape(-1, 3), axis=0
+    ).astype(dtype)
+    return [terms[i] for i in order], spo
+
+
+def build_index(
+    triples: Iterable[Triple],
+    directory: str | Path,
+    namespaces: Mapping[str, str] | None = None,
+) -> int:
+    """
+    Builds a triple index, replacing any existing index at the path.
+
+    Args:
+        triples: Triples to index (a Graph, or a stream such as
+            scimantic.ntriples.iter_triples); duplicates are dropped
+        directory: Index directory to write
+        namespaces: Prefix bindings to store with the index
+
+    Returns:
+        Number of distinct triples indexed
+    """
+    sorted_terms, spo = dictionary_encode(triples)
+
+    directory = Path(directory)
+    tmp = directory.with_name(f".{directory.name}.tmp")
+    shutil.rmtree(tmp, ignore_errors=True)
+    tmp.mkdir(parents=True)
+
+    offsets = np.zeros(len(sorted_terms) + 1, dtype=np.uint64)
+    np.cumsum([len(t) for t in sorted_terms], out=offsets[1:])
+    with open(tmp / "terms.bin", "wb") as f:
+        f.writelines(sorted_terms)
+    np.save(tmp / "offsets.npy", offsets)
+
+    for name, columns in _ORDERS.items():
+        permuted = spo[:, columns]
+        if name != "spo":  # np.unique already sorted spo
+            permuted = permuted[np.lexsort(permuted.T[::-1])]
+        np.save(tmp / f"{name}.npy", np.ascontiguousarray(permuted.T))
+
+    meta = {
+        "format": INDEX_FORMAT,
+        "terms": len(sorted_terms),
+        "triples": len(spo),
+        "namespaces": dict(namespaces or {}),
+    }
+    (tmp / _META).write_text(json.dumps(meta, indent=2, sort_keys=True) + "\n")
+
+    if directory.exists():
+        shutil.rmtree(directory)
+    os.replace(tmp, directory)
+    return len(spo)
+
+
+class TripleIndex:
+    """
+    Read-only view of an index directory written by build_index.
+
+    Args:
+        directory: The index directory
+    """
+
+    def __init__(self, directory: str | Path):
+        self.directory = Path(directory)
+        meta = json.loads((self.directory / _META).read_text())
+        if meta.get("format") != INDEX_FORMAT:
+            raise ValueError(
+                f"Unsupported index format {meta.get('format')!r} in {directory}"
+            )
+        self.namespaces: dict[str, str] = dict(meta.get("namespaces", {}))
+        self.term_count: int = meta["terms"]
+        self._triple_count: int = meta["triples"]
+
+        self._offsets = np.load(self.directory / "offsets.npy", mmap_mode="r")
+        self._orders = {
+            name: np.load(self.directory / f"{name}.npy", mmap_mode="r")
+            for name in _ORDERS
+        }
+        self._terms: mmap.mmap | bytes = b""
+        # The map keeps its own descriptor, so the file can be closed at once
+        with open(self.directory / "terms.bin", "rb") as f:
+            if os.fstat(f.fileno()).st_size:
+                self._terms = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._decode = lru_cache(maxsize=_TERM_CACHE)(self._decode_uncached)
+
+    def close(self) -> None:
+        if isinstance(self._terms, mmap.mmap):
+            self._terms.close()
+
+    def __len__(self) -> int:
+        return self._triple_count
+
+    def _encoded(self, term_id: int) -> bytes:
+        return self._terms[
+            int(self._offsets[term_id]) : int(self._offsets[term_id + 1])
+        ]
+
+    def _decode_uncached(self, term_id: int) -> Node:
+        return decode_term(self._encoded(term_id))
+
+    def term(self, term_id: int) -> Node:
+        """Returns the term with an ID."""
+        return self._decode(term_id)
+
+    def term_id(self, term: Node) -> int | None:
+        """Returns the ID of a term, or None if the index does not contain it."""
+        key = encode_term(term)
+        lo, hi = 0, self.term_count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._encoded(mid) < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo < self.term_count and self._encoded(lo) == key:
+            return lo
+        return None
+
+    def _ids(self, pattern: Pattern) -> list[int | None] | None:
+        """Term IDs of a pattern (None where unbound); None if nothing can match."""
+        ids: list[int | None] = []
+        for term in pattern:
+            if term is None:
+                ids.append(None)
+                continue
+            term_id = self.term_id(term)
+            if term_id is None:
+                return None
+            ids.append(term_id)
+        return ids
+
+    def _range(
+        self, ids: list[int | None]
+    ) -> tuple[np.ndarray, tuple[int, int, int], int, int]:
+        """Picks the permutation with bound leading columns and bisects it."""
+        s, p, o = ids
+        if s is not None:
+            name = "osp" if o is not None and p is None else "spo"
+        elif p is not None:
+            name = "pos"
+        elif o is not None:
+            name = "osp"
+        else:
+            name = "spo"
+        columns = _ORDERS[name]
+        data = self._orders[name]
+
+        lo, hi = 0, data.shape[1]
+        for row, position in enumerate(columns):
+            value = ids[position]
+            if value is None:
+                break
+            column = data[row, lo:hi]  # contiguous, so no copy is made
+            key = data.dtype.type(value)
+            lo, hi = (
+                lo + int(np.searchsorted(column, key, side="left")),
+                lo + int(np.searchsorted(column, key, side="right")),
+            )
+        return data, columns, lo, hi
+
+    def count(self, pattern: Pattern) -> int:
+        """Counts the triples matching a pattern without decoding them."""
+        ids = self._ids(pattern)
+        if ids is None:
+            return 0
+        _, _, lo, hi = self._range(ids)
+        return hi - lo
+
+    def triples(self, pattern: Pattern) -> Iterator[Triple]:
+        """
+        Yields the triples matching a pattern.
+
+        Args:
+            pattern: (subject, predicate, object), None matching anything
+        """
+        ids = self._ids(pattern)
+        if ids is None:
+            return
+        data, columns, lo, hi = self._range(ids)
+        rows = [columns.index(position) for position in range(3)]
+        for start in range(lo, hi, _BLOCK):
+            block = np.asarray(data[:, start : min(hi, start + _BLOCK)])
+            s_ids, p_ids, o_ids = (block[row].tolist() for row in rows)
+            for s, p, o in zip(s_ids, p_ids, o_ids, strict=True):
+                yield self.term(s), self.term(p), self.term(o)
+
+
+class IndexStore(Store):
+    """
+    rdflib Store over a TripleIndex (read-only).
+
+    Args:
+        configuration: Path of the index directory to open
+        identifier: Store identifier (unused)
+    """
+
+    context_aware = False
+    formula_aware = False
+    transaction_aware = False
+    graph_aware = False
+
+    def __init__(self, configuration: str | None = None, identifier: Any = None):
+        self.index: TripleIndex | None = None
+        self._namespace: dict[str, URIRef] = {}
+        self._prefix: dict[URIRef, str] = {}
+        super().__init__(configuration, identifier)
+
+    def open(self, configuration: Any, create: bool = False) -> int | None:
+        self.index = TripleIndex(configuration)
+        for prefix, namespace in self.index.namespaces.items():
+            self.bind(prefix, URIRef(namespace))
+        return VALID_STORE
+
+    def close(self, commit_pending_transaction: bool = False) -> None:
+        if self.index is not None:
+            self.index.close()
+            self.index = None
+
+    def _open_index(self) -> TripleIndex:
+        if self.index is None:
+            raise ValueError("IndexStore is not open")
+        return self.index
+
+    def triples(self, triple_pattern, context=None):  # type: ignore[no-untyped-def]
+        for triple in self._open_index().triples(triple_pattern):
+            yield triple, iter(())
+
+    def __len__(self, context: Any = None) -> int:
+        return len(self._open_index())
+
+    def add(self, triple, context, quoted=False):  # type: ignore[no-untyped-def]
+        raise ModificationException()
+
+    def addN(self, quads):  # type: ignore[no-untyped-def]
+        raise ModificationException()
+
+    def remove(self, triple, context=None):  # type: ignore[no-untyped-def]
+        raise ModificationException()
+
+    def bind(self, prefix: str, namespace: URIRef, override: bool = True) -> None:
+        if not override and (prefix in self._namespace or namespace in self._prefix):
+            return
+        old_prefix = self._prefix.pop(namespace, None)
+        if old_prefix is not None:
+            del self._namespace[old_prefix]
+        old_namespace = self._namespace.pop(prefix, None)
+        if old_namespace is not None:
+            del self._prefix[old_namespace]
+        self._namespace[prefix] = namespace
+        self._prefix[namespace] = prefix
+
+    def namespace(self, prefix: str) -> URIRef | None:
+        return self._namespace.get(prefix)
+
+    def prefix(self, namespace: URIRef) -> str | None:
+        return self._prefix.get(namespace)
+
+    def namespaces(self) -> Iterator[tuple[str, URIRef]]:
+        yield from self._namespace.items()
+
+
+def open_index(directory: str | Path) -> Graph:
+    """Opens an index directory as a read-only rdflib Graph."""
+    return Graph(store=IndexStore(str(directory)))
@@ -0,0 +1,128 @@
+"""
+Trusty URI (RA module) computation for nanopublications.
+
+Implements the RA artifact code used by nanopub servers: quads are
+normalized against the nanopub's temporary namespace, sorted, written in the
+RA canonical text form and hashed with SHA-256. This produces the same codes
+as ``nanopub.trustyuri.rdf.RdfHasher.make_hash`` with ``hashstr=" "``, without
+building an rdflib graph or running its comparator-based sort, so many
+nanopubs can be minted offline.
+"""
+
+import base64
+import hashlib
+from collections.abc import Iterable
+
+from rdflib import Literal, URIRef
+from rdflib.term import Node
+
+NP_PURL = "http://purl.org/np/"
+NP_TEMP_PREFIX = "http://purl.org/nanopub/temp/"
+XSD_STRING = "http://www.w3.org/2001/XMLSchema#string"
+
+# Placeholder for the artifact code while hashing (RA uses a single space)
+_HASH_PLACEHOLDER = " "
+
+Quad = tuple[URIRef | None, Node, Node, Node]
+
+
+def _prefix(base_uri: str) -> str:
+    """Namespace the artifact code is appended to (temporary URIs → purl.org/np)."""
+    if base_uri.startswith(NP_TEMP_PREFIX):
+        return NP_PURL
+    return "/".join(base_uri.split("/")[:-1]) + "/"
+
+
+def _normalizer(base_uri: str):
+    """
+    Returns a function mapping URIs in the temporary nanopub namespace to their
+    hash-time form (e.g. ``http://purl.org/np/ #assertion``).
+    """
+    np_uri = base_uri[:-1] if base_uri.endswith(("#", "/")) else base_uri
+    this = _prefix(base_uri) + _HASH_PLACEHOLDER
+
+    def normalize(uri: str) -> str:
+        if uri == np_uri or uri == base_uri:
+            return this
+        if uri.startswith(base_uri):
+            return f"{this}#{uri[len(base_uri) :]}"
+        return uri
+
+    return normalize
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n")
+
+
+def normalize_quads(quads: Iterable[Quad], base_uri: str) -> str:
+    """
+    Returns the RA canonical text of a nanopublication.
+
+    Args:
+        quads: (graph, subject, predicate, object) tuples. Blank nodes must
+            already be replaced by URIs in the nanopub namespace.
+        base_uri: Temporary nanopub namespace used while minting
+            (e.g. ``http://purl.org/nanopub/temp/np#``)
+
+    Returns:
+        One newline-terminated line per term, four lines per quad, in RA order
+    """
+    normalize = _normalizer(base_uri)
+    entries = []
+    for graph, s, p, o in quads:
+        g_text = normalize(str(graph)) if graph is not None else None
+        s_text = normalize(str(s))
+        p_text = normalize(str(p))
+        if isinstance(o, Literal):
+            if o.language is not None:
+                datatype, lang = "", o.language
+                o_line = f"@{lang.lower()} {_escape(o)}\n"
+            else:
+                datatype, lang = str(o.datatype or XSD_STRING), ""
+                o_line = f"^{datatype} {_escape(o)}\n"
+            # Literals sort after URIs; then by value, datatype, language
+            o_key: tuple = (1, str(o).encode(), datatype != "", datatype, lang)
+        else:
+            o_text = normalize(str(o))
+            o_line = o_text + "\n"
+            o_key = (0, o_text.encode())
+
+        key = (
+            g_text is not None,
+            (g_text or "").encode(),
+            s_text.encode(),
+            p_text.encode(),
+            o_key,
+        )
+        line = f"{g_text or ''}\n{s_text}\n{p_text}\n{o_line}"
+        entries.append((key, line))
+
+    entries.sort(key=lambda entry: entry[0])
+    lines = []
+    previous = None
+    for _, line in entries:
+        if line != previous:
+            lines.append(line)
+        previous = line
+    return "".join(lines)
+
+
+def artifact_code(quads: Iterable[Quad], base_uri: str) -> str:
+    """
+    Computes the RA artifact code (``RA`` + base64url SHA-256) of a nanopub.
+
+    Args:
+        quads: Nanopub quads in the temporary namespace (see normalize_quads)
+        base_uri: Temporary nanopub namespace used while minting
+
+    Returns:
+        Artifact code such as ``RAq3...``
+    """
+    digest = hashlib.sha256(normalize_quads(quads, base_uri).encode()).digest()
+    return "RA" + base64.urlsafe_b64encode(digest).decode().rstrip("=")
+
+
+def trusty_uri(code: str, base_uri: str) -> str:
+    """Returns the final nanopub URI for an artifact code."""
+    return _prefix(base_uri) + code
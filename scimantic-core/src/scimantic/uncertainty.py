@@ -0,0 +1,387 @@
+"""
+Monte Carlo uncertainty propagation for Result entities.
+
+A Result's ``scimantic:value`` is a string; the forms understood here are
+
+- ``"28.0134"``: a plain number;
+- ``"28.0134 ± 0.0004"`` (or ``+/-``): a mean and standard uncertainty;
+- ``"28.0134(4)"``: the same in concise notation;
+- ``"[27.5, 28.5]"``: an interval, read as a uniform distribution.
+
+Results whose ``scimantic:hasUncertainty`` is an Aleatory uncertainty model
+are sampled from their distribution (normal for a standard uncertainty).
+Other Results, including those with only Epistemic uncertainty, are held at
+their nominal value: Monte Carlo sampling says nothing about lack of
+knowledge.
+
+Samples are drawn in batches of (inputs × batch size) NumPy arrays and passed
+to a vectorized analysis function, so a million samples of hundreds of
+inputs never need to be held in memory at once. Only the function's outputs
+are kept, to compute summary statistics, which propagate_results writes back
+to the project as new Results derived from their inputs.
+"""
+
+import math
+import re
+import uuid
+from collections.abc import Callable, Iterable, Mapping
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+
+import numpy as np
+from rdflib import BNode, Graph, Literal, Namespace, URIRef
+from rdflib.namespace import PROV, RDF, RDFS, XSD
+from rdflib.term import Node
+
+from scimantic.config import SCIMANTIC_ONTOLOGY_URI
+from scimantic.storage import add_to_project, load_project
+
+SCIMANTIC = Namespace(SCIMANTIC_ONTOLOGY_URI)
+URREF = Namespace("https://raw.githubusercontent.com/adelphi23/urref/469137/URREF.ttl#")
+UNCERTAINTY_NATURE = Namespace(f"{SCIMANTIC_ONTOLOGY_URI}UncertaintyNature#")
+
+NORMAL = "normal"
+UNIFORM = "uniform"
+FIXED = "fixed"
+
+DEFAULT_SAMPLES = 1_000_000
+# Sampled values held per batch (inputs × samples), about 32 MB of float64
+DEFAULT_BATCH_ELEMENTS = 1 << 22
+RESULT_URI_PREFIX = "http://example.org/research/result/"
+
+# Classes read from partitioned projects to find Results and their models
+RESULT_CLASSES = (
+    SCIMANTIC.Result,
+    SCIMANTIC.Aleatory,
+    SCIMANTIC.UncertaintyModel,
+    URREF.Aleatory,
+    URREF.UncertaintyModel,
+)
+
+_NUMBER = r"[-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?"
+_PLUS_MINUS = re.compile(rf"^\s*({_NUMBER})\s*(?:±|\+/-|\+-)\s*({_NUMBER})\s*$")
+_CONCISE = re.compile(r"^\s*([-+]?\d+(?:\.(\d+))?)\((\d+)\)([eE][-+]?\d+)?\s*$")
+_INTERVAL = re.compile(rf"^\s*\[\s*({_NUMBER})\s*,\s*({_NUMBER})\s*\]\s*$")
+_PLAIN = re.compile(rf"^\s*({_NUMBER})\s*$")
+
+AnalysisFunction = Callable[
+    [Mapping[str, np.ndarray]], np.ndarray | Mapping[str, np.ndarray]
+]
+
+
+@dataclass(frozen=True)
+class Distribution:
+    """
+    A sampled input: normal (loc ± scale), uniform (loc ± scale) or fixed.
+
+    Args:
+        kind: NORMAL, UNIFORM or FIXED
+        loc: Mean (or the value of a fixed input)
+        scale: Standard deviation (normal) or half-width (uniform)
+    """
+
+    kind: str
+    loc: float
+    scale: float = 0.0
+
+    def nominal(self) -> "Distribution":
+        return Distribution(FIXED, self.loc)
+
+
+@dataclass(frozen=True)
+class Summary:
+    """Summary statistics of one propagated output."""
+
+    mean: float
+    std: float
+    median: float
+    low: float
+    high: float
+    interval: float
+    samples: int
+
+    @property
+    def value(self) -> str:
+        """The mean and standard uncertainty as a Result value string."""
+        return format_value(self.mean, self.std)
+
+
+def parse_value(text: str) -> Distribution:
+    """
+    Parses a Result value string.
+
+    Raises:
+        ValueError: If the value is not one of the numeric forms above
+    """
+    if match := _PLUS_MINUS.match(text):
+        return Distribution(NORMAL, float(match[1]), abs(float(match[2])))
+    if match := _CONCISE.match(text):
+        exponent = float(f"1{match[4]}") if match[4] else 1.0
+        decimals = len(match[2] or "")
+        scale = int(match[3]) * 10.0**-decimals * exponent
+        return Distribution(NORMAL, float(match[1]) * exponent, scale)
+    if match := _INTERVAL.match(text):
+        low, high = sorted((float(match[1]), float(match[2])))
+        return Distribution(UNIFORM, (low + high) / 2, (high - low) / 2)
+    if match := _PLAIN.match(text):
+        return Distribution(FIXED, float(match[1]))
+    raise ValueError(f"Not a numeric Result value: {text!r}")
+
+
+def format_value(mean: float, std: float) -> str:
+    """Writes mean ± std, rounded to two significant digits of std."""
+    if not (math.isfinite(std) and std > 0):
+        return f"{mean:.12g}"
+    digits = 1 - math.floor(math.log10(std))
+    places = max(digits, 0)
+    return f"{round(mean, digits):.{places}f} ± {round(std, digits):.{places}f}"
+
+
+def is_aleatory(graph: Graph, model: Node | None) -> bool:
+    """Whether an uncertainty model is Aleatory (by class or by nature)."""
+    if model is None:
+        return False
+    if {URREF.Aleatory, SCIMANTIC.Aleatory} & set(graph.objects(model, RDF.type)):
+        return True
+    natures = list(graph.objects(model, URREF.natureOfUncertainty))
+    natures += graph.objects(model, SCIMANTIC.natureOfUncertainty)
+    return any(str(n).rsplit("#", 1)[-1] == "Aleatory" for n in natures)
+
+
+def result_distribution(graph: Graph, result: Node) -> Distribution:
+    """
+    The distribution of a Result's value.
+
+    Raises:
+        ValueError: If the Result has no numeric value
+    """
+    value = graph.value(result, SCIMANTIC.value)
+    if value is None:
+        raise ValueError(f"{result} has no scimantic:value")
+    distribution = parse_value(str(value))
+    if not is_aleatory(graph, graph.value(result, SCIMANTIC.hasUncertainty)):
+        return distribution.nominal()
+    return distribution
+
+
+class _Sampler:
+    """Draws batches of samples for a fixed set of input distributions."""
+
+    def __init__(self, distributions: list[Distribution], rng: np.random.Generator):
+        # Rows are grouped by kind so each kind is drawn as one contiguous block
+        order = {NORMAL: 0, UNIFORM: 1, FIXED: 2}
+        self.rows = sorted(
+            range(len(distributions)), key=lambda i: order[distributions[i].kind]
+        )
+        ordered = [distributions[i] for i in self.rows]
+        kinds = [d.kind for d in ordered]
+        self.normal = kinds.count(NORMAL)
+        self.random = self.normal + kinds.count(UNIFORM)
+        self.loc = np.array([d.loc for d in ordered])[:, None]
+        self.scale = np.array([d.scale for d in ordered])[:, None]
+        self.rng = rng
+        self._buffer = np.empty((len(ordered), 0))
+
+    def draw(self, size: int) -> np.ndarray:
+        """Samples as a (row, sample) array, rows in self.rows order."""
+        if self._buffer.shape[1] != size:
+            self._buffer = np.empty((len(self.loc), size))
+            self._buffer[self.random :] = self.loc[self.random :]
+        buffer = self._buffer
+        normal, random = self.normal, self.random
+        if normal:
+            self.rng.standard_normal(out=buffer[:normal])
+        if random > normal:
+            buffer[normal:random] = self.rng.uniform(-1.0, 1.0, (random - normal, size))
+        buffer[:random] *= self.scale[:random]
+        buffer[:random] += self.loc[:random]
+        return buffer
+
+
+def propagate(
+    function: AnalysisFunction,
+    inputs: Mapping[str, Distribution],
+    samples: int = DEFAULT_SAMPLES,
+    seed: int | None = None,
+    batch_size: int | None = None,
+    interval: float = 0.95,
+) -> dict[str, Summary]:
+    """
+    Propagates input distributions through a vectorized analysis function.
+
+    Args:
+        function: Called once per batch with {input name: samples array}; it
+            returns an array of outputs per sample, or {output name: array}.
+            Input arrays are read-only and reused between batches.
+        inputs: Distribution of each named input
+        samples: Number of Monte Carlo samples
+        seed: Seed of the NumPy random generator (for reproducible results)
+        batch_size: Samples per batch (default: about 4M values per batch)
+        interval: Coverage of the reported central interval
+
+    Returns:
+        Summary statistics per output ("value" for a single array output)
+    """
+    names = list(inputs)
+    sampler = _Sampler([inputs[name] for name in names], np.random.default_rng(seed))
+    if batch_size is None:
+        batch_size = max(1024, DEFAULT_BATCH_ELEMENTS // max(len(names), 1))
+
+    outputs: dict[str, np.ndarray] = {}
+    for start in range(0, samples, batch_size):
+        size = min(batch_size, samples - start)
+        batch = sampler.draw(size)
+        arguments = {}
+        for position, row in enumerate(sampler.rows):
+            view = batch[position]
+            view.flags.writeable = False
+            arguments[names[row]] = view
+        result = function(arguments)
+        produced = result if isinstance(result, Mapping) else {"value": result}
+        for name, values in produced.items():
+            if name not in outputs:
+                outputs[name] = np.empty(samples)
+            outputs[name][start : start + size] = values
+
+    tail = (1.0 - interval) / 2
+    summaries = {}
+    for name, values in outputs.items():
+        low, median, high = np.quantile(values, [tail, 0.5, 1.0 - tail])
+        summaries[name] = Summary(
+            mean=float(values.mean()),
+            std=float(values.std(ddof=1)) if samples > 1 else 0.0,
+            median=float(median),
+            low=float(low),
+            high=float(high),
+            interval=interval,
+            samples=samples,
+        )
+    return summaries
+
+
+def results_graph(
+    summaries: Mapping[str, Summary],
+    inputs: Iterable[Node],
+    units: Mapping[str, str] | str | None = None,
+    agent: str | None = None,
+    seed: int | None = None,
+) -> tuple[Graph, dict[str, URIRef]]:
+    """
+    Builds new Results for propagated outputs, with their provenance.
+
+    Each output becomes a scimantic:Result whose value is "mean ± std", with
+    an Aleatory uncertainty model, generated by one scimantic:Analysis that
+    used the input Results, and derived from those inputs.
+
+    Args:
+        summaries: Output statistics (see propagate)
+        inputs: URIs of the input Results
+        units: Unit of every output, or per output name
+        agent: Agent URI the Results are attributed to
+        seed: Random seed, recorded on the Analysis
+
+    Returns:
+        The graph and the URI of each output's Result
+    """
+    g = Graph()
+    g.bind("scimantic", SCIMANTIC)
+    g.bind("prov", PROV)
+    g.bind("urref", URREF)
+    now = Literal(datetime.now(timezone.utc), datatype=XSD.dateTime)
+    inputs = list(inputs)
+
+    analysis = URIRef(f"{RESULT_URI_PREFIX}analysis/{uuid.uuid4().hex}")
+    samples = next(iter(summaries.values())).samples if summaries else 0
+    g.add((analysis, RDF.type, SCIMANTIC.Analysis))
+    g.add((analysis, RDF.type, PROV.Activity))
+    g.add((analysis, RDFS.label, Literal("Monte Carlo uncertainty propagation")))
+    comment = f"{samples} samples of {len(inputs)} input Results"
+    if seed is not None:
+        comment += f" (seed {seed})"
+    g.add((analysis, RDFS.comment, Literal(comment)))
+    g.add((analysis, PROV.endedAtTime, now))
+    for source in inputs:
+        g.add((analysis, PROV.used, source))
+    if agent:
+        g.add((analysis, PROV.wasAssociatedWith, URIRef(agent)))
+        g.add((URIRef(agent), RDF.type, PROV.Agent))
+
+    uris = {}
+    for name, summary in summaries.items():
+        result = URIRef(f"{RESULT_URI_PREFIX}{uuid.uuid4().hex}")
+        unit = units.get(name) if isinstance(units, Mapping) else units
+        label = (
+            f"{name}: {summary.value}{f' {unit}' if unit else ''} "
+            f"({summary.interval:.0%} interval {summary.low:.6g} to "
+            f"{summary.high:.6g}, {summary.samples} samples)"
+        )
+        g.add((result, RDF.type, SCIMANTIC.Result))
+        g.add((result, RDF.type, PROV.Entity))
+        g.add((result, RDFS.label, Literal(label)))
+        g.add((result, SCIMANTIC.value, Literal(summary.value)))
+        if unit:
+            g.add((result, SCIMANTIC.unit, Literal(unit)))
+        g.add((result, PROV.wasGeneratedBy, analysis))
+        g.add((result, PROV.generatedAtTime, now))
+        for source in inputs:
+            g.add((result, PROV.wasDerivedFrom, source))
+        if agent:
+            g.add((result, PROV.wasAttributedTo, URIRef(agent)))
+
+        model = BNode()
+        g.add((result, SCIMANTIC.hasUncertainty, model))
+        g.add((model, RDF.type, URREF.Aleatory))
+        g.add((model, URREF.natureOfUncertainty, UNCERTAINTY_NATURE.Aleatory))
+        uris[name] = result
+    return g, uris
+
+
+def propagate_results(
+    project_path: str | Path,
+    function: AnalysisFunction,
+    inputs: Mapping[str, str],
+    units: Mapping[str, str] | str | None = None,
+    agent: str | None = None,
+    samples: int = DEFAULT_SAMPLES,
+    seed: int | None = None,
+    interval: float = 0.95,
+) -> dict[str, str]:
+    """
+    Propagates the uncertainty of project Results and records the outcome.
+
+    Example:
+        >>> propagate_results(
+        ...     "project.ttl",
+        ...     lambda x: x["mass"] / x["volume"],
+        ...     {"mass": mass_uri, "volume": volume_uri},
+        ...     units="g/cm^3",
+        ... )
+
+    Args:
+        project_path: Project holding the input Results
+        function: Vectorized analysis function (see propagate)
+        inputs: Result URI of each input name
+        units: Unit of every output, or per output name
+        agent: Agent URI the new Results are attributed to
+        samples: Number of Monte Carlo samples
+        seed: Seed of the NumPy random generator
+        interval: Coverage of the interval reported in each Result's label
+
+    Returns:
+        URI of the new Result per output name
+    """
+    graph = load_project(project_path, classes=RESULT_CLASSES)
+    distributions = {
+        name: result_distribution(graph, URIRef(uri)) for name, uri in inputs.items()
+    }
+    summaries = propagate(function, distributions, samples, seed, interval=interval)
+    g, uris = results_graph(
+        summaries,
+        [URIRef(uri) for uri in dict.fromkeys(inputs.values())],
+        units=units,
+        agent=agent,
+        seed=seed,
+    )
+    add_to_project(g, project_path)
+    return {name: str(uri) for name, uri in uris.items()}
@@ -1,11 +1,22 @@
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
 import pytest
 from pathlib import Path
-from rdflib import Graph
 from pyshacl import validate
 
+from scimantic.graph_cache import load_graph
+
+
+@pytest.fixture(scope="session")
+def graph_cache_dir(tmp_path_factory):
+    """Parsed-graph cache shared by the session, outside the repository."""
+    return tmp_path_factory.mktemp("graphcache")
+
 
 @pytest.fixture(scope="session")
-def ontology_graph():
+def ontology_graph(graph_cache_dir):
     """Load the Scimantic ontology once per session."""
     # Path to scimantic-ontology sibling package
     ontology_path = (
@@ -17,13 +28,11 @@ def ontology_graph():
     if not ontology_path.exists():
         pytest.fail(f"Ontology file not found at {ontology_path}")
 
-    g = Graph()
-    g.parse(str(ontology_path), format="turtle")
-    return g
+    return load_graph(ontology_path, cache_dir=graph_cache_dir)
 
 
 @pytest.fixture(scope="session")
-def shacl_graph():
+def shacl_graph(graph_cache_dir):
     """Load the SHACL shapes once per session."""
     shapes_path = (
         Path(__file__).parent.parent.parent
@@ -35,9 +44,7 @@ def shacl_graph():
     if not shapes_path.exists():
         pytest.fail(f"SHACL shapes file not found at {shapes_path}")
 
-    g = Graph()
-    g.parse(str(shapes_path), format="turtle")
-    return g
+    return load_graph(shapes_path, cache_dir=graph_cache_dir)
 
 
 @pytest.fixture
@@ -64,3 +71,93 @@ def validate_with_shacl(ontology_graph, shacl_graph):
         return True
 
     return _validate
+
+
+class _NanopubServer:
+    """Local stand-in for a nanopub server, recording uploads."""
+
+    def __init__(self):
+        self.received: list[bytes] = []
+        self.content_types: list[str] = []
+        self.statuses: list[int] = []  # scripted responses, then 201
+        self.delay = 0.0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        lock = threading.Lock()
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers["Content-Length"]))
+                with lock:
+                    server.in_flight += 1
+                    server.max_in_flight = max(server.max_in_flight, server.in_flight)
+                    status = server.statuses.pop(0) if server.statuses else 201
+                    if status < 300:
+                        server.received.append(body)
+                        server.content_types.append(self.headers["Content-Type"])
+                time.sleep(server.delay)
+                with lock:
+                    server.in_flight -= 1
+                self.send_response(status)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.httpd.server_port}/"
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+
+    def close(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+@pytest.fixture
+def nanopub_server():
+    """A local nanopub server stand-in, for publishing tests."""
+    server = _NanopubServer()
+    yield server
+    server.close()
+
+
+GAUSSIAN_LOG = """\
+ Entering Gaussian System, Link 0=g16
+ Gaussian 16:  ES64L-G16RevA.03 25-Dec-2016
+ Gaussian, Inc.  All Rights Reserved.
+ #P B3LYP/6-31G(d) opt
+
+ Charge =  0 Multiplicity = 1
+                          Standard orientation:
+ ---------------------------------------------------------------------
+ Center     Atomic      Atomic             Coordinates (Angstroms)
+ Number     Number       Type             X           Y           Z
+ ---------------------------------------------------------------------
+      1          8           0        0.000000    0.000000    {z:.6f}
+      2          1           0        0.000000    0.763239   -0.477047
+      3          1           0        0.000000   -0.763239   -0.477047
+ ---------------------------------------------------------------------
+ SCF Done:  E(RB3LYP) =  {energy:.7f}     A.U. after   10 cycles
+ Job cpu time:       0 days  0 hours  1 minutes 23.4 seconds.
+ Elapsed time:       0 days  0 hours  0 minutes 12.0 seconds.
+ Normal termination of Gaussian 16 at Mon Jan  1 00:00:00 2025.
+"""
+
+
+@pytest.fixture
+def outputs(tmp_path):
+    """
+    A directory of Gaussian outputs (runs/batch/water{0,1,2}.log, SCF
+    energies -76.4, -77.4, -78.4 hartree) plus one file cclib cannot parse.
+    """
+    runs = tmp_path / "runs"
+    (runs / "batch").mkdir(parents=True)
+    for i in range(3):
+        path = runs / "batch" / f"water{i}.log"
+        path.write_text(GAUSSIAN_LOG.format(z=0.119262 + i * 1e-3, energy=-76.4 - i))
+    (runs / "notes.txt").write_text("not an output")
+    (runs / "broken.out").write_text("nothing to see here\n")
+    return runs
@@ -0,0 +1,203 @@
+"""
+Unit tests for the interval index of Annotation selectors.
+"""
+
+import json
+import random
+
+import pytest
+from rdflib import BNode, Graph, Literal, Namespace, URIRef
+from rdflib.namespace import RDF
+
+from scimantic import annotations
+from scimantic.annotations import (
+    AnnotationIndex,
+    _annotation_rows,
+    index_path,
+    load_annotation_index,
+    position,
+)
+from scimantic.config import DEFAULT_ANNOTATION_CACHE_DIR
+from scimantic.storage import add_to_project, save_project
+
+EX = Namespace("http://example.org/research/")
+OA = Namespace("http://www.w3.org/ns/oa#")
+SCIMANTIC = Namespace("http://scimantic.io/")
+PAPER = "https://doi.org/10.1063/1.555546"
+NOTES = "file:///notes.txt"
+
+
+def _annotation(
+    g, name, target, start=None, end=None, page=None, exact=None, selector=None
+):
+    uri = EX[f"annotation/{name}"]
+    selector = EX[f"selector/{name}"] if selector is None else selector
+    g.add((uri, RDF.type, OA.Annotation))
+    g.add((uri, OA.hasTarget, URIRef(target)))
+    g.add((uri, OA.hasSelector, selector))
+    g.add((selector, RDF.type, OA.TextQuoteSelector))
+    for predicate, value in (
+        (OA.start, start),
+        (OA.end, end),
+        (SCIMANTIC.pageNumber, page),
+        (OA.exact, exact),
+    ):
+        if value is not None:
+            g.add((selector, predicate, Literal(value)))
+    return uri
+
+
+@pytest.fixture
+def graph():
+    g = Graph()
+    _annotation(g, "intro", PAPER, 0, 120, page=1)
+    _annotation(g, "claim", PAPER, 100, 180, page=1)
+    _annotation(g, "quote", PAPER, 40, page=2, exact="N2 is bound")
+    _annotation(g, "figure", PAPER, page=3)
+    _annotation(g, "note", NOTES, 10, 20)
+    _annotation(g, "unplaced", NOTES, exact="somewhere")
+    return g
+
+
+@pytest.fixture(params=["project.ttl", "project.nt", "graph"])
+def project(request, graph, tmp_path):
+    path = tmp_path / request.param
+    save_project(graph, path, partitioned=request.param == "graph")
+    return path
+
+
+def _names(index, rows):
+    return [str(index.annotations[row]).rsplit("/", 1)[1] for row in rows]
+
+
+class TestQuery:
+    def test_overlapping_and_contained(self, project):
+        index = load_annotation_index(project)
+
+        assert _names(index, index.query(PAPER, 110, 150, page=1)) == [
+            "intro",
+            "claim",
+        ]
+        assert _names(index, index.query(PAPER, 90, 200, page=1, contained=True)) == [
+            "claim"
+        ]
+
+    def test_whole_pages_and_documents(self, project):
+        index = load_annotation_index(project)
+
+        assert _names(index, index.query(PAPER, page=2, last_page=3)) == [
+            "quote",
+            "figure",
+        ]
+        assert len(index.query(PAPER)) == 4
+        assert _names(index, index.query(NOTES)) == ["note"]
+        assert len(index.query("https://example.org/unknown")) == 0
+
+    def test_end_from_exact_quote(self, project):
+        index = load_annotation_index(project)
+
+        (row,) = index.query(PAPER, 50, 51, page=2)
+
+        assert index.highs[row] == position(2, 40 + len("N2 is bound"))
+        assert index.ends[row] == -1
+
+    def test_matches_a_scan(self):
+        rng = random.Random(7)
+        rows = {}
+        for i in range(500):
+            start = rng.randrange(10_000)
+            rows[f"s{i}"] = {
+                "annotation": f"a{i}",
+                "target": rng.choice([PAPER, NOTES]),
+                "page": rng.choice([-1, 1, 2]),
+                "start": start,
+                "end": start + rng.randrange(1, 400),
+                "length": -1,
+            }
+        index = AnnotationIndex.from_rows(rows)
+        for _ in range(100):
+            low = rng.randrange(10_000)
+            high = low + rng.randrange(1, 800)
+            page = rng.choice([None, 1, 2])
+            for contained in (False, True):
+                expected = {
+                    s
+                    for s, row in rows.items()
+                    if row["target"] == PAPER
+                    and row["page"] == (page or -1)
+                    and (
+                        low <= row["start"] and row["end"] <= high
+                        if contained
+                        else row["start"] < high and row["end"] > low
+                    )
+                }
+                found = index.query(PAPER, low, high, page, contained=contained)
+                assert set(index.selectors[found]) == expected
+
+
+class TestMaintenance:
+    def test_index_is_updated_incrementally(self, project, monkeypatch):
+        load_annotation_index(project)
+
+        def no_rebuild(path):
+            raise AssertionError("the index should be merged, not rebuilt")
+
+        monkeypatch.setattr(annotations, "build_annotation_index", no_rebuild)
+        delta = Graph()
+        _annotation(delta, "results", PAPER, 10, 30, page=2)
+        delta.add((EX["selector/unplaced"], OA.start, Literal(0)))
+        add_to_project(delta, project)
+
+        index = load_annotation_index(project)
+        assert len(index) == 7
+        assert _names(index, index.query(PAPER, 0, 50, page=2)) == [
+            "results",
+            "quote",
+        ]
+        assert _names(index, index.query(NOTES, 0, 5)) == ["unplaced"]
+
+    def test_stale_index_is_rebuilt(self, project):
+        load_annotation_index(project)
+        g = Graph()
+        _annotation(g, "only", NOTES, 0, 5)
+
+        save_project(g, project)
+
+        assert _names(load_annotation_index(project), range(1)) == ["only"]
+        assert index_path(project).exists()
+        assert (
+            index_path(project).parent == project.parent / DEFAULT_ANNOTATION_CACHE_DIR
+        )
+
+    def test_blank_node_selectors(self, tmp_path):
+        g = Graph()
+        _annotation(g, "highlight", NOTES, 3, 8, selector=BNode())
+        save_project(g, tmp_path / "project.ttl")
+
+        index = load_annotation_index(tmp_path / "project.ttl")
+
+        assert _names(index, index.query(NOTES, 0, 4)) == ["highlight"]
+
+    def test_rows_round_trip(self, graph):
+        rows = _annotation_rows(graph, set(graph.subjects(RDF.type, OA.Annotation)))
+
+        assert AnnotationIndex.from_rows(rows).rows() == rows
+
+
+def test_query_annotations_tool(project):
+    from scimantic.mcp import query_annotations
+
+    data = json.loads(
+        query_annotations(PAPER, 110, 150, page=1, limit=1, project_path=str(project))
+    )
+
+    assert data["count"] == 2
+    assert data["annotations"] == [
+        {
+            "uri": str(EX["annotation/intro"]),
+            "selector": str(EX["selector/intro"]),
+            "page": 1,
+            "start": 0,
+            "end": 120,
+        }
+    ]
@@ -0,0 +1,160 @@
+"""
+Unit tests for nanopub archives (per-nanopub named graphs with byte offsets).
+"""
+
+import json
+from datetime import datetime, timezone
+
+import pytest
+from rdflib import Graph, Literal, Namespace, URIRef
+from rdflib.namespace import RDF, XSD
+
+from scimantic.archive import NanopubArchive, is_archive
+from scimantic.publish import NP, assemble_nanopub
+from scimantic.storage import add_to_project, convert_project, load_project
+
+EX = Namespace("http://example.org/research/")
+SCIMANTIC = Namespace("http://scimantic.io/")
+CREATED = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+
+def _minted(name):
+    assertion = Graph()
+    assertion.add((EX[name], RDF.type, SCIMANTIC.Hypothesis))
+    assertion.add((EX[name], SCIMANTIC.value, Literal("28.0134", datatype=XSD.double)))
+    assertion.add((EX[name], SCIMANTIC.note, Literal('two\nlines, "quoted"')))
+    return assemble_nanopub(assertion, created=CREATED)
+
+
+@pytest.fixture
+def minted():
+    return [_minted(f"h{i}") for i in range(3)]
+
+
+@pytest.fixture(params=["nq", "trig"])
+def archive(request, minted, tmp_path):
+    archive = NanopubArchive(tmp_path / f"project.{request.param}")
+    archive.append(minted)
+    return archive
+
+
+def test_is_archive():
+    assert is_archive("project.nq")
+    assert is_archive("project.trig")
+    assert not is_archive("project.nt")
+
+
+class TestNanopubArchive:
+    def test_append_indexes_graphs_and_nanopubs(self, archive, minted):
+        assert archive.nanopubs() == [m.uri for m in minted]
+        assert len(archive.graphs()) == 4 * len(minted)
+        assert f"{minted[0].uri}#assertion" in archive
+
+    def test_append_skips_nanopubs_already_stored(self, archive, minted):
+        size = archive.path.stat().st_size
+
+        assert archive.append(minted) == []
+        assert archive.path.stat().st_size == size
+
+    def test_reads_one_nanopub(self, archive, minted):
+        nanopub = archive.nanopub(minted[1].uri)
+
+        expected = minted[1].to_dataset()
+        assert set(nanopub.quads()) == set(expected.quads())
+
+    def test_reads_only_the_requested_bytes(self, archive, minted):
+        data = archive.read(minted[1].uri)
+
+        assert minted[1].uri.encode() in data
+        assert minted[0].uri.encode() not in data
+        assert minted[2].uri.encode() not in data
+
+    def test_assertion_keeps_lexical_forms(self, archive, minted):
+        assertion = archive.assertion(minted[2].uri)
+
+        assert assertion.identifier == minted[2].assertion_uri
+        value = assertion.value(EX.h2, SCIMANTIC.value)
+        assert str(value) == "28.0134"
+        assert str(assertion.value(EX.h2, SCIMANTIC.note)) == 'two\nlines, "quoted"'
+
+    def test_unknown_uri(self, archive):
+        with pytest.raises(KeyError):
+            archive.read("http://purl.org/np/RAmissing")
+
+    def test_offsets_file_is_rebuilt(self, archive):
+        spans = dict(archive._spans)
+        archive.offsets_path.unlink()
+
+        reopened = NanopubArchive(archive.path)
+
+        assert reopened._spans == spans
+        assert reopened.offsets_path.exists()
+
+    def test_unindexed_tail_is_indexed_on_open(self, archive):
+        # An append that stopped before its offsets were written
+        late = _minted("late")
+        with open(archive.path, "ab") as f:
+            for graph in sorted({g for g, *_ in late.quads}):
+                triples = [(s, p, o) for g, s, p, o in late.quads if g == graph]
+                f.write(archive._block(graph, triples))
+
+        reopened = NanopubArchive(archive.path)
+
+        assert reopened.nanopubs()[-1] == late.uri
+        assert len(reopened.assertion(late.uri)) == 3
+
+
+class TestArchiveProjects:
+    def test_load_project_is_the_union_of_all_graphs(self, archive, minted):
+        graph = load_project(archive.path)
+
+        assert set(graph.subjects(RDF.type, SCIMANTIC.Hypothesis)) == {
+            EX.h0,
+            EX.h1,
+            EX.h2,
+        }
+        assert len(set(graph.subjects(RDF.type, NP.Nanopublication))) == 3
+
+    def test_add_to_project_appends_a_nanopub(self, tmp_path):
+        project = tmp_path / "project.nq"
+        delta = Graph()
+        delta.add((EX.q1, RDF.type, SCIMANTIC.Question))
+
+        add_to_project(delta, project)
+        add_to_project(delta, project)
+
+        archive = NanopubArchive(project)
+        assert len(archive) == 2
+        (assertion,) = {len(archive.assertion(uri)) for uri in archive.nanopubs()}
+        assert assertion == 1
+
+    def test_convert_between_nquads_and_trig(self, archive, minted, tmp_path):
+        destination = (
+            tmp_path / "copy.trig"
+            if archive.format == "nquads"
+            else tmp_path / "copy.nq"
+        )
+
+        convert_project(archive.path, destination)
+
+        copy = NanopubArchive(destination)
+        assert set(copy.nanopubs()) == {m.uri for m in minted}
+        assert set(copy.nanopub(minted[0].uri).quads()) == set(
+            archive.nanopub(minted[0].uri).quads()
+        )
+
+    def test_mcp_tools_read_archives(self, tmp_path):
+        from scimantic.mcp import add_question, get_provenance_graph_json
+
+        project = tmp_path / "project.trig"
+        add_question(
+            label="Is N2 linear?",
+            agent="http://example.org/agent/test",
+            project_path=str(project),
+        )
+
+        data = json.loads(get_provenance_graph_json(str(project)))
+
+        assert [q["label"] for q in data["questions"]] == ["Is N2 linear?"]
+        assert len(NanopubArchive(project)) == 1
+        assert URIRef(data["questions"][0]["uri"]) in load_project(project).subjects()
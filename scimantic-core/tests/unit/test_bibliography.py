@@ -0,0 +1,275 @@
+"""
+Unit tests for streaming Evidence import from reference libraries.
+"""
+
+import json
+
+import pytest
+from rdflib import Literal, Namespace, URIRef
+from rdflib.namespace import DCTERMS, PROV, RDF
+
+from scimantic import bibliography, cli
+from scimantic.bibliography import (
+    format_citation,
+    import_evidence,
+    normalize_citation,
+    normalize_doi,
+    project_evidence_keys,
+    read_records,
+)
+from scimantic.storage import load_project, save_project
+
+SCIMANTIC = Namespace("http://scimantic.io/")
+AGENT = "http://example.org/agent/test"
+
+BIBTEX = r"""
+@comment{exported by a reference manager}
+@string{jcp = "J. Chem. Phys."}
+
+@article{huber1979,
+  author = {Huber, K. P. and Herzberg, G.},
+  title = {Constants of {Diatomic} Molecules},
+  journal = {Molecular Spectra and Molecular Structure},
+  year = 1979,
+  doi = {10.1007/978-1-4757-0961-2},
+  abstract = {Spectroscopic constants of N$_2$ and other diatomics.}
+}
+
+@Article(lofthus1977,
+  author = "Lofthus, A. and Krupenie, P. H.",
+  title = "The spectrum of molecular nitrogen (N{\"o}te)",
+  journal = "J. Phys. Chem. Ref. Data",
+  year = "1977",
+  url = {https://doi.org/10.1063/1.555546}
+)
+"""
+
+RIS = """\
+TY  - JOUR
+AU  - Huber, K. P.
+AU  - Herzberg, G.
+TI  - Constants of Diatomic
+  Molecules
+PY  - 1979
+DO  - https://doi.org/10.1007/978-1-4757-0961-2
+ER  -
+TY  - JOUR
+AU  - Curtiss, L. A.
+AU  - Raghavachari, K.
+AU  - Pople, J. A.
+TI  - Gaussian-2 theory
+JO  - J. Chem. Phys.
+PY  - 1991
+AB  - G2 energies of first-row molecules.
+ER  -
+"""
+
+CSV = """\
+Title,Authors,Year,Journal,DOI,Abstract
+Gaussian-2 theory,Curtiss; Raghavachari; Pople,1991,J. Chem. Phys.,,
+Untitled,,,,,
+A new benchmark,Smith,2020,J. Chem. Theory Comput.,10.1021/acs.jctc.0c00001,
+"""
+
+
+def _write(tmp_path, name, text):
+    path = tmp_path / name
+    path.write_text(text)
+    return path
+
+
+class TestReaders:
+    def test_bibtex(self, tmp_path):
+        records = list(read_records(_write(tmp_path, "refs.bib", BIBTEX)))
+
+        assert len(records) == 2
+        assert records[0]["authors"] == ["Huber, K. P.", "Herzberg, G."]
+        assert records[0]["title"] == "Constants of Diatomic Molecules"
+        assert records[0]["year"] == "1979"
+        assert records[1]["title"] == "The spectrum of molecular nitrogen (Note)"
+        assert records[1]["url"] == "https://doi.org/10.1063/1.555546"
+
+    def test_ris_joins_continuation_lines(self, tmp_path):
+        records = list(read_records(_write(tmp_path, "refs.ris", RIS)))
+
+        assert [r["title"] for r in records] == [
+            "Constants of Diatomic Molecules",
+            "Gaussian-2 theory",
+        ]
+        assert records[1]["authors"] == [
+            "Curtiss, L. A.",
+            "Raghavachari, K.",
+            "Pople, J. A.",
+        ]
+
+    def test_csv(self, tmp_path):
+        records = list(read_records(_write(tmp_path, "refs.csv", CSV)))
+
+        assert records[0]["authors"] == ["Curtiss", "Raghavachari", "Pople"]
+        assert "doi" not in records[0]
+
+    def test_ndjson_with_csl_authors(self, tmp_path):
+        line = {
+            "title": "Gaussian-2 theory",
+            "author": [{"family": "Curtiss", "given": "L. A."}],
+            "container-title": ["J. Chem. Phys."],
+            "DOI": "10.1063/1.460205",
+        }
+        path = _write(tmp_path, "refs.ndjson", json.dumps(line) + "\n\n")
+
+        (record,) = read_records(path)
+
+        assert record["authors"] == ["Curtiss, L. A."]
+        assert record["journal"] == "J. Chem. Phys."
+        assert record["doi"] == "10.1063/1.460205"
+
+    def test_unknown_format(self, tmp_path):
+        with pytest.raises(ValueError, match="Unknown reference format"):
+            list(read_records(_write(tmp_path, "refs.txt", "")))
+
+
+class TestNormalization:
+    @pytest.mark.parametrize(
+        "text",
+        [
+            "10.1063/1.460205",
+            "doi:10.1063/1.460205",
+            "https://doi.org/10.1063/1.460205.",
+            "https://dx.doi.org/10.1063/1.460205",
+        ],
+    )
+    def test_doi(self, text):
+        assert normalize_doi(text) == "10.1063/1.460205"
+
+    def test_citation(self):
+        assert normalize_citation("Huber,  K.P. {Constants}") == normalize_citation(
+            "huber k p constants"
+        )
+
+    def test_format_citation(self):
+        record = {
+            "authors": ["Curtiss", "Raghavachari", "Pople"],
+            "year": "1991",
+            "title": "Gaussian-2 theory",
+            "journal": "J. Chem. Phys.",
+        }
+
+        assert format_citation(record) == (
+            "Curtiss et al. (1991). Gaussian-2 theory. J. Chem. Phys."
+        )
+
+
+class TestImportEvidence:
+    def test_records_become_evidence(self, tmp_path):
+        project = tmp_path / "project.ttl"
+
+        report = import_evidence(
+            _write(tmp_path, "refs.bib", BIBTEX), project, agent=AGENT
+        )
+
+        g = load_project(project)
+        assert len(report.added) == 2
+        huber = next(
+            e
+            for e in report.added
+            if "Huber" in str(g.value(e, DCTERMS.bibliographicCitation))
+        )
+        assert (huber, RDF.type, SCIMANTIC.Evidence) in g
+        assert str(g.value(huber, DCTERMS.source)) == (
+            "https://doi.org/10.1007/978-1-4757-0961-2"
+        )
+        assert str(g.value(huber, SCIMANTIC.content)).startswith("Spectroscopic")
+        assert g.value(huber, PROV.wasAttributedTo) == URIRef(AGENT)
+
+    def test_duplicates_within_and_across_imports(self, tmp_path):
+        project = tmp_path / "project.nt"
+        import_evidence(_write(tmp_path, "refs.bib", BIBTEX), project)
+
+        report = import_evidence(_write(tmp_path, "refs.ris", RIS), project)
+        again = import_evidence(_write(tmp_path, "refs.csv", CSV), project)
+
+        # Huber matches by DOI; Curtiss is new
+        assert (len(report.added), report.duplicates) == (1, 1)
+        # Curtiss matches by citation
+        assert (len(again.added), again.duplicates) == (2, 1)
+        g = load_project(project)
+        assert len(set(g.subjects(RDF.type, SCIMANTIC.Evidence))) == 5
+
+    def test_invalid_records_are_reported(self, tmp_path):
+        path = _write(tmp_path, "refs.csv", "Title,Year\n,2020\nKept,2021\n")
+
+        report = import_evidence(path, tmp_path / "project.ttl")
+
+        assert report.invalid == [(1, "Record has no abstract, title or content")]
+        assert len(report.added) == 1
+
+    def test_malformed_ndjson_lines_are_reported(self, tmp_path):
+        lines = ['{"title": "Kept"}', '{"title": ', "[1, 2]", '{"title": "Also kept"}']
+        path = _write(tmp_path, "refs.ndjson", "\n".join(lines) + "\n")
+
+        report = import_evidence(path, tmp_path / "project.ttl")
+
+        assert [number for number, _ in report.invalid] == [2, 3]
+        assert "not valid JSON" in report.invalid[0][1]
+        assert "not a JSON object" in report.invalid[1][1]
+        assert len(report.added) == 2
+        assert all(len(str(e).rsplit("/", 1)[1]) == 32 for e in report.added)
+
+    def test_every_citation_and_source_is_a_duplicate_key(self, tmp_path):
+        project = tmp_path / "project.ttl"
+        import_evidence(_write(tmp_path, "refs.bib", BIBTEX), project)
+        g = load_project(project)
+        evidence = next(iter(g.subjects(RDF.type, SCIMANTIC.Evidence)))
+        g.add((evidence, DCTERMS.bibliographicCitation, Literal("Second citation")))
+        g.add((evidence, DCTERMS.source, URIRef("https://doi.org/10.1000/second")))
+        save_project(g, project)
+
+        keys = project_evidence_keys(project)
+
+        assert "citation:second citation" in keys
+        assert "doi:10.1000/second" in keys
+
+    def test_batches_report_progress_and_write_once(self, tmp_path, monkeypatch):
+        rows = "".join(f"Paper {i},Author {i},2020\n" for i in range(25))
+        path = _write(tmp_path, "refs.csv", "Title,Author,Year\n" + rows)
+        writes, calls = [], []
+        monkeypatch.setattr(
+            bibliography, "add_to_project", lambda g, p: writes.append(len(g))
+        )
+
+        import_evidence(
+            path,
+            tmp_path / "project.ttl",
+            batch_size=10,
+            progress=lambda read, added: calls.append((read, added)),
+        )
+
+        assert calls == [(10, 10), (20, 20), (25, 25)]
+        assert writes == [25 * 7]
+
+    def test_cli(self, tmp_path, capsys):
+        project = tmp_path / "project.ttl"
+
+        with pytest.raises(SystemExit) as exit_code:
+            cli.main(
+                [
+                    "import-evidence",
+                    str(_write(tmp_path, "refs.ris", RIS)),
+                    *("--project", str(project), "--agent", AGENT),
+                ]
+            )
+
+        assert exit_code.value.code == 0
+        assert "Imported 2 Evidence" in capsys.readouterr().out
+
+    def test_mcp_tool(self, tmp_path):
+        from scimantic.mcp import import_evidence as import_tool
+
+        result = import_tool(
+            str(_write(tmp_path, "refs.bib", BIBTEX)),
+            AGENT,
+            project_path=str(tmp_path / "project.ttl"),
+        )
+
+        assert result["status"] == "success"
+        assert result["added"] == 2
@@ -0,0 +1,157 @@
+"""
+Unit tests for the content-hash cache of cclib-parsed outputs.
+"""
+
+import os
+import shutil
+from dataclasses import replace
+from datetime import timedelta
+
+import numpy as np
+import pytest
+from cclib.parser.data import ccData
+from rdflib import Namespace
+from rdflib.namespace import PROV
+
+from scimantic import cclib_cache
+from scimantic.cclib_cache import CclibCache, entity_uri, file_digest
+from scimantic.ingest import ingest_outputs, parse_output, parse_outputs
+from scimantic.storage import load_project
+
+SCIMANTIC = Namespace("http://scimantic.io/")
+
+
+@pytest.fixture
+def water(outputs):
+    return outputs / "batch" / "water0.log"
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return CclibCache(tmp_path / "cache")
+
+
+@pytest.fixture
+def no_parsing(monkeypatch):
+    def fail(*args, **kwargs):
+        raise AssertionError("the output should not be parsed again")
+
+    def disable():
+        monkeypatch.setattr(cclib_cache.cclib.io, "ccread", fail)
+
+    return disable
+
+
+class TestCclibCache:
+    def test_parsed_once(self, cache, water, no_parsing):
+        first = cache.load(water)
+        no_parsing()
+
+        second = cache.load(water)
+
+        np.testing.assert_array_equal(second.scfenergies, first.scfenergies)
+        np.testing.assert_array_equal(second.atomcoords, first.atomcoords)
+        assert second.metadata == first.metadata
+        assert second.charge == 0
+        assert (cache.directory / f"{file_digest(water)}.npz").exists()
+
+    def test_round_trips_lists_of_arrays(self, cache, tmp_path):
+        data = ccData()
+        data.moenergies = [np.array([-10.0, 1.0]), np.array([-9.0, 2.0, 3.0])]
+        data.homos = np.array([0, 0])
+        data.optdone = True
+        data.metadata = {"package": "ORCA", "methods": ["HF"]}
+
+        cache_dir = cache.directory
+        size = cclib_cache._write(cache_dir, "abc", data)
+        restored = cache.read("abc")
+
+        assert size > 0
+        assert [list(m) for m in restored.moenergies] == [[-10, 1], [-9, 2, 3]]
+        assert restored.optdone is True
+        assert restored.metadata["methods"] == ["HF"]
+
+    def test_lookup_by_path_skips_hashing(self, cache, water, monkeypatch):
+        cache.load(water)
+        cache.save()
+        monkeypatch.setattr(cclib_cache, "file_digest", None)
+
+        reopened = CclibCache(cache.directory)
+
+        assert reopened.lookup(water) is not None
+        assert reopened.get(water) is not None
+
+    def test_changed_stamp_falls_back_to_content(self, cache, water, no_parsing):
+        cache.load(water)
+        copy = water.with_name("copy.log")
+        shutil.copy(water, copy)
+        os.utime(water, ns=(0, 0))
+        no_parsing()
+
+        assert cache.lookup(water) is None
+        assert cache.load(water) is not None
+        assert cache.load(copy) is not None
+        assert len(cache) == 1
+
+    def test_edited_file_is_parsed_again(self, cache, water):
+        cache.load(water)
+        water.write_text(water.read_text().replace("-76.4000000", "-76.5000000"))
+
+        data = cache.load(water)
+
+        assert data.scfenergies[-1] == pytest.approx(-76.5 * 27.211386, rel=1e-6)
+        assert len(cache) == 2
+
+    def test_least_recently_used_entries_are_evicted(self, outputs, tmp_path):
+        paths = sorted((outputs / "batch").glob("*.log"))
+        cache = CclibCache(tmp_path / "cache")
+        for path in paths[:2]:
+            cache.load(path)
+        entry = cache.size() // 2
+        cache.max_bytes = 2 * entry
+        cache.load(paths[0])  # now more recently used than paths[1]
+
+        cache.load(paths[2])
+
+        assert len(cache) == 2
+        assert cache.lookup(paths[1]) is None
+        assert cache.lookup(paths[0]) and cache.lookup(paths[2])
+        assert not (cache.directory / f"{file_digest(paths[1])}.npz").exists()
+
+
+class TestCachedIngestion:
+    def test_repeated_parse_skips_parsing(self, outputs, cache, no_parsing):
+        paths = sorted((outputs / "batch").glob("*.log"))
+        first = parse_outputs(paths, jobs=1, cache=cache)
+        no_parsing()
+
+        second = parse_outputs(paths, jobs=1, cache=CclibCache(cache.directory))
+
+        assert second == first
+        assert all(p.sha256 for p in second)
+
+    def test_cache_hit_matches_a_fresh_parse(self, water, cache, no_parsing):
+        fresh = parse_output(water)
+        assert "Job cpu time" in water.read_text()
+        parse_outputs([water], jobs=1, cache=cache)
+        no_parsing()
+
+        (cached,) = parse_outputs([water], jobs=1, cache=CclibCache(cache.directory))
+
+        assert cached == replace(fresh, sha256=file_digest(water))
+        assert (cached.package, cached.method_label) == ("Gaussian", "Gaussian B3LYP")
+        assert cached.success is True
+        assert cache.read(cached.sha256).metadata["cpu_time"] == [
+            timedelta(minutes=1, seconds=23.4)
+        ]
+
+    def test_analysis_used_the_cached_data(self, outputs, cache, tmp_path):
+        project = tmp_path / "project.ttl"
+
+        report = ingest_outputs(project, [outputs], jobs=1, cache=cache)
+
+        g = load_project(project)
+        for path, dataset in report.datasets.items():
+            artifact = entity_uri(file_digest(path))
+            assert (report.analysis, PROV.used, artifact) in g
+            assert g.value(artifact, PROV.wasDerivedFrom) == dataset
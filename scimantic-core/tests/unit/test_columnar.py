@@ -0,0 +1,165 @@
+"""
+Unit tests for the columnar graph representation and summary statistics.
+"""
+
+import json
+
+import numpy as np
+import pytest
+from rdflib import Graph, Literal, Namespace
+from rdflib.namespace import PROV, RDF, XSD
+
+from scimantic.columnar import (
+    MISSING,
+    ColumnarGraph,
+    class_counts,
+    evidence_summary,
+    group_count,
+    load_columnar,
+)
+
+EX = Namespace("http://example.org/research/")
+SCIMANTIC = Namespace("http://scimantic.io/")
+
+
+@pytest.fixture
+def graph():
+    g = Graph()
+    g.add((EX.q1, RDF.type, SCIMANTIC.Question))
+    g.add((EX.q2, RDF.type, SCIMANTIC.Question))
+    evidence = [
+        ("e1", "q1", "alice", "2025-01-05T10:00:00Z"),
+        ("e2", "q1", "alice", "2025-01-20T10:00:00+02:00"),
+        ("e3", "q1", "bob", "2025-02-01T00:30:00+01:00"),  # 2025-01-31 UTC
+        ("e4", "q2", "alice", "2025-03-01T00:00:00Z"),
+        ("e5", None, "bob", "2025-03-02T00:00:00Z"),
+    ]
+    for name, question, agent, time in evidence:
+        e = EX[name]
+        g.add((e, RDF.type, SCIMANTIC.Evidence))
+        g.add((e, PROV.wasAttributedTo, EX[agent]))
+        g.add((e, PROV.generatedAtTime, Literal(time, datatype=XSD.dateTime)))
+        if question:
+            g.add((e, PROV.wasDerivedFrom, EX[question]))
+    g.add((EX.e1, SCIMANTIC.value, Literal(28.0134)))
+    g.add((EX.e2, SCIMANTIC.value, Literal(7, datatype=XSD.integer)))
+    return g
+
+
+@pytest.fixture
+def columns(graph):
+    return ColumnarGraph.from_triples(graph)
+
+
+class TestColumnarGraph:
+    def test_columns_hold_distinct_triples(self, graph, columns):
+        assert len(columns) == len(graph)
+        assert columns.s.dtype == np.int32
+        decoded = {
+            (columns.term(s), columns.term(p), columns.term(o))
+            for s, p, o in zip(columns.s, columns.p, columns.o, strict=True)
+        }
+        assert decoded == set(graph)
+
+    def test_typed_columns(self, columns):
+        generated = columns.relation(PROV.generatedAtTime)
+        e3 = columns.term_id(EX.e3)
+        time = columns.datetimes[generated.first(np.array([e3]))[0]]
+        assert time == np.datetime64("2025-01-31T23:30:00")
+
+        values = columns.relation(SCIMANTIC.value)
+        assert sorted(columns.numbers[values.objects]) == [7.0, 28.0134]
+        assert np.isnan(columns.numbers[MISSING])
+        assert np.isnat(columns.datetimes[MISSING])
+
+    def test_mask(self, graph, columns):
+        mask = columns.mask(p=RDF.type, o=[SCIMANTIC.Question, SCIMANTIC.Evidence])
+
+        assert mask.sum() == 7
+        assert columns.mask(s=EX.missing).sum() == 0
+
+    def test_join(self, columns):
+        keys = columns.ids([EX.e1, EX.e5, EX.e3])
+
+        positions, objects = columns.relation(PROV.wasDerivedFrom).join(keys)
+
+        assert positions.tolist() == [0, 2]
+        assert [columns.term(o) for o in objects] == [EX.q1, EX.q1]
+
+    def test_first_is_a_left_join(self, columns):
+        keys = columns.ids([EX.e5, EX.e4])
+
+        objects = columns.relation(PROV.wasDerivedFrom).first(keys)
+
+        assert objects[0] == MISSING
+        assert columns.term(objects[1]) == EX.q2
+
+    def test_instances(self, columns):
+        assert {columns.term(i) for i in columns.instances(SCIMANTIC.Question)} == {
+            EX.q1,
+            EX.q2,
+        }
+
+
+class TestGroupCount:
+    def test_groups_by_several_columns(self):
+        (a, b), counts = group_count(np.array([1, 2, 1, 1]), np.array([5, 5, 5, 6]))
+
+        assert list(zip(a, b, counts, strict=True)) == [(1, 5, 2), (1, 6, 1), (2, 5, 1)]
+
+    def test_missing_datetimes_form_one_group(self):
+        months = np.array(["NaT", "2025-01", "NaT"], dtype="datetime64[M]")
+
+        (keys,), counts = group_count(months)
+
+        assert np.isnat(keys[0])
+        assert counts.tolist() == [2, 1]
+
+    def test_empty(self):
+        _keys, counts = group_count(np.array([], dtype=np.int32))
+
+        assert len(counts) == 0
+
+
+class TestSummaries:
+    def test_class_counts(self, columns):
+        assert class_counts(columns) == {
+            str(SCIMANTIC.Evidence): 5,
+            str(SCIMANTIC.Question): 2,
+        }
+
+    def test_evidence_per_question_agent_month(self, columns):
+        rows = {
+            (r["question"], r["agent"], r["month"]): r["count"]
+            for r in evidence_summary(columns)
+        }
+
+        assert rows == {
+            (str(EX.q1), str(EX.alice), "2025-01"): 2,
+            (str(EX.q1), str(EX.bob), "2025-01"): 1,
+            (str(EX.q2), str(EX.alice), "2025-03"): 1,
+            (None, str(EX.bob), "2025-03"): 1,
+        }
+
+    def test_load_columnar_is_cached_until_the_project_changes(self, graph, tmp_path):
+        project = tmp_path / "project.nt"
+        graph.serialize(destination=str(project), format="nt")
+
+        first = load_columnar(project)
+        assert load_columnar(project) is first
+
+        with open(project, "a") as f:
+            f.write(f"<{EX.q3}> <{RDF.type}> <{SCIMANTIC.Question}> .\n")
+        assert class_counts(load_columnar(project))[str(SCIMANTIC.Question)] == 3
+
+    def test_statistics_tool(self, graph, tmp_path):
+        from scimantic.mcp import get_project_statistics
+
+        project = tmp_path / "project.ttl"
+        graph.serialize(destination=str(project), format="turtle")
+
+        stats = json.loads(get_project_statistics(str(project)))
+
+        assert stats["triples"] == len(graph)
+        assert stats["classes"][str(SCIMANTIC.Evidence)] == 5
+        assert sum(row["count"] for row in stats["evidence"]) == 5
@@ -0,0 +1,215 @@
+"""
+Unit tests for streaming NDJSON / JSON-LD export of project entities.
+"""
+
+import json
+
+import pytest
+from rdflib import BNode, Graph, Literal, Namespace, URIRef
+from rdflib.compare import isomorphic
+from rdflib.namespace import PROV, RDF, RDFS, XSD
+
+from scimantic import cli, export
+from scimantic.export import export_entities, iter_entities, resolve_class
+from scimantic.storage import convert_project, save_project
+
+SCIMANTIC = Namespace("http://scimantic.io/")
+EX = Namespace("http://example.org/research/")
+AGENT = URIRef("http://example.org/agent/test")
+
+
+@pytest.fixture
+def graph():
+    g = Graph()
+    question = EX["question/q1"]
+    g.add((question, RDF.type, SCIMANTIC.Question))
+    g.add((question, RDFS.label, Literal("Is N2 bound?")))
+    g.add((question, PROV.wasAttributedTo, AGENT))
+    evidence = EX["evidence/e1"]
+    g.add((evidence, RDF.type, SCIMANTIC.Evidence))
+    g.add((evidence, RDF.type, PROV.Entity))
+    g.add((evidence, SCIMANTIC.content, Literal("Bond energy 9.8 eV", lang="en")))
+    g.add((evidence, SCIMANTIC.relatesToQuestion, question))
+    g.add(
+        (
+            evidence,
+            PROV.generatedAtTime,
+            Literal("2024-01-01T00:00:00+00:00", datatype=XSD.dateTime),
+        )
+    )
+    result = EX["result/r1"]
+    g.add((result, RDF.type, SCIMANTIC.Result))
+    g.add((result, SCIMANTIC.value, Literal(-76.4, datatype=XSD.double)))
+    g.add((result, SCIMANTIC["count"], Literal(3)))
+    g.add((AGENT, RDF.type, PROV.Agent))
+    g.add((EX["misc/untyped"], RDFS.label, Literal("not an entity")))
+    return g
+
+
+@pytest.fixture(params=["project.ttl", "project.nt", "project.sqlite", "graph"])
+def project(request, graph, tmp_path):
+    path = tmp_path / request.param
+    save_project(graph, path, partitioned=request.param == "graph")
+    return path
+
+
+def _by_id(nodes):
+    return {node["@id"]: node for node in nodes}
+
+
+class TestNodeObjects:
+    def test_every_schema_entity_once(self, project):
+        nodes = _by_id(iter_entities(project))
+
+        assert set(nodes) == {
+            "http://example.org/research/question/q1",
+            "http://example.org/research/evidence/e1",
+            "http://example.org/research/result/r1",
+            "http://example.org/agent/test",
+        }
+        evidence = nodes["http://example.org/research/evidence/e1"]
+        assert evidence["@type"] == ["Evidence", "Entity"]
+        assert evidence["scimantic:content"] == {
+            "@value": "Bond energy 9.8 eV",
+            "@language": "en",
+        }
+        assert evidence["scimantic:relatesToQuestion"] == {
+            "@id": "http://example.org/research/question/q1"
+        }
+        assert evidence["prov:generatedAtTime"]["@type"] == "xsd:dateTime"
+
+    def test_native_json_values(self, project):
+        result = _by_id(iter_entities(project))["http://example.org/research/result/r1"]
+
+        assert result["scimantic:value"] == -76.4
+        assert result["scimantic:count"] == 3
+
+    def test_classes_filter(self, project):
+        nodes = list(iter_entities(project, [resolve_class("Evidence")]))
+
+        assert [n["@id"] for n in nodes] == ["http://example.org/research/evidence/e1"]
+
+    def test_ntriples_are_streamed(self, graph, tmp_path, monkeypatch):
+        project = tmp_path / "project.nt"
+        save_project(graph, project)
+        monkeypatch.setattr(export, "load_project", None)
+
+        assert len(list(iter_entities(project))) == 4
+
+
+class TestResolveClass:
+    @pytest.mark.parametrize(
+        "name",
+        [
+            "TextSelector",
+            "oa:TextQuoteSelector",
+            "http://www.w3.org/ns/oa#TextQuoteSelector",
+        ],
+    )
+    def test_names(self, name):
+        assert resolve_class(name) == URIRef(
+            "http://www.w3.org/ns/oa#TextQuoteSelector"
+        )
+
+    def test_unknown(self):
+        with pytest.raises(ValueError, match="Unknown schema class"):
+            resolve_class("Nonsense")
+
+
+class TestExportEntities:
+    def test_ndjson(self, graph, tmp_path):
+        project = tmp_path / "project.nt"
+        save_project(graph, project)
+
+        count = export_entities(project, tmp_path / "out.ndjson")
+
+        lines = (tmp_path / "out.ndjson").read_text().splitlines()
+        assert count == len(lines) == 4
+        assert all(json.loads(line)["@id"] for line in lines)
+
+    def test_json_ld_round_trips(self, graph, tmp_path):
+        project = tmp_path / "project.ttl"
+        save_project(graph, project)
+
+        export_entities(project, tmp_path / "out.jsonld")
+
+        exported = Graph().parse(tmp_path / "out.jsonld", format="json-ld")
+        graph.remove((EX["misc/untyped"], None, None))
+        assert isomorphic(exported, graph)
+
+    @pytest.mark.parametrize("name", ["project.ttl", "project.nt", "graph"])
+    def test_blank_nodes_are_embedded(self, graph, tmp_path, name):
+        activity = EX["activity/a1"]
+        usage, role = BNode(), BNode()
+        graph.add((activity, RDF.type, PROV.Activity))
+        graph.add((activity, PROV.qualifiedUsage, usage))
+        graph.add((usage, PROV.entity, EX["evidence/e1"]))
+        graph.add((usage, PROV.hadRole, role))
+        graph.add((role, RDFS.label, Literal("input")))
+        project = tmp_path / name
+        save_project(graph, project, partitioned=name == "graph")
+
+        export_entities(project, tmp_path / "out.jsonld")
+        export_entities(project, tmp_path / "out.ndjson")
+
+        exported = Graph().parse(tmp_path / "out.jsonld", format="json-ld")
+        graph.remove((EX["misc/untyped"], None, None))
+        assert isomorphic(exported, graph)
+        lines = (tmp_path / "out.ndjson").read_text().splitlines()
+        (node,) = [json.loads(line) for line in lines if "activity" in line]
+        embedded = node["prov:qualifiedUsage"]
+        assert embedded["prov:entity"] == {"@id": str(EX["evidence/e1"])}
+        assert embedded["prov:hadRole"]["rdfs:label"] == "input"
+
+    def test_unsorted_ntriples_are_loaded(self, graph, tmp_path):
+        lines = graph.serialize(format="nt").splitlines(keepends=True)
+        project = tmp_path / "project.nt"
+        # Ordered by predicate, so each subject's triples are scattered
+        lines.sort(key=lambda line: line.split(" ", 1)[1])
+        project.write_text("".join(lines))
+
+        export_entities(project, tmp_path / "out.jsonld")
+
+        exported = Graph().parse(tmp_path / "out.jsonld", format="json-ld")
+        graph.remove((EX["misc/untyped"], None, None))
+        assert isomorphic(exported, graph)
+
+    def test_unknown_suffix(self, graph, tmp_path):
+        save_project(graph, tmp_path / "project.ttl")
+
+        with pytest.raises(ValueError, match="Unknown export format"):
+            export_entities(tmp_path / "project.ttl", tmp_path / "out.xml")
+
+        assert list(tmp_path.iterdir()) == [tmp_path / "project.ttl"]
+
+    def test_cli(self, graph, tmp_path, capsys):
+        project = tmp_path / "project.nt.gz"
+        save_project(graph, tmp_path / "project.ttl")
+        convert_project(tmp_path / "project.ttl", project)
+
+        with pytest.raises(SystemExit) as exit_code:
+            cli.main(
+                [
+                    "export",
+                    str(tmp_path / "questions.json"),
+                    *("--project", str(project), "--class", "Question"),
+                ]
+            )
+
+        assert exit_code.value.code == 0
+        assert "Exported 1 entities" in capsys.readouterr().out
+        document = json.loads((tmp_path / "questions.json").read_text())
+        assert document["@context"]["Question"] == "scimantic:Question"
+        assert [n["rdfs:label"] for n in document["@graph"]] == ["Is N2 bound?"]
+
+    def test_mcp_tool_returns_path(self, graph, tmp_path, monkeypatch):
+        from scimantic.mcp import export_entities as export_tool
+
+        monkeypatch.chdir(tmp_path)
+        save_project(graph, tmp_path / "project.nt")
+
+        result = export_tool(project_path="project.nt")
+
+        assert result["status"] == "success"
+        assert result["entities"] == 4
+        assert result["path"] == str(tmp_path / ".scimantic/exports/project.ndjson")
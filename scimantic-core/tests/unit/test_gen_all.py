@@ -0,0 +1,401 @@
+"""
+Unit tests for the gen-all build pipeline (manifest-driven incremental builds).
+"""
+
+import hashlib
+from functools import partial
+from pathlib import Path
+
+import pytest
+from rdflib import Graph, Namespace
+from rdflib.namespace import RDF
+
+from scimantic import gen_all
+from scimantic.gen_all import BuildManifest, Step, run_steps
+
+SH = Namespace("http://www.w3.org/ns/shacl#")
+SCHEMA = (
+    Path(__file__).parent.parent.parent.parent
+    / "scimantic-ontology"
+    / "schema"
+    / "scimantic.yaml"
+)
+
+
+def _write(path: Path, text: str):
+    path.write_text(text)
+
+
+def _concat(dest: Path, *sources: Path):
+    dest.write_text("".join(source.read_text() for source in sources))
+
+
+def _fail():
+    raise RuntimeError("generator crashed")
+
+
+class Pipeline:
+    """A small in-place pipeline mirroring generate → determinize → inject."""
+
+    def __init__(self, root: Path):
+        self.schema = root / "schema.yaml"
+        self.ttl = root / "out.ttl"
+        self.summary = root / "summary.txt"
+        self.manifest_path = root / "manifest.json"
+        self.schema.write_text("version: 1\n")
+        self.calls: list[str] = []
+
+    def generate(self):
+        self.calls.append("generate")
+        # Output only depends on the first line, like a generator ignoring comments
+        self.ttl.write_text(self.schema.read_text().splitlines()[0] + "\n")
+
+    def determinize(self):
+        self.calls.append("determinize")
+        self.ttl.write_text(self.ttl.read_text().upper())
+
+    def inject(self):
+        self.calls.append("inject")
+        self.ttl.write_text(self.ttl.read_text() + "# injected\n")
+
+    def summarize(self):
+        self.calls.append("summarize")
+        self.summary.write_text(str(len(self.ttl.read_text())))
+
+    def steps(self) -> list[Step]:
+        return [
+            Step("generate", self.generate, [self.schema], [self.ttl]),
+            Step(
+                "determinize",
+                self.determinize,
+                [self.ttl],
+                [self.ttl],
+                deps=["generate"],
+            ),
+            Step(
+                "inject",
+                self.inject,
+                [self.schema, self.ttl],
+                [self.ttl],
+                deps=["determinize"],
+            ),
+            Step(
+                "summarize",
+                self.summarize,
+                [self.ttl],
+                [self.summary],
+                deps=["inject"],
+            ),
+        ]
+
+    def build(self, force: bool = False) -> list[str]:
+        # jobs=1 runs in-process so the recorded calls are visible here
+        self.calls = []
+        manifest = BuildManifest(self.manifest_path)
+        run_steps(self.steps(), manifest, force=force, jobs=1)
+        return self.calls
+
+
+class TestIncrementalBuild:
+    """Tests for BuildManifest-driven step skipping"""
+
+    def test_first_build_runs_every_step(self, tmp_path):
+        pipeline = Pipeline(tmp_path)
+
+        assert pipeline.build() == ["generate", "determinize", "inject", "summarize"]
+        assert pipeline.ttl.read_text() == "VERSION: 1\n# injected\n"
+        assert pipeline.manifest_path.exists()
+
+    def test_noop_build_skips_every_step(self, tmp_path):
+        pipeline = Pipeline(tmp_path)
+        pipeline.build()
+
+        assert pipeline.build() == []
+        assert pipeline.ttl.read_text() == "VERSION: 1\n# injected\n"
+
+    def test_force_reruns_every_step(self, tmp_path):
+        pipeline = Pipeline(tmp_path)
+        pipeline.build()
+
+        assert len(pipeline.build(force=True)) == 4
+
+    def test_input_change_reruns_pipeline(self, tmp_path):
+        pipeline = Pipeline(tmp_path)
+        pipeline.build()
+
+        pipeline.schema.write_text("version: 2\n")
+
+        assert pipeline.build() == ["generate", "determinize", "inject", "summarize"]
+        assert pipeline.ttl.read_text() == "VERSION: 2\n# injected\n"
+
+    def test_unchanged_intermediate_output_stops_propagation(self, tmp_path):
+        """Downstream steps only re-run when their own inputs changed"""
+        pipeline = Pipeline(tmp_path)
+        pipeline.build()
+
+        # Generator output is unchanged, but inject reads the schema directly
+        pipeline.schema.write_text("version: 1\n# comment\n")
+
+        calls = pipeline.build()
+        assert calls == ["generate", "determinize", "inject"]
+        assert pipeline.ttl.read_text() == "VERSION: 1\n# injected\n"
+
+    def test_tampered_output_is_regenerated(self, tmp_path):
+        pipeline = Pipeline(tmp_path)
+        pipeline.build()
+
+        pipeline.ttl.write_text("hand edited\n")
+
+        assert pipeline.build() == ["generate", "determinize", "inject"]
+        assert pipeline.ttl.read_text() == "VERSION: 1\n# injected\n"
+
+    def test_deleted_output_is_regenerated(self, tmp_path):
+        pipeline = Pipeline(tmp_path)
+        pipeline.build()
+
+        pipeline.summary.unlink()
+
+        assert pipeline.build() == ["summarize"]
+        assert pipeline.summary.exists()
+
+    def test_unreadable_manifest_triggers_full_build(self, tmp_path):
+        pipeline = Pipeline(tmp_path)
+        pipeline.build()
+
+        pipeline.manifest_path.write_text("{not json")
+
+        assert len(pipeline.build()) == 4
+
+
+class TestParallelBuild:
+    """Tests for DAG execution in the process pool"""
+
+    def _steps(self, root: Path) -> list[Step]:
+        owl, shacl, merged = root / "owl.ttl", root / "shacl.ttl", root / "all.ttl"
+        return [
+            Step("gen-owl", partial(_write, owl, "owl\n"), [], [owl]),
+            Step("gen-shacl", partial(_write, shacl, "shacl\n"), [], [shacl]),
+            Step(
+                "merge",
+                partial(_concat, merged, owl, shacl),
+                [owl, shacl],
+                [merged],
+                deps=["gen-owl", "gen-shacl"],
+            ),
+        ]
+
+    def test_independent_steps_run_in_pool(self, tmp_path):
+        manifest = BuildManifest(tmp_path / "manifest.json")
+
+        run_steps(self._steps(tmp_path), manifest, jobs=2)
+
+        assert (tmp_path / "all.ttl").read_text() == "owl\nshacl\n"
+        assert set(manifest.steps) == {"gen-owl", "gen-shacl", "merge"}
+
+    def test_noop_parallel_build_skips_every_step(self, tmp_path, capsys):
+        run_steps(self._steps(tmp_path), BuildManifest(tmp_path / "m.json"), jobs=2)
+        capsys.readouterr()
+
+        run_steps(self._steps(tmp_path), BuildManifest(tmp_path / "m.json"), jobs=2)
+
+        out = capsys.readouterr().out
+        assert out.count("up to date") == 3
+        assert "Running" not in out
+
+    def test_failing_step_aborts_build(self, tmp_path):
+        out = tmp_path / "never.txt"
+        steps = [
+            Step("broken", _fail, [], [tmp_path / "broken.txt"]),
+            Step(
+                "downstream",
+                partial(_write, out, "x"),
+                [],
+                [out],
+                deps=["broken"],
+            ),
+        ]
+
+        with pytest.raises(SystemExit):
+            run_steps(steps, BuildManifest(tmp_path / "manifest.json"), jobs=2)
+
+        assert not out.exists()
+
+    def test_unknown_dependency_is_rejected(self, tmp_path):
+        steps = [Step("orphan", _fail, deps=["missing"])]
+
+        with pytest.raises(ValueError, match="unknown steps"):
+            run_steps(steps, BuildManifest(tmp_path / "manifest.json"), jobs=1)
+
+
+class TestInProcessGenerators:
+    """Tests for LinkML generators called in-process with a shared SchemaView"""
+
+    @pytest.fixture(autouse=True)
+    def schema_path(self, monkeypatch):
+        load_schema_view = gen_all.load_schema_view
+        monkeypatch.setattr(gen_all, "SCHEMA_PATH", SCHEMA)
+        load_schema_view.cache_clear()
+        yield
+        load_schema_view.cache_clear()
+
+    def test_schema_view_is_loaded_once(self):
+        assert gen_all.load_schema_view() is gen_all.load_schema_view()
+
+    def test_generate_shacl_writes_shapes(self, tmp_path, monkeypatch):
+        dest = tmp_path / "shapes.ttl"
+        monkeypatch.setattr(gen_all, "SHACL_DEST", dest)
+
+        gen_all.generate_shacl()
+
+        g = Graph().parse(dest, format="turtle")
+        shapes = set(g.subjects(RDF.type, SH.NodeShape))
+        assert Namespace("http://scimantic.io/").Question in shapes
+
+    def test_falls_back_to_subprocess_without_linkml(self, monkeypatch):
+        commands = []
+        monkeypatch.setattr(gen_all, "load_schema_view", lambda: None)
+        monkeypatch.setattr(gen_all, "run_command", commands.append)
+
+        gen_all.generate_owl()
+
+        assert len(commands) == 1
+        assert commands[0].startswith("uv run gen-owl --no-metadata")
+
+
+class TestVersionInjection:
+    """Tests for in-process version injection during finalization"""
+
+    @pytest.fixture(autouse=True)
+    def ontology_paths(self, monkeypatch):
+        load_script = gen_all.load_script
+        monkeypatch.setattr(gen_all, "SCHEMA_PATH", SCHEMA)
+        monkeypatch.setattr(
+            gen_all,
+            "INJECT_SCRIPT",
+            SCHEMA.parent.parent / "scripts" / "inject_version.py",
+        )
+        load_script.cache_clear()
+        yield
+        load_script.cache_clear()
+
+    def _version(self) -> str:
+        return gen_all.load_version_injector().get_version(SCHEMA)
+
+    def test_finalize_owl_fixes_subject_and_adds_version(self, tmp_path):
+        target = tmp_path / "scimantic.ttl"
+        target.write_text(
+            "@prefix scimantic: <http://scimantic.io/> .\n"
+            "@prefix owl: <http://www.w3.org/2002/07/owl#> .\n"
+            "@prefix pav: <http://purl.org/pav/> .\n"
+            'scimantic:schema.owl.ttl a owl:Ontology ; pav:version "0.0.1" .\n'
+            "scimantic:Question a owl:Class .\n"
+        )
+
+        gen_all.finalize_ttl(target)
+
+        version = self._version()
+        text = target.read_text()
+        assert "scimantic:schema.owl.ttl" not in text
+        assert f"owl:versionIRI <http://scimantic.io/v/{version}/ontology.ttl>" in text
+        assert f'owl:versionInfo "{version}"' in text
+        assert f'pav:version "{version}"' in text
+
+    def test_finalize_shacl_adds_shapes_ontology(self, tmp_path):
+        target = tmp_path / "shapes.ttl"
+        target.write_text(
+            "@prefix scimantic: <http://scimantic.io/> .\n"
+            "@prefix sh: <http://www.w3.org/ns/shacl#> .\n"
+            "scimantic:Question a sh:NodeShape .\n"
+        )
+
+        gen_all.finalize_ttl(target, is_shacl=True)
+
+        version = self._version()
+        text = target.read_text()
+        assert text.startswith("@prefix owl:")
+        assert (
+            "<http://scimantic.io/shacl/scimantic-shapes.ttl> a owl:Ontology ;" in text
+        )
+        assert (
+            f"owl:versionIRI <http://scimantic.io/v/{version}/shacl/scimantic-shapes.ttl>"
+            in text
+        )
+
+    def test_finalize_failure_propagates(self, tmp_path):
+        target = tmp_path / "broken.ttl"
+        target.write_text("this is not turtle")
+
+        with pytest.raises(Exception, match="Bad syntax"):
+            gen_all.finalize_ttl(target)
+
+        assert target.read_text() == "this is not turtle"
+
+    def test_finalize_is_idempotent_on_committed_artifacts(self, tmp_path):
+        """Re-finalizing the committed artifacts leaves them byte-identical"""
+        generated = SCHEMA.parent.parent / "generated"
+        for artifact, is_shacl in [
+            ("scimantic.ttl", False),
+            ("shacl/scimantic-shapes.ttl", True),
+        ]:
+            target = tmp_path / Path(artifact).name
+            committed = (generated / artifact).read_text()
+            target.write_text(committed)
+
+            gen_all.finalize_ttl(target, is_shacl=is_shacl)
+
+            assert target.read_text() == committed
+
+
+class TestOntologyGraph:
+    """Tests for in-process diagram generation with render skipping"""
+
+    @pytest.fixture
+    def root(self, tmp_path, monkeypatch):
+        repo = SCHEMA.parent.parent.parent
+        generated = tmp_path / "scimantic-ontology" / "generated"
+        generated.mkdir(parents=True)
+        (generated / "scimantic.ttl").write_bytes(
+            (repo / "scimantic-ontology" / "generated" / "scimantic.ttl").read_bytes()
+        )
+        monkeypatch.setattr(gen_all, "ROOT_DIR", tmp_path)
+        monkeypatch.setattr(
+            gen_all, "GRAPH_SCRIPT", repo / "scripts" / "visualize_ontology.py"
+        )
+        return tmp_path
+
+    @pytest.fixture
+    def renders(self, root, monkeypatch):
+        """Replaces mmdc with a stub that writes the PNG and records the call."""
+        calls = []
+
+        def fake_mmdc(cmd, check):
+            calls.append(cmd)
+            Path(cmd[cmd.index("-o") + 1]).write_bytes(b"png")
+
+        visualize = gen_all.load_script(gen_all.GRAPH_SCRIPT)
+        monkeypatch.setattr(visualize.subprocess, "run", fake_mmdc)
+        return calls
+
+    def test_unchanged_diagram_is_not_rerendered(self, root, renders):
+        gen_all.generate_ontology_graph()
+        gen_all.generate_ontology_graph()
+
+        assert len(renders) == 1
+        assert (root / "ontology_graph.mmd").read_text().count("Question") > 1
+        assert (root / "ontology_graph.png.sha256").exists()
+
+    def test_changed_diagram_is_rerendered(self, root, renders):
+        gen_all.generate_ontology_graph()
+
+        (root / "ontology_graph.png.sha256").write_text("stale\n")
+        gen_all.generate_ontology_graph()
+
+        assert len(renders) == 2
+
+    def test_committed_diagram_matches_render_hash(self):
+        """The committed PNG was rendered from the committed .mmd"""
+        repo = SCHEMA.parent.parent.parent
+        mmd = (repo / "ontology_graph.mmd").read_bytes()
+        recorded = (repo / "ontology_graph.png.sha256").read_text().strip()
+
+        assert hashlib.sha256(mmd).hexdigest() == recorded
@@ -0,0 +1,140 @@
+"""
+Unit tests for the binary parsed-graph cache.
+"""
+
+from pathlib import Path
+
+import pytest
+from rdflib import BNode, Graph, Literal, Namespace, URIRef
+from rdflib.compare import isomorphic
+from rdflib.namespace import RDF, RDFS, XSD
+
+from scimantic.graph_cache import CACHE_MAGIC, cache_path_for, load_graph
+
+SCIMANTIC = Namespace("http://scimantic.io/")
+
+
+def _write_sample(path: Path) -> Graph:
+    g = Graph()
+    g.bind("scimantic", SCIMANTIC)
+    restriction = BNode()
+    g.add((SCIMANTIC.Question, RDF.type, URIRef("http://www.w3.org/2002/07/owl#Class")))
+    g.add((SCIMANTIC.Question, RDFS.label, Literal("Question", lang="en")))
+    g.add((SCIMANTIC.Question, RDFS.subClassOf, restriction))
+    g.add((restriction, SCIMANTIC.minCount, Literal(1, datatype=XSD.integer)))
+    g.add((restriction, RDFS.comment, Literal("multi\nline \\ text")))
+    g.serialize(destination=str(path), format="turtle")
+    return g
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return tmp_path / "cache"
+
+
+class TestLoadGraph:
+    """Tests for load_graph and its on-disk cache"""
+
+    def test_cold_load_writes_cache(self, tmp_path, cache):
+        """First load parses the source and writes a cache in the cache dir"""
+        source = tmp_path / "sample.ttl"
+        expected = _write_sample(source)
+
+        g = load_graph(source, cache_dir=cache)
+
+        assert isomorphic(g, expected)
+        assert cache_path_for(source, cache_dir=cache).exists()
+        assert (
+            cache_path_for(source, cache_dir=cache).read_bytes().startswith(CACHE_MAGIC)
+        )
+        assert sorted(tmp_path.iterdir()) == [cache, source]
+
+    def test_warm_load_is_isomorphic(self, tmp_path, cache):
+        """Graph rebuilt from the cache matches the parsed graph"""
+        source = tmp_path / "sample.ttl"
+        expected = _write_sample(source)
+
+        load_graph(source, cache_dir=cache)
+        g = load_graph(source, cache_dir=cache)
+
+        assert isomorphic(g, expected)
+        assert dict(g.namespaces())["scimantic"] == URIRef(str(SCIMANTIC))
+        labels = list(g.objects(SCIMANTIC.Question, RDFS.label))
+        assert labels == [Literal("Question", lang="en")]
+
+    def test_cache_invalidated_when_source_changes(self, tmp_path, cache):
+        """Editing the source invalidates the cache"""
+        source = tmp_path / "sample.ttl"
+        _write_sample(source)
+        load_graph(source, cache_dir=cache)
+
+        with open(source, "a") as f:
+            f.write('scimantic:Evidence rdfs:label "Evidence" .\n')
+
+        g = load_graph(source, cache_dir=cache)
+        assert (SCIMANTIC.Evidence, RDFS.label, Literal("Evidence")) in g
+
+    def test_format_is_part_of_the_key(self, tmp_path, cache):
+        """The same file parsed with another parser gets its own cache"""
+        source = tmp_path / "sample.ttl"
+        expected = _write_sample(source)
+        load_graph(source, cache_dir=cache)
+
+        g = load_graph(source, format="n3", cache_dir=cache)
+
+        assert isomorphic(g, expected)
+        assert cache_path_for(source, "n3", cache) != cache_path_for(
+            source, "turtle", cache
+        )
+        assert len(list(cache.iterdir())) == 2
+
+    def test_default_cache_is_beside_the_source(self, tmp_path):
+        """Without cache_dir the cache sits beside the source, one per source"""
+        source = tmp_path / "sample.ttl"
+        _write_sample(source)
+        load_graph(source)
+        with open(source, "a") as f:
+            f.write('scimantic:Evidence rdfs:label "Evidence" .\n')
+
+        load_graph(source)
+
+        cache = tmp_path / ".scimantic" / "cache" / "graphs"
+        assert list(cache.iterdir()) == [cache_path_for(source)]
+
+    def test_corrupt_cache_falls_back_to_parsing(self, tmp_path, cache):
+        """A truncated cache file is ignored rather than raising"""
+        source = tmp_path / "sample.ttl"
+        expected = _write_sample(source)
+        load_graph(source, cache_dir=cache)
+
+        cache_file = cache_path_for(source, cache_dir=cache)
+        cache_file.write_bytes(cache_file.read_bytes()[:-20])
+
+        assert isomorphic(load_graph(source, cache_dir=cache), expected)
+
+    def test_use_cache_false_skips_cache(self, tmp_path, cache):
+        """use_cache=False neither reads nor writes the cache"""
+        source = tmp_path / "sample.ttl"
+        expected = _write_sample(source)
+
+        g = load_graph(source, use_cache=False, cache_dir=cache)
+
+        assert isomorphic(g, expected)
+        assert not cache_path_for(source, cache_dir=cache).exists()
+
+    def test_generated_ontology_round_trip(self, tmp_path, cache):
+        """The generated ontology survives the cache round trip"""
+        ontology = (
+            Path(__file__).parent.parent.parent.parent
+            / "scimantic-ontology"
+            / "generated"
+            / "scimantic.ttl"
+        )
+        source = tmp_path / "scimantic.ttl"
+        source.write_bytes(ontology.read_bytes())
+
+        parsed = load_graph(source, cache_dir=cache)
+        cached = load_graph(source, cache_dir=cache)
+
+        assert len(cached) == len(parsed)
+        assert isomorphic(cached, parsed)
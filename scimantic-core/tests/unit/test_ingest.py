@@ -0,0 +1,105 @@
+"""
+Unit tests for cclib ingestion of computational chemistry outputs.
+"""
+
+import pytest
+from rdflib import Namespace, URIRef
+from rdflib.namespace import DCAT, PROV, RDF
+
+from scimantic import cli
+from scimantic.ingest import find_outputs, ingest_outputs, parse_output, parse_outputs
+from scimantic.storage import load_project
+
+SCIMANTIC = Namespace("http://scimantic.io/")
+AGENT = "http://example.org/agent/test"
+
+
+class TestParse:
+    def test_parse_output(self, outputs):
+        parsed = parse_output(outputs / "batch" / "water1.log")
+
+        assert parsed.error is None
+        assert parsed.package == "Gaussian"
+        assert parsed.method_label == "Gaussian B3LYP"
+        assert parsed.formula == "H2O"
+        assert parsed.natom == 3
+        ((name, value, unit),) = parsed.quantities
+        assert (name, unit) == ("SCF energy", "hartree")
+        assert value == pytest.approx(-77.4)
+
+    def test_unrecognized_files_are_reported(self, outputs):
+        parsed = parse_output(outputs / "broken.out")
+
+        assert parsed.error
+        assert parsed.quantities == ()
+
+    def test_find_outputs_expands_directories(self, outputs):
+        assert [p.name for p in find_outputs([outputs])] == [
+            "water0.log",
+            "water1.log",
+            "water2.log",
+            "broken.out",
+        ]
+
+    def test_process_pool_keeps_input_order(self, outputs):
+        paths = find_outputs([outputs])
+
+        parsed = parse_outputs(paths, jobs=2, chunksize=1)
+
+        assert [p.path for p in parsed] == [str(p) for p in paths]
+        assert parsed == parse_outputs(paths, jobs=1)
+
+
+class TestIngest:
+    def test_datasets_and_results_with_provenance(self, outputs, tmp_path):
+        project = tmp_path / "project.ttl"
+
+        report = ingest_outputs(project, [outputs], agent=AGENT, jobs=1)
+
+        g = load_project(project)
+        assert len(report.datasets) == 3
+        assert list(report.failed) == [str(outputs / "broken.out")]
+        analysis = report.analysis
+        assert (analysis, RDF.type, SCIMANTIC.Analysis) in g
+        assert set(g.objects(analysis, PROV.used)) == set(report.datasets.values())
+        (method,) = set(g.subjects(RDF.type, SCIMANTIC.ExperimentalMethod))
+        for path, dataset in report.datasets.items():
+            assert (dataset, RDF.type, SCIMANTIC.Dataset) in g
+            assert g.value(dataset, DCAT.downloadURL) == URIRef(f"file://{path}")
+            experimentation = g.value(dataset, PROV.wasGeneratedBy)
+            assert (experimentation, RDF.type, SCIMANTIC.Experimentation) in g
+            assert g.value(experimentation, PROV.used) == method
+            assert (analysis, PROV.wasInformedBy, experimentation) in g
+        for result in report.results:
+            assert g.value(result, PROV.wasGeneratedBy) == analysis
+            assert g.value(result, PROV.wasDerivedFrom) in report.datasets.values()
+            assert str(g.value(result, SCIMANTIC.unit)) == "hartree"
+            assert g.value(result, PROV.wasAttributedTo) == URIRef(AGENT)
+
+    def test_batch_is_one_write(self, outputs, tmp_path, monkeypatch):
+        writes = []
+        monkeypatch.setattr(
+            "scimantic.ingest.add_to_project", lambda g, path: writes.append(len(g))
+        )
+
+        ingest_outputs(tmp_path / "project.ttl", [outputs], jobs=1)
+
+        assert len(writes) == 1
+
+    def test_cli(self, outputs, tmp_path, capsys):
+        project = tmp_path / "project.nt"
+
+        with pytest.raises(SystemExit) as exit_code:
+            cli.main(
+                [
+                    "ingest",
+                    str(outputs),
+                    *("--project", str(project), "-j", "1"),
+                    *("--cache-dir", str(tmp_path / "cache")),
+                ]
+            )
+
+        assert exit_code.value.code == 0
+        assert "Ingested 3 outputs" in capsys.readouterr().out
+        assert len(set(load_project(project).subjects(RDF.type, SCIMANTIC.Result))) == 3
+        assert (tmp_path / "cache" / "index.json").exists()
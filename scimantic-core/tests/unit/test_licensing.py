@@ -0,0 +1,143 @@
+"""
+Unit tests for the license/access index.
+"""
+
+import time
+
+from rdflib import Graph, Literal, Namespace, URIRef
+from rdflib.namespace import DCTERMS, PROV
+
+from scimantic.licensing import (
+    ACCESS_LEVEL,
+    PUBLISHABLE,
+    LicenseIndex,
+    LicenseReport,
+    Violation,
+)
+
+EX = Namespace("http://example.org/research/")
+CC_BY = URIRef("https://creativecommons.org/licenses/by/4.0/")
+CC0 = URIRef("https://creativecommons.org/publicdomain/zero/1.0/")
+PROPRIETARY = URIRef("http://scimantic.io/license#Proprietary")
+
+
+def _graph() -> Graph:
+    g = Graph()
+    g.add((EX.paper, DCTERMS.license, CC_BY))
+    g.add((EX.paper, ACCESS_LEVEL, Literal("public")))
+    g.add((EX.labdata, DCTERMS.license, PROPRIETARY))
+    g.add((EX.labdata, ACCESS_LEVEL, Literal("institutional")))
+    g.add((EX.labdata, PUBLISHABLE, Literal(False)))
+    # evidence <- paper ; result <- evidence + labdata ; relicensed <- labdata
+    g.add((EX.evidence, PROV.wasDerivedFrom, EX.paper))
+    g.add((EX.result, PROV.wasDerivedFrom, EX.evidence))
+    g.add((EX.result, PROV.wasDerivedFrom, EX.labdata))
+    g.add((EX.relicensed, PROV.wasDerivedFrom, EX.labdata))
+    g.add((EX.relicensed, DCTERMS.license, CC0))
+    g.add((EX.relicensed, PUBLISHABLE, Literal(True)))
+    return g
+
+
+class TestLicenseIndex:
+    def test_own_terms(self):
+        index = LicenseIndex(_graph())
+
+        assert index[EX.paper].licenses == {str(CC_BY)}
+        assert index[EX.paper].access_level == "public"
+
+    def test_inherits_through_derivation_chains(self):
+        index = LicenseIndex(_graph())
+
+        assert index[EX.evidence] == index[EX.paper]
+
+    def test_multiple_sources_combine_restrictively(self):
+        terms = LicenseIndex(_graph())[EX.result]
+
+        assert terms.licenses == {str(CC_BY), str(PROPRIETARY)}
+        assert terms.access_level == "institutional"
+        assert terms.publishable is False
+
+    def test_own_terms_override_sources(self):
+        terms = LicenseIndex(_graph())[EX.relicensed]
+
+        assert terms.licenses == {str(CC0)}
+        assert terms.access_level == "institutional"  # still inherited
+        assert terms.publishable is True
+
+    def test_cycles_terminate(self):
+        g = Graph()
+        g.add((EX.a, PROV.wasDerivedFrom, EX.b))
+        g.add((EX.b, PROV.wasDerivedFrom, EX.a))
+        g.add((EX.b, DCTERMS.license, CC_BY))
+
+        index = LicenseIndex(g)
+
+        assert index[EX.a].licenses == {str(CC_BY)}
+
+    def test_unknown_entities(self):
+        terms = LicenseIndex(Graph())[EX.nothing]
+
+        assert not terms.licenses
+        assert terms.access_level is None and terms.publishable is None
+
+
+class TestCheck:
+    def test_violation_report(self):
+        index = LicenseIndex(_graph())
+
+        report = index.check(
+            [EX.evidence, EX.result, EX.relicensed, EX.orphan],
+            {"allow": ["CC-BY-4.0", "CC0"], "block": ["Proprietary"]},
+        )
+
+        assert report.counts == {
+            "CC-BY-4.0": 2,
+            "Proprietary": 1,
+            "CC0": 1,
+            "unlicensed": 1,
+        }
+        assert set(report.violations) == {
+            Violation(str(EX.result), "not publishable"),
+            Violation(str(EX.result), "blocked: Proprietary"),
+        }
+        assert not report.publishable
+        assert "Overall: BLOCKED" in report.summary()
+
+    def test_allow_list_and_access_levels(self):
+        index = LicenseIndex(_graph())
+
+        report = index.check(
+            [EX.evidence, EX.relicensed], {"allow": ["CC-BY-4.0"], "access": ["public"]}
+        )
+
+        assert set(report.violations) == {
+            Violation(str(EX.relicensed), "access level institutional"),
+            Violation(str(EX.relicensed), "not allowed: CC0"),
+        }
+
+    def test_warnings_do_not_block(self):
+        index = LicenseIndex(_graph())
+
+        report = index.check([EX.paper], {"warn": [str(CC_BY)]})
+
+        assert report.publishable and report.warnings
+        assert LicenseReport.from_dict(report.to_dict()) == report
+
+    def test_scales_linearly(self):
+        """Deep and wide derivation graphs resolve in one pass"""
+        n = 50_000
+        g = Graph()
+        g.add((EX.root, DCTERMS.license, CC_BY))
+        g.addN(
+            (EX[f"e{i}"], PROV.wasDerivedFrom, EX[f"e{i - 1}"] if i else EX.root, g)
+            for i in range(n)
+        )
+        entities = [EX[f"e{i}"] for i in range(n)]
+
+        start = time.perf_counter()
+        report = LicenseIndex(g).check(entities, {"allow": ["CC-BY-4.0"]})
+        elapsed = time.perf_counter() - start
+
+        assert report.counts == {"CC-BY-4.0": n}
+        assert report.publishable
+        assert elapsed < 10
@@ -236,3 +236,74 @@ class TestGetProvenanceGraphTool:
 
             # Verify source is a valid URL
             assert evidence["source"].startswith("https://doi.org/")
+
+
+class TestMintTools:
+    """Tests for mint_hypothesis / mint_design MCP tools"""
+
+    def test_mint_hypothesis_writes_trusty_nanopub(self, tmp_path):
+        from scimantic.mcp import mint_hypothesis
+
+        result = mint_hypothesis(
+            "N2 bond length is 1.10 Å",
+            evidence_uris=["http://example.org/research/evidence/abc"],
+            nanopub_dir=str(tmp_path),
+        )
+
+        uri = result.removeprefix("Minted Hypothesis: ")
+        assert uri.startswith("http://purl.org/np/RA")
+        files = list(tmp_path.glob("*.trig"))
+        assert [f.stem for f in files] == [uri.rsplit("/", 1)[-1]]
+
+        from rdflib import Dataset
+
+        ds = Dataset()
+        ds.parse(files[0], format="trig")
+        assertion = ds.graph(URIRef(f"{uri}#assertion"))
+        hypothesis = URIRef(f"{uri}#hypothesis")
+        assert (hypothesis, RDF.type, SCIMANTIC.Hypothesis) in assertion
+        assert (
+            hypothesis,
+            PROV.wasDerivedFrom,
+            URIRef("http://example.org/research/evidence/abc"),
+        ) in assertion
+
+    def test_mint_design_records_parameters(self, tmp_path):
+        from scimantic.mcp import mint_design
+
+        result = mint_design(
+            {"basis set": "cc-pVQZ", "charge": 0},
+            "GAMESS MRCI",
+            nanopub_dir=str(tmp_path),
+        )
+
+        uri = result.removeprefix("Minted Design: ")
+        assert uri.startswith("http://purl.org/np/RA")
+        text = next(tmp_path.glob("*.trig")).read_text()
+        assert "cc-pVQZ" in text
+        assert "GAMESS MRCI" in text
+
+    def test_publish_nanopubs_runs_in_background(self, tmp_path, nanopub_server):
+        import time
+
+        from scimantic.mcp import _publishers, mint_hypothesis, publish_nanopubs
+
+        mint_hypothesis("N2 is linear", nanopub_dir=str(tmp_path))
+
+        result = publish_nanopubs(nanopub_server.url, nanopub_dir=str(tmp_path))
+        assert result.startswith(f"Publishing to {nanopub_server.url}")
+
+        deadline = time.time() + 5
+        while not nanopub_server.received and time.time() < deadline:
+            time.sleep(0.02)
+        for publisher in _publishers.values():
+            publisher.stop(timeout=5)
+        _publishers.clear()
+
+        assert len(nanopub_server.received) == 1
+        assert "1 published" in publish_nanopubs(
+            nanopub_server.url, nanopub_dir=str(tmp_path)
+        )
+        for publisher in _publishers.values():
+            publisher.stop(timeout=5)
+        _publishers.clear()
@@ -0,0 +1,235 @@
+"""
+Unit tests for the sorted canonical N-Triples project format.
+"""
+
+import gzip
+import json
+
+import pytest
+from rdflib import BNode, Graph, Literal, Namespace, URIRef
+from rdflib.compare import isomorphic
+from rdflib.namespace import RDF
+
+from scimantic import cli
+from scimantic.ntriples import (
+    find_subject,
+    is_sorted,
+    iter_triples,
+    load_ntriples,
+    merge_graph,
+    merge_ntriples,
+    write_ntriples,
+)
+from scimantic.storage import convert_project, load_project
+
+EX = Namespace("http://example.org/research/")
+SCIMANTIC = Namespace("http://scimantic.io/")
+
+
+def _graph(*subjects: str) -> Graph:
+    g = Graph()
+    for name in subjects:
+        g.add((EX[name], RDF.type, SCIMANTIC.Evidence))
+        g.add((EX[name], SCIMANTIC.content, Literal(f"content of {name}")))
+    return g
+
+
+@pytest.fixture(params=["project.nt", "project.nt.gz"])
+def nt_path(request, tmp_path):
+    return tmp_path / request.param
+
+
+class TestWriteNTriples:
+    def test_lines_are_sorted_and_unique(self, tmp_path):
+        path = tmp_path / "project.nt"
+        count = write_ntriples(_graph("b", "a", "c"), path)
+
+        lines = path.read_bytes().splitlines()
+        assert count == len(lines) == 6
+        assert lines == sorted(set(lines))
+
+    def test_gzip_output_is_deterministic(self, tmp_path):
+        first, second = tmp_path / "1.nt.gz", tmp_path / "2.nt.gz"
+        write_ntriples(_graph("a", "b"), first)
+        write_ntriples(_graph("b", "a"), second)
+
+        assert first.read_bytes() == second.read_bytes()
+        assert gzip.decompress(first.read_bytes()).startswith(b"<http://example.org")
+
+    def test_round_trip(self, nt_path):
+        g = _graph("a")
+        g.add((EX.a, SCIMANTIC.note, Literal('line one\nline "two"', lang="en")))
+        g.add((EX.a, SCIMANTIC.value, Literal(28.0134)))
+        node = BNode()
+        g.add((EX.a, SCIMANTIC.measurement, node))
+        g.add((node, SCIMANTIC.unit, Literal("g/mol")))
+
+        write_ntriples(g, nt_path)
+
+        assert isomorphic(load_ntriples(nt_path), g)
+
+    def test_blank_node_labels_are_canonical(self, tmp_path):
+        def graph_with_bnode() -> Graph:
+            g = Graph()
+            node = BNode()
+            g.add((EX.a, SCIMANTIC.measurement, node))
+            g.add((node, SCIMANTIC.unit, Literal("K")))
+            return g
+
+        write_ntriples(graph_with_bnode(), tmp_path / "1.nt")
+        write_ntriples(graph_with_bnode(), tmp_path / "2.nt")
+
+        assert (tmp_path / "1.nt").read_bytes() == (tmp_path / "2.nt").read_bytes()
+
+    def test_streams_in_chunks(self, tmp_path, monkeypatch):
+        from scimantic import ntriples
+
+        monkeypatch.setattr(ntriples, "_CHUNK_LINES", 3)
+        path = tmp_path / "project.nt"
+        g = _graph(*(f"e{i}" for i in range(10)))
+        write_ntriples(g, path)
+
+        assert set(iter_triples(path)) == set(g)
+
+
+class TestMerge:
+    def test_merge_graph_adds_new_triples(self, nt_path):
+        write_ntriples(_graph("a", "c"), nt_path)
+
+        count = merge_graph(_graph("b", "c"), nt_path)
+
+        assert count == 6
+        assert set(load_ntriples(nt_path)) == set(_graph("a", "b", "c"))
+        if nt_path.suffix == ".nt":
+            lines = nt_path.read_bytes().splitlines()
+            assert lines == sorted(set(lines))
+
+    def test_merge_graph_creates_file(self, nt_path):
+        merge_graph(_graph("a"), nt_path)
+
+        assert set(load_ntriples(nt_path)) == set(_graph("a"))
+
+    def test_merge_graph_with_blank_nodes(self, nt_path):
+        write_ntriples(_graph("a"), nt_path)
+        delta = Graph()
+        node = BNode()
+        delta.add((EX.b, SCIMANTIC.measurement, node))
+        delta.add((node, SCIMANTIC.unit, Literal("K")))
+
+        merge_graph(delta, nt_path)
+
+        assert isomorphic(load_ntriples(nt_path), _graph("a") + delta)
+
+    def test_merge_files(self, tmp_path):
+        write_ntriples(_graph("a", "b"), tmp_path / "1.nt")
+        write_ntriples(_graph("b", "c"), tmp_path / "2.nt.gz")
+
+        count = merge_ntriples(
+            [tmp_path / "1.nt", tmp_path / "2.nt.gz"], tmp_path / "1.nt"
+        )
+
+        assert count == 6
+        assert set(load_ntriples(tmp_path / "1.nt")) == set(_graph("a", "b", "c"))
+
+
+def _write_unsorted(path, graph):
+    """Writes N-Triples as another tool might: unsorted, with a duplicate."""
+    lines = sorted(graph.serialize(format="nt").splitlines(keepends=True))
+    text = "".join(reversed(lines + lines[:1]))
+    if path.suffix == ".gz":
+        path.write_bytes(gzip.compress(text.encode()))
+    else:
+        path.write_text(text)
+
+
+class TestUnsortedFiles:
+    def test_merge_rewrites_unsorted_file(self, nt_path):
+        _write_unsorted(nt_path, _graph("a", "c"))
+        assert not is_sorted(nt_path)
+
+        count = merge_graph(_graph("b"), nt_path)
+
+        assert count == 6
+        assert is_sorted(nt_path)
+        assert set(load_ntriples(nt_path)) == set(_graph("a", "b", "c"))
+
+    def test_find_subject_in_unsorted_file(self, nt_path):
+        _write_unsorted(nt_path, _graph(*(f"e{i}" for i in range(20))))
+
+        assert set(find_subject(nt_path, EX.e3)) == set(_graph("e3"))
+
+    def test_merge_files_with_unsorted_source(self, tmp_path):
+        _write_unsorted(tmp_path / "1.nt", _graph("c", "a"))
+        write_ntriples(_graph("b"), tmp_path / "2.nt")
+
+        count = merge_ntriples(
+            [tmp_path / "1.nt", tmp_path / "2.nt"], tmp_path / "3.nt"
+        )
+
+        assert count == 6
+        assert is_sorted(tmp_path / "3.nt")
+
+
+class TestFindSubject:
+    def test_finds_subject_block(self, nt_path):
+        write_ntriples(_graph(*(f"e{i}" for i in range(50))), nt_path)
+
+        triples = find_subject(nt_path, EX.e17)
+
+        assert set(triples) == set(_graph("e17"))
+
+    def test_does_not_match_longer_iris(self, nt_path):
+        g = _graph("b", "b/c", "bc")
+        write_ntriples(g, nt_path)
+
+        assert set(find_subject(nt_path, EX.b)) == set(_graph("b"))
+
+    def test_missing_subject(self, nt_path):
+        write_ntriples(_graph("a", "c"), nt_path)
+
+        assert find_subject(nt_path, EX.b) == []
+        assert find_subject(nt_path, EX.z) == []
+        assert find_subject(nt_path, URIRef("http://a.example/")) == []
+
+
+class TestProjectStorage:
+    def test_convert_turtle_to_ntriples_and_back(self, tmp_path):
+        turtle = tmp_path / "project.ttl"
+        _graph("a", "b").serialize(destination=str(turtle), format="turtle")
+
+        assert convert_project(turtle, tmp_path / "project.nt.gz") == 4
+        convert_project(tmp_path / "project.nt.gz", tmp_path / "copy.ttl")
+
+        assert isomorphic(load_project(tmp_path / "copy.ttl"), _graph("a", "b"))
+
+    def test_add_evidence_to_ntriples_project(self, tmp_path):
+        from scimantic.mcp import add_evidence, get_provenance_graph_json
+
+        project_file = tmp_path / "project.nt"
+        for content in ("First finding", "Second finding"):
+            add_evidence(
+                content=content,
+                citation="Kuhn, T., et al. (2016).",
+                source="https://doi.org/10.7717/peerj-cs.78",
+                agent="http://example.org/agent/test",
+                project_path=str(project_file),
+            )
+
+        lines = project_file.read_bytes().splitlines()
+        assert lines == sorted(set(lines))
+        graph = json.loads(get_provenance_graph_json(project_path=str(project_file)))
+        assert {e["content"] for e in graph["evidence"]} == {
+            "First finding",
+            "Second finding",
+        }
+
+    def test_cli_convert(self, tmp_path, capsys):
+        turtle = tmp_path / "project.ttl"
+        _graph("a").serialize(destination=str(turtle), format="turtle")
+
+        with pytest.raises(SystemExit) as exit_info:
+            cli.main(["convert", str(turtle), str(tmp_path / "project.nt")])
+
+        assert exit_info.value.code == 0
+        assert "Converted" in capsys.readouterr().out
+        assert set(load_ntriples(tmp_path / "project.nt")) == set(_graph("a"))
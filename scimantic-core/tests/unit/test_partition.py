@@ -0,0 +1,159 @@
+"""
+Unit tests for partitioned project storage.
+"""
+
+import json
+
+import pytest
+from rdflib import BNode, Graph, Literal, Namespace
+from rdflib.namespace import PROV, RDF, RDFS
+
+from scimantic.partition import (
+    MISC_PARTITION,
+    PartitionedProject,
+    is_partitioned,
+    partition_key,
+)
+from scimantic.storage import convert_project, load_project, save_project
+
+EX = Namespace("http://example.org/research/")
+SCIMANTIC = Namespace("http://scimantic.io/")
+
+
+@pytest.fixture
+def graph():
+    g = Graph()
+    g.add((EX.q1, RDF.type, SCIMANTIC.Question))
+    g.add((EX.q1, RDF.type, PROV.Entity))
+    g.add((EX.q1, RDFS.label, Literal("Is N2 linear?")))
+    g.add((EX.e1, RDF.type, SCIMANTIC.Evidence))
+    g.add((EX.e1, PROV.wasAttributedTo, EX.alice))
+    g.add((EX.alice, RDF.type, PROV.Agent))
+    g.add((EX.h1, RDF.type, SCIMANTIC.Hypothesis))
+    measurement = BNode()
+    g.add((EX.h1, SCIMANTIC.measurement, measurement))
+    g.add((measurement, SCIMANTIC.unit, Literal("K")))
+    g.add((EX.loose, RDFS.comment, Literal("untyped")))
+    return g
+
+
+@pytest.fixture
+def project(graph, tmp_path):
+    project = PartitionedProject(tmp_path / "graph")
+    project.save(graph)
+    return project
+
+
+class TestPartitionKey:
+    def test_scimantic_class_wins(self):
+        assert partition_key([PROV.Entity, SCIMANTIC.Evidence]) == "Evidence"
+
+    def test_generic_prov_class(self):
+        assert partition_key([PROV.Agent]) == "Agent"
+
+    def test_untyped(self):
+        assert partition_key([]) == MISC_PARTITION
+
+
+class TestPartitionedProject:
+    def test_one_file_per_class(self, project):
+        files = sorted(p.name for p in project.directory.glob("*.nt"))
+
+        assert files == [
+            "Agent.nt",
+            "Evidence.nt",
+            "Hypothesis.nt",
+            "Question.nt",
+            "misc.nt",
+        ]
+        manifest = json.loads((project.directory / "manifest.json").read_text())
+        assert manifest["partitions"]["Question"]["classes"] == [
+            str(SCIMANTIC.Question),
+            str(PROV.Entity),
+        ]
+        assert manifest["partitions"]["Question"]["triples"] == 3
+
+    def test_round_trip(self, graph, project):
+        assert PartitionedProject(project.directory).load().isomorphic(graph)
+
+    def test_loads_only_requested_classes(self, project):
+        g = PartitionedProject(project.directory).load([SCIMANTIC.Question])
+
+        assert set(g.subjects()) == {EX.q1}
+
+    def test_blank_nodes_stay_with_their_subject(self, project):
+        g = project.load([SCIMANTIC.Hypothesis])
+
+        (measurement,) = g.objects(EX.h1, SCIMANTIC.measurement)
+        assert g.value(measurement, SCIMANTIC.unit) == Literal("K")
+
+    def test_add_touches_only_affected_partitions(self, project):
+        before = {p.name: p.stat().st_mtime_ns for p in project.directory.glob("*.nt")}
+        delta = Graph()
+        delta.add((EX.e2, RDF.type, SCIMANTIC.Evidence))
+        delta.add((EX.q1, RDFS.comment, Literal("untyped in the delta")))
+
+        changed = project.add(delta)
+
+        assert changed == ["Evidence", "Question"]
+        after = {p.name: p.stat().st_mtime_ns for p in project.directory.glob("*.nt")}
+        assert after["Agent.nt"] == before["Agent.nt"]
+        assert after["Hypothesis.nt"] == before["Hypothesis.nt"]
+        question = project.load([SCIMANTIC.Question])
+        assert (EX.q1, RDFS.comment, None) in question
+        assert project.partitions["Evidence"]["triples"] == 3
+
+
+class TestPartitionedStorage:
+    def test_mcp_tree_view_reads_question_and_evidence(self, tmp_path, monkeypatch):
+        from scimantic import partition
+        from scimantic.mcp import add_evidence, add_question, get_provenance_graph_json
+
+        directory = tmp_path / ".scimantic" / "graph"
+        directory.mkdir(parents=True)
+        question = add_question(
+            label="Is N2 linear?",
+            agent="http://example.org/agent/test",
+            project_path=str(directory),
+        )
+        add_evidence(
+            content="N2 is diatomic",
+            citation="Kuhn, T., et al. (2016).",
+            source="https://doi.org/10.7717/peerj-cs.78",
+            agent="http://example.org/agent/test",
+            project_path=str(directory),
+            relates_to_question=question["uri"],
+        )
+
+        loaded = []
+        load_ntriples = partition.load_ntriples
+
+        def recording_load(path, graph=None):
+            loaded.append(path.name)
+            return load_ntriples(path, graph)
+
+        monkeypatch.setattr(partition, "load_ntriples", recording_load)
+        data = json.loads(get_provenance_graph_json(str(directory)))
+
+        assert sorted(loaded) == ["Evidence.nt", "Question.nt"]
+        assert [e["content"] for e in data["evidence"]] == ["N2 is diatomic"]
+        assert [q["label"] for q in data["questions"]] == ["Is N2 linear?"]
+        assert (directory / "QuestionFormation.nt").exists()
+
+    def test_convert_to_and_from_partitions(self, graph, tmp_path):
+        graph.serialize(destination=str(tmp_path / "project.ttl"), format="turtle")
+
+        convert_project(tmp_path / "project.ttl", tmp_path / "graph", partitioned=True)
+        convert_project(tmp_path / "graph", tmp_path / "copy.ttl")
+
+        assert load_project(tmp_path / "copy.ttl").isomorphic(graph)
+
+    def test_partitions_are_created_only_on_request(self, graph, tmp_path):
+        save_project(graph, tmp_path / "project")
+
+        assert (tmp_path / "project").is_file()
+        assert not is_partitioned(tmp_path / "project")
+        assert not is_partitioned(tmp_path / "missing")
+        assert load_project(tmp_path / "project").isomorphic(graph)
+        (tmp_path / "empty").mkdir()
+        assert is_partitioned(tmp_path / "empty")
@@ -0,0 +1,187 @@
+"""
+Unit tests for the typed Result table.
+"""
+
+import json
+
+import numpy as np
+import pytest
+from rdflib import Graph, Literal, Namespace
+from rdflib.namespace import PROV, RDF, RDFS
+
+from scimantic import results
+from scimantic.config import DEFAULT_RESULT_CACHE_DIR
+from scimantic.results import (
+    convert,
+    load_result_table,
+    normalize_unit,
+    table_path,
+)
+from scimantic.storage import add_to_project, save_project
+
+EX = Namespace("http://example.org/research/")
+SCIMANTIC = Namespace("http://scimantic.io/")
+
+
+def _result(g, name, value, unit, dataset=None, supports=None):
+    uri = EX[name]
+    g.add((uri, RDF.type, SCIMANTIC.Result))
+    g.add((uri, RDFS.label, Literal(name)))
+    g.add((uri, SCIMANTIC.value, Literal(value)))
+    g.add((uri, SCIMANTIC.unit, Literal(unit)))
+    if dataset:
+        g.add((uri, PROV.wasDerivedFrom, EX[dataset]))
+    if supports:
+        g.add((uri, SCIMANTIC.supports, EX[supports]))
+    return uri
+
+
+@pytest.fixture(params=["project.ttl", "project.nt", "graph"])
+def project(request, tmp_path):
+    g = Graph()
+    _result(g, "barrier", "25.1 ± 0.3", "kcal mol-1", dataset="run1", supports="h1")
+    _result(g, "barrier_dft", "1.05(2)", "eV", dataset="run2")
+    _result(g, "temperature", "25", "°C", dataset="run1")
+    _result(g, "bond", "1.0977", "Å", supports="h1")
+    _result(g, "note", "not measured", "")
+    path = tmp_path / request.param
+    save_project(g, path, partitioned=request.param == "graph")
+    return path
+
+
+class TestUnits:
+    @pytest.mark.parametrize(
+        "unit, expected",
+        [
+            ("kcal mol-1", "kcal/mol"),
+            ("kJ·mol^-1", "kJ/mol"),
+            ("Å", "angstrom"),
+            ("° C", "degC"),
+            ("Hartree", "hartree"),
+            ("µs", "us"),
+            ("MeV", "MeV"),
+            ("meV", "meV"),
+            ("mHz", "mHz"),
+            ("MHz", "MHz"),
+        ],
+    )
+    def test_normalize_unit(self, unit, expected):
+        assert normalize_unit(unit) == expected
+
+    @pytest.mark.parametrize("unit", ["g/cm^3", "MEV", "ev"])
+    def test_unknown_unit(self, unit):
+        with pytest.raises(ValueError, match="Unknown unit"):
+            normalize_unit(unit)
+
+    def test_prefix_case_is_kept(self):
+        energies = convert(np.array([1.0, 1.0]), np.array(["MeV", "meV"]), "eV")
+        frequencies = convert(np.array([1.0, 1.0]), np.array(["MHz", "mHz"]), "Hz")
+
+        assert energies.tolist() == pytest.approx([1e6, 1e-3])
+        assert frequencies.tolist() == pytest.approx([1e6, 1e-3])
+
+    def test_convert_per_distinct_unit(self):
+        values = np.array([1.0, 4.184, 0.0, 1.0, 2.0])
+        units = np.array(["kcal/mol", "kJ/mol", "degC", "m", "g/cm^3"])
+
+        converted = convert(values, units, "kJ/mol")
+
+        assert converted[:2] == pytest.approx([4.184, 4.184])
+        assert np.isnan(converted[2:]).all()
+        assert convert(values[2:3], units[2:3], "K")[0] == pytest.approx(273.15)
+        with pytest.raises(ValueError, match="Unknown unit"):
+            convert(values[4:], units[4:], "g/cm^3")
+
+    def test_uncertainties_ignore_offsets(self):
+        assert convert(np.array([0.5]), np.array(["degC"]), "K", offset=False)[
+            0
+        ] == pytest.approx(0.5)
+
+
+class TestResultTable:
+    def test_values_are_parsed_once(self, project):
+        table = load_result_table(project)
+
+        assert len(table) == 5
+        row = list(table.uris).index(str(EX.barrier))
+        assert table.values[row] == 25.1
+        assert table.uncertainties[row] == 0.3
+        assert table.units[row] == "kcal/mol"
+        assert np.isnan(table.values[list(table.uris).index(str(EX.note))])
+        assert table_path(project).exists()
+        assert table_path(project).parent == project.parent / DEFAULT_RESULT_CACHE_DIR
+
+    def test_select_range_in_a_unit(self, project):
+        table = load_result_table(project)
+
+        rows = table.select(min_value=100, unit="kJ/mol")
+
+        assert sorted(table.uris[rows]) == [str(EX.barrier), str(EX.barrier_dft)]
+        values = table.values_in("kJ/mol")[rows]
+        assert values == pytest.approx([105.0184, 101.309], rel=1e-4)
+
+    def test_select_by_links(self, project):
+        table = load_result_table(project)
+
+        by_dataset = table.uris[table.select(dataset=str(EX.run1))]
+        by_hypothesis = table.uris[table.select(supports=str(EX.h1), unit="pm")]
+
+        assert sorted(by_dataset) == [str(EX.barrier), str(EX.temperature)]
+        assert list(by_hypothesis) == [str(EX.bond)]
+
+    def test_table_is_updated_incrementally(self, project, monkeypatch):
+        load_result_table(project)
+
+        def no_rebuild(path):
+            raise AssertionError("the table should be merged, not rebuilt")
+
+        monkeypatch.setattr(results, "build_result_table", no_rebuild)
+        delta = Graph()
+        _result(delta, "barrier_ccsd", "23.9 ± 0.2", "kcal/mol", dataset="run3")
+        delta.add((EX.bond, SCIMANTIC.contradicts, EX.h2))
+        add_to_project(delta, project)
+
+        table = load_result_table(project)
+        assert len(table) == 6
+        assert list(table.uris[table.select(max_value=24.1, unit="kcal/mol")]) == [
+            str(EX.barrier_ccsd)
+        ]
+        assert list(table.uris[table.select(contradicts=str(EX.h2))]) == [str(EX.bond)]
+        assert list(table.uris[table.select(supports=str(EX.h1))]) == [
+            str(EX.barrier),
+            str(EX.bond),
+        ]
+
+    def test_stale_table_is_rebuilt(self, project):
+        load_result_table(project)
+        g = Graph()
+        _result(g, "only", "1", "K")
+
+        save_project(g, project)
+
+        assert list(load_result_table(project).uris) == [str(EX.only)]
+
+    def test_results_derived_from_results_have_no_dataset(self, tmp_path):
+        g = Graph()
+        _result(g, "a", "1", "K", dataset="run1")
+        derived = _result(g, "b", "2", "K")
+        g.add((derived, PROV.wasDerivedFrom, EX.a))
+        save_project(g, tmp_path / "project.ttl")
+
+        table = load_result_table(tmp_path / "project.ttl")
+
+        assert set(table.link_targets) == {str(EX.run1)}
+
+
+def test_query_results_tool(project):
+    from scimantic.mcp import query_results
+
+    data = json.loads(
+        query_results(min_value=1.0, unit="eV", limit=1, project_path=str(project))
+    )
+
+    assert data["count"] == 2
+    assert len(data["results"]) == 1
+    assert data["min"] == pytest.approx(1.05)
+    assert data["max"] == pytest.approx(25.1 * 4.184 / 96.485332, rel=1e-4)
+    assert data["results"][0]["unit"] == "eV"
@@ -0,0 +1,162 @@
+"""
+Unit tests for the deterministic Turtle serializer.
+"""
+
+import random
+from pathlib import Path
+
+import pytest
+from rdflib import BNode, Graph, Literal, Namespace, URIRef
+from rdflib.collection import Collection
+from rdflib.compare import isomorphic
+from rdflib.namespace import OWL, RDF, RDFS, XSD
+
+from scimantic.gen_all import TTL_NAMESPACES, determinize_ttl
+from scimantic.serializer import serialize_deterministic
+
+SCIMANTIC = Namespace("http://scimantic.io/")
+SH = Namespace("http://www.w3.org/ns/shacl#")
+GENERATED = (
+    Path(__file__).parent.parent.parent.parent / "scimantic-ontology" / "generated"
+)
+
+
+def _sample_triples() -> list[tuple]:
+    """Triples with inline bnodes, a shared bnode, a list and tricky literals."""
+    restriction, shared, items = BNode(), BNode(), BNode()
+    triples = [
+        (SCIMANTIC[""], RDF.type, OWL.Ontology),
+        (SCIMANTIC.Question, RDF.type, OWL.Class),
+        (SCIMANTIC.Question, RDFS.label, Literal("Question", lang="en")),
+        (SCIMANTIC.Question, RDFS.comment, Literal('multi\nline "quoted" \\ text')),
+        (SCIMANTIC.Question, RDFS.subClassOf, restriction),
+        (restriction, RDF.type, OWL.Restriction),
+        (restriction, OWL.onProperty, SCIMANTIC.motivates),
+        (restriction, OWL.minCardinality, Literal(0)),
+        (SCIMANTIC.Question, SCIMANTIC.uncertainty, shared),
+        (SCIMANTIC.Hypothesis, SCIMANTIC.uncertainty, shared),
+        (shared, SCIMANTIC.value, Literal("0.5", datatype=XSD.decimal)),
+        (shared, SCIMANTIC.publishable, Literal(True)),
+        (SCIMANTIC.QuestionShape, SH.ignoredProperties, items),
+    ]
+    g = Graph()
+    Collection(g, items, [RDFS.label, SCIMANTIC.value, RDF.type])
+    return triples + list(g)
+
+
+def _graph(triples: list[tuple]) -> Graph:
+    """Builds a graph with fresh blank node ids, as a new parse would."""
+    fresh: dict[BNode, BNode] = {}
+    g = Graph()
+    for triple in triples:
+        g.add(
+            tuple(
+                fresh.setdefault(t, BNode()) if isinstance(t, BNode) else t
+                for t in triple
+            )
+        )
+    return g
+
+
+def _serialize(g: Graph, **kwargs) -> str:
+    return serialize_deterministic(g, namespaces=TTL_NAMESPACES, **kwargs)
+
+
+class TestSerializeDeterministic:
+    """Tests for serialize_deterministic"""
+
+    def test_byte_identical_across_runs(self):
+        """Fresh bnode ids and insertion order do not change the output"""
+        triples = _sample_triples()
+        outputs = set()
+        for seed in range(5):
+            random.Random(seed).shuffle(triples)
+            outputs.add(_serialize(_graph(triples)))
+
+        assert len(outputs) == 1
+
+    def test_output_is_isomorphic_to_input(self):
+        g = _graph(_sample_triples())
+
+        parsed = Graph().parse(data=_serialize(g), format="turtle")
+
+        assert isomorphic(parsed, g)
+
+    def test_inlines_single_use_bnodes_and_labels_shared_ones(self):
+        text = _serialize(_graph(_sample_triples()))
+
+        assert "rdfs:subClassOf [ a owl:Restriction ;" in text
+        assert text.count("_:b") == 3  # shared bnode: two references + subject
+
+    def test_sorted_list_predicates(self):
+        text = _serialize(
+            _graph(_sample_triples()), sorted_list_predicates=[SH.ignoredProperties]
+        )
+
+        # Sorted by full IRI, not by prefixed name
+        assert "sh:ignoredProperties ( scimantic:value rdf:type rdfs:label )" in text
+
+    def test_unsorted_lists_keep_their_order(self):
+        text = _serialize(_graph(_sample_triples()))
+
+        assert "sh:ignoredProperties ( rdfs:label scimantic:value rdf:type )" in text
+
+    def test_only_used_prefixes_are_declared(self):
+        text = _serialize(_graph(_sample_triples()))
+
+        assert "@prefix sh: <http://www.w3.org/ns/shacl#> ." in text
+        assert "@prefix prov:" not in text
+        assert text.endswith(" .\n") and not text.endswith("\n\n")
+
+    def test_non_qname_iris_are_written_in_full(self):
+        g = Graph()
+        g.add((URIRef("http://scimantic.io/a/b"), RDFS.label, Literal("x")))
+        g.add((URIRef("http://example.org/thing"), RDFS.label, Literal("y")))
+
+        text = _serialize(g)
+
+        assert "<http://scimantic.io/a/b> rdfs:label" in text
+        assert "<http://example.org/thing> rdfs:label" in text
+        assert isomorphic(Graph().parse(data=text, format="turtle"), g)
+
+    def test_identical_inline_bnodes_are_kept(self):
+        g = Graph().parse(
+            data="""
+                @prefix ex: <http://example.org/> .
+                ex:s ex:p [ ex:q [ ex:r 1 ] ], [ ex:q [ ex:r 1 ] ] .
+            """,
+            format="turtle",
+        )
+
+        text = _serialize(g)
+
+        assert len(g) == 6
+        assert isomorphic(Graph().parse(data=text, format="turtle"), g)
+
+    @pytest.mark.parametrize(
+        "artifact", ["scimantic.ttl", "shacl/scimantic-shapes.ttl"]
+    )
+    def test_generated_artifacts(self, artifact):
+        """Generated ontology and shapes serialize stably and losslessly"""
+        source = (GENERATED / artifact).read_text()
+        first = Graph().parse(data=source, format="turtle")
+        second = Graph().parse(data=source, format="turtle")
+
+        text = _serialize(first)
+
+        assert text == _serialize(second)
+        assert isomorphic(Graph().parse(data=text, format="turtle"), first)
+
+
+class TestDeterminizeTtl:
+    """Tests for gen_all.determinize_ttl"""
+
+    def test_determinize_is_idempotent(self, tmp_path):
+        target = tmp_path / "shapes.ttl"
+        target.write_bytes((GENERATED / "shacl" / "scimantic-shapes.ttl").read_bytes())
+
+        determinize_ttl(target)
+        first = target.read_bytes()
+        determinize_ttl(target)
+
+        assert target.read_bytes() == first
@@ -0,0 +1,164 @@
+"""
+Unit tests for the SQLite-backed project store.
+"""
+
+import json
+import sqlite3
+
+import pytest
+from rdflib import BNode, Dataset, Graph, Literal, Namespace, URIRef
+from rdflib.namespace import PROV, RDF
+
+from scimantic.sqlitestore import SQLiteStore, open_sqlite
+from scimantic.storage import add_to_project, convert_project, load_project
+
+EX = Namespace("http://example.org/research/")
+SCIMANTIC = Namespace("http://scimantic.io/")
+
+
+@pytest.fixture
+def graph():
+    g = Graph()
+    for i in range(10):
+        entity = EX[f"e{i}"]
+        g.add((entity, RDF.type, SCIMANTIC.Evidence))
+        g.add((entity, SCIMANTIC.content, Literal(f'finding "{i}"\nsecond line')))
+        g.add((entity, PROV.wasDerivedFrom, EX[f"e{i // 3}"]))
+    g.add((EX.e1, SCIMANTIC.value, Literal(28.0134)))
+    measurement = BNode()
+    g.add((EX.e2, SCIMANTIC.measurement, measurement))
+    g.add((measurement, SCIMANTIC.unit, Literal("K", lang="en")))
+    return g
+
+
+@pytest.fixture
+def project(graph, tmp_path):
+    path = tmp_path / "project.sqlite"
+    g = open_sqlite(path)
+    g.addN((s, p, o, g) for s, p, o in graph)
+    g.commit()
+    g.close()
+    return path
+
+
+class TestSQLiteStore:
+    def test_persists_committed_triples(self, graph, project):
+        g = open_sqlite(project)
+
+        assert len(g) == len(graph)
+        assert g.isomorphic(graph)
+
+    def test_pattern_lookups(self, graph, project):
+        g = open_sqlite(project)
+
+        for pattern in [
+            (EX.e1, None, None),
+            (None, PROV.wasDerivedFrom, EX.e1),
+            (None, None, Literal(28.0134)),
+            (EX.e1, RDF.type, None),
+            (EX.missing, None, None),
+        ]:
+            assert set(g.triples(pattern)) == set(graph.triples(pattern))
+
+    def test_terms_are_interned(self, project):
+        db = sqlite3.connect(project)
+
+        (count,) = db.execute(
+            "SELECT COUNT(*) FROM terms WHERE term = ?",
+            (b"<http://scimantic.io/Evidence>",),
+        ).fetchone()
+
+        assert count == 1
+
+    def test_wal_mode(self, project):
+        db = sqlite3.connect(project)
+
+        assert db.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+    def test_rollback_discards_writes(self, project):
+        g = open_sqlite(project)
+        g.add((EX.new, RDF.type, SCIMANTIC.Question))
+        g.remove((EX.e1, None, None))
+
+        g.rollback()
+
+        assert (EX.new, None, None) not in g
+        assert (EX.e1, None, None) in g
+
+    def test_uncommitted_writes_are_not_visible(self, project):
+        writer = open_sqlite(project)
+        writer.add((EX.new, RDF.type, SCIMANTIC.Question))
+
+        reader = open_sqlite(project)
+        assert (EX.new, None, None) not in reader
+
+        writer.commit()
+        assert (EX.new, None, None) in reader
+
+    def test_named_graphs(self, project):
+        store = SQLiteStore(str(project))
+        dataset = Dataset(store=store)
+        nanopub = dataset.graph(URIRef("http://example.org/np/1"))
+        nanopub.add((EX.h1, RDF.type, SCIMANTIC.Hypothesis))
+        store.commit()
+
+        default = Graph(store=store, identifier=URIRef("urn:x-rdflib:default"))
+        assert len(nanopub) == 1
+        assert (EX.h1, None, None) not in default
+        contexts = {c.identifier for c in store.contexts()}
+        assert URIRef("http://example.org/np/1") in contexts
+
+        store.remove_graph(nanopub)
+        assert len(Graph(store=store, identifier=nanopub.identifier)) == 0
+
+    def test_namespaces_persist(self, tmp_path):
+        g = open_sqlite(tmp_path / "project.sqlite")
+        g.bind("ex", EX)
+        g.commit()
+        g.close()
+
+        assert open_sqlite(tmp_path / "project.sqlite").store.namespace("ex") == (
+            URIRef(EX)
+        )
+
+
+class TestSQLiteProjects:
+    def test_turtle_import_and_export(self, graph, tmp_path):
+        graph.serialize(destination=str(tmp_path / "project.ttl"), format="turtle")
+
+        convert_project(tmp_path / "project.ttl", tmp_path / "project.sqlite")
+        convert_project(tmp_path / "project.sqlite", tmp_path / "export.ttl")
+
+        # Compare against the parsed Turtle: doubles change lexical form in it
+        expected = load_project(tmp_path / "project.ttl")
+        assert load_project(tmp_path / "export.ttl").isomorphic(expected)
+
+    def test_add_to_project_appends(self, graph, project):
+        delta = Graph()
+        delta.add((EX.q1, RDF.type, SCIMANTIC.Question))
+
+        add_to_project(delta, project)
+
+        g = load_project(project)
+        assert len(g) == len(graph) + 1
+        assert (EX.q1, RDF.type, SCIMANTIC.Question) in g
+
+    def test_mcp_tools_use_sqlite_project(self, tmp_path):
+        from scimantic.mcp import add_evidence, get_provenance_graph_json
+
+        project_file = tmp_path / "project.sqlite"
+        for content in ("First finding", "Second finding"):
+            add_evidence(
+                content=content,
+                citation="Kuhn, T., et al. (2016).",
+                source="https://doi.org/10.7717/peerj-cs.78",
+                agent="http://example.org/agent/test",
+                project_path=str(project_file),
+            )
+
+        data = json.loads(get_provenance_graph_json(str(project_file)))
+
+        assert {e["content"] for e in data["evidence"]} == {
+            "First finding",
+            "Second finding",
+        }
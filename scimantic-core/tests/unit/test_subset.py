@@ -0,0 +1,195 @@
+"""
+Unit tests for subset generation.
+"""
+
+import pytest
+from rdflib import Graph, URIRef
+
+from scimantic import subset
+from scimantic.storage import convert_project
+from scimantic.subset import SubsetDefinition, SubsetEngine
+
+PROJECT_TTL = """
+@prefix scimantic: <http://scimantic.io/> .
+@prefix dcterms: <http://purl.org/dc/terms/> .
+@prefix prov: <http://www.w3.org/ns/prov#> .
+@prefix ex: <http://example.org/research/> .
+
+ex:q1 a scimantic:Question ;
+    scimantic:content "Is N2 linear?" .
+
+ex:e1 a scimantic:Evidence ;
+    scimantic:content "N2 is diatomic" ;
+    dcterms:license <https://creativecommons.org/licenses/by/4.0/> ;
+    prov:wasDerivedFrom ex:q1 .
+
+ex:e2 a scimantic:Evidence ;
+    scimantic:content "Bond length 1.10 A" ;
+    dcterms:license <http://scimantic.io/license#AllRightsReserved> .
+"""
+
+EVIDENCE_YAML = """
+name: evidence
+title: Evidence
+license_filter:
+  allow: [CC-BY-4.0]
+  warn: [AllRightsReserved]
+query: |
+  CONSTRUCT { ?s ?p ?o } WHERE {
+    ?s a scimantic:Evidence .
+    ?s ?p ?o .
+  }
+"""
+
+QUESTIONS_YAML = """
+query: |
+  CONSTRUCT { ?s ?p ?o } WHERE { ?s a scimantic:Question ; ?p ?o . }
+"""
+
+
+@pytest.fixture
+def project(tmp_path):
+    (tmp_path / "project.ttl").write_text(PROJECT_TTL)
+    definitions = tmp_path / ".scimantic" / "subsets"
+    definitions.mkdir(parents=True)
+    (definitions / "evidence.yaml").write_text(EVIDENCE_YAML)
+    (definitions / "questions.yaml").write_text(QUESTIONS_YAML)
+    return tmp_path
+
+
+@pytest.fixture
+def master_loads(monkeypatch):
+    """Counts how often the master graph is parsed."""
+    calls = []
+    load_project = subset.load_project
+
+    def counting_load_project(path, *args, **kwargs):
+        calls.append(path)
+        return load_project(path, *args, **kwargs)
+
+    monkeypatch.setattr(subset, "load_project", counting_load_project)
+    return calls
+
+
+class TestSubsetDefinition:
+    def test_from_file(self, project):
+        definition = SubsetDefinition.from_file(
+            project / ".scimantic" / "subsets" / "evidence.yaml"
+        )
+
+        assert definition.name == "evidence"
+        assert definition.license_filter == {
+            "allow": ["CC-BY-4.0"],
+            "warn": ["AllRightsReserved"],
+        }
+        assert len(definition.digest) == 64
+
+    def test_name_defaults_to_file_stem(self, project):
+        definition = SubsetDefinition.from_file(
+            project / ".scimantic" / "subsets" / "questions.yaml"
+        )
+
+        assert definition.name == "questions"
+
+    def test_requires_construct_query(self, tmp_path):
+        path = tmp_path / "bad.yaml"
+        path.write_text("query: SELECT * WHERE { ?s ?p ?o }\n")
+
+        with pytest.raises(ValueError, match="CONSTRUCT"):
+            SubsetDefinition.from_file(path)
+
+
+class TestSubsetEngine:
+    def test_generates_subsets(self, project):
+        results = SubsetEngine(project).generate()
+
+        assert [r.name for r in results] == ["evidence", "questions"]
+        evidence = Graph().parse(project / "subsets" / "evidence.ttl")
+        e1 = URIRef("http://example.org/research/e1")
+        assert (e1, None, None) in evidence
+        assert (URIRef("http://example.org/research/q1"), None, None) not in evidence
+        assert results[0].entities == 2
+        assert results[0].licenses == {"CC-BY-4.0": 1, "AllRightsReserved": 1}
+
+    def test_license_report(self, project):
+        evidence, questions = SubsetEngine(project).generate()
+
+        assert evidence.report.publishable
+        assert [w.entity for w in evidence.report.warnings] == [
+            "http://example.org/research/e2"
+        ]
+        assert questions.licenses == {"unlicensed": 1}
+
+    def test_license_report_is_memoized(self, project):
+        first = SubsetEngine(project).generate()[0]
+
+        second = SubsetEngine(project).generate()[0]
+
+        assert second.cached
+        assert second.report == first.report
+
+    def test_master_is_loaded_once(self, project, master_loads):
+        SubsetEngine(project).generate()
+
+        assert len(master_loads) == 1
+
+    def test_unchanged_definitions_are_memoized(self, project, master_loads):
+        SubsetEngine(project).generate()
+        output = (project / "subsets" / "evidence.ttl").read_bytes()
+
+        results = SubsetEngine(project).generate()
+
+        assert all(r.cached for r in results)
+        assert len(master_loads) == 1  # nothing to query, no parse
+        assert (project / "subsets" / "evidence.ttl").read_bytes() == output
+
+    def test_changed_definition_is_regenerated(self, project):
+        SubsetEngine(project).generate()
+        definition = project / ".scimantic" / "subsets" / "questions.yaml"
+        definition.write_text(QUESTIONS_YAML + "title: Questions\n")
+
+        results = SubsetEngine(project).generate()
+
+        assert [r.cached for r in results] == [True, False]
+
+    def test_changed_master_regenerates_everything(self, project):
+        engine = SubsetEngine(project)
+        engine.generate()
+        with open(project / "project.ttl", "a") as f:
+            f.write('ex:q1 scimantic:content "Is CO2 linear?" .\n')
+
+        results = engine.generate()
+
+        assert not any(r.cached for r in results)
+        questions = (project / "subsets" / "questions.ttl").read_text()
+        assert "CO2" in questions
+
+    def test_edited_output_is_regenerated(self, project):
+        SubsetEngine(project).generate()
+        output = project / "subsets" / "evidence.ttl"
+        expected = output.read_text()
+        output.write_text("# edited\n")
+
+        results = SubsetEngine(project).generate()
+
+        assert not results[0].cached
+        assert output.read_text() == expected
+
+    @pytest.mark.parametrize("name", ["project.nt", "project.sqlite"])
+    def test_any_project_format_is_a_master(self, project, name):
+        convert_project(project / "project.ttl", project / name)
+
+        evidence, _ = SubsetEngine(project, project_file=name).generate()
+
+        assert evidence.entities == 2
+        assert not list(project.glob("*.graphcache"))
+
+    def test_forked_workers_match_in_process(self, tmp_path, project):
+        SubsetEngine(project).generate(jobs=1)
+        expected = {p.name: p.read_bytes() for p in (project / "subsets").glob("*.ttl")}
+
+        SubsetEngine(project).generate(jobs=2, force=True)
+
+        assert {
+            p.name: p.read_bytes() for p in (project / "subsets").glob("*.ttl")
+        } == expected
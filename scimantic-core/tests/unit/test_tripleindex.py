@@ -0,0 +1,146 @@
+"""
+Unit tests for the memory-mapped triple index.
+"""
+
+import json
+from itertools import product
+
+import pytest
+from rdflib import BNode, Graph, Literal, Namespace
+from rdflib.graph import ModificationException
+from rdflib.namespace import PROV, RDF
+
+from scimantic.ntriples import write_ntriples
+from scimantic.storage import add_to_project, convert_project, load_project
+from scimantic.tripleindex import TripleIndex, build_index, open_index
+
+EX = Namespace("http://example.org/research/")
+SCIMANTIC = Namespace("http://scimantic.io/")
+
+
+@pytest.fixture
+def graph():
+    g = Graph()
+    for i in range(20):
+        entity = EX[f"e{i}"]
+        g.add((entity, RDF.type, SCIMANTIC.Evidence))
+        g.add((entity, SCIMANTIC.content, Literal(f'finding "{i}"\nsecond line')))
+        g.add((entity, PROV.wasDerivedFrom, EX[f"e{i // 3}"]))
+    g.add((EX.e1, SCIMANTIC.value, Literal(28.0134)))
+    g.add((EX.e1, SCIMANTIC.label, Literal("Stickstoff", lang="de")))
+    measurement = BNode()
+    g.add((EX.e2, SCIMANTIC.measurement, measurement))
+    g.add((measurement, SCIMANTIC.unit, Literal("K")))
+    return g
+
+
+@pytest.fixture
+def index(graph, tmp_path):
+    build_index(graph, tmp_path / "project.idx")
+    index = TripleIndex(tmp_path / "project.idx")
+    yield index
+    index.close()
+
+
+class TestTripleIndex:
+    def test_build_counts_distinct_triples(self, graph, tmp_path):
+        count = build_index(list(graph) + list(graph), tmp_path / "project.idx")
+
+        assert count == len(graph)
+        meta = json.loads((tmp_path / "project.idx" / "index.json").read_text())
+        assert meta["triples"] == len(graph)
+
+    def test_every_pattern_matches_rdflib(self, graph, index):
+        subjects = [EX.e1, EX.e2, EX.missing, None]
+        predicates = [RDF.type, PROV.wasDerivedFrom, SCIMANTIC.value, None]
+        objects = [EX.e0, SCIMANTIC.Evidence, Literal(28.0134), Literal("x"), None]
+
+        for pattern in product(subjects, predicates, objects):
+            expected = set(graph.triples(pattern))
+            assert set(index.triples(pattern)) == expected, pattern
+            assert index.count(pattern) == len(expected), pattern
+
+    def test_round_trips_terms(self, graph, index):
+        round_tripped = Graph()
+        for triple in index.triples((None, None, None)):
+            round_tripped.add(triple)
+
+        assert round_tripped.isomorphic(graph)
+
+    def test_term_ids(self, index):
+        term_id = index.term_id(EX.e5)
+
+        assert term_id is not None
+        assert index.term(term_id) == EX.e5
+        assert index.term_id(EX.missing) is None
+
+    def test_empty_index(self, tmp_path):
+        build_index(Graph(), tmp_path / "empty.idx")
+
+        index = TripleIndex(tmp_path / "empty.idx")
+
+        assert len(index) == 0
+        assert list(index.triples((None, None, None))) == []
+
+    def test_rebuild_replaces_index(self, graph, tmp_path):
+        build_index(graph, tmp_path / "project.idx")
+
+        build_index([(EX.a, RDF.type, SCIMANTIC.Question)], tmp_path / "project.idx")
+
+        assert len(TripleIndex(tmp_path / "project.idx")) == 1
+
+
+class TestIndexStore:
+    def test_sparql_query(self, graph, tmp_path):
+        build_index(graph, tmp_path / "project.idx", namespaces={"ex": str(EX)})
+        g = open_index(tmp_path / "project.idx")
+
+        rows = g.query(
+            """
+            PREFIX scimantic: <http://scimantic.io/>
+            PREFIX prov: <http://www.w3.org/ns/prov#>
+            SELECT ?e WHERE { ?e a scimantic:Evidence ; prov:wasDerivedFrom ex:e1 }
+            """
+        )
+
+        assert {row[0] for row in rows} == {EX.e3, EX.e4, EX.e5}
+        assert len(g) == len(graph)
+
+    def test_is_read_only(self, graph, tmp_path):
+        build_index(graph, tmp_path / "project.idx")
+        g = open_index(tmp_path / "project.idx")
+
+        with pytest.raises(ModificationException):
+            g.add((EX.a, RDF.type, SCIMANTIC.Question))
+
+
+class TestIndexProjects:
+    def test_mcp_reads_index_project(self, tmp_path):
+        from scimantic.mcp import add_evidence, get_provenance_graph_json
+
+        add_evidence(
+            content="Nanopublications are smallest publishable units.",
+            citation="Kuhn, T., et al. (2016).",
+            source="https://doi.org/10.7717/peerj-cs.78",
+            agent="http://example.org/agent/test",
+            project_path=str(tmp_path / "project.nt"),
+        )
+        convert_project(tmp_path / "project.nt", tmp_path / "project.idx")
+
+        data = json.loads(get_provenance_graph_json(str(tmp_path / "project.idx")))
+
+        assert [e["citation"] for e in data["evidence"]] == ["Kuhn, T., et al. (2016)."]
+
+    def test_convert_index_to_turtle(self, graph, tmp_path):
+        write_ntriples(graph, tmp_path / "project.nt.gz")
+        convert_project(tmp_path / "project.nt.gz", tmp_path / "project.idx")
+
+        convert_project(tmp_path / "project.idx", tmp_path / "project.ttl")
+
+        assert load_project(tmp_path / "project.ttl").isomorphic(graph)
+
+    def test_add_to_index_is_rejected(self, graph, tmp_path):
+        build_index(graph, tmp_path / "project.idx")
+
+        with pytest.raises(ValueError, match="read-only"):
+            add_to_project(graph, tmp_path / "project.idx")
@@ -0,0 +1,170 @@
+"""
+Unit tests for Monte Carlo uncertainty propagation.
+"""
+
+import numpy as np
+import pytest
+from rdflib import BNode, Graph, Literal, Namespace, URIRef
+from rdflib.namespace import PROV, RDF
+
+from scimantic.storage import load_project
+from scimantic.uncertainty import (
+    FIXED,
+    NORMAL,
+    UNCERTAINTY_NATURE,
+    UNIFORM,
+    URREF,
+    Distribution,
+    format_value,
+    parse_value,
+    propagate,
+    propagate_results,
+    result_distribution,
+)
+
+EX = Namespace("http://example.org/research/")
+SCIMANTIC = Namespace("http://scimantic.io/")
+
+
+class TestParseValue:
+    @pytest.mark.parametrize(
+        "text, expected",
+        [
+            ("28.0134", Distribution(FIXED, 28.0134)),
+            ("28.0134 ± 0.0004", Distribution(NORMAL, 28.0134, 0.0004)),
+            ("-1.5 +/- 2e-3", Distribution(NORMAL, -1.5, 0.002)),
+            ("[27.5, 28.5]", Distribution(UNIFORM, 28.0, 0.5)),
+        ],
+    )
+    def test_forms(self, text, expected):
+        assert parse_value(text) == expected
+
+    def test_concise_notation(self):
+        distribution = parse_value("1.23(4)e5")
+
+        assert distribution.kind == NORMAL
+        assert distribution.loc == pytest.approx(1.23e5)
+        assert distribution.scale == pytest.approx(4e3)
+
+    def test_rejects_non_numeric_values(self):
+        with pytest.raises(ValueError, match="Not a numeric"):
+            parse_value("about three")
+
+    def test_format_value_rounds_to_the_uncertainty(self):
+        assert format_value(28.01342371, 0.000412) == "28.01342 ± 0.00041"
+        assert format_value(1234.5, 130) == "1230 ± 130"
+        assert format_value(5.0, 0.0) == "5"
+        assert parse_value(format_value(28.01342371, 0.000412)).loc == 28.01342
+
+
+class TestPropagate:
+    def test_linear_combination_of_normals(self):
+        inputs = {
+            "a": Distribution(NORMAL, 10.0, 0.3),
+            "b": Distribution(NORMAL, 5.0, 0.4),
+        }
+
+        (summary,) = propagate(
+            lambda x: x["a"] - x["b"], inputs, samples=200_000, seed=1
+        ).values()
+
+        assert summary.mean == pytest.approx(5.0, abs=0.01)
+        assert summary.std == pytest.approx(0.5, rel=0.01)
+        assert summary.low == pytest.approx(5.0 - 1.96 * 0.5, abs=0.01)
+        assert summary.samples == 200_000
+
+    def test_uniform_and_fixed_inputs(self):
+        inputs = {
+            "u": Distribution(UNIFORM, 1.0, 0.5),
+            "c": Distribution(FIXED, 3.0),
+        }
+
+        summaries = propagate(
+            lambda x: {"u": x["u"], "c": x["c"]}, inputs, samples=100_000, seed=2
+        )
+
+        assert summaries["u"].std == pytest.approx(0.5 / np.sqrt(3), rel=0.01)
+        assert summaries["u"].low >= 0.5
+        assert summaries["c"].mean == 3.0
+        assert summaries["c"].std == 0.0
+
+    def test_batches_do_not_change_the_result_size(self):
+        seen = []
+
+        def record(x):
+            seen.append(len(x["a"]))
+            assert not x["a"].flags.writeable
+            return x["a"]
+
+        propagate(
+            record, {"a": Distribution(NORMAL, 0, 1)}, samples=2500, batch_size=1000
+        )
+
+        assert seen == [1000, 1000, 500]
+
+    def test_seed_makes_runs_reproducible(self):
+        inputs = {"a": Distribution(NORMAL, 0.0, 1.0)}
+
+        first = propagate(lambda x: x["a"], inputs, samples=1000, seed=7)
+        second = propagate(lambda x: x["a"], inputs, samples=1000, seed=7)
+
+        assert first == second
+
+
+@pytest.fixture
+def project(tmp_path):
+    g = Graph()
+    mass, volume = EX.mass, EX.volume
+    g.add((mass, RDF.type, SCIMANTIC.Result))
+    g.add((mass, SCIMANTIC.value, Literal("10.0 ± 0.1")))
+    g.add((mass, SCIMANTIC.unit, Literal("g")))
+    model = BNode()
+    g.add((mass, SCIMANTIC.hasUncertainty, model))
+    g.add((model, RDF.type, URREF.Aleatory))
+    g.add((volume, RDF.type, SCIMANTIC.Result))
+    g.add((volume, SCIMANTIC.value, Literal("4.0(2)")))
+    g.add((volume, SCIMANTIC.hasUncertainty, EX.volume_uncertainty))
+    g.add((EX.volume_uncertainty, URREF.natureOfUncertainty, Literal("Aleatory")))
+    g.add((EX.density_guess, RDF.type, SCIMANTIC.Result))
+    g.add((EX.density_guess, SCIMANTIC.value, Literal("2.5 ± 0.5")))
+    g.add((EX.density_guess, SCIMANTIC.hasUncertainty, EX.epistemic))
+    g.add((EX.epistemic, URREF.natureOfUncertainty, Literal("Epistemic")))
+    path = tmp_path / "project.ttl"
+    g.serialize(destination=str(path), format="turtle")
+    return path
+
+
+class TestResults:
+    def test_only_aleatory_uncertainty_is_sampled(self, project):
+        g = load_project(project)
+
+        assert result_distribution(g, EX.mass) == Distribution(NORMAL, 10.0, 0.1)
+        assert result_distribution(g, EX.volume).kind == NORMAL
+        assert result_distribution(g, EX.density_guess) == Distribution(FIXED, 2.5)
+
+    def test_propagate_results_writes_results_with_provenance(self, project):
+        uris = propagate_results(
+            project,
+            lambda x: x["mass"] / x["volume"],
+            {"mass": str(EX.mass), "volume": str(EX.volume)},
+            units="g/cm^3",
+            agent="http://example.org/agent/test",
+            samples=100_000,
+            seed=3,
+        )
+
+        g = load_project(project)
+        density = URIRef(uris["value"])
+        assert (density, RDF.type, SCIMANTIC.Result) in g
+        assert parse_value(str(g.value(density, SCIMANTIC.value))).loc == (
+            pytest.approx(2.5, rel=0.01)
+        )
+        assert str(g.value(density, SCIMANTIC.unit)) == "g/cm^3"
+        assert set(g.objects(density, PROV.wasDerivedFrom)) == {EX.mass, EX.volume}
+        analysis = g.value(density, PROV.wasGeneratedBy)
+        assert (analysis, RDF.type, SCIMANTIC.Analysis) in g
+        assert set(g.objects(analysis, PROV.used)) == {EX.mass, EX.volume}
+        model = g.value(density, SCIMANTIC.hasUncertainty)
+        assert g.value(model, URREF.natureOfUncertainty) == UNCERTAINTY_NATURE.Aleatory
+        # The new Result can itself be propagated further
+        assert result_distribution(g, density).kind == NORMAL
@@ -1,6 +1,23 @@
 #!/usr/bin/env python3
+"""
+Version injection for the generated ontology artifacts.
+
+The owl:Ontology metadata (ontology IRI, owl:versionIRI, owl:versionInfo,
+pav:version) is added to the parsed graph before it is serialized, so
+`gen-all` writes each artifact exactly once. `gen-all` imports this module
+in-process; running it as a script re-applies the injection to the committed
+artifacts.
+"""
+
 import re
+
 import yaml
+from rdflib import Graph, Literal, URIRef
+from rdflib.namespace import OWL, RDF
+
+PAV_VERSION = URIRef("http://purl.org/pav/version")
+ONTOLOGY_IRI = URIRef("http://scimantic.io/")
+SHAPES_IRI = URIRef("http://scimantic.io/shacl/scimantic-shapes.ttl")
 
 
 def get_version(schema_path):
@@ -26,164 +43,86 @@ def update_widoco_conf(file_path, version):
         content = f.read()
 
     # Update ontologyRevisionNumber
-    content = re.sub(
+    new_content = re.sub(
         r"ontologyRevisionNumber=.*", f"ontologyRevisionNumber={version}", content
     )
 
     # Update ontologyNamespaceURI (ensure NO trailing slash as per release script expectation)
-    content = re.sub(
+    new_content = re.sub(
         r"ontologyNamespaceURI=.*",
         "ontologyNamespaceURI=https://scimantic.io/",
-        content,
+        new_content,
     )
 
+    if new_content == content:
+        return
+
     with open(file_path, "w") as f:
-        f.write(content)
+        f.write(new_content)
     print(f"Updated {file_path} with version {version}")
 
 
-def update_ttl(file_path, version, is_shacl=False):
-    with open(file_path, "r") as f:
-        original_content = f.read()
-    content = original_content
-
-    # Define the new properties
-    if is_shacl:
-        base_name = "shacl/scimantic-shapes.ttl"
-    else:
-        base_name = "ontology.ttl"
-
-    version_iri = f"<http://scimantic.io/v/{version}/{base_name}>"
-    version_info = f'"{version}"'
-
-    # Check if owl:Ontology exists
-    # Pattern to match the Ontology declaration block
-    # It usually ends with a dot .
-    # We look for 'a owl:Ontology ;'
-
-    ontology_pattern = re.compile(r"(\s+a owl:Ontology ;)", re.MULTILINE)
-
-    match = ontology_pattern.search(content)
-    if not match:
-        if is_shacl:
-            print(f"Creating new owl:Ontology block for {file_path}")
-
-            # 1. Ensure owl prefix exists
-            if "@prefix owl:" not in content:
-                # Insert after last prefix or at top
-                prefix_def = "@prefix owl: <http://www.w3.org/2002/07/owl#> .\n"
-                last_prefix = re.search(r"@prefix .*\n", content)
-                if last_prefix:
-                    # Insert after the last detected prefix
-                    # We find the *last* occurrence of a prefix line to keep them grouped
-                    all_prefixes = list(
-                        re.finditer(r"^@prefix .* \.$", content, re.MULTILINE)
-                    )
-                    if all_prefixes:
-                        end_pos = all_prefixes[-1].end()
-                        content = (
-                            content[:end_pos] + "\n" + prefix_def + content[end_pos:]
-                        )
-                    else:
-                        content = prefix_def + content
-                else:
-                    content = prefix_def + content
-
-            # 2. Append ontology block
-            # Use specific IRI for shapes file as subject
-            # This matches release-ontology.yml expectations
-            ontology_subject = "<http://scimantic.io/shacl/scimantic-shapes.ttl>"
-
-            new_block = f"""
-{ontology_subject} a owl:Ontology ;
-    owl:versionIRI {version_iri} ;
-    owl:versionInfo {version_info} .
-"""
-            content += new_block
-
-            # Strict EOF newline
-            content = content.rstrip() + "\n"
-
-            # Write immediately and return (skip regex replacement logic)
-            with open(file_path, "w") as f:
-                f.write(content)
-            print(
-                f"Updated {file_path} with new ontology definition and version {version}"
-            )
-            return
-
-        else:
-            print(f"Warning: No owl:Ontology definition found in {file_path}")
-            ensure_newline(file_path)
-            return
-
-    # --------------------------------------------------------------------------
-    # FIX: Ensure main ontology has correct subject (e.g. <http://scimantic.io/>)
-    # instead of LinkML generated default/ID-based subject
-    # --------------------------------------------------------------------------
-    if not is_shacl:
-        # Search for subject preceding 'a owl:Ontology'
-        # Generated: scimantic:schema.owl.ttl ... a owl:Ontology ;
-        # Desired: <http://scimantic.io/> ... a owl:Ontology ;
-
-        # We look for the subject token right before the owl:Ontology definition part
-        # Note: In Turtle, it could be "SUBJECT a owl:Ontology" or "SUBJECT\n ... ; a owl:Ontology"
-        # Ideally we replace specifically the incorrect subject.
-
-        # Pattern to find the subject at start of the block containing version info or just 'a owl:Ontology'
-        # LinkML output example provided by user:
-        # scimantic:schema.owl.ttl
-        #    owl:versionIRI <...>; ... a owl:Ontology ;
-
-        # We replace the specific known bad identifier if found
-        bad_subject = "scimantic:schema.owl.ttl"
-        good_subject = "<http://scimantic.io/>"
-
-        if bad_subject in content:
-            content = content.replace(bad_subject, good_subject)
-            print(f"Fixed ontology subject: {bad_subject} -> {good_subject}")
-
-    # Check if versionIRI already exists
-    if "owl:versionIRI" in content:
-        # Update existing
-        content = re.sub(
-            r"owl:versionIRI\s+<[^>]+>", f"owl:versionIRI {version_iri}", content
-        )
-    else:
-        # Insert it
-        replacement = f"\n    owl:versionIRI {version_iri} ;"
-        content = ontology_pattern.sub(f"{replacement}\\1", content)
-
-    # Also ensure pav:version is correct if present
-    if "pav:version" in content:
-        content = re.sub(
-            r'pav:version\s+"[^"]+"', f"pav:version {version_info}", content
-        )
-
-    # strict EOF newline
-    content = content.rstrip() + "\n"
-
-    if content == original_content:
-        # print(f"No changes needed for {file_path}")
-        return
+def version_iri(version, is_shacl=False):
+    """Returns the versioned IRI of the ontology or of the shapes file."""
+    base_name = "shacl/scimantic-shapes.ttl" if is_shacl else "ontology.ttl"
+    return URIRef(f"http://scimantic.io/v/{version}/{base_name}")
 
-    with open(file_path, "w") as f:
-        f.write(content)
-    print(f"Updated {file_path} with version {version}")
+
+def inject_version_triples(graph: Graph, version, is_shacl=False) -> Graph:
+    """
+    Adds the versioned owl:Ontology description to a parsed artifact in place.
+
+    For the OWL artifact, the LinkML-generated ontology subject
+    (scimantic:schema.owl.ttl) is renamed to <http://scimantic.io/>. The
+    SHACL artifact gets its own owl:Ontology node for the shapes file, as
+    expected by release-ontology.yml.
+
+    Args:
+        graph: Parsed scimantic.ttl or scimantic-shapes.ttl graph
+        version: Schema version (e.g. "0.1.3")
+        is_shacl: Whether the graph holds the SHACL shapes
+
+    Returns:
+        The same graph, for chaining
+    """
+    subject = SHAPES_IRI if is_shacl else ONTOLOGY_IRI
+
+    if not is_shacl:
+        for generated in list(graph.subjects(RDF.type, OWL.Ontology)):
+            if generated == subject:
+                continue
+            # Fix the generated subject (e.g. scimantic:schema.owl.ttl)
+            for p, o in list(graph.predicate_objects(generated)):
+                graph.remove((generated, p, o))
+                graph.add((subject, p, o))
+            for s, p in list(graph.subject_predicates(generated)):
+                graph.remove((s, p, generated))
+                graph.add((s, p, subject))
+
+    graph.add((subject, RDF.type, OWL.Ontology))
+    graph.set((subject, OWL.versionIRI, version_iri(version, is_shacl)))
+    graph.set((subject, OWL.versionInfo, Literal(version)))
+    if (subject, PAV_VERSION, None) in graph:
+        graph.set((subject, PAV_VERSION, Literal(version)))
+    return graph
 
 
 if __name__ == "__main__":
+    from pathlib import Path
+
+    from scimantic.gen_all import determinize_ttl
+
     # Paths relative to scimantic-ontology directory
     schema_path = "schema/scimantic.yaml"
-    ontology_path = "generated/scimantic.ttl"
-    shacl_path = "generated/shacl/scimantic-shapes.ttl"
+    ontology_path = Path("generated/scimantic.ttl")
+    shacl_path = Path("generated/shacl/scimantic-shapes.ttl")
     widoco_conf_path = "generated/widoco.conf"
 
     version = get_version(schema_path)
     print(f"Injecting version {version}...")
 
-    update_ttl(ontology_path, version, is_shacl=False)
-    update_ttl(shacl_path, version, is_shacl=True)
+    determinize_ttl(ontology_path, version=version)
+    determinize_ttl(shacl_path, version=version, is_shacl=True)
     update_widoco_conf(widoco_conf_path, version)
 
     # Also ensure models.py has a trailing newline
@@ -1,3 +1,4 @@
+import hashlib
 import rdflib
 from rdflib import RDF, RDFS, OWL, Namespace, BNode
 import subprocess
@@ -14,9 +15,40 @@ def get_name(uri):
         return str(uri).split("#")[-1]
     return str(uri).split("/")[-1]
 
-def generate_mermaid_v2():
-    g = rdflib.Graph()
-    g.parse("scimantic-ontology/generated/scimantic.ttl", format="turtle")
+def collection_items(g, list_node):
+    items = []
+    while list_node is not None and list_node != RDF.nil:
+        items.append(g.value(list_node, RDF.first))
+        list_node = g.value(list_node, RDF.rest)
+    return items
+
+def build_union_index(g):
+    """
+    Maps each class (named or anonymous) to its union members, scanning the
+    graph once. Direct owl:unionOf wins over owl:equivalentClass [ owl:unionOf ].
+    """
+    direct = {}
+    for s, _, union_list_node in g.triples((None, OWL.unionOf, None)):
+        direct.setdefault(s, []).extend(collection_items(g, union_list_node))
+
+    index = dict(direct)
+    for s, _, equivalent in g.triples((None, OWL.equivalentClass, None)):
+        if s not in direct and equivalent in direct:
+            index.setdefault(s, []).extend(direct[equivalent])
+    return index
+
+def load_ontology(ontology_path):
+    try:
+        # Reuse the parsed-graph cache when running inside the scimantic-core env
+        from scimantic.graph_cache import load_graph
+        return load_graph(ontology_path)
+    except ImportError:
+        g = rdflib.Graph()
+        g.parse(ontology_path, format="turtle")
+        return g
+
+def build_mermaid(g):
+    """Builds the Mermaid diagram source for the ontology graph."""
 
     # --- Configuration: Explicit Include Lists & Order ---
     # These lists define WHAT is shown and the vertical ORDER (Rank).
@@ -71,23 +103,11 @@ def generate_mermaid_v2():
     }
 
     # --- Helper: Get Union Members ---
+    # Built once per parse instead of rescanning the graph for every edge
+    union_index = build_union_index(g)
+
     def get_union_members(class_uri):
-        members = []
-
-        # 1. Direct unionOf: class_uri owl:unionOf ?list
-        for _, _, union_list_node in g.triples((class_uri, OWL.unionOf, None)):
-             c = rdflib.collection.Collection(g, union_list_node)
-             for member in c:
-                 members.append(member)
-
-        # 2. EquivalentClass union: class_uri owl:equivalentClass [ owl:unionOf ?list ]
-        if not members:
-            for _, _, bnode in g.triples((class_uri, OWL.equivalentClass, None)):
-                for _, _, union_list_node in g.triples((bnode, OWL.unionOf, None)):
-                    c = rdflib.collection.Collection(g, union_list_node)
-                    for member in c:
-                        members.append(member)
-        return members
+        return union_index.get(class_uri, [])
 
     # --- Extraction Cycle ---
     tuples = [] # List of (Source, Label, Target, SortKey)
@@ -151,7 +171,7 @@ def generate_mermaid_v2():
                         if isinstance(target, BNode):
                             # Handle Anonymous Union inside Restriction (legacy/any_of)
                             # [ owl:unionOf (...) ]
-                            if (target, OWL.unionOf, None) in g:
+                            if target in union_index:
                                 # It's an anonymous union, expand members
                                 members = get_union_members(target)
                                 for m in members:
@@ -325,37 +345,54 @@ def generate_mermaid_v2():
   }
 }%%"""
 
-    # Compare with existing file to avoid unnecessary IO and binary churn
-    output_mmd_path = Path("ontology_graph.mmd")
-    output_png_path = Path("ontology_graph.png")
-
     full_new_content = f"{config}\n{mmd_content}"
     if not full_new_content.endswith("\n"):
         full_new_content += "\n"
-
-    needs_regen = True
-    if output_mmd_path.exists() and output_png_path.exists():
-        with open(output_mmd_path, "r") as f:
-            old_content = f.read()
-        if old_content == full_new_content:
-            needs_regen = False
+    return full_new_content
+
+def render_png(output_mmd_path, output_png_path, hash_path):
+    """
+    Renders the PNG with mmdc unless the .mmd content hash matches the hash
+    recorded by the last successful render.
+    """
+    mmd_hash = hashlib.sha256(output_mmd_path.read_bytes()).hexdigest()
+    if output_png_path.exists() and hash_path.exists():
+        if hash_path.read_text().strip() == mmd_hash:
             print("Graph definition unchanged. Skipping PNG generation.")
+            return
+
+    # SVG/PNG Gen
+    try:
+        cmd = ["npx", "@mermaid-js/mermaid-cli", "-i", str(output_mmd_path), "-o", str(output_png_path), "-b", "white", "-s", "3"]
+        print("Running mmdc...")
+        subprocess.run(cmd, check=True)
+        hash_path.write_text(mmd_hash + "\n")
+        print(f"Generated {output_png_path}")
+    except Exception as e:
+        print(f"Error running mmdc: {e}")
+        if not output_png_path.exists():
+            print("Warning: PNG generation failed and no stale PNG exists.")
+
+def generate_mermaid_v2(root=Path("."), g=None):
+    """
+    Writes ontology_graph.mmd and renders ontology_graph.png below root.
+    Pass an already parsed graph to skip loading the ontology.
+    """
+    root = Path(root)
+    if g is None:
+        g = load_ontology(root / "scimantic-ontology" / "generated" / "scimantic.ttl")
+
+    # Compare with existing file to avoid unnecessary IO and binary churn
+    output_mmd_path = root / "ontology_graph.mmd"
+    output_png_path = root / "ontology_graph.png"
+    hash_path = root / "ontology_graph.png.sha256"
 
-    if needs_regen:
-        with open(output_mmd_path, "w") as f:
-            f.write(full_new_content)
+    full_new_content = build_mermaid(g)
+    if not output_mmd_path.exists() or output_mmd_path.read_text() != full_new_content:
+        output_mmd_path.write_text(full_new_content)
         print("Generated ontology_graph.mmd")
 
-        # SVG/PNG Gen
-        try:
-            cmd = ["npx", "@mermaid-js/mermaid-cli", "-i", "ontology_graph.mmd", "-o", "ontology_graph.png", "-b", "white", "-s", "3"]
-            print("Running mmdc...")
-            subprocess.run(cmd, check=True)
-            print("Generated ontology_graph.png")
-        except Exception as e:
-            print(f"Error running mmdc: {e}")
-            if not output_png_path.exists():
-                print("Warning: PNG generation failed and no stale PNG exists.")
+    render_png(output_mmd_path, output_png_path, hash_path)
 
 
 if __name__ == "__main__":